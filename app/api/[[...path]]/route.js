@@ -1,6 +1,18 @@
 import { NextResponse } from 'next/server'
-import { supabase } from '@/lib/supabase'
+import { createHash } from 'crypto'
+import { supabase, supabaseForRequest, getSettingsVersion, getGameRunsVersion, getScoreSeries, getDictionaryWords, getWordWindow } from '@/lib/supabase'
 import { toDbFormat, fromDbFormat } from '@/lib/dbCase'
+import { parsePageParams, applyKeyset, buildPage, pageHeaders, InvalidCursorError } from '@/lib/pagination'
+import { resolveSelect, projectRows, InvalidProjectionError } from '@/lib/projection'
+import { compressedJson } from '@/lib/compression'
+import { makeEtag, requestVariant, hasConditional, matchingEtag, notModified, etagHeaders } from '@/lib/etag'
+import { completeGame } from '@/lib/gamification'
+import { uuidv7 } from '@/lib/ids'
+import { INGEST_MODE, InvalidGameRunError, validateGameRun, enqueueGameRun, pendingGameRuns, mergePendingRuns } from '@/lib/ingest-queue'
+import { withIdempotency } from '@/lib/idempotency'
+import { PUZZLE_GENERATORS, PUZZLE_GENERATOR_VERSION, PUZZLE_LOCALES, PUZZLE_POOL_SIZE, PUZZLE_PAGE_SIZE, getPuzzlePage } from '@/lib/puzzles'
+import { ANAGRAM_LOCALES, MAX_RACK_LENGTH, loadAnagramIndex } from '@/lib/anagram-index'
+import { WORD_FREQUENCY_BANDS, MAX_SAMPLE_SIZE, MAX_WORD_LENGTH, sampleWords } from '@/lib/word-sampler'
 
 export const runtime = 'nodejs'
 
@@ -9,11 +21,72 @@ function handleCors() {
   const corsHeaders = {
     'Access-Control-Allow-Origin': '*',
     'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-    'Access-Control-Allow-Headers': 'Content-Type, Authorization'
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, If-None-Match, Idempotency-Key'
   }
   return corsHeaders
 }
 
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i
+const MAX_GAME_RUNS_BATCH = 100
+
+// RFC 9562 name-based (version 5) UUID in the URL namespace
+const URL_NAMESPACE = Buffer.from('6ba7b8119dad11d180b400c04fd430c8', 'hex')
+
+function uuidFromKey(key, table = 'game_runs') {
+  const hash = createHash('sha1').update(URL_NAMESPACE).update(`spiread:${table}:${key}`).digest()
+  hash[6] = 0x50 | (hash[6] & 0x0f)
+  hash[8] = 0x80 | (hash[8] & 0x3f)
+  const hex = hash.subarray(0, 16).toString('hex')
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`
+}
+
+// Build a game_runs row from a request body. A client-supplied id (e.g. the
+// key of an offline-queued run) is kept, or mapped to a stable UUID when it is
+// not one (legacy gr_... ids), so a replayed run keeps its identity.
+// created_at is the server's time, so a replayed run changes the gameRuns
+// version; the client's time goes to client_created_at.
+function buildGameRunRow(body) {
+  const clientKey = body.id || body.idempotencyKey
+  const createdAt = body.createdAt || body.created_at
+  return {
+    id: UUID_PATTERN.test(clientKey || '') ? clientKey : clientKey ? uuidFromKey(clientKey) : uuidv7(),
+    user_id: body.userId || body.user_id,
+    game: body.game,
+    difficulty_level: body.difficultyLevel || body.difficulty_level || 1,
+    duration_ms: body.durationMs || body.duration_ms || 0,
+    score: body.score || 0,
+    metrics: body.metrics || {},
+    created_at: new Date().toISOString(),
+    client_created_at: createdAt && !Number.isNaN(Date.parse(createdAt))
+      ? new Date(createdAt).toISOString()
+      : null
+  }
+}
+
+// Data exceptions and constraint violations (e.g. an unknown user_id) are the
+// row's fault: 400, so offline replays dead-letter the row instead of retrying
+function rowErrorStatus(error) {
+  return /^2[23]/.test(error?.code || '') ? 400 : 500
+}
+
+// Build a session_schedules row from a request body; the client key is kept
+// as the id (or mapped like buildGameRunRow), so a replayed schedule is
+// inserted once
+function buildSessionScheduleRow(body) {
+  const clientKey = body.id || body.idempotencyKey
+  return {
+    id: UUID_PATTERN.test(clientKey || '') ? clientKey
+      : clientKey ? uuidFromKey(clientKey, 'session_schedules') : uuidv7(),
+    user_id: body.userId || body.user_id,
+    template: body.template,
+    duration_ms: body.totalDurationMs || body.total_duration_ms || body.durationMs || body.duration_ms || 0,
+    total_score: body.totalScore || body.total_score || 0,
+    blocks: body.blocks || [],
+    started_at: body.startedAt || body.started_at || new Date().toISOString(),
+    completed_at: body.completedAt || body.completed_at || null
+  }
+}
+
 export async function OPTIONS() {
   return new NextResponse(null, {
     status: 200,
@@ -52,12 +125,14 @@ export async function GET(request, { params }) {
           )
         }
 
-        const { data: sessions, error: sessionsError } = await supabase
-          .from('sessions')
-          .select('*')
-          .eq('user_id', userId)
-          .order('created_at', { ascending: false })
-          .limit(50)
+        const sessionsPage = parsePageParams(request.nextUrl.searchParams, { defaultLimit: 50 })
+        const { data: sessions, error: sessionsError } = await applyKeyset(
+          supabase
+            .from('sessions')
+            .select(resolveSelect('sessions', request.nextUrl.searchParams))
+            .eq('user_id', userId),
+          sessionsPage
+        )
 
         if (sessionsError) {
           console.error('Error fetching sessions:', sessionsError)
@@ -67,7 +142,10 @@ export async function GET(request, { params }) {
           )
         }
 
-        return NextResponse.json(sessions || [], { headers: corsHeaders })
+        const sessionsResult = buildPage(sessions, sessionsPage.limit)
+        return compressedJson(request, sessionsResult.items, {
+          headers: { ...corsHeaders, ...pageHeaders(sessionsResult.nextCursor) }
+        })
 
       case 'documents':
         const docUserId = request.nextUrl.searchParams.get('user_id')
@@ -79,12 +157,14 @@ export async function GET(request, { params }) {
           )
         }
 
-        const { data: documents, error: docsError } = await supabase
-          .from('documents')
-          .select('*')
-          .eq('user_id', docUserId)
-          .order('created_at', { ascending: false })
-          .limit(20)
+        const docsPage = parsePageParams(request.nextUrl.searchParams, { defaultLimit: 20 })
+        const { data: documents, error: docsError } = await applyKeyset(
+          supabase
+            .from('documents')
+            .select(resolveSelect('documents', request.nextUrl.searchParams))
+            .eq('user_id', docUserId),
+          docsPage
+        )
 
         if (docsError) {
           console.error('Error fetching documents:', docsError)
@@ -94,7 +174,10 @@ export async function GET(request, { params }) {
           )
         }
 
-        return NextResponse.json(documents || [], { headers: corsHeaders })
+        const docsResult = buildPage(documents, docsPage.limit)
+        return compressedJson(request, docsResult.items, {
+          headers: { ...corsHeaders, ...pageHeaders(docsResult.nextCursor) }
+        })
 
       case 'settings':
         const settingsUserId = request.nextUrl.searchParams.get('user_id')
@@ -106,9 +189,20 @@ export async function GET(request, { params }) {
           )
         }
 
+        // Revalidation: compare against settings.updated_at before reading the row
+        const settingsVariant = requestVariant(request.nextUrl.searchParams)
+        if (hasConditional(request)) {
+          const settingsVersion = await getSettingsVersion(settingsUserId)
+          const settingsProbeEtag = makeEtag('settings', settingsVersion, settingsVariant)
+          const settingsMatch = matchingEtag(request, settingsProbeEtag)
+          if (settingsMatch) {
+            return notModified(settingsMatch, corsHeaders)
+          }
+        }
+
         const { data: userSettings, error: settingsError } = await supabase
           .from('settings')
-          .select('*')
+          .select(resolveSelect('settings', request.nextUrl.searchParams))
           .eq('user_id', settingsUserId)
           .single()
 
@@ -120,7 +214,10 @@ export async function GET(request, { params }) {
           )
         }
 
-        return NextResponse.json(userSettings || {}, { headers: corsHeaders })
+        const settingsEtag = makeEtag('settings', userSettings?.updated_at || null, settingsVariant)
+        return NextResponse.json(userSettings || {}, {
+          headers: { ...corsHeaders, ...etagHeaders(settingsEtag) }
+        })
 
       case 'gameRuns':
         const gameUserId = request.nextUrl.searchParams.get('user_id')
@@ -132,12 +229,29 @@ export async function GET(request, { params }) {
           )
         }
 
-        const { data: gameRuns, error: gameRunsError } = await supabase
-          .from('game_runs')
-          .select('*')
-          .eq('user_id', gameUserId)
-          .order('created_at', { ascending: false })
-          .limit(50)
+        // Runs are insert-only, so the newest run identifies every page's content
+        const gameRunsPage = parsePageParams(request.nextUrl.searchParams, { defaultLimit: 50 })
+        const gameRunsVariant = requestVariant(request.nextUrl.searchParams)
+        const gameRunsSelect = resolveSelect('game_runs', request.nextUrl.searchParams)
+        // Read-your-writes: runs still in the ingest queue join the first page
+        const queuedRuns = gameRunsPage.cursor ? [] : pendingGameRuns(gameUserId)
+        let gameRunsVersion
+        if ((hasConditional(request) || gameRunsPage.cursor) && queuedRuns.length === 0) {
+          gameRunsVersion = await getGameRunsVersion(gameUserId)
+          const gameRunsProbeEtag = makeEtag('gameRuns', gameRunsVersion, gameRunsVariant)
+          const gameRunsMatch = matchingEtag(request, gameRunsProbeEtag)
+          if (gameRunsMatch) {
+            return notModified(gameRunsMatch, corsHeaders)
+          }
+        }
+
+        const { data: gameRuns, error: gameRunsError } = await applyKeyset(
+          supabase
+            .from('game_runs')
+            .select(gameRunsSelect)
+            .eq('user_id', gameUserId),
+          gameRunsPage
+        )
 
         if (gameRunsError) {
           console.error('Error fetching game runs:', gameRunsError)
@@ -147,7 +261,199 @@ export async function GET(request, { params }) {
           )
         }
 
-        return NextResponse.json(gameRuns || [], { headers: corsHeaders })
+        const gameRunsResult = buildPage(
+          mergePendingRuns(projectRows(queuedRuns, gameRunsSelect), gameRuns),
+          gameRunsPage.limit
+        )
+        if (gameRunsVersion === undefined) {
+          const newestRun = gameRunsResult.items[0]
+          gameRunsVersion = newestRun ? `${newestRun.created_at}/${newestRun.id}` : null
+        }
+        const gameRunsEtag = makeEtag('gameRuns', gameRunsVersion, gameRunsVariant)
+        return compressedJson(request, gameRunsResult.items, {
+          headers: {
+            ...corsHeaders,
+            ...etagHeaders(gameRunsEtag),
+            ...pageHeaders(gameRunsResult.nextCursor),
+            'Access-Control-Expose-Headers': 'ETag, X-Next-Cursor'
+          }
+        })
+
+      case 'scoreHistory':
+        // Pre-binned daily series from game_daily_stats (one entry per day)
+        const historyUserId = request.nextUrl.searchParams.get('user_id')
+        const historyGame = request.nextUrl.searchParams.get('game')
+        const historyDays = parseInt(request.nextUrl.searchParams.get('days') || '30', 10)
+        const historyTo = request.nextUrl.searchParams.get('to')
+
+        if (!historyUserId || !historyGame) {
+          return NextResponse.json(
+            { error: 'User ID and game required' },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (!Number.isInteger(historyDays) || historyDays < 1 || historyDays > 366) {
+          return NextResponse.json(
+            { error: 'days must be an integer between 1 and 366' },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (historyTo && !/^\d{4}-\d{2}-\d{2}$/.test(historyTo)) {
+          return NextResponse.json(
+            { error: 'to must be a YYYY-MM-DD date' },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        try {
+          const series = await getScoreSeries(historyUserId, historyGame, historyDays, historyTo)
+          return compressedJson(request, { game: historyGame, days: historyDays, series }, {
+            headers: corsHeaders
+          })
+        } catch (error) {
+          return NextResponse.json(
+            { error: 'Failed to fetch score history' },
+            { status: 500, headers: corsHeaders }
+          )
+        }
+
+      case 'puzzles':
+        // Pregenerated puzzles by seed; identical for every user and cacheable
+        // for as long as the generator version (part of the URL) is current
+        const puzzleGame = request.nextUrl.searchParams.get('game')
+        const puzzleLevel = parseInt(request.nextUrl.searchParams.get('level') || '1', 10)
+        const puzzleLocale = request.nextUrl.searchParams.get('locale') || 'es'
+        const puzzleFrom = parseInt(request.nextUrl.searchParams.get('from') || '0', 10)
+        const puzzleCount = parseInt(request.nextUrl.searchParams.get('count') || String(PUZZLE_PAGE_SIZE), 10)
+
+        if (!PUZZLE_GENERATORS[puzzleGame]) {
+          return NextResponse.json(
+            { error: `game must be one of ${Object.keys(PUZZLE_GENERATORS).join(', ')}` },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (!PUZZLE_LOCALES.includes(puzzleLocale)) {
+          return NextResponse.json(
+            { error: `locale must be one of ${PUZZLE_LOCALES.join(', ')}` },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (!Number.isInteger(puzzleLevel) || puzzleLevel < 1 || puzzleLevel > 20) {
+          return NextResponse.json(
+            { error: 'level must be an integer between 1 and 20' },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (!Number.isInteger(puzzleFrom) || puzzleFrom < 0 || puzzleFrom >= PUZZLE_POOL_SIZE ||
+            !Number.isInteger(puzzleCount) || puzzleCount < 1 || puzzleCount > PUZZLE_POOL_SIZE) {
+          return NextResponse.json(
+            { error: `from must be below ${PUZZLE_POOL_SIZE} and count between 1 and ${PUZZLE_POOL_SIZE}` },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        return compressedJson(request, {
+          version: PUZZLE_GENERATOR_VERSION,
+          poolSize: PUZZLE_POOL_SIZE,
+          puzzles: await getPuzzlePage(puzzleGame, puzzleLevel, puzzleLocale, puzzleFrom, puzzleCount)
+        }, {
+          headers: { ...corsHeaders, 'Cache-Control': 'public, max-age=86400' }
+        })
+
+      case 'words':
+        // Random words by length range and frequency band (lib/word-sampler.js)
+        const wordsLocale = request.nextUrl.searchParams.get('locale') || 'es'
+        const wordsMinLength = parseInt(request.nextUrl.searchParams.get('min_length') || '4', 10)
+        const wordsMaxLength = parseInt(request.nextUrl.searchParams.get('max_length') || String(wordsMinLength), 10)
+        const wordsBand = request.nextUrl.searchParams.get('band') || 'any'
+        const wordsCount = parseInt(request.nextUrl.searchParams.get('count') || '20', 10)
+
+        if (!ANAGRAM_LOCALES.includes(wordsLocale)) {
+          return NextResponse.json(
+            { error: `locale must be one of ${ANAGRAM_LOCALES.join(', ')}` },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (!Number.isInteger(wordsMinLength) || !Number.isInteger(wordsMaxLength) ||
+            wordsMinLength < 1 || wordsMaxLength < wordsMinLength || wordsMaxLength > MAX_WORD_LENGTH) {
+          return NextResponse.json(
+            { error: `min_length and max_length must satisfy 1 <= min_length <= max_length <= ${MAX_WORD_LENGTH}` },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (!Object.keys(WORD_FREQUENCY_BANDS).includes(wordsBand)) {
+          return NextResponse.json(
+            { error: `band must be one of ${Object.keys(WORD_FREQUENCY_BANDS).join(', ')}` },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (!Number.isInteger(wordsCount) || wordsCount < 1 || wordsCount > MAX_SAMPLE_SIZE) {
+          return NextResponse.json(
+            { error: `count must be an integer between 1 and ${MAX_SAMPLE_SIZE}` },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        const wordSample = await sampleWords({
+          language: wordsLocale,
+          minLength: wordsMinLength,
+          maxLength: wordsMaxLength,
+          band: wordsBand,
+          count: wordsCount
+        }, getWordWindow)
+
+        return compressedJson(request, { locale: wordsLocale, band: wordsBand, ...wordSample }, {
+          headers: { ...corsHeaders, 'Cache-Control': 'no-store' }
+        })
+
+      case 'anagrams':
+        // Words formable from a rack, and optionally whether one answer is valid
+        const anagramLocale = request.nextUrl.searchParams.get('locale') || 'es'
+        const anagramRack = request.nextUrl.searchParams.get('rack') || ''
+        const anagramWord = request.nextUrl.searchParams.get('word')
+        const anagramMinLength = parseInt(request.nextUrl.searchParams.get('min_length') || '2', 10)
+
+        if (!ANAGRAM_LOCALES.includes(anagramLocale)) {
+          return NextResponse.json(
+            { error: `locale must be one of ${ANAGRAM_LOCALES.join(', ')}` },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (!/^\p{L}+$/u.test(anagramRack) || anagramRack.length > MAX_RACK_LENGTH) {
+          return NextResponse.json(
+            { error: `rack must be 1 to ${MAX_RACK_LENGTH} letters` },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        if (!Number.isInteger(anagramMinLength) || anagramMinLength < 1) {
+          return NextResponse.json(
+            { error: 'min_length must be a positive integer' },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        const anagramIndex = await loadAnagramIndex(anagramLocale, locale =>
+          getDictionaryWords(locale, 1, MAX_RACK_LENGTH)
+        )
+
+        return compressedJson(request, {
+          locale: anagramLocale,
+          rack: anagramRack.toLowerCase(),
+          words: anagramIndex.wordsFromRack(anagramRack, { minLength: anagramMinLength }),
+          ...(anagramWord !== null ? { word: anagramWord, valid: anagramIndex.isValidWord(anagramWord, anagramRack) } : {})
+        }, {
+          headers: { ...corsHeaders, 'Cache-Control': 'public, max-age=600' }
+        })
 
       case 'session_schedules':
         const scheduleUserId = request.nextUrl.searchParams.get('user_id')
@@ -160,10 +466,10 @@ export async function GET(request, { params }) {
         }
 
         const { data: schedules, error: schedulesError } = await supabase
-          .from('sessionSchedules')
+          .from('session_schedules')
           .select('*')
-          .eq('userId', scheduleUserId)
-          .order('startedAt', { ascending: false })
+          .eq('user_id', scheduleUserId)
+          .order('started_at', { ascending: false })
           .limit(20)
 
         if (schedulesError) {
@@ -183,6 +489,13 @@ export async function GET(request, { params }) {
         )
     }
   } catch (error) {
+    if (error instanceof InvalidCursorError || error instanceof InvalidProjectionError) {
+      return NextResponse.json(
+        { error: error.message },
+        { status: 400, headers: corsHeaders }
+      )
+    }
+
     console.error('API Error:', error)
     return NextResponse.json(
       { error: 'Internal server error' },
@@ -191,7 +504,13 @@ export async function GET(request, { params }) {
   }
 }
 
-export async function POST(request, { params }) {
+// Writes honor Idempotency-Key, so clients can retry or hedge a slow POST
+// without creating duplicates
+export async function POST(request, context) {
+  return withIdempotency(request, () => handlePost(request, context), { headers: handleCors() })
+}
+
+async function handlePost(request, { params }) {
   const { path } = params
   const corsHeaders = handleCors()
 
@@ -212,7 +531,7 @@ export async function POST(request, { params }) {
         const { data: sessionData, error: sessionError } = await supabase
           .from('sessions')
           .insert([{
-            id: `session_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+            id: uuidv7(),
             user_id: body.user_id,
             wpm_start: body.wpm_start,
             wpm_end: body.wpm_end || body.wpm_start,
@@ -239,7 +558,7 @@ export async function POST(request, { params }) {
         const { data: documentData, error: documentError } = await supabase
           .from('documents')
           .insert([{
-            id: `doc_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+            id: uuidv7(),
             user_id: body.user_id,
             title: body.title,
             content: body.content,
@@ -288,17 +607,54 @@ export async function POST(request, { params }) {
         return NextResponse.json(settingsData, { headers: corsHeaders })
 
       case 'gameRuns':
+        // Batched replay ({ runs: [...] }) from the service worker offline
+        // queue; rows keep their queued ids, so replaying a batch is a no-op
+        if (Array.isArray(body.runs)) {
+          if (body.runs.length === 0 || body.runs.length > MAX_GAME_RUNS_BATCH) {
+            return NextResponse.json(
+              { error: `runs must contain 1-${MAX_GAME_RUNS_BATCH} items` },
+              { status: 400, headers: corsHeaders }
+            )
+          }
+
+          // Same checks in both modes: queue mode must not accept what an
+          // insert would reject
+          const batchRows = body.runs.map(buildGameRunRow)
+          batchRows.forEach(validateGameRun)
+          if (INGEST_MODE === 'queue') {
+            await Promise.all(batchRows.map(enqueueGameRun))
+            return NextResponse.json(
+              { ids: batchRows.map(row => row.id) },
+              { status: 202, headers: corsHeaders }
+            )
+          }
+
+          const { error: batchError } = await supabase
+            .from('game_runs')
+            .upsert(batchRows, { onConflict: 'id', ignoreDuplicates: true })
+
+          if (batchError) {
+            console.error('Error creating game runs batch:', batchError)
+            return NextResponse.json(
+              { error: 'Failed to create game runs' },
+              { status: rowErrorStatus(batchError), headers: corsHeaders }
+            )
+          }
+
+          return NextResponse.json({ ids: batchRows.map(row => row.id) }, { headers: corsHeaders })
+        }
+
+        const gameRunRow = validateGameRun(buildGameRunRow(body))
+
+        // Ingestion mode: durable append now, bulk insert by the flusher
+        if (INGEST_MODE === 'queue') {
+          await enqueueGameRun(gameRunRow)
+          return NextResponse.json(gameRunRow, { status: 202, headers: corsHeaders })
+        }
+
         const { data: gameRunData, error: gameRunError } = await supabase
           .from('game_runs')
-          .insert([{
-            user_id: body.userId || body.user_id,
-            game: body.game,
-            difficulty_level: body.difficultyLevel || body.difficulty_level || 1,
-            duration_ms: body.durationMs || body.duration_ms || 0,
-            score: body.score || 0,
-            metrics: body.metrics || {},
-            created_at: new Date().toISOString()
-          }])
+          .insert([gameRunRow])
           .select()
           .single()
 
@@ -306,35 +662,64 @@ export async function POST(request, { params }) {
           console.error('Error creating game run:', gameRunError)
           return NextResponse.json(
             { error: 'Failed to create game run' },
-            { status: 500, headers: corsHeaders }
+            { status: rowErrorStatus(gameRunError), headers: corsHeaders }
           )
         }
 
         return NextResponse.json(gameRunData, { headers: corsHeaders })
 
+      case 'completeGame':
+        // Run insert, progress merge, XP, streak and achievements in one call
+        const completeUserId = body.userId || body.user_id
+        if (!completeUserId || !body.game) {
+          return NextResponse.json(
+            { error: 'Missing required fields: userId, game' },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        const completion = await completeGame(completeUserId, {
+          game: body.game,
+          score: body.score || 0,
+          duration_ms: body.durationMs || body.duration_ms || 0,
+          difficulty_level: body.difficultyLevel || body.difficulty_level || 1,
+          metrics: body.metrics || {}
+        }, body.progress || null, supabaseForRequest(request))
+
+        if (!completion) {
+          return NextResponse.json(
+            { error: 'Failed to complete game' },
+            { status: 500, headers: corsHeaders }
+          )
+        }
+
+        return NextResponse.json(completion, { headers: corsHeaders })
+
       case 'session_schedules':
+        const scheduleRow = buildSessionScheduleRow(body)
+        if (!UUID_PATTERN.test(scheduleRow.user_id || '') || !scheduleRow.template) {
+          return NextResponse.json(
+            { error: 'Missing required fields: userId (UUID), template' },
+            { status: 400, headers: corsHeaders }
+          )
+        }
+
+        // Upsert on id: a replayed schedule returns the stored row
         const { data: scheduleData, error: scheduleError } = await supabase
-          .from('sessionSchedules')
-          .insert([{
-            id: body.id || `ss_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
-            userId: body.userId || body.user_id,
-            startedAt: body.startedAt || body.started_at || new Date().toISOString(),
-            template: body.template,
-            totalDurationMs: body.totalDurationMs || body.total_duration_ms || 0,
-            blocks: body.blocks || []
-          }])
+          .from('session_schedules')
+          .upsert([scheduleRow], { onConflict: 'id', ignoreDuplicates: true })
           .select()
-          .single()
+          .maybeSingle()
 
         if (scheduleError) {
           console.error('Error creating session schedule:', scheduleError)
           return NextResponse.json(
             { error: 'Failed to create session schedule' },
-            { status: 500, headers: corsHeaders }
+            { status: rowErrorStatus(scheduleError), headers: corsHeaders }
           )
         }
 
-        return NextResponse.json(scheduleData, { headers: corsHeaders })
+        return NextResponse.json(scheduleData || scheduleRow, { headers: corsHeaders })
 
       default:
         return NextResponse.json(
@@ -343,6 +728,13 @@ export async function POST(request, { params }) {
         )
     }
   } catch (error) {
+    if (error instanceof InvalidGameRunError) {
+      return NextResponse.json(
+        { error: error.message },
+        { status: 400, headers: corsHeaders }
+      )
+    }
+
     console.error('API Error:', error)
     return NextResponse.json(
       { error: 'Internal server error' },
@@ -5,6 +5,7 @@ import openai from '@/lib/openai';
 import { supabase } from '@/lib/supabase';
 import { toDbFormat, fromDbFormat } from '@/lib/dbCase';
 import { ENV } from '@/lib/env';
+import { compressedJson, cachedEntryResponse, precompressCacheEntry } from '@/lib/compression';
 
 export const runtime = 'nodejs';
 
@@ -105,14 +106,10 @@ export async function POST(request) {
     const cacheHash = generateHash(cacheInput);
     
     // Check cache
-    const cachedResult = await checkCache(cacheHash, 'questions');
-    if (cachedResult) {
+    const cachedEntry = await checkCache(cacheHash, 'questions');
+    if (cachedEntry) {
       try {
-        const parsed = JSON.parse(cachedResult);
-        return NextResponse.json({
-          ...parsed,
-          cached: true
-        });
+        return cachedEntryResponse(request, cachedEntry);
       } catch (e) {
         console.error('Error parsing cached result:', e);
       }
@@ -196,7 +193,7 @@ Respond ONLY with the requested JSON, no additional text.`;
       // Update token usage
       await updateTokenUsage(userId, tokenCount);
       
-      return NextResponse.json({
+      return compressedJson(request, {
         ...cacheData,
         cached: false,
         tokenCount,
@@ -342,7 +339,7 @@ async function checkCache(cacheHash, requestType) {
   try {
     const { data, error } = await supabase
       .from('ai_cache')
-      .select('output_text')
+      .select('output_text, output_br, output_gzip')
       .eq('input_hash', cacheHash)
       .eq('request_type', requestType)
       .single();
@@ -363,7 +360,7 @@ async function checkCache(cacheHash, requestType) {
         .eq('input_hash', cacheHash)
         .eq('request_type', requestType);
       
-      return data.output_text;
+      return data;
     }
     
     return null;
@@ -383,6 +380,7 @@ async function saveToCache(cacheHash, outputText, requestType, tokenCount) {
         output_text: outputText,
         request_type: requestType,
         token_count: tokenCount,
+        ...precompressCacheEntry(outputText),
         ver: 'v2'
       });
     
@@ -3,13 +3,17 @@ import { z } from 'zod';
 import openai from '@/lib/openai';
 import { 
   checkAndUpdateQuota, 
-  checkCache, 
+  checkCacheEntry, 
   saveToCache, 
   updateTokenUsage,
   chunkText,
   generateLocalSummary
 } from '@/lib/ai-utils';
 import { ENV } from '@/lib/env';
+import { compressedJson, cachedEntryResponse } from '@/lib/compression';
+
+// Fields of a stored summary returned on a cache hit
+const SUMMARY_FIELDS = ['bullets', 'abstract'];
 
 // Input validation schema
 const SummarizeSchema = z.object({
@@ -64,15 +68,10 @@ export async function POST(request) {
     
     // Check cache first
     const cacheKey = `${docId}_${locale}_summarize`;
-    const cachedResult = await checkCache(cacheKey, 'summarize');
-    if (cachedResult) {
+    const cachedEntry = await checkCacheEntry(cacheKey, 'summarize');
+    if (cachedEntry) {
       try {
-        const parsed = JSON.parse(cachedResult);
-        return NextResponse.json({
-          bullets: parsed.bullets,
-          abstract: parsed.abstract,
-          cached: true
-        });
+        return cachedEntryResponse(request, cachedEntry, SUMMARY_FIELDS);
       } catch (e) {
         console.error('Error parsing cached result:', e);
       }
@@ -115,12 +114,12 @@ export async function POST(request) {
     };
     
     // Save to cache
-    await saveToCache(cacheKey, JSON.stringify(result), 'summarize', tokenCount);
+    await saveToCache(cacheKey, JSON.stringify(result), 'summarize', tokenCount, SUMMARY_FIELDS);
     
     // Update token usage
     await updateTokenUsage(userId, tokenCount);
     
-    return NextResponse.json({
+    return compressedJson(request, {
       bullets: result.bullets,
       abstract: result.abstract,
       cached: false,
@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { supabase } from '@/lib/supabase';
+import { supabase, getSettingsVersion } from '@/lib/supabase';
+import { makeEtag, requestVariant, hasConditional, isNotModified, notModified, etagHeaders } from '@/lib/etag';
 import { fromDbFormat } from '@/lib/dbCase';
 
 export const runtime = 'nodejs';
@@ -17,10 +18,26 @@ export async function GET(request: NextRequest) {
       );
     }
 
+    const corsHeaders = {
+      'Access-Control-Allow-Origin': '*',
+      'Access-Control-Allow-Methods': 'GET, OPTIONS',
+      'Access-Control-Allow-Headers': 'Content-Type, If-None-Match',
+    };
+    const variant = requestVariant(searchParams);
+
+    // Revalidation: progress lives in settings, so settings.updated_at versions it
+    if (hasConditional(request)) {
+      const version = await getSettingsVersion(userId);
+      const probeEtag = makeEtag('progress', version, variant);
+      if (isNotModified(request, probeEtag)) {
+        return notModified(probeEtag, corsHeaders);
+      }
+    }
+
     // Fetch user settings with progress
     const { data, error } = await supabase
       .from('settings')
-      .select('progress')
+      .select('progress, updated_at')
       .eq('user_id', userId)
       .single();
 
@@ -32,19 +49,17 @@ export async function GET(request: NextRequest) {
       );
     }
 
+    const headers = {
+      ...corsHeaders,
+      ...etagHeaders(makeEtag('progress', data?.updated_at || null, variant)),
+    };
+
     // If no settings exist, return default progress
     if (!data || !data.progress) {
       const defaultProgress = game ? { [game]: getDefaultProgress(game) } : {};
       return NextResponse.json(
         { progress: defaultProgress },
-        {
-          status: 200,
-          headers: {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type',
-          }
-        }
+        { status: 200, headers }
       );
     }
 
@@ -57,28 +72,14 @@ export async function GET(request: NextRequest) {
       const gameProgress = progress[game] || getDefaultProgress(game);
       return NextResponse.json(
         { progress: { [game]: gameProgress } },
-        {
-          status: 200,
-          headers: {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type',
-          }
-        }
+        { status: 200, headers }
       );
     }
 
     // Return all progress
     return NextResponse.json(
       { progress },
-      {
-        status: 200,
-        headers: {
-          'Access-Control-Allow-Origin': '*',
-          'Access-Control-Allow-Methods': 'GET, OPTIONS',
-          'Access-Control-Allow-Headers': 'Content-Type',
-        }
-      }
+      { status: 200, headers }
     );
 
   } catch (error) {
@@ -98,7 +99,7 @@ export async function OPTIONS() {
       headers: {
         'Access-Control-Allow-Origin': '*',
         'Access-Control-Allow-Methods': 'GET, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type',
+        'Access-Control-Allow-Headers': 'Content-Type, If-None-Match',
       }
     }
   );
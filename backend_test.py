@@ -161,6 +161,10 @@ def test_game_runs_api_for_ux():
         "game_runs_get": False,
         "historical_data_support": False,
         "pr_a_game_types": {},
+        "complete_game": False,
+        "complete_game_types": {},
+        "complete_game_ms": {},
+        "idempotent_retry": False,
         "errors": []
     }
     
@@ -190,7 +194,7 @@ def test_game_runs_api_for_ux():
                     timeout=10
                 )
                 
-                if response.status_code == 200:
+                if response.status_code in (200, 202):  # 202 when GAME_RUNS_INGEST=queue
                     results["pr_a_game_types"][game_type] = True
                     print(f"    ✅ {game_type}: Game run saved successfully")
                 else:
@@ -202,6 +206,34 @@ def test_game_runs_api_for_ux():
                 results["pr_a_game_types"][game_type] = False
                 results["errors"].append(f"Game run {game_type} error: {str(e)}")
                 print(f"    ❌ {game_type}: Game run error - {str(e)}")
+
+            # One-shot completion: run, progress, XP, streak and achievements
+            complete_data = dict(game_run_data, progress={"lastLevel": 3, "lastBestScore": 120})
+            try:
+                start_time = time.time()
+                response = requests.post(
+                    f"{API_BASE}/completeGame",
+                    json=complete_data,
+                    headers={"Content-Type": "application/json"},
+                    timeout=10
+                )
+                elapsed_ms = round((time.time() - start_time) * 1000, 2)
+                results["complete_game_ms"][game_type] = elapsed_ms
+
+                data = response.json() if response.status_code == 200 else {}
+                if response.status_code == 200 and all(k in data for k in ("run", "xp", "streak", "achievements")):
+                    results["complete_game_types"][game_type] = True
+                    print(f"    ✅ {game_type}: Game completed in one call ({elapsed_ms}ms, "
+                          f"{len(data['achievements'])} achievements)")
+                else:
+                    results["complete_game_types"][game_type] = False
+                    print(f"    ❌ {game_type}: Complete game failed ({response.status_code})")
+                    results["errors"].append(f"Complete game {game_type}: {response.status_code} - {response.text[:100]}")
+
+            except Exception as e:
+                results["complete_game_types"][game_type] = False
+                results["errors"].append(f"Complete game {game_type} error: {str(e)}")
+                print(f"    ❌ {game_type}: Complete game error - {str(e)}")
         
         # Check if at least one PR A game type works
         if any(results["pr_a_game_types"].values()):
@@ -209,7 +241,48 @@ def test_game_runs_api_for_ux():
             print("  ✅ Game Runs POST: Working for at least one PR A game type")
         else:
             print("  ❌ Game Runs POST: Failed for all PR A game types")
+
+        if any(results["complete_game_types"].values()):
+            results["complete_game"] = True
+            timings = list(results["complete_game_ms"].values())
+            print(f"  ✅ Complete Game: Working (avg {sum(timings) / len(timings):.2f}ms per completion)")
+        else:
+            print("  ❌ Complete Game: Failed for all PR A game types")
         
+        # Retrying a POST with the same Idempotency-Key must replay, not insert twice
+        print("  🔁 Testing Idempotency-Key retry on Game Runs POST...")
+
+        try:
+            retry_data = {
+                "userId": test_user_id,
+                "game": "schulte",
+                "difficultyLevel": 3,
+                "durationMs": 60000,
+                "score": 120,
+                "metrics": get_game_specific_metrics("schulte")
+            }
+            retry_headers = {"Content-Type": "application/json", "Idempotency-Key": f"backend-test-{time.time()}"}
+            first = requests.post(f"{API_BASE}/gameRuns", json=retry_data, headers=retry_headers, timeout=10)
+            second = requests.post(f"{API_BASE}/gameRuns", json=retry_data, headers=retry_headers, timeout=10)
+            changed = requests.post(f"{API_BASE}/gameRuns", json=dict(retry_data, score=121), headers=retry_headers, timeout=10)
+
+            if (
+                first.status_code in (200, 202)
+                and second.status_code == first.status_code
+                and second.headers.get("Idempotent-Replayed") == "true"
+                and second.json().get("id") == first.json().get("id")
+                and changed.status_code == 422
+            ):
+                results["idempotent_retry"] = True
+                print("    ✅ Idempotency-Key: Retry replayed the stored response, changed body rejected (422)")
+            else:
+                print(f"    ❌ Idempotency-Key: Unexpected responses ({first.status_code}, {second.status_code}, {changed.status_code})")
+                results["errors"].append(f"Idempotent retry: {first.status_code}/{second.status_code}/{changed.status_code}")
+
+        except Exception as e:
+            results["errors"].append(f"Idempotent retry error: {str(e)}")
+            print(f"    ❌ Idempotency-Key: Error - {str(e)}")
+
         # Test Game Runs GET for historical data
         print("  📖 Testing Game Runs GET for historical data...")
         
@@ -430,6 +503,121 @@ def test_health_endpoint():
     
     return results
 
+def test_puzzles_api():
+    """Test the pregenerated puzzle pool (WordSearch and LettersGrid seeds)"""
+    print("🔍 Testing Puzzles API (Seeded Puzzle Pool)...")
+    
+    results = {
+        "puzzles_get": False,
+        "reproducible": False,
+        "errors": []
+    }
+    
+    try:
+        params = {"game": "word_search", "level": 12, "locale": "es", "from": 8, "count": 4}
+        first = requests.get(f"{API_BASE}/puzzles", params=params, timeout=10)
+        second = requests.get(f"{API_BASE}/puzzles", params=params, timeout=10)
+        
+        if first.status_code == 200:
+            puzzles = first.json().get("puzzles", [])
+            seeds = [puzzle.get("seed") for puzzle in puzzles]
+            results["puzzles_get"] = seeds == [8, 9, 10, 11] and all(len(p.get("grid", [])) == 13 for p in puzzles)
+            results["reproducible"] = second.status_code == 200 and second.json() == first.json()
+            print(f"  ✅ Puzzles GET: seeds {seeds}")
+            print(f"  {'✅' if results['reproducible'] else '❌'} Same seeds, same puzzles")
+        else:
+            print(f"  ❌ Puzzles GET: Failed ({first.status_code})")
+            results["errors"].append(f"Puzzles get: {first.status_code} - {first.text[:100]}")
+        
+        invalid = requests.get(f"{API_BASE}/puzzles", params={"game": "chess"}, timeout=10)
+        if invalid.status_code != 400:
+            results["puzzles_get"] = False
+            results["errors"].append(f"Puzzles unknown game: expected 400, got {invalid.status_code}")
+            
+    except Exception as e:
+        results["errors"].append(f"Puzzles API test error: {str(e)}")
+        print(f"  ❌ Puzzles API: Error - {str(e)}")
+    
+    return results
+
+def test_anagrams_api():
+    """Test anagram validation against the dictionary index"""
+    print("🔍 Testing Anagrams API (Dictionary Index)...")
+    
+    results = {
+        "anagrams_get": False,
+        "validation": False,
+        "errors": []
+    }
+    
+    try:
+        response = requests.get(f"{API_BASE}/anagrams", params={"locale": "es", "rack": "romacx", "min_length": 4}, timeout=10)
+        
+        if response.status_code == 200:
+            words = response.json().get("words", [])
+            results["anagrams_get"] = "amor" in words and all(len(word) >= 4 for word in words)
+            print(f"  ✅ Anagrams GET: {len(words)} words from rack")
+        else:
+            print(f"  ❌ Anagrams GET: Failed ({response.status_code})")
+            results["errors"].append(f"Anagrams get: {response.status_code} - {response.text[:100]}")
+        
+        valid = requests.get(f"{API_BASE}/anagrams", params={"locale": "es", "rack": "romacx", "word": "amor"}, timeout=10)
+        missing = requests.get(f"{API_BASE}/anagrams", params={"locale": "es", "rack": "rmacx", "word": "amor"}, timeout=10)
+        results["validation"] = (
+            valid.status_code == 200 and valid.json().get("valid") is True and
+            missing.status_code == 200 and missing.json().get("valid") is False
+        )
+        print(f"  {'✅' if results['validation'] else '❌'} Word validated against the rack")
+        
+        invalid = requests.get(f"{API_BASE}/anagrams", params={"locale": "es", "rack": "ab1"}, timeout=10)
+        if invalid.status_code != 400:
+            results["anagrams_get"] = False
+            results["errors"].append(f"Anagrams invalid rack: expected 400, got {invalid.status_code}")
+            
+    except Exception as e:
+        results["errors"].append(f"Anagrams API test error: {str(e)}")
+        print(f"  ❌ Anagrams API: Error - {str(e)}")
+    
+    return results
+
+def test_words_api():
+    """Test word sampling by length range and frequency band"""
+    print("🔍 Testing Words API (Frequency-Ranked Sampling)...")
+    
+    results = {
+        "words_get": False,
+        "validation": False,
+        "errors": []
+    }
+    
+    try:
+        params = {"locale": "es", "min_length": 4, "max_length": 6, "band": "common", "count": 10}
+        response = requests.get(f"{API_BASE}/words", params=params, timeout=10)
+        
+        if response.status_code == 200:
+            data = response.json()
+            words = data.get("words", [])
+            results["words_get"] = (
+                0 < len(words) <= 10 and len(set(words)) == len(words) and
+                all(4 <= len(word) <= 6 for word in words) and
+                data.get("source") in ("word_bank", "bundled", "mixed")
+            )
+            print(f"  ✅ Words GET: {len(words)} words from {data.get('source')}")
+        else:
+            print(f"  ❌ Words GET: Failed ({response.status_code})")
+            results["errors"].append(f"Words get: {response.status_code} - {response.text[:100]}")
+        
+        invalid_band = requests.get(f"{API_BASE}/words", params={"locale": "es", "band": "frequent"}, timeout=10)
+        invalid_count = requests.get(f"{API_BASE}/words", params={"locale": "es", "count": 1000}, timeout=10)
+        results["validation"] = invalid_band.status_code == 400 and invalid_count.status_code == 400
+        print(f"  {'✅' if results['validation'] else '❌'} Invalid band and count rejected")
+            
+    except Exception as e:
+        results["errors"].append(f"Words API test error: {str(e)}")
+        print(f"  ❌ Words API: Error - {str(e)}")
+    
+    return results
+
 def test_cors_headers():
     """Test CORS headers for frontend component compatibility"""
     print("🔍 Testing CORS Headers (Frontend Component Compatibility)...")
@@ -503,6 +691,18 @@ def run_pr_a_backend_tests():
     all_results["settings_api"] = test_settings_api_for_persistence()
     print()
     
+    # Test 6: Puzzle pool
+    all_results["puzzles_api"] = test_puzzles_api()
+    print()
+    
+    # Test 7: Anagram dictionary index
+    all_results["anagrams_api"] = test_anagrams_api()
+    print()
+    
+    # Test 8: Word sampling
+    all_results["words_api"] = test_words_api()
+    print()
+    
     # Generate summary
     print("=" * 60)
     print("📊 PR A CORE UX BACKEND TEST SUMMARY")
@@ -544,6 +744,22 @@ def run_pr_a_backend_tests():
     else:
         print("❌ Game Runs API (EndScreen Historical Data): FAILED")
     total_tests += 1
+
+    # One-shot game completion
+    if all_results["game_runs_api"]["complete_game"]:
+        print("✅ Complete Game API (EndScreen Result): WORKING")
+        passed_tests += 1
+    else:
+        print("❌ Complete Game API (EndScreen Result): FAILED")
+    total_tests += 1
+
+    # Idempotent retries
+    if all_results["game_runs_api"]["idempotent_retry"]:
+        print("✅ Idempotency-Key Retries: WORKING")
+        passed_tests += 1
+    else:
+        print("❌ Idempotency-Key Retries: FAILED")
+    total_tests += 1
     
     # Settings API
     settings_working = all_results["settings_api"]["settings_get"] and all_results["settings_api"]["settings_post"]
@@ -554,6 +770,30 @@ def run_pr_a_backend_tests():
         print("❌ Settings API (Level Persistence): FAILED")
     total_tests += 1
     
+    # Puzzle pool
+    if all_results["puzzles_api"]["puzzles_get"] and all_results["puzzles_api"]["reproducible"]:
+        print("✅ Puzzles API (Seeded Puzzle Pool): WORKING")
+        passed_tests += 1
+    else:
+        print("❌ Puzzles API (Seeded Puzzle Pool): FAILED")
+    total_tests += 1
+    
+    # Anagram dictionary index
+    if all_results["anagrams_api"]["anagrams_get"] and all_results["anagrams_api"]["validation"]:
+        print("✅ Anagrams API (Dictionary Index): WORKING")
+        passed_tests += 1
+    else:
+        print("❌ Anagrams API (Dictionary Index): FAILED")
+    total_tests += 1
+    
+    # Word sampling
+    if all_results["words_api"]["words_get"] and all_results["words_api"]["validation"]:
+        print("✅ Words API (Frequency-Ranked Sampling): WORKING")
+        passed_tests += 1
+    else:
+        print("❌ Words API (Frequency-Ranked Sampling): FAILED")
+    total_tests += 1
+    
     print()
     print(f"📈 OVERALL RESULTS: {passed_tests}/{total_tests} tests passed ({(passed_tests/total_tests)*100:.1f}%)")
     
@@ -1,6 +1,6 @@
 'use client'
 
-import { useState, useEffect, useRef, useCallback } from 'react'
+import { useState, useEffect, useRef, useCallback, useMemo } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
@@ -25,12 +25,16 @@ import {
 } from 'lucide-react'
 
 import { useAppStore } from '@/lib/store'
-import { tokenizeText, createChunks, calculateAcceleratorScore } from '@/lib/types'
+import { calculateAcceleratorScore } from '@/lib/types'
+import { getTokenizedDocument, transferList, countWords } from '@/lib/tokenizer'
 import { supabase } from '@/lib/supabase'
+import { uuidv7 } from '@/lib/ids'
 
 export default function AcceleratorReader({ onGameFinish, difficultyLevel = 1, durationMs }) {
   const [inputText, setInputText] = useState('')
-  const [chunks, setChunks] = useState([])
+  const [chunkCount, setChunkCount] = useState(0)
+  const [currentChunk, setCurrentChunk] = useState([])
+  const [contextChunks, setContextChunks] = useState([])
   const [currentIndex, setCurrentIndex] = useState(0)
   const [isPlaying, setIsPlaying] = useState(false)
   const [wpm, setWpm] = useState(300)
@@ -49,6 +53,7 @@ export default function AcceleratorReader({ onGameFinish, difficultyLevel = 1, d
   const [quizScore, setQuizScore] = useState(0)
   
   const workerRef = useRef(null)
+  const timingStatsRef = useRef(null)
   const { sessionId } = useAppStore()
   
   // Sample text for testing
@@ -85,9 +90,15 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
       const { type, payload } = e.data
       
       switch (type) {
+        case 'LOADED':
+          setChunkCount(payload.chunkCount)
+          break
+
         case 'TICK':
           setCurrentIndex(payload.index)
           setProgress(payload.progress)
+          setCurrentChunk(payload.chunk)
+          setContextChunks(payload.context)
           break
           
         case 'END':
@@ -98,6 +109,10 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
           setIsPlaying(false)
           setSessionMetrics(prev => ({ ...prev, pauses: prev.pauses + 1 }))
           break
+
+        case 'STATS':
+          timingStatsRef.current = payload
+          break
       }
     })
 
@@ -117,26 +132,34 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
     }
   }, [])
 
-  // Load text and create chunks
-  const loadText = useCallback((text) => {
-    const words = tokenizeText(text)
-    const newChunks = createChunks(words, chunkSize)
-    setChunks(newChunks)
+  // Load text: the tokenized document (cached in IndexedDB) is handed to the
+  // worker, which owns it from then on and sends the chunks to display.
+  // WPM and chunk size are sent separately (SET_WPM, SET_CHUNK_SIZE) and
+  // keep the current position.
+  const loadText = useCallback(async (text) => {
+    const tokenized = await getTokenizedDocument(text)
     setCurrentIndex(0)
     setProgress(0)
     
-    // Initialize worker with chunks
     workerRef.current?.postMessage({
       type: 'INIT',
-      payload: { chunks: newChunks, wpm, chunkSize }
-    })
-  }, [chunkSize, wpm])
+      payload: { document: tokenized }
+    }, transferList(tokenized))
+  }, [])
 
   // Load sample text on mount
   useEffect(() => {
     loadText(sampleText)
   }, [loadText])
 
+  // Update worker when chunk size changes
+  useEffect(() => {
+    workerRef.current?.postMessage({
+      type: 'SET_CHUNK_SIZE',
+      payload: { chunkSize }
+    })
+  }, [chunkSize])
+
   // Update worker when WPM changes
   useEffect(() => {
     workerRef.current?.postMessage({
@@ -180,7 +203,7 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
   }
 
   const skipForward = () => {
-    const newIndex = Math.min(chunks.length - 1, currentIndex + 1)
+    const newIndex = Math.min(chunkCount - 1, currentIndex + 1)
     setCurrentIndex(newIndex)
     workerRef.current?.postMessage({
       type: 'SEEK',
@@ -208,6 +231,8 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
     // Calculate game metrics
     const metrics = {
       wpm_avg: wpm,
+      wpm_achieved: timingStatsRef.current?.achievedWpm ?? wpm,
+      timing_p95_ms: timingStatsRef.current?.latenessP95Ms ?? null,
       chunk: chunkSize,
       pauses: sessionMetrics.pauses,
       regressions: sessionMetrics.regressions,
@@ -220,7 +245,7 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
     // Save game run
     try {
       await supabase.from('gameRuns').insert({
-        id: `gr_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+        id: uuidv7(),
         userId: sessionId,
         game: 'accelerator',
         difficultyLevel,
@@ -274,9 +299,9 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
 
     window.addEventListener('keydown', handleKeyPress)
     return () => window.removeEventListener('keydown', handleKeyPress)
-  }, [isPlaying, wpm, currentIndex, chunks.length])
+  }, [isPlaying, wpm, currentIndex, chunkCount])
 
-  const currentChunk = chunks[currentIndex] || []
+  const inputWordCount = useMemo(() => countWords(inputText), [inputText])
 
   if (showQuiz) {
     return (
@@ -366,7 +391,7 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
           <div className="space-y-2">
             <Progress value={progress} className="h-2" />
             <div className="flex justify-between text-sm text-muted-foreground">
-              <span>Chunk {currentIndex + 1} de {chunks.length}</span>
+              <span>Chunk {currentIndex + 1} de {chunkCount}</span>
               <span>{Math.round(progress)}% completado</span>
             </div>
           </div>
@@ -401,8 +426,7 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
 
               {/* Context Text */}
               <div className="text-sm text-muted-foreground max-w-4xl mx-auto leading-relaxed">
-                {chunks.map((chunk, index) => {
-                  if (Math.abs(index - currentIndex) > 3) return null
+                {contextChunks.map(({ index, words }) => {
                   return (
                     <span 
                       key={index}
@@ -414,7 +438,7 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
                             : 'text-gray-600'
                       }`}
                     >
-                      {chunk.join(' ')}{' '}
+                      {words.join(' ')}{' '}
                     </span>
                   )
                 })}
@@ -486,7 +510,7 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
             />
             <div className="flex justify-between items-center">
               <span className="text-sm text-muted-foreground">
-                {inputText.split(/\s+/).filter(w => w.length > 0).length} palabras
+                {inputWordCount} palabras
               </span>
               <Button 
                 onClick={() => loadText(inputText)}
@@ -532,12 +556,7 @@ El entrenamiento sistemático incluye ejercicios específicos para expandir el c
                     key={size}
                     size="sm"
                     variant={chunkSize === size ? 'default' : 'outline'}
-                    onClick={() => {
-                      setChunkSize(size)
-                      if (chunks.length > 0) {
-                        loadText(sampleText) // Reload with new chunk size
-                      }
-                    }}
+                    onClick={() => setChunkSize(size)}
                   >
                     {size}
                   </Button>
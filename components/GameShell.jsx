@@ -21,14 +21,7 @@ import {
 import { GAME_STATES, AUTO_PAUSE_DELAY } from '@/lib/constants'
 import { AdaptiveDifficulty } from '@/lib/adaptive-difficulty'
 import { useAppStore } from '@/lib/store'
-import { supabase } from '@/lib/supabase'
-import { 
-  updateUserProfile, 
-  updateStreak, 
-  checkAchievements, 
-  isValidGameRun,
-  calculateXpGain 
-} from '@/lib/gamification'
+import { submitGameCompletion } from '@/lib/gamification'
 
 // Import new UX components (PR A)
 import GameIntro from './games/GameIntro'
@@ -239,11 +232,8 @@ export default function GameShell({
     
     setGameResults(results)
     
-    // Save to database
-    await saveGameRun(results)
-    
-    // Update gamification (XP, Streaks, Achievements)
-    await updateGamification(results)
+    // Save run, progress and gamification (XP, Streaks, Achievements)
+    await completeGameRun(results)
     
     // PR A - Update level persistence and best score
     if (gameKey) {
@@ -267,80 +257,56 @@ export default function GameShell({
     }
   }
 
-  const updateGamification = async (results) => {
+  const completeGameRun = async (results) => {
     try {
       const gameData = {
         game: gameId,
         score: results.score || 0,
         duration_ms: results.duration,
+        difficulty_level: results.difficultyLevel,
         metrics: results.metrics || {}
       }
+      const progress = gameKey ? {
+        lastLevel: results.difficultyLevel || currentLevel,
+        lastBestScore: Math.max(getLastBestScore(gameKey), results.score || 0)
+      } : null
+
+      // Run, progress, XP, streak and achievements in one transaction
+      const completion = await submitGameCompletion(sessionId, gameData, progress)
+      if (!completion || !completion.isValid) {
+        return
+      }
 
-      // Check if this is a valid run for gamification
-      const isValid = isValidGameRun(gameData)
-      
-      if (isValid) {
-        // Calculate and award XP
-        const xpGain = calculateXpGain(results.score || 0)
-        const profileUpdate = await updateUserProfile(sessionId, xpGain)
-        
-        if (profileUpdate) {
-          toast.success(`¡+${xpGain} XP! Nivel ${profileUpdate.level}`, {
-            duration: 3000,
-            icon: '⭐'
-          })
-          
-          if (profileUpdate.levelUp) {
-            toast.success(`¡Subiste al Nivel ${profileUpdate.level}!`, {
-              duration: 5000,
-              icon: '🎉'
-            })
-          }
-        }
+      if (completion.xp) {
+        toast.success(`¡+${completion.xp.xpGain} XP! Nivel ${completion.xp.level}`, {
+          duration: 3000,
+          icon: '⭐'
+        })
 
-        // Update streak
-        const streakUpdate = await updateStreak(sessionId, true)
-        
-        if (streakUpdate && streakUpdate.increased) {
-          toast.success(`¡Racha de ${streakUpdate.current} días!`, {
-            duration: 3000,
-            icon: '🔥'
+        if (completion.xp.levelUp) {
+          toast.success(`¡Subiste al Nivel ${completion.xp.level}!`, {
+            duration: 5000,
+            icon: '🎉'
           })
         }
+      }
 
-        // Check and unlock achievements
-        const newAchievements = await checkAchievements(sessionId, gameData)
-        
-        newAchievements.forEach(achievement => {
-          toast.success(`¡Logro desbloqueado: ${achievement.title}!`, {
-            description: achievement.description,
-            duration: 5000,
-            icon: achievement.icon
-          })
+      if (completion.streak?.increased) {
+        toast.success(`¡Racha de ${completion.streak.current} días!`, {
+          duration: 3000,
+          icon: '🔥'
         })
-      } else {
-        // Invalid run - might break streak
-        await updateStreak(sessionId, false)
       }
-    } catch (error) {
-      console.error('Error updating gamification:', error)
-    }
-  }
 
-  const saveGameRun = async (results) => {
-    try {
-      await supabase.from('gameRuns').insert({
-        id: `gr_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
-        userId: sessionId,
-        game: gameId,
-        difficultyLevel: results.difficultyLevel,
-        durationMs: results.duration,
-        score: results.score || 0,
-        metrics: results.metrics || {},
-        createdAt: new Date().toISOString()
+      completion.achievements.forEach(achievement => {
+        toast.success(`¡Logro desbloqueado: ${achievement.title}!`, {
+          description: achievement.description,
+          duration: 5000,
+          icon: achievement.icon
+        })
       })
     } catch (error) {
-      console.error('Error saving game run:', error)
+      console.error('Error completing game:', error)
     }
   }
 
@@ -1,6 +1,6 @@
 'use client'
 
-import { useState, useEffect, useRef, useCallback } from 'react'
+import { useState, useEffect, useRef, useCallback, useMemo } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import { Card, CardHeader, CardTitle, CardContent } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
@@ -24,6 +24,7 @@ import {
 
 import { useRSVPStore, useAppStore } from '@/lib/store'
 import { saveReadingSession } from '@/lib/supabase'
+import { countWords } from '@/lib/tokenizer'
 
 export default function RSVPReader() {
   const [inputText, setInputText] = useState('')
@@ -36,7 +37,7 @@ export default function RSVPReader() {
   
   const {
     isActive,
-    words,
+    wordCount,
     currentIndex,
     wpm,
     chunkSize,
@@ -78,7 +79,7 @@ export default function RSVPReader() {
 
   // RSVP display logic
   const startReading = useCallback(() => {
-    if (words.length === 0) return
+    if (wordCount === 0) return
     
     setSessionStartTime(Date.now())
     setStartWpm(wpm)
@@ -92,7 +93,7 @@ export default function RSVPReader() {
         handleReadingComplete()
       }
     }, interval)
-  }, [words.length, wpm, chunkSize, start, advance])
+  }, [wordCount, wpm, chunkSize, start, advance])
 
   const pauseReading = useCallback(() => {
     pause()
@@ -127,7 +128,7 @@ export default function RSVPReader() {
         comprehensionScore: 0, // TODO: Add comprehension test
         exerciseType: 'rsvp',
         durationSeconds,
-        textLength: words.length
+        textLength: wordCount
       })
     } catch (error) {
       console.error('Error saving reading session:', error)
@@ -167,7 +168,7 @@ export default function RSVPReader() {
           event.preventDefault()
           if (isActive) {
             pauseReading()
-          } else if (words.length > 0) {
+          } else if (wordCount > 0) {
             startReading()
           }
           break
@@ -196,7 +197,7 @@ export default function RSVPReader() {
 
     window.addEventListener('keydown', handleKeyPress)
     return () => window.removeEventListener('keydown', handleKeyPress)
-  }, [isActive, words.length, wpm, startReading, pauseReading, stopReading, setWpm, setChunkSize])
+  }, [isActive, wordCount, wpm, startReading, pauseReading, stopReading, setWpm, setChunkSize])
 
   const loadSampleText = (difficulty) => {
     const text = sampleTexts[difficulty]
@@ -211,6 +212,7 @@ export default function RSVPReader() {
   }
 
   const currentChunk = getNextChunk()
+  const inputWordCount = useMemo(() => countWords(inputText), [inputText])
 
   return (
     <div className="space-y-6">
@@ -241,11 +243,11 @@ export default function RSVPReader() {
         </CardHeader>
         <CardContent className="space-y-4">
           {/* Progress Bar */}
-          {words.length > 0 && (
+          {wordCount > 0 && (
             <div className="space-y-2">
               <Progress value={getProgress()} className="h-2" />
               <div className="flex justify-between text-sm text-muted-foreground">
-                <span>Palabra {currentIndex + 1} de {words.length}</span>
+                <span>Palabra {currentIndex + 1} de {wordCount}</span>
                 <span>{Math.round(getProgress())}% completado</span>
               </div>
             </div>
@@ -276,7 +278,7 @@ export default function RSVPReader() {
                     {currentChunk}
                   </div>
                 </motion.div>
-              ) : words.length === 0 ? (
+              ) : wordCount === 0 ? (
                 <div className="text-center text-muted-foreground">
                   <BookOpen className="w-12 h-12 mx-auto mb-4 opacity-50" />
                   <p>Carga un texto para comenzar a leer</p>
@@ -297,7 +299,7 @@ export default function RSVPReader() {
               size="sm"
               variant="outline"
               onClick={stopReading}
-              disabled={!words.length}
+              disabled={!wordCount}
             >
               <Square className="w-4 h-4" />
             </Button>
@@ -312,7 +314,7 @@ export default function RSVPReader() {
             
             <Button
               onClick={isActive ? pauseReading : startReading}
-              disabled={!words.length}
+              disabled={!wordCount}
               className="px-6"
             >
               {isActive ? (
@@ -342,7 +344,7 @@ export default function RSVPReader() {
               onClick={() => {
                 /* TODO: Add quick comprehension test */
               }}
-              disabled={words.length === 0}
+              disabled={wordCount === 0}
             >
               <Timer className="w-4 h-4" />
             </Button>
@@ -403,7 +405,7 @@ export default function RSVPReader() {
               />
               <div className="flex justify-between">
                 <span className="text-sm text-muted-foreground">
-                  {inputText.split(/\s+/).filter(w => w.length > 0).length} palabras
+                  {inputWordCount} palabras
                 </span>
                 <Button onClick={handleTextLoad} disabled={!inputText.trim()}>
                   <Upload className="w-4 h-4 mr-2" />
@@ -18,6 +18,7 @@ import {
 import { getDifficultyParams, calculateSchulteScore } from '@/lib/types'
 import { useAppStore } from '@/lib/store'
 import { supabase } from '@/lib/supabase'
+import { uuidv7 } from '@/lib/ids'
 
 export default function SchulteTable({ onGameFinish, difficultyLevel = 1, durationMs }) {
   const [grid, setGrid] = useState([])
@@ -124,7 +125,7 @@ export default function SchulteTable({ onGameFinish, difficultyLevel = 1, durati
     // Save game run
     try {
       await supabase.from('gameRuns').insert({
-        id: `gr_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+        id: uuidv7(),
         userId: sessionId,
         game: 'schulte',
         difficultyLevel,
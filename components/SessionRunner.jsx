@@ -19,6 +19,7 @@ import {
 import { getSessionTemplate, adjustDifficulty } from '@/lib/types'
 import { useAppStore } from '@/lib/store'
 import { supabase } from '@/lib/supabase'
+import { uuidv7 } from '@/lib/ids'
 
 // Game components
 import AcceleratorReader from './AcceleratorReader'
@@ -98,7 +99,7 @@ export default function SessionRunner({ template = '15min', onSessionComplete })
     // Save session schedule
     try {
       await supabase.from('sessionSchedules').insert({
-        id: `ss_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+        id: uuidv7(),
         userId: sessionId,
         startedAt: new Date(sessionStartTime).toISOString(),
         template,
@@ -19,6 +19,11 @@ import {
 import { getDifficultyParams, calculateTwinWordsScore } from '@/lib/types'
 import { useAppStore } from '@/lib/store'
 import { supabase } from '@/lib/supabase'
+import { uuidv7 } from '@/lib/ids'
+import { getTwinWordsIndex, pairKindsForSubtlety } from '@/lib/twin-words-index'
+
+const PAIRS_PER_GAME = 20
+const IDENTICAL_SHARE = 0.2
 
 export default function TwinWords({ onGameFinish, difficultyLevel = 1, durationMs }) {
   const [wordPairs, setWordPairs] = useState([])
@@ -35,6 +40,22 @@ export default function TwinWords({ onGameFinish, difficultyLevel = 1, durationM
   const { sessionId } = useAppStore()
   const timeoutRef = useRef(null)
 
+  // Candidate pairs of the word bank, grouped by how subtle the difference is
+  const [twinIndex, setTwinIndex] = useState(null)
+
+  useEffect(() => {
+    let cancelled = false
+    getTwinWordsIndex('es')
+      .then(index => {
+        if (!cancelled) setTwinIndex(index)
+      })
+      .catch(error => console.error('Error loading TwinWords pairs:', error))
+
+    return () => {
+      cancelled = true
+    }
+  }, [])
+
   // Game parameters based on difficulty
   const [gameParams, setGameParams] = useState({
     exposureMs: 1200,
@@ -47,53 +68,19 @@ export default function TwinWords({ onGameFinish, difficultyLevel = 1, durationM
     setGameParams(params)
   }, [difficultyLevel])
 
-  // Word pairs with micro-differences
+  // Fresh pairs each game, subtler differences (accents, lookalike letters)
+  // at higher levels
   const generateWordPairs = () => {
-    const basePairs = [
-      // Identical pairs
-      { word1: 'casa', word2: 'casa', identical: true },
-      { word1: 'gato', word2: 'gato', identical: true },
-      { word1: 'libro', word2: 'libro', identical: true },
-      { word1: 'mundo', word2: 'mundo', identical: true },
-      { word1: 'tiempo', word2: 'tiempo', identical: true },
-      
-      // Different pairs with subtle differences
-      { word1: 'cosa', word2: 'casa', identical: false }, // o/a
-      { word1: 'peso', word2: 'piso', identical: false }, // e/i
-      { word1: 'perro', word2: 'perno', identical: false }, // rr/rn
-      { word1: 'carro', word2: 'corro', identical: false }, // a/o
-      { word1: 'mano', word2: 'nano', identical: false }, // m/n
-      { word1: 'claro', word2: 'daro', identical: false }, // cl/d
-      { word1: 'bueno', word2: 'nuevo', identical: false }, // b/n
-      { word1: 'tiempo', word2: 'tiernpo', identical: false }, // m/rn
-      { word1: 'persona', word2: 'persorna', identical: false }, // o/or
-      { word1: 'momento', word2: 'mornento', identical: false }, // m/rn
-      { word1: 'trabajo', word2: 'trabaja', identical: false }, // o/a
-      { word1: 'problema', word2: 'problerna', identical: false }, // m/rn
-      { word1: 'gobierno', word2: 'gobiemo', identical: false }, // rn/m
-      { word1: 'desarrollo', word2: 'desarroilo', identical: false }, // ll/il
-      
-      // Accent differences
-      { word1: 'médico', word2: 'medico', identical: false },
-      { word1: 'rápido', word2: 'rapido', identical: false },
-      { word1: 'teléfono', word2: 'telefono', identical: false },
-      
-      // Case differences
-      { word1: 'CASA', word2: 'casa', identical: false },
-      { word1: 'Mundo', word2: 'mundo', identical: false },
-      { word1: 'TIEMPO', word2: 'tiempo', identical: false }
-    ]
-
-    // Filter by word length based on difficulty
-    const filteredPairs = basePairs.filter(pair => {
-      const avgLength = (pair.word1.length + pair.word2.length) / 2
-      return avgLength >= Math.max(3, gameParams.wordLength - 2) && 
-             avgLength <= gameParams.wordLength + 2
-    })
-
-    // Shuffle and take 20 pairs for the game
-    const shuffled = [...filteredPairs].sort(() => Math.random() - 0.5)
-    return shuffled.slice(0, 20)
+    const identicalCount = Math.round(PAIRS_PER_GAME * IDENTICAL_SHARE)
+    const differentPairs = twinIndex
+      .drawPairs(pairKindsForSubtlety(gameParams.subtlety), PAIRS_PER_GAME - identicalCount)
+      .map(pair => ({ ...pair, identical: false }))
+    const usedWords = new Set(differentPairs.flatMap(pair => [pair.word1.toLowerCase(), pair.word2.toLowerCase()]))
+    const identicalPairs = twinIndex
+      .drawWords(PAIRS_PER_GAME - differentPairs.length, Math.random, usedWords)
+      .map(word => ({ word1: word, word2: word, identical: true }))
+
+    return [...identicalPairs, ...differentPairs].sort(() => Math.random() - 0.5)
   }
 
   // Initialize game
@@ -110,8 +97,8 @@ export default function TwinWords({ onGameFinish, difficultyLevel = 1, durationM
   }
 
   useEffect(() => {
-    initializeGame()
-  }, [gameParams])
+    if (twinIndex) initializeGame()
+  }, [gameParams, twinIndex])
 
   // Start game
   const startGame = () => {
@@ -188,7 +175,7 @@ export default function TwinWords({ onGameFinish, difficultyLevel = 1, durationM
     // Save game run
     try {
       await supabase.from('gameRuns').insert({
-        id: `gr_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+        id: uuidv7(),
         userId: sessionId,
         game: 'twin_words',
         difficultyLevel,
@@ -287,7 +274,7 @@ export default function TwinWords({ onGameFinish, difficultyLevel = 1, durationM
                 <div className="text-xs text-muted-foreground">Exposición</div>
               </div>
               <div className="text-center">
-                <div className="text-2xl font-bold text-blue-600">20</div>
+                <div className="text-2xl font-bold text-blue-600">{PAIRS_PER_GAME}</div>
                 <div className="text-xs text-muted-foreground">Pares</div>
               </div>
               <div className="text-center">
@@ -296,7 +283,7 @@ export default function TwinWords({ onGameFinish, difficultyLevel = 1, durationM
               </div>
             </div>
 
-            <Button onClick={startGame} size="lg" className="mt-8">
+            <Button onClick={startGame} size="lg" className="mt-8" disabled={wordPairs.length === 0}>
               <Timer className="w-4 h-4 mr-2" />
               Comenzar Entrenamiento
             </Button>
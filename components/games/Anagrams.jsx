@@ -5,7 +5,9 @@ import { Button } from '@/components/ui/button'
 import { Card, CardContent } from '@/components/ui/card'
 import { Input } from '@/components/ui/input'
 import { Progress } from '@/components/ui/progress'
-import { WORD_BANK } from '@/lib/word-bank'
+import { getAnagramIndex } from '@/lib/anagram-index'
+import { fetchWordSample, bandForLevel } from '@/lib/word-sampler'
+import { useWordBank } from '@/hooks/useWordBank'
 
 const GAME_CONFIG = {
   name: 'anagrams',
@@ -52,6 +54,7 @@ export default function Anagrams({
   const [sessionData, setSessionData] = useState({
     totalAnagrams: 0,
     solvedAnagrams: 0,
+    alternativeSolutions: 0,
     expiredAnagrams: 0,
     responseTimes: [],
     accuracy: 0,
@@ -60,35 +63,58 @@ export default function Anagrams({
   })
 
   const config = GAME_CONFIG.levels[Math.min(level, 20)]
-  const wordsData = WORD_BANK.anagrams[locale] || WORD_BANK.anagrams.es
+  const wordsData = useWordBank('anagrams', locale)
+  const [sampledWords, setSampledWords] = useState(null)
+  const [anagramIndex, setAnagramIndex] = useState(null)
   const anagramStartTime = useRef(null)
   const anagramTimer = useRef(null)
 
+  useEffect(() => {
+    let cancelled = false
+    getAnagramIndex(locale)
+      .then(index => {
+        if (!cancelled) setAnagramIndex(index)
+      })
+      .catch(error => console.error('Error loading anagram dictionary:', error))
+    return () => {
+      cancelled = true
+    }
+  }, [locale])
+
+  // Target words from the full word_bank table, by frequency band for the
+  // level; the word bank shard is used until (or unless) they arrive
+  useEffect(() => {
+    let cancelled = false
+    setSampledWords(null)
+    fetchWordSample({
+      locale,
+      minLength: config.length,
+      maxLength: config.length,
+      band: bandForLevel(level),
+      count: 50
+    }).then(words => {
+      if (!cancelled && words?.length > 0) setSampledWords(words)
+    })
+    return () => {
+      cancelled = true
+    }
+  }, [locale, level, config.length])
+
   // Get random word for current length
   const getRandomWord = useCallback(() => {
-    const wordsOfLength = wordsData[config.length] || []
+    const wordsOfLength = sampledWords || wordsData?.[config.length] || []
     if (wordsOfLength.length === 0) return 'test'
     return wordsOfLength[Math.floor(Math.random() * wordsOfLength.length)]
-  }, [config.length, wordsData])
+  }, [config.length, wordsData, sampledWords])
 
   // Shuffle letters to create anagram
   const shuffleWord = useCallback((word) => {
     const letters = word.split('')
     
-    // Add decoy letters if enabled
+    // Add 1-2 decoy letters if enabled, as common as they are in the locale's words
     if (config.decoyLetters && Math.random() < 0.4) {
-      const vowels = ['a', 'e', 'i', 'o', 'u']
-      const consonants = ['b', 'c', 'd', 'f', 'g', 'h', 'j', 'k', 'l', 'm', 'n', 'p', 'q', 'r', 's', 't', 'v', 'w', 'x', 'y', 'z']
-      
-      // Add 1-2 decoy letters
       const decoyCount = Math.random() < 0.7 ? 1 : 2
-      for (let i = 0; i < decoyCount; i++) {
-        const isVowel = Math.random() < 0.3
-        const decoyLetter = isVowel 
-          ? vowels[Math.floor(Math.random() * vowels.length)]
-          : consonants[Math.floor(Math.random() * consonants.length)]
-        letters.push(decoyLetter)
-      }
+      letters.push(...anagramIndex.decoyLetters(decoyCount))
     }
     
     // Shuffle the letters
@@ -98,7 +124,7 @@ export default function Anagrams({
     }
     
     return letters.join('')
-  }, [config.decoyLetters])
+  }, [config.decoyLetters, anagramIndex])
 
   // Start new anagram
   const startAnagram = useCallback(() => {
@@ -155,19 +181,24 @@ export default function Anagrams({
     }, 1000)
   }, [timeRemaining, startAnagram])
 
+  const isAnswer = useCallback((value) => (
+    value === currentWord ||
+    (value.length === currentWord.length && anagramIndex.isValidWord(value, anagram))
+  ), [currentWord, anagram, anagramIndex])
+
   // Handle input change
   const handleInputChange = useCallback((e) => {
     const value = e.target.value.toLowerCase()
     setUserInput(value)
     
-    // Check if correct
-    if (value === currentWord) {
-      handleCorrectAnswer()
+    // Any dictionary word of the target's length made from the shown letters counts
+    if (isAnswer(value)) {
+      handleCorrectAnswer(value)
     }
-  }, [currentWord])
+  }, [isAnswer])
 
   // Handle correct answer
-  const handleCorrectAnswer = useCallback(() => {
+  const handleCorrectAnswer = useCallback((answer) => {
     if (anagramTimer.current) {
       clearInterval(anagramTimer.current)
       anagramTimer.current = null
@@ -191,6 +222,7 @@ export default function Anagrams({
       ...prev,
       totalAnagrams: prev.totalAnagrams + 1,
       solvedAnagrams: prev.solvedAnagrams + 1,
+      alternativeSolutions: prev.alternativeSolutions + (answer !== currentWord ? 1 : 0),
       responseTimes: [...prev.responseTimes, rt],
       correctStreak: newStreak,
       bestStreak: Math.max(prev.bestStreak, newStreak),
@@ -205,22 +237,22 @@ export default function Anagrams({
         setGameState('complete')
       }
     }, 1000)
-  }, [streak, config, score, onScoreUpdate, timeRemaining, startAnagram])
+  }, [streak, config, score, onScoreUpdate, timeRemaining, startAnagram, currentWord])
 
   // Handle key press (Enter to submit)
   const handleKeyPress = useCallback((e) => {
-    if (e.key === 'Enter' && userInput === currentWord) {
-      handleCorrectAnswer()
+    if (e.key === 'Enter' && isAnswer(userInput)) {
+      handleCorrectAnswer(userInput)
     }
-  }, [userInput, currentWord, handleCorrectAnswer])
+  }, [userInput, isAnswer, handleCorrectAnswer])
 
-  // Auto-start first anagram
+  // Auto-start first anagram once the words and dictionary have loaded
   useEffect(() => {
-    if (timeRemaining > 0 && gameState === 'idle') {
+    if (timeRemaining > 0 && gameState === 'idle' && wordsData && anagramIndex) {
       setGameState('playing')
       startAnagram()
     }
-  }, [timeRemaining, gameState, startAnagram])
+  }, [timeRemaining, gameState, startAnagram, wordsData, anagramIndex])
 
   // Cleanup timer on unmount
   useEffect(() => {
@@ -249,6 +281,7 @@ export default function Anagrams({
         length: config.length,
         timeLimit_ms: config.timePerAnagram,
         solved: sessionData.solvedAnagrams,
+        alternativeSolutions: sessionData.alternativeSolutions,
         expired: sessionData.expiredAnagrams,
         rt_ms: meanRT,
         totalAnagrams: sessionData.totalAnagrams,
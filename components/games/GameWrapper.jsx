@@ -130,7 +130,7 @@ export default function GameWrapper({
       await saveGameRun(finalScore, metrics)
       
       // Update XP and check for level up
-      const profileUpdate = await updateUserProfile(userProfile.id, { xp: xpGain })
+      const profileUpdate = await updateUserProfile(userProfile.id, xpGain)
       const leveledUp = profileUpdate && profileUpdate.levelUp
       
       // Update streak
@@ -270,15 +270,6 @@ export default function GameWrapper({
       if (updateError) {
         console.error('Error updating progress:', updateError)
       }
-
-      // Update XP and streaks
-      if (isValidGameRun(finalScore, DURATION_MS, metrics)) {
-        const xpGain = calculateXpGain(gameConfig.name, finalScore, level)
-        await updateUserProfile(userProfile.id, { xp: userProfile.xp + xpGain })
-        await updateStreak(userProfile.id)
-        await checkAchievements(userProfile.id, gameConfig.name, finalScore)
-      }
-
     } catch (error) {
       console.error('Error in updateGameProgress:', error)
     }
@@ -1,37 +1,16 @@
 'use client'
 
-import { useState, useEffect, useCallback, useRef } from 'react'
+import { useState, useEffect, useCallback, useRef, useMemo } from 'react'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
-import { WORD_BANK } from '@/lib/word-bank'
+import { LETTERS_GRID_LEVELS, createPuzzleQueue } from '@/lib/puzzles'
 
 const GAME_CONFIG = {
   name: 'letters_grid',
   displayName: 'Letters Grid',
   description: 'Encuentra las letras objetivo en la cuadrícula',
-  levels: {
-    1: { N: 5, targets: 1, exposureTotal: 12000, goalRT: 2000 },
-    2: { N: 6, targets: 1, exposureTotal: 11000, goalRT: 1900 },
-    3: { N: 6, targets: 1, exposureTotal: 10000, goalRT: 1800 },
-    4: { N: 7, targets: 2, exposureTotal: 10000, goalRT: 1800 },
-    5: { N: 7, targets: 2, exposureTotal: 9000, goalRT: 1700 },
-    6: { N: 8, targets: 2, exposureTotal: 9000, goalRT: 1700 },
-    7: { N: 8, targets: 2, exposureTotal: 8000, goalRT: 1600 },
-    8: { N: 9, targets: 2, exposureTotal: 8000, goalRT: 1600 },
-    9: { N: 9, targets: 2, exposureTotal: 7000, goalRT: 1500 },
-    10: { N: 10, targets: 3, exposureTotal: 7000, goalRT: 1500, useConfusables: true },
-    11: { N: 10, targets: 3, exposureTotal: 6500, goalRT: 1400, useConfusables: true },
-    12: { N: 11, targets: 3, exposureTotal: 6000, goalRT: 1400, useConfusables: true },
-    13: { N: 11, targets: 3, exposureTotal: 5500, goalRT: 1300, useConfusables: true },
-    14: { N: 12, targets: 3, exposureTotal: 5500, goalRT: 1300, useConfusables: true },
-    15: { N: 12, targets: 3, exposureTotal: 5000, goalRT: 1200, useConfusables: true },
-    16: { N: 13, targets: 3, exposureTotal: 5000, goalRT: 1200, useConfusables: true },
-    17: { N: 13, targets: 3, exposureTotal: 4500, goalRT: 1100, useConfusables: true },
-    18: { N: 14, targets: 3, exposureTotal: 4500, goalRT: 1100, useConfusables: true },
-    19: { N: 14, targets: 3, exposureTotal: 4200, goalRT: 1000, useConfusables: true },
-    20: { N: 15, targets: 3, exposureTotal: 4000, goalRT: 1000, useConfusables: true }
-  }
+  levels: LETTERS_GRID_LEVELS
 }
 
 export default function LettersGrid({ 
@@ -56,108 +35,38 @@ export default function LettersGrid({
   })
 
   const config = GAME_CONFIG.levels[Math.min(level, 20)]
-  const lettersData = WORD_BANK.lettersGrid[locale] || WORD_BANK.lettersGrid.es
   const screenStartTime = useRef(null)
   const gameStartTime = useRef(null)
+  const puzzleSeeds = useRef([])
 
-  // Generate random letters with optional confusables
-  const generateLetters = useCallback((count, useConfusables = false) => {
-    const availableLetters = lettersData.targets
-    const selectedTargets = []
-    
-    for (let i = 0; i < count; i++) {
-      const randomLetter = availableLetters[Math.floor(Math.random() * availableLetters.length)]
-      selectedTargets.push(randomLetter)
-    }
-
-    if (useConfusables) {
-      // Add some confusable letters to make it harder
-      selectedTargets.forEach(letter => {
-        if (lettersData.confusables[letter] && Math.random() < 0.3) {
-          const confusables = lettersData.confusables[letter]
-          const confusable = confusables[Math.floor(Math.random() * confusables.length)]
-          if (Math.random() < 0.5) {
-            selectedTargets.push(confusable)
-          }
-        }
-      })
-    }
-
-    return selectedTargets
-  }, [lettersData])
-
-  // Generate grid
-  const generateGrid = useCallback(() => {
-    const { N, targets: targetCount, useConfusables } = config
-    const targets = generateLetters(targetCount, useConfusables)
-    
-    // Calculate target positions (ensure at least one of each target)
-    const targetPositions = new Map()
-    targets.forEach(letter => {
-      if (!targetPositions.has(letter)) {
-        targetPositions.set(letter, [])
-      }
-    })
-
-    // Place at least one of each unique target
-    const uniqueTargets = [...new Set(targets)]
-    uniqueTargets.forEach(letter => {
-      const row = Math.floor(Math.random() * N)
-      const col = Math.floor(Math.random() * N)
-      targetPositions.get(letter).push({ row, col })
-    })
+  // Grids come from the pregenerated pool (see lib/puzzles.js)
+  const puzzleQueue = useMemo(() => createPuzzleQueue('letters_grid', Math.min(level, 20), locale), [level, locale])
 
-    // Generate random additional targets (2-4 more per target letter)
-    uniqueTargets.forEach(letter => {
-      const additional = 2 + Math.floor(Math.random() * 3)
-      for (let i = 0; i < additional; i++) {
-        const row = Math.floor(Math.random() * N)
-        const col = Math.floor(Math.random() * N)
-        targetPositions.get(letter).push({ row, col })
-      }
-    })
+  const [queueReady, setQueueReady] = useState(false)
 
-    // Create grid
-    const newGrid = Array(N).fill(null).map(() => Array(N).fill(''))
-    
-    // Fill with target letters
-    targetPositions.forEach((positions, letter) => {
-      positions.forEach(({ row, col }) => {
-        newGrid[row][col] = letter
-      })
+  useEffect(() => {
+    let cancelled = false
+    setQueueReady(false)
+    puzzleQueue.prefetch().then(() => {
+      if (!cancelled) setQueueReady(true)
     })
-
-    // Fill remaining cells with random letters
-    const allLetters = lettersData.targets
-    for (let row = 0; row < N; row++) {
-      for (let col = 0; col < N; col++) {
-        if (newGrid[row][col] === '') {
-          // Use confusables sometimes if enabled
-          let randomLetter
-          if (useConfusables && Math.random() < 0.4) {
-            const targetLetter = uniqueTargets[Math.floor(Math.random() * uniqueTargets.length)]
-            const confusables = lettersData.confusables[targetLetter]
-            if (confusables && Math.random() < 0.6) {
-              randomLetter = confusables[Math.floor(Math.random() * confusables.length)]
-            } else {
-              randomLetter = allLetters[Math.floor(Math.random() * allLetters.length)]
-            }
-          } else {
-            randomLetter = allLetters[Math.floor(Math.random() * allLetters.length)]
-          }
-          newGrid[row][col] = randomLetter
-        }
-      }
+    return () => {
+      cancelled = true
     }
-
-    return { grid: newGrid, targets: uniqueTargets, targetPositions }
-  }, [config, generateLetters, lettersData])
+  }, [puzzleQueue])
 
   // Start new screen
   const startScreen = useCallback(() => {
     if (timeRemaining <= 0) return
 
-    const { grid: newGrid, targets, targetPositions } = generateGrid()
+    const puzzle = puzzleQueue.next()
+    puzzleSeeds.current.push(puzzle.seed)
+    const newGrid = puzzle.grid
+    const targets = puzzle.targets
+    const targetPositions = new Map(targets.map(letter => [
+      letter,
+      puzzle.targetPositions[letter].map(([row, col]) => ({ row, col }))
+    ]))
     setGrid(newGrid)
     setTargetLetters(targets)
     setSelectedCells(new Set())
@@ -172,7 +81,7 @@ export default function LettersGrid({
     setTimeout(() => {
       completeScreen(newGrid, targets, targetPositions)
     }, config.exposureTotal)
-  }, [timeRemaining, generateGrid, config.exposureTotal])
+  }, [timeRemaining, puzzleQueue, config.exposureTotal])
 
   // Handle cell click
   const handleCellClick = useCallback((row, col) => {
@@ -245,12 +154,12 @@ export default function LettersGrid({
     }, 1000)
   }, [selectedCells, score, onScoreUpdate, timeRemaining, startScreen])
 
-  // Auto-start first screen
+  // Auto-start first screen once the first puzzles are ready
   useEffect(() => {
-    if (timeRemaining > 0 && gameState === 'idle') {
+    if (timeRemaining > 0 && gameState === 'idle' && queueReady) {
       startScreen()
     }
-  }, [timeRemaining, gameState, startScreen])
+  }, [timeRemaining, gameState, startScreen, queueReady])
 
   // Handle game completion
   useEffect(() => {
@@ -270,7 +179,8 @@ export default function LettersGrid({
         exposure_ms: config.exposureTotal,
         mean_rt_ms: meanRT,
         totalScreens: sessionData.totalScreens,
-        accuracy: sessionData.accuracy
+        accuracy: sessionData.accuracy,
+        puzzle_seeds: puzzleSeeds.current
       }
 
       onComplete?.(score, metrics)
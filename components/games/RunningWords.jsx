@@ -4,7 +4,7 @@ import { useState, useEffect, useCallback, useRef } from 'react'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent } from '@/components/ui/card'
 import { Progress } from '@/components/ui/progress'
-import { WORD_BANK } from '@/lib/word-bank'
+import { useWordBank } from '@/hooks/useWordBank'
 
 const GAME_CONFIG = {
   name: 'running_words',
@@ -57,7 +57,7 @@ export default function RunningWords({
   })
 
   const config = GAME_CONFIG.levels[Math.min(level, 20)]
-  const words = WORD_BANK.runningWords[locale] || WORD_BANK.runningWords.es
+  const words = useWordBank('runningWords', locale)
   const showLineNumbers = level < 8
 
   const questionStartTime = useRef(null)
@@ -180,12 +180,12 @@ export default function RunningWords({
     }, 1500)
   }, [selectedAnswer, questionData, config, score, onScoreUpdate, timeRemaining, startRound])
 
-  // Auto-start first round
+  // Auto-start first round once the words have loaded
   useEffect(() => {
-    if (timeRemaining > 0 && gameState === 'idle') {
+    if (timeRemaining > 0 && gameState === 'idle' && words) {
       startRound()
     }
-  }, [timeRemaining, gameState, startRound])
+  }, [timeRemaining, gameState, startRound, words])
 
   // Handle game completion
   useEffect(() => {
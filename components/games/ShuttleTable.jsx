@@ -8,7 +8,7 @@ import { Button } from '@/components/ui/button'
 import { Progress } from '@/components/ui/progress'
 import { Grid3x3, Clock, Target, Zap, Eye } from 'lucide-react'
 import { EnhancedAdaptiveDifficulty } from '@/lib/enhanced-difficulty'
-import { loadGameProgress, saveGameProgress, generateSchulteNumbers } from '@/lib/progress-tracking'
+import { loadGameProgress, saveGameProgress, generateSchulteNumbers, getSchulteSequence, nextSchulteValue } from '@/lib/progress-tracking'
 
 const GAME_STATES = {
   READY: 'ready',
@@ -135,9 +135,8 @@ export default function ShuttleTable({ userId = 'anonymous', onFinish, onExit, t
       case 'multiples':
         return current + 3
       case 'primes':
-        return getNextPrime(current)
       case 'fibonacci':
-        return getNextFibonacci(current, params.n)
+        return nextSchulteValue(current, params.n, params.mode)
       default:
         return current + 1
     }
@@ -153,7 +152,8 @@ export default function ShuttleTable({ userId = 'anonymous', onFinish, onExit, t
         return target > params.n * 3
       case 'primes':
       case 'fibonacci':
-        return target > Math.max(...currentTable.map(c => c.value))
+        const sequence = getSchulteSequence(params.n, params.mode)
+        return target > sequence[sequence.length - 1]
       default:
         return target > params.n
     }
@@ -347,30 +347,6 @@ export default function ShuttleTable({ userId = 'anonymous', onFinish, onExit, t
   const currentParams = adaptiveDifficulty?.getGameParameters() || { n: 9, layout: 'grid', hasGuide: true }
   const progress = timeLimit > 0 ? ((timeLimit - timeRemaining) / timeLimit) * 100 : 0
 
-  // Helper functions for special number sequences
-  const getNextPrime = (current) => {
-    let next = current + 1
-    while (!isPrime(next)) next++
-    return next
-  }
-
-  const isPrime = (num) => {
-    if (num < 2) return false
-    for (let i = 2; i <= Math.sqrt(num); i++) {
-      if (num % i === 0) return false
-    }
-    return true
-  }
-
-  const getNextFibonacci = (current, maxN) => {
-    const fibSeq = [1, 1]
-    while (fibSeq[fibSeq.length - 1] < maxN * 10) {
-      fibSeq.push(fibSeq[fibSeq.length - 1] + fibSeq[fibSeq.length - 2])
-    }
-    const currentIndex = fibSeq.indexOf(current)
-    return currentIndex >= 0 && currentIndex < fibSeq.length - 1 ? fibSeq[currentIndex + 1] : current + 1
-  }
-
   if (!gameStarted) {
     return (
       <Card className="w-full max-w-2xl mx-auto">
@@ -7,6 +7,7 @@ import { Badge } from '@/components/ui/badge'
 import { Button } from '@/components/ui/button'
 import { CheckCircle, XCircle } from 'lucide-react'
 import GameShell from '../GameShell'
+import { getTwinWordsIndex, pairKindsForSubtlety } from '@/lib/twin-words-index'
 
 export default function TwinWordsGrid({ difficultyLevel = 1, durationMs, onFinish, onExit }) {
   return (
@@ -39,53 +40,28 @@ function TwinWordsGame({ gameContext }) {
     handleGameEnd 
   } = gameContext
 
-  // Word pairs dataset with micro-differences
-  const wordDatabase = [
-    // Spanish pairs
-    { word1: 'casa', word2: 'casa', identical: true },
-    { word1: 'cosa', word2: 'casa', identical: false },
-    { word1: 'peso', word2: 'piso', identical: false },
-    { word1: 'perro', word2: 'perno', identical: false },
-    { word1: 'carro', word2: 'corro', identical: false },
-    { word1: 'mano', word2: 'nano', identical: false },
-    { word1: 'claro', word2: 'daro', identical: false },
-    { word1: 'tiempo', word2: 'tiempo', identical: true },
-    { word1: 'tiempo', word2: 'tiernpo', identical: false },
-    { word1: 'persona', word2: 'persorna', identical: false },
-    { word1: 'momento', word2: 'mornento', identical: false },
-    { word1: 'trabajo', word2: 'trabajo', identical: true },
-    { word1: 'trabajo', word2: 'trabaja', identical: false },
-    { word1: 'problema', word2: 'problerna', identical: false },
-    { word1: 'gobierno', word2: 'gobiemo', identical: false },
-    { word1: 'desarrollo', word2: 'desarroilo', identical: false },
-    
-    // Accent differences
-    { word1: 'médico', word2: 'medico', identical: false },
-    { word1: 'rápido', word2: 'rapido', identical: false },
-    { word1: 'teléfono', word2: 'telefono', identical: false },
-    { word1: 'música', word2: 'musica', identical: false },
-    { word1: 'público', word2: 'publico', identical: false },
-    
-    // Case differences
-    { word1: 'CASA', word2: 'casa', identical: false },
-    { word1: 'Mundo', word2: 'mundo', identical: false },
-    { word1: 'TIEMPO', word2: 'tiempo', identical: false },
-    
-    // More subtle differences
-    { word1: 'leer', word2: 'leer', identical: true },
-    { word1: 'leer', word2: 'beer', identical: false },
-    { word1: 'escribir', word2: 'escribir', identical: true },
-    { word1: 'escribir', word2: 'escnbir', identical: false },
-    { word1: 'estudiar', word2: 'estudiar', identical: true },
-    { word1: 'estudiar', word2: 'estuciar', identical: false }
-  ]
+  // Candidate pairs of the word bank, grouped by how subtle the difference is
+  const [twinIndex, setTwinIndex] = useState(null)
+
+  useEffect(() => {
+    let cancelled = false
+    getTwinWordsIndex('es')
+      .then(index => {
+        if (!cancelled) setTwinIndex(index)
+      })
+      .catch(error => console.error('Error loading TwinWords pairs:', error))
+
+    return () => {
+      cancelled = true
+    }
+  }, [])
 
   // Generate new round when game starts
   useEffect(() => {
-    if (gameState === 'playing' && currentPairs.length === 0) {
+    if (gameState === 'playing' && currentPairs.length === 0 && twinIndex) {
       generateNewRound()
     }
-  }, [gameState])
+  }, [gameState, twinIndex])
 
   // Round timer
   useEffect(() => {
@@ -109,38 +85,20 @@ function TwinWordsGame({ gameContext }) {
     const params = getGameParameters()
     const { pairsCount, difficultyRatio, subtletyLevel } = params
     
-    // Filter words by subtlety level
-    let availablePairs = wordDatabase.filter(pair => {
-      if (pair.identical) return true
-      
-      // More subtle differences at higher levels
-      const wordLength = Math.max(pair.word1.length, pair.word2.length)
-      const isSubtle = pair.word1.toLowerCase() !== pair.word2.toLowerCase() &&
-                      (pair.word1.includes('m') || pair.word1.includes('n') || 
-                       pair.word1.includes('rn') || pair.word1.includes('cl') ||
-                       pair.word1.includes('í') || pair.word1.includes('é'))
-      
-      if (subtletyLevel >= 4) return isSubtle
-      if (subtletyLevel >= 3) return wordLength >= 6
-      if (subtletyLevel >= 2) return wordLength >= 4
-      return true
-    })
-
-    // Shuffle and select pairs
-    availablePairs = [...availablePairs].sort(() => Math.random() - 0.5)
-    
     // Calculate how many should be different
     const differentCount = Math.round(pairsCount * difficultyRatio)
-    const identicalCount = pairsCount - differentCount
-    
-    const selectedPairs = []
-    const identicalPairs = availablePairs.filter(p => p.identical).slice(0, identicalCount)
-    const differentPairs = availablePairs.filter(p => !p.identical).slice(0, differentCount)
-    
-    selectedPairs.push(...identicalPairs, ...differentPairs)
+
+    // Fresh pairs each round, subtler differences at higher levels
+    const differentPairs = twinIndex
+      .drawPairs(pairKindsForSubtlety(subtletyLevel), differentCount)
+      .map(pair => ({ ...pair, identical: false }))
+    const usedWords = new Set(differentPairs.flatMap(pair => [pair.word1.toLowerCase(), pair.word2.toLowerCase()]))
+    const identicalPairs = twinIndex
+      .drawWords(pairsCount - differentPairs.length, Math.random, usedWords)
+      .map(word => ({ word1: word, word2: word, identical: true }))
     
     // Shuffle final pairs
-    const shuffledPairs = selectedPairs.sort(() => Math.random() - 0.5)
+    const shuffledPairs = [...identicalPairs, ...differentPairs].sort(() => Math.random() - 0.5)
     
     setCurrentPairs(shuffledPairs)
     setSelectedPairs(new Set())
@@ -7,6 +7,7 @@ import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
 import { Card } from '@/components/ui/card'
 import { Eye, Timer, Trophy, Target, TrendingUp, AlertCircle } from 'lucide-react'
+import { getTwinWordsIndex, pairKindsForSubtlety } from '@/lib/twin-words-index'
 
 // PR C - TwinWords with 60s gameplay and adaptive difficulty
 export default function TwinWordsGridPRC({ onExit, onBackToGames, onViewStats }) {
@@ -30,50 +31,32 @@ export default function TwinWordsGridPRC({ onExit, onBackToGames, onViewStats })
   const performanceWindowRef = useRef([])
   const lastLevelUpdateRef = useRef(Date.now())
 
-  // PR C: Word pairs database
-  const WORD_PAIRS = [
-    // Similar words for difficulty
-    ['casa', 'caza'], ['peso', 'beso'], ['mano', 'mono'], ['gato', 'dato'],
-    ['mesa', 'meta'], ['piso', 'paso'], ['rama', 'dama'], ['cola', 'copa'],
-    ['amor', 'amos'], ['luna', 'lupa'], ['vida', 'vino'], ['agua', 'agus'],
-    ['papel', 'papul'], ['madre', 'madro'], ['padre', 'padru'], ['verde', 'varde'],
-    ['rojo', 'rojs'], ['azul', 'azol'], ['negro', 'negru'], ['blanco', 'blenco'],
-    // Accent differences  
-    ['médico', 'medico'], ['rápido', 'rapido'], ['fácil', 'facil'], ['difícil', 'dificil'],
-    ['música', 'musica'], ['público', 'publico'], ['único', 'unico'], ['práctico', 'practico'],
-    // Letter swaps
-    ['forma', 'froma'], ['tiempo', 'tiempi'], ['mundo', 'mundi'], ['grande', 'grende'],
-    ['pequeño', 'peqeño'], ['ciudad', 'ciduad'], ['persona', 'presona'], ['trabajo', 'trabojo']
-  ]
+  // Candidate pairs of the word bank, grouped by how subtle the difference is
+  const [twinIndex, setTwinIndex] = useState(null)
 
   // PR C: Calculate pairs count based on level
   const calculatePairsCount = (level) => {
     return Math.min(10, 4 + Math.floor(level / 2)) // 4 + floor(level/2), max 10
   }
 
+  // Pair kinds for a level: subtler differences as the level rises
+  const pairKindsForLevel = (level) => {
+    return pairKindsForSubtlety(Math.ceil(level / 2))
+  }
+
   // PR C: Generate random pairs for current difficulty
-  const generatePairs = (pairsCount) => {
-    const selectedPairs = []
-    const usedWords = new Set()
-    
-    while (selectedPairs.length < pairsCount) {
-      const randomPair = WORD_PAIRS[Math.floor(Math.random() * WORD_PAIRS.length)]
-      const word = randomPair[Math.floor(Math.random() * 2)] // Pick one word from pair
-      
-      if (!usedWords.has(word)) {
-        // Add the word and its pair
-        selectedPairs.push({
-          id: `pair-${selectedPairs.length}`,
-          word1: randomPair[0],
-          word2: randomPair[1],
-          positions: [],
-          solved: false,
-          startTime: Date.now()
-        })
-        usedWords.add(randomPair[0])
-        usedWords.add(randomPair[1])
-      }
-    }
+  const generatePairs = (pairsCount, level) => {
+    const selectedPairs = twinIndex
+      .drawPairs(pairKindsForLevel(level), pairsCount)
+      .map((pair, index) => ({
+        id: `pair-${index}`,
+        word1: pair.word1,
+        word2: pair.word2,
+        kind: pair.kind,
+        positions: [],
+        solved: false,
+        startTime: Date.now()
+      }))
     
     // Create grid positions - ensure minimum spacing for peripheral vision
     const allCards = []
@@ -106,7 +89,7 @@ export default function TwinWordsGridPRC({ onExit, onBackToGames, onViewStats })
     const pairsCount = calculatePairsCount(level)
     setCurrentPairsCount(pairsCount)
     
-    const { pairs: newPairs, cards } = generatePairs(pairsCount)
+    const { pairs: newPairs, cards } = generatePairs(pairsCount, level)
     setPairs(newPairs)
     
     // Set start times for performance tracking
@@ -120,9 +103,22 @@ export default function TwinWordsGridPRC({ onExit, onBackToGames, onViewStats })
   }
 
   useEffect(() => {
-    initializeRound()
+    let cancelled = false
+    getTwinWordsIndex('es')
+      .then(index => {
+        if (!cancelled) setTwinIndex(index)
+      })
+      .catch(error => console.error('Error loading TwinWords pairs:', error))
+
+    return () => {
+      cancelled = true
+    }
   }, [])
 
+  useEffect(() => {
+    if (twinIndex) initializeRound()
+  }, [twinIndex])
+
   // PR C: Handle card selection
   const handleCardClick = (card) => {
     if (!gameContextRef.current || gameContextRef.current.gameState !== 'playing') return
@@ -277,38 +273,36 @@ export default function TwinWordsGridPRC({ onExit, onBackToGames, onViewStats })
 
   // PR C: Regenerate single pair to maintain pairs count
   const regeneratePair = (solvedPairId) => {
-    if (!gameContextRef.current || gameContextRef.current.gameState !== 'playing') return
+    if (!gameContextRef.current || gameContextRef.current.gameState !== 'playing' || !twinIndex) return
     
-    // Generate one new pair to replace the solved one
-    const availablePairs = WORD_PAIRS.filter(wordPair => {
-      // Make sure we don't duplicate existing pairs
-      return !pairs.some(existingPair => 
-        existingPair.id !== solvedPairId && 
-        (existingPair.word1 === wordPair[0] || existingPair.word1 === wordPair[1])
-      )
-    })
+    // Draw a fresh pair whose words are not already on the board
+    const onBoard = new Set(
+      pairs.filter(pair => pair.id !== solvedPairId).flatMap(pair => [pair.word1, pair.word2])
+    )
+    const level = gameContextRef.current.currentLevel || 1
+    const replacement = twinIndex
+      .drawPairs(pairKindsForLevel(level), 4)
+      .find(pair => !onBoard.has(pair.word1) && !onBoard.has(pair.word2))
+    if (!replacement) return
     
-    if (availablePairs.length === 0) {
-      // If no unique pairs available, recycle from existing ones
-      const randomPair = WORD_PAIRS[Math.floor(Math.random() * WORD_PAIRS.length)]
-      const newPair = {
-        id: `pair-${Date.now()}`,
-        word1: randomPair[0],
-        word2: randomPair[1],
-        solved: false,
-        startTime: Date.now()
-      }
-      
-      setPairs(prevPairs => 
-        prevPairs.map(p => p.id === solvedPairId ? newPair : p)
-      )
-      
-      // Update start time tracking
-      setPairStartTimes(prev => ({
-        ...prev,
-        [newPair.id]: Date.now()
-      }))
+    const newPair = {
+      id: `pair-${Date.now()}`,
+      word1: replacement.word1,
+      word2: replacement.word2,
+      kind: replacement.kind,
+      solved: false,
+      startTime: Date.now()
     }
+    
+    setPairs(prevPairs => 
+      prevPairs.map(p => p.id === solvedPairId ? newPair : p)
+    )
+    
+    // Update start time tracking
+    setPairStartTimes(prev => ({
+      ...prev,
+      [newPair.id]: Date.now()
+    }))
   }
 
   // PR C: Handle game end
@@ -1,44 +1,16 @@
 'use client'
 
-import { useState, useEffect, useCallback, useRef } from 'react'
+import { useState, useEffect, useCallback, useRef, useMemo } from 'react'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
-import { WORD_BANK } from '@/lib/word-bank'
+import { WORD_SEARCH_LEVELS, createPuzzleQueue } from '@/lib/puzzles'
 
 const GAME_CONFIG = {
   name: 'word_search',
   displayName: 'Word Search',
   description: 'Encuentra las palabras ocultas en la sopa de letras',
-  levels: {
-    1: { gridSize: 8, wordsCount: 3, diagonals: false, reverse: false, goalTimePerWord: 8000 },
-    2: { gridSize: 8, wordsCount: 3, diagonals: false, reverse: false, goalTimePerWord: 7500 },
-    3: { gridSize: 9, wordsCount: 4, diagonals: false, reverse: false, goalTimePerWord: 7000 },
-    4: { gridSize: 9, wordsCount: 4, diagonals: false, reverse: false, goalTimePerWord: 6500 },
-    5: { gridSize: 10, wordsCount: 5, diagonals: false, reverse: false, goalTimePerWord: 6000 },
-    6: { gridSize: 10, wordsCount: 5, diagonals: false, reverse: false, goalTimePerWord: 5500 },
-    7: { gridSize: 11, wordsCount: 6, diagonals: false, reverse: false, goalTimePerWord: 5000 },
-    8: { gridSize: 11, wordsCount: 6, diagonals: true, reverse: true, goalTimePerWord: 5000 },
-    9: { gridSize: 12, wordsCount: 7, diagonals: true, reverse: true, goalTimePerWord: 4500 },
-    10: { gridSize: 12, wordsCount: 7, diagonals: true, reverse: true, goalTimePerWord: 4000 },
-    11: { gridSize: 12, wordsCount: 8, diagonals: true, reverse: true, goalTimePerWord: 4000 },
-    12: { gridSize: 13, wordsCount: 8, diagonals: true, reverse: true, goalTimePerWord: 3500 },
-    13: { gridSize: 13, wordsCount: 9, diagonals: true, reverse: true, goalTimePerWord: 3500 },
-    14: { gridSize: 13, wordsCount: 9, diagonals: true, reverse: true, goalTimePerWord: 3000 },
-    15: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 3000 },
-    16: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2800 },
-    17: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2600 },
-    18: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2400 },
-    19: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2200 },
-    20: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2000 }
-  }
-}
-
-const DIRECTIONS = {
-  horizontal: [0, 1],
-  vertical: [1, 0],
-  diagonalDown: [1, 1],
-  diagonalUp: [-1, 1]
+  levels: WORD_SEARCH_LEVELS
 }
 
 export default function WordSearch({ 
@@ -66,131 +38,39 @@ export default function WordSearch({
   })
 
   const config = GAME_CONFIG.levels[Math.min(level, 20)]
-  const wordsData = WORD_BANK.wordSearch[locale] || WORD_BANK.wordSearch.es
   const roundStartTime = useRef(null)
+  const puzzleSeeds = useRef([])
 
-  // Get words for current round
-  const getWordsForRound = useCallback(() => {
-    const allWords = []
-    // Collect words from different lengths (4-8 chars for variety)
-    for (let length = 4; length <= 8; length++) {
-      if (wordsData[length]) {
-        allWords.push(...wordsData[length])
-      }
-    }
-    
-    // Shuffle and pick required number
-    const shuffled = allWords.sort(() => Math.random() - 0.5)
-    return shuffled.slice(0, config.wordsCount)
-  }, [config.wordsCount, wordsData])
+  // Puzzles come from the pregenerated pool (see lib/puzzles.js)
+  const puzzleQueue = useMemo(() => createPuzzleQueue('word_search', Math.min(level, 20), locale), [level, locale])
 
-  // Place word in grid
-  const placeWord = useCallback((grid, word, gridSize, diagonals, reverse) => {
-    const directions = [
-      DIRECTIONS.horizontal,
-      DIRECTIONS.vertical
-    ]
-    
-    if (diagonals) {
-      directions.push(DIRECTIONS.diagonalDown, DIRECTIONS.diagonalUp)
-    }
+  const [queueReady, setQueueReady] = useState(false)
 
-    // Try random placements
-    for (let attempts = 0; attempts < 100; attempts++) {
-      const direction = directions[Math.floor(Math.random() * directions.length)]
-      const [dr, dc] = direction
-      
-      // Randomly decide if word should be reversed
-      const actualWord = (reverse && Math.random() < 0.3) ? word.split('').reverse().join('') : word
-      
-      // Find valid starting position
-      const maxRow = dr >= 0 ? gridSize - actualWord.length : actualWord.length - 1
-      const maxCol = dc >= 0 ? gridSize - actualWord.length : actualWord.length - 1
-      const minRow = dr < 0 ? actualWord.length - 1 : 0
-      const minCol = dc < 0 ? actualWord.length - 1 : 0
-      
-      if (maxRow < minRow || maxCol < minCol) continue
-      
-      const startRow = minRow + Math.floor(Math.random() * (maxRow - minRow + 1))
-      const startCol = minCol + Math.floor(Math.random() * (maxCol - minCol + 1))
-      
-      // Check if word can be placed
-      let canPlace = true
-      const positions = []
-      
-      for (let i = 0; i < actualWord.length; i++) {
-        const row = startRow + i * dr
-        const col = startCol + i * dc
-        
-        if (row < 0 || row >= gridSize || col < 0 || col >= gridSize) {
-          canPlace = false
-          break
-        }
-        
-        if (grid[row][col] !== '' && grid[row][col] !== actualWord[i].toUpperCase()) {
-          canPlace = false
-          break
-        }
-        
-        positions.push({ row, col, letter: actualWord[i].toUpperCase() })
-      }
-      
-      if (canPlace) {
-        // Place the word
-        positions.forEach(({ row, col, letter }) => {
-          grid[row][col] = letter
-        })
-        
-        return { positions, word: actualWord, originalWord: word }
-      }
-    }
-    
-    return null
-  }, [])
-
-  // Generate new round
-  const generateRound = useCallback(() => {
-    const { gridSize } = config
-    const roundWords = getWordsForRound()
-    const newGrid = Array(gridSize).fill(null).map(() => Array(gridSize).fill(''))
-    const newWordPositions = new Map()
-    const placedWords = []
-
-    // Place words
-    roundWords.forEach(word => {
-      const placement = placeWord(newGrid, word, gridSize, config.diagonals, config.reverse)
-      if (placement) {
-        newWordPositions.set(word, placement.positions)
-        placedWords.push(word)
-      }
+  useEffect(() => {
+    let cancelled = false
+    setQueueReady(false)
+    puzzleQueue.prefetch().then(() => {
+      if (!cancelled) setQueueReady(true)
     })
-
-    // Fill empty cells with random letters
-    const alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    for (let row = 0; row < gridSize; row++) {
-      for (let col = 0; col < gridSize; col++) {
-        if (newGrid[row][col] === '') {
-          newGrid[row][col] = alphabet[Math.floor(Math.random() * alphabet.length)]
-        }
-      }
+    return () => {
+      cancelled = true
     }
-
-    return { grid: newGrid, words: placedWords, wordPositions: newWordPositions }
-  }, [config, getWordsForRound, placeWord])
+  }, [puzzleQueue])
 
   // Start new round
   const startRound = useCallback(() => {
     if (timeRemaining <= 0) return
 
-    const { grid: newGrid, words: newWords, wordPositions: newWordPositions } = generateRound()
-    setGrid(newGrid)
-    setWords(newWords)
-    setWordPositions(newWordPositions)
+    const puzzle = puzzleQueue.next()
+    puzzleSeeds.current.push(puzzle.seed)
+    setGrid(puzzle.grid.map(row => [...row]))
+    setWords(puzzle.words)
+    setWordPositions(new Map(puzzle.words.map(word => [word, puzzle.positions[word].map(([row, col]) => ({ row, col }))])))
     setFoundWords(new Set())
     setSelection({ start: null, end: null, cells: [] })
     setGameState('playing')
     roundStartTime.current = Date.now()
-  }, [generateRound, timeRemaining])
+  }, [puzzleQueue, timeRemaining])
 
   // Handle mouse down on cell
   const handleMouseDown = useCallback((row, col) => {
@@ -312,12 +192,12 @@ export default function WordSearch({
     setSelection({ start: null, end: null, cells: [] })
   }, [isSelecting, selection, grid, words, foundWords, score, onScoreUpdate, timeRemaining, startRound])
 
-  // Auto-start first round
+  // Auto-start first round once the first puzzles are ready
   useEffect(() => {
-    if (timeRemaining > 0 && gameState === 'idle') {
+    if (timeRemaining > 0 && gameState === 'idle' && queueReady) {
       startRound()
     }
-  }, [timeRemaining, gameState, startRound])
+  }, [timeRemaining, gameState, startRound, queueReady])
 
   // Handle game completion
   useEffect(() => {
@@ -335,7 +215,8 @@ export default function WordSearch({
         invalidSelections: sessionData.invalidSelections,
         time_per_word_ms: meanTimePerWord,
         totalRounds: sessionData.totalRounds + (words.length > 0 ? 1 : 0),
-        accuracy: sessionData.accuracy
+        accuracy: sessionData.accuracy,
+        puzzle_seeds: puzzleSeeds.current
       }
 
       onComplete?.(score, metrics)
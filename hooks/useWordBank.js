@@ -0,0 +1,25 @@
+'use client'
+
+import { useState, useEffect } from 'react'
+import { loadWordBank, getLoadedWordBank } from '@/lib/word-bank-shards'
+
+// Words of one game and locale from its word bank shard; null while loading
+export function useWordBank(game, locale = 'es') {
+  const [words, setWords] = useState(() => getLoadedWordBank(game, locale))
+
+  useEffect(() => {
+    let cancelled = false
+    setWords(getLoadedWordBank(game, locale))
+    loadWordBank(game, locale)
+      .then(data => {
+        if (!cancelled) setWords(data)
+      })
+      .catch(error => console.error('Error loading word bank:', error))
+
+    return () => {
+      cancelled = true
+    }
+  }, [game, locale])
+
+  return words
+}
@@ -1,4 +1,5 @@
 import { STAIRCASE_CONFIG, DIFFICULTY_RANGE } from './constants'
+import { TrialWindow } from './trial-window'
 
 /**
  * Adaptive Difficulty System using 3-down/1-up staircase method
@@ -10,7 +11,7 @@ export class AdaptiveDifficulty {
     this.gameType = gameType
     this.currentLevel = Math.max(DIFFICULTY_RANGE[0], Math.min(DIFFICULTY_RANGE[1], initialLevel))
     this.consecutiveSuccesses = 0
-    this.recentTrials = [] // Recent performance window
+    this.recentTrials = new TrialWindow(STAIRCASE_CONFIG.WINDOW_SIZE) // Recent performance window
     this.totalTrials = 0
     this.totalSuccesses = 0
   }
@@ -31,21 +32,8 @@ export class AdaptiveDifficulty {
       this.consecutiveSuccesses = 0
     }
 
-    // Add to recent trials window
-    const trial = {
-      success,
-      responseTime,
-      level: this.currentLevel,
-      timestamp: Date.now(),
-      ...metadata
-    }
-    
-    this.recentTrials.push(trial)
-    
-    // Keep only recent window
-    if (this.recentTrials.length > STAIRCASE_CONFIG.WINDOW_SIZE) {
-      this.recentTrials.shift()
-    }
+    // Add to recent trials window (the oldest trial drops out when full)
+    this.recentTrials.push(success, responseTime, this.currentLevel)
 
     // Check for level adjustment
     const adjustment = this.checkLevelAdjustment()
@@ -88,8 +76,7 @@ export class AdaptiveDifficulty {
     }
 
     // 1-up rule: decrease difficulty immediately after failure
-    const lastTrial = this.recentTrials[this.recentTrials.length - 1]
-    if (lastTrial && !lastTrial.success) {
+    if (this.recentTrials.lastSuccess() === false) {
       if (this.currentLevel > DIFFICULTY_RANGE[0]) {
         this.currentLevel--
         return {
@@ -108,18 +95,12 @@ export class AdaptiveDifficulty {
    * @returns {Object} - Performance stats
    */
   getStats() {
-    const recentAccuracy = this.recentTrials.length > 0 
-      ? this.recentTrials.filter(t => t.success).length / this.recentTrials.length 
-      : 0
+    const recentAccuracy = this.recentTrials.successRate()
 
     const overallAccuracy = this.totalTrials > 0 
       ? this.totalSuccesses / this.totalTrials 
       : 0
 
-    const avgResponseTime = this.recentTrials
-      .filter(t => t.responseTime !== null)
-      .reduce((sum, t, _, arr) => sum + t.responseTime / arr.length, 0)
-
     return {
       currentLevel: this.currentLevel,
       totalTrials: this.totalTrials,
@@ -127,8 +108,9 @@ export class AdaptiveDifficulty {
       consecutiveSuccesses: this.consecutiveSuccesses,
       recentAccuracy: Math.round(recentAccuracy * 100) / 100,
       overallAccuracy: Math.round(overallAccuracy * 100) / 100,
-      avgResponseTime: Math.round(avgResponseTime),
-      recentTrialsCount: this.recentTrials.length
+      avgResponseTime: Math.round(this.recentTrials.meanRt()),
+      medianResponseTime: Math.round(this.recentTrials.medianRt()),
+      recentTrialsCount: this.recentTrials.size
     }
   }
 
@@ -219,7 +201,7 @@ export class AdaptiveDifficulty {
       consecutiveSuccesses: this.consecutiveSuccesses,
       totalTrials: this.totalTrials,
       totalSuccesses: this.totalSuccesses,
-      recentTrials: this.recentTrials
+      recentTrials: this.recentTrials.toArray()
     }
   }
 
@@ -231,7 +213,9 @@ export class AdaptiveDifficulty {
     instance.consecutiveSuccesses = data.consecutiveSuccesses || 0
     instance.totalTrials = data.totalTrials || 0
     instance.totalSuccesses = data.totalSuccesses || 0
-    instance.recentTrials = data.recentTrials || []
+    for (const trial of (data.recentTrials || []).slice(-STAIRCASE_CONFIG.WINDOW_SIZE)) {
+      instance.recentTrials.push(trial.success, trial.responseTime, trial.level)
+    }
     return instance
   }
 }
\ No newline at end of file
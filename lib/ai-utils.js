@@ -1,6 +1,7 @@
 import crypto from 'crypto';
 import { v4 as uuidv4 } from 'uuid';
 import { supabase } from './supabase';
+import { precompressCacheEntry } from './compression';
 
 // Generate a hash for caching
 export function generateHash(text) {
@@ -91,6 +92,12 @@ function getMaxRequests() {
 
 // Check cache for existing results
 export async function checkCache(inputText, requestType) {
+  const entry = await checkCacheEntry(inputText, requestType);
+  return entry ? entry.output_text : null;
+}
+
+// Check cache and return the whole entry (including pre-compressed bodies)
+export async function checkCacheEntry(inputText, requestType) {
   const inputHash = generateHash(inputText);
   
   const { data, error } = await supabase
@@ -115,14 +122,14 @@ export async function checkCache(inputText, requestType) {
       })
       .eq('id', data.id);
     
-    return data.output_text;
+    return data;
   }
   
   return null;
 }
 
-// Save result to cache
-export async function saveToCache(inputText, outputText, requestType, tokenCount) {
+// Save result to cache; resultFields limits the cache-hit body to those fields
+export async function saveToCache(inputText, outputText, requestType, tokenCount, resultFields = null) {
   const inputHash = generateHash(inputText);
   const cacheKey = `${requestType}_${uuidv4()}`;
   
@@ -134,6 +141,7 @@ export async function saveToCache(inputText, outputText, requestType, tokenCount
       output_text: outputText,
       request_type: requestType,
       token_count: tokenCount,
+      ...precompressCacheEntry(outputText, resultFields),
       ver: 'v1',
       created_at: new Date().toISOString(),
       last_accessed_at: new Date().toISOString()
@@ -0,0 +1,250 @@
+/**
+ * Anagram dictionary index
+ *
+ * An AnagramIndex answers the two questions the Anagrams game asks: "is
+ * this a dictionary word made from these letters?" and "which words can be
+ * made from this rack?". Words are grouped by signature (their letters
+ * sorted), so the exact anagrams of a rack are one Map lookup. The
+ * dictionary is also kept as a trie in flat typed arrays, and a rack is
+ * solved by one walk of the trie that only follows letters still left in
+ * the rack. That covers words using a subset of the letters, e.g. a rack
+ * with decoy letters.
+ *
+ * getAnagramIndex(locale) builds the index from the locale's word bank
+ * shards (lib/word-bank-shards.js) and works the same on the client and the
+ * server. loadAnagramIndex() also adds the locale's rows from the word_bank
+ * table, and is used by GET /api/anagrams.
+ */
+
+import { WORD_BANK_LOCALES, loadWordBank } from './word-bank-shards'
+
+export const ANAGRAM_LOCALES = WORD_BANK_LOCALES
+export const MAX_RACK_LENGTH = 16
+const DICTIONARY_TTL_MS = 10 * 60 * 1000
+const WORD_PATTERN = /^\p{L}+$/u
+
+export function normalizeWord(word) {
+  return String(word).normalize('NFC').trim().toLowerCase()
+}
+
+// Sorted letters; words with the same signature are anagrams of each other
+export function signature(word) {
+  return Array.from(normalizeWord(word)).sort().join('')
+}
+
+export class AnagramIndex {
+  constructor(words) {
+    const unique = new Set()
+    for (const word of words) {
+      const normalized = normalizeWord(word)
+      if (WORD_PATTERN.test(normalized)) unique.add(normalized)
+    }
+    this.words = [...unique].sort()
+
+    const letters = new Set()
+    for (const word of this.words) {
+      for (const letter of word) letters.add(letter)
+    }
+    this.alphabet = [...letters].sort()
+    this.letterIds = new Map(this.alphabet.map((letter, id) => [letter, id]))
+
+    this.bySignature = new Map()
+    for (const word of this.words) {
+      const key = signature(word)
+      const group = this.bySignature.get(key)
+      if (group) group.push(word)
+      else this.bySignature.set(key, [word])
+    }
+
+    this.buildTrie()
+    this.buildLetterWeights()
+  }
+
+  get size() {
+    return this.words.length
+  }
+
+  /**
+   * First-child/next-sibling trie: node 0 is the root, children are kept in
+   * alphabet order and wordIds[node] is the word ending at the node (or -1)
+   */
+  buildTrie() {
+    const letters = [0]
+    const firstChild = [-1]
+    const nextSibling = [-1]
+    const wordIds = [-1]
+
+    this.words.forEach((word, wordId) => {
+      let node = 0
+      for (const char of word) {
+        const letter = this.letterIds.get(char)
+        let previous = -1
+        let child = firstChild[node]
+        while (child !== -1 && letters[child] < letter) {
+          previous = child
+          child = nextSibling[child]
+        }
+        if (child === -1 || letters[child] !== letter) {
+          const created = letters.length
+          letters.push(letter)
+          firstChild.push(-1)
+          nextSibling.push(child)
+          wordIds.push(-1)
+          if (previous === -1) firstChild[node] = created
+          else nextSibling[previous] = created
+          child = created
+        }
+        node = child
+      }
+      wordIds[node] = wordId
+    })
+
+    this.nodeLetters = Uint16Array.from(letters)
+    this.firstChild = Int32Array.from(firstChild)
+    this.nextSibling = Int32Array.from(nextSibling)
+    this.wordIds = Int32Array.from(wordIds)
+  }
+
+  // How often each unaccented letter appears in the dictionary, for decoys
+  buildLetterWeights() {
+    const counts = new Map()
+    for (const word of this.words) {
+      for (const letter of word) {
+        if (letter.normalize('NFD').length === 1) counts.set(letter, (counts.get(letter) || 0) + 1)
+      }
+    }
+    this.decoyPool = [...counts.keys()].sort()
+    this.decoyWeights = Float64Array.from(this.decoyPool, letter => counts.get(letter))
+  }
+
+  // Letter counts of a rack by alphabet id; letters outside the alphabet are ignored
+  rackCounts(rack) {
+    const counts = new Uint8Array(this.alphabet.length)
+    for (const char of normalizeWord(rack)) {
+      const letter = this.letterIds.get(char)
+      if (letter !== undefined) counts[letter]++
+    }
+    return counts
+  }
+
+  has(word) {
+    let node = 0
+    for (const char of normalizeWord(word)) {
+      const letter = this.letterIds.get(char)
+      if (letter === undefined) return false
+      let child = this.firstChild[node]
+      while (child !== -1 && this.nodeLetters[child] < letter) child = this.nextSibling[child]
+      if (child === -1 || this.nodeLetters[child] !== letter) return false
+      node = child
+    }
+    return node !== 0 && this.wordIds[node] !== -1
+  }
+
+  /**
+   * Dictionary words using exactly these letters
+   */
+  anagramsOf(letters) {
+    return [...(this.bySignature.get(signature(letters)) || [])]
+  }
+
+  /**
+   * True if `word` is in the dictionary and can be made from the rack's
+   * letters (each letter used at most as often as it appears in the rack)
+   */
+  isValidWord(word, rack) {
+    const normalized = normalizeWord(word)
+    if (!this.has(normalized)) return false
+    const counts = this.rackCounts(rack)
+    for (const char of normalized) {
+      if (counts[this.letterIds.get(char)]-- === 0) return false
+    }
+    return true
+  }
+
+  /**
+   * Every dictionary word that can be made from the rack's letters, longest
+   * first, then alphabetically
+   */
+  wordsFromRack(rack, { minLength = 1, maxLength = Infinity } = {}) {
+    const counts = this.rackCounts(rack)
+    const found = []
+
+    const walk = (node, depth) => {
+      for (let child = this.firstChild[node]; child !== -1; child = this.nextSibling[child]) {
+        const letter = this.nodeLetters[child]
+        if (counts[letter] === 0) continue
+        counts[letter]--
+        if (this.wordIds[child] !== -1 && depth + 1 >= minLength) found.push(this.words[this.wordIds[child]])
+        if (depth + 1 < maxLength) walk(child, depth + 1)
+        counts[letter]++
+      }
+    }
+    walk(0, 0)
+
+    return found.sort((a, b) => b.length - a.length || (a < b ? -1 : 1))
+  }
+
+  /**
+   * `count` decoy letters for a rack, drawn by how common each letter is in
+   * the locale's words so they blend in (accented letters are never used)
+   */
+  decoyLetters(count, random = Math.random) {
+    const total = this.decoyWeights.reduce((sum, weight) => sum + weight, 0)
+    const decoys = []
+    for (let i = 0; i < count && total > 0; i++) {
+      let target = random() * total
+      let letter = 0
+      while (letter < this.decoyWeights.length - 1 && target >= this.decoyWeights[letter]) {
+        target -= this.decoyWeights[letter]
+        letter++
+      }
+      decoys.push(this.decoyPool[letter])
+    }
+    return decoys
+  }
+}
+
+// Words of the word bank games for a locale (lists, or lists by length)
+async function bundledWords(locale) {
+  const banks = await Promise.all(['anagrams', 'wordSearch', 'runningWords'].map(game => loadWordBank(game, locale)))
+  return banks.flatMap(bank => (Array.isArray(bank) ? bank : Object.values(bank).flat()))
+}
+
+const bundledIndexes = new Map()
+
+/**
+ * Promise of the index of the word bank for a locale, built once per locale
+ */
+export function getAnagramIndex(locale = 'es') {
+  let index = bundledIndexes.get(locale)
+  if (!index) {
+    index = bundledWords(locale).then(words => new AnagramIndex(words))
+    index.catch(() => bundledIndexes.delete(locale))
+    bundledIndexes.set(locale, index)
+  }
+  return index
+}
+
+const loadedIndexes = new Map()
+
+/**
+ * Index of the word bank words plus `fetchWords(locale)` (the word_bank rows
+ * on the server), rebuilt at most every DICTIONARY_TTL_MS per locale. If the
+ * fetch fails the word bank alone is used until the next rebuild.
+ */
+export function loadAnagramIndex(locale, fetchWords) {
+  const cached = loadedIndexes.get(locale)
+  if (cached && Date.now() - cached.loadedAt < DICTIONARY_TTL_MS) return cached.index
+
+  const extraWords = Promise.resolve()
+    .then(() => fetchWords(locale))
+    .catch(error => {
+      console.error(`Failed to load the ${locale} dictionary:`, error)
+      return []
+    })
+  const index = Promise.all([bundledWords(locale), extraWords])
+    .then(([words, extra]) => new AnagramIndex([...words, ...extra]))
+
+  loadedIndexes.set(locale, { index, loadedAt: Date.now() })
+  return index
+}
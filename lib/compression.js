@@ -0,0 +1,128 @@
+/**
+ * Content-negotiated compression for JSON API responses
+ *
+ * Bodies above COMPRESSION_THRESHOLD are compressed with Brotli or gzip
+ * depending on Accept-Encoding. Immutable AI cache entries are compressed
+ * once at max quality when saved and served as stored bytes on cache hits.
+ */
+
+import zlib from 'zlib'
+import { NextResponse } from 'next/server'
+import { encodedEtag } from './etag'
+
+// Below this many bytes compression costs more than it saves
+export const COMPRESSION_THRESHOLD = 1024
+
+// Fast settings for per-request compression, max settings for stored entries
+const DYNAMIC_LEVELS = { br: 4, gzip: 6 }
+const STORED_LEVELS = { br: 11, gzip: 9 }
+
+/**
+ * Pick the best encoding the client accepts ('br', 'gzip' or null)
+ */
+export function negotiateEncoding(request) {
+  const header = request.headers.get('accept-encoding') || ''
+  const accepted = {}
+
+  for (const part of header.split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';')
+    if (!name) continue
+    const q = params.map(p => p.trim()).find(p => p.startsWith('q='))
+    accepted[name] = q ? parseFloat(q.slice(2)) : 1
+  }
+
+  const wildcard = accepted['*'] ?? 0
+  const weight = name => accepted[name] ?? wildcard
+
+  if (weight('br') > 0 && weight('br') >= weight('gzip')) return 'br'
+  if (weight('gzip') > 0) return 'gzip'
+  return null
+}
+
+/**
+ * Compress a buffer with the given encoding
+ */
+export function compressBuffer(buffer, encoding, levels = DYNAMIC_LEVELS) {
+  if (encoding === 'br') {
+    return zlib.brotliCompressSync(buffer, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_MODE]: zlib.constants.BROTLI_MODE_TEXT,
+        [zlib.constants.BROTLI_PARAM_QUALITY]: levels.br,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: buffer.length
+      }
+    })
+  }
+  return zlib.gzipSync(buffer, { level: levels.gzip })
+}
+
+function encodedResponse(body, encoding, init = {}) {
+  const etag = init.headers?.ETag
+  return new NextResponse(body, {
+    status: init.status || 200,
+    headers: {
+      ...init.headers,
+      ...(etag && { ETag: encodedEtag(etag, encoding) }),
+      'Content-Type': 'application/json',
+      'Content-Encoding': encoding,
+      'Content-Length': String(body.length),
+      Vary: 'Accept-Encoding'
+    }
+  })
+}
+
+/**
+ * Drop-in replacement for NextResponse.json that compresses large bodies
+ */
+export function compressedJson(request, data, init = {}) {
+  const encoding = negotiateEncoding(request)
+  const body = Buffer.from(JSON.stringify(data), 'utf8')
+
+  if (!encoding || body.length < COMPRESSION_THRESHOLD) {
+    return NextResponse.json(data, {
+      ...init,
+      headers: { ...init.headers, Vary: 'Accept-Encoding' }
+    })
+  }
+
+  return encodedResponse(compressBuffer(body, encoding), encoding, init)
+}
+
+/**
+ * Body returned on an AI cache hit: the stored result, or only its `fields`
+ * when given, flagged as cached
+ */
+export function cachedResultBody(outputText, fields = null) {
+  const result = JSON.parse(outputText)
+  const body = fields ? Object.fromEntries(fields.map(field => [field, result[field]])) : result
+  return JSON.stringify({ ...body, cached: true })
+}
+
+/**
+ * Pre-compress the cache-hit body of an immutable AI cache entry.
+ * Returns base64 columns for ai_cache (output_br, output_gzip).
+ */
+export function precompressCacheEntry(outputText, fields = null) {
+  const body = Buffer.from(cachedResultBody(outputText, fields), 'utf8')
+  if (body.length < COMPRESSION_THRESHOLD) {
+    return { output_br: null, output_gzip: null }
+  }
+  return {
+    output_br: compressBuffer(body, 'br', STORED_LEVELS).toString('base64'),
+    output_gzip: compressBuffer(body, 'gzip', STORED_LEVELS).toString('base64')
+  }
+}
+
+/**
+ * Serve an ai_cache row, using its stored compressed bytes when possible.
+ * `fields` must match the ones the entry was precompressed with.
+ */
+export function cachedEntryResponse(request, entry, fields = null, init = {}) {
+  const encoding = negotiateEncoding(request)
+  const stored = encoding === 'br' ? entry.output_br : encoding === 'gzip' ? entry.output_gzip : null
+
+  if (stored) {
+    return encodedResponse(Buffer.from(stored, 'base64'), encoding, init)
+  }
+
+  return compressedJson(request, JSON.parse(cachedResultBody(entry.output_text, fields)), init)
+}
@@ -1,13 +1,15 @@
 // Enhanced Adaptive Difficulty System for Sprint Juegos
 // Implements precise staircase algorithms for each game type
 
+import { TrialWindow } from './trial-window'
+
 export class EnhancedAdaptiveDifficulty {
   constructor(gameType, initialLevel = 1) {
     this.gameType = gameType
     this.currentLevel = Math.max(1, Math.min(20, initialLevel))
     this.consecutiveCorrect = 0
-    this.recentTrials = []
     this.maxTrials = 10 // Keep recent trials for RT calculations
+    this.recentTrials = new TrialWindow(this.maxTrials)
     
     // Game-specific configurations
     this.config = this.getGameConfig(gameType)
@@ -82,18 +84,8 @@ export class EnhancedAdaptiveDifficulty {
   }
 
   recordTrial(success, responseTime = null, metadata = {}) {
-    const trial = {
-      success,
-      responseTime,
-      metadata,
-      timestamp: Date.now(),
-      level: this.currentLevel
-    }
-    
-    this.recentTrials.push(trial)
-    if (this.recentTrials.length > this.maxTrials) {
-      this.recentTrials.shift()
-    }
+    // A response time of 0 means "not measured" here
+    this.recentTrials.push(success, responseTime || null, this.currentLevel)
 
     const oldLevel = this.currentLevel
     let levelChanged = false
@@ -101,11 +93,11 @@ export class EnhancedAdaptiveDifficulty {
 
     // Game-specific staircase logic
     if (this.gameType === 'memory_digits') {
-      levelChanged = this.handleMemoryDigitsStaircase(trial)
+      levelChanged = this.handleMemoryDigitsStaircase(success, responseTime)
     } else if (this.gameType === 'schulte') {
-      levelChanged = this.handleSchulteStaircase(trial)
+      levelChanged = this.handleSchulteStaircase(success, responseTime)
     } else if (this.gameType === 'par_impar') {
-      levelChanged = this.handleParImparStaircase(trial)
+      levelChanged = this.handleParImparStaircase(success, metadata)
     }
 
     if (levelChanged) {
@@ -123,17 +115,16 @@ export class EnhancedAdaptiveDifficulty {
     }
   }
 
-  handleMemoryDigitsStaircase(trial) {
+  handleMemoryDigitsStaircase(success, responseTime) {
     const params = this.config.getLevelParams(this.currentLevel)
     
-    if (trial.success) {
+    if (success) {
       this.consecutiveCorrect++
       
       // Check for level up: 3 consecutive correct AND mean RT ≤ goal_rt
       if (this.consecutiveCorrect >= 3) {
-        const recentCorrect = this.recentTrials.filter(t => t.success).slice(-3)
-        if (recentCorrect.length >= 3) {
-          const meanRt = recentCorrect.reduce((sum, t) => sum + (t.responseTime || 0), 0) / recentCorrect.length
+        const meanRt = this.recentTrials.recentSuccessMeanRt(3)
+        if (meanRt !== null) {
           if (meanRt <= params.goalRt && this.currentLevel < this.config.maxLevel) {
             this.currentLevel++
             this.consecutiveCorrect = 0
@@ -151,7 +142,7 @@ export class EnhancedAdaptiveDifficulty {
     }
 
     // Also check RT performance for level down
-    if (trial.responseTime && trial.responseTime > params.goalRt * 1.25) {
+    if (responseTime && responseTime > params.goalRt * 1.25) {
       this.consecutiveCorrect = 0
       if (this.currentLevel > 1) {
         this.currentLevel--
@@ -162,15 +153,15 @@ export class EnhancedAdaptiveDifficulty {
     return false
   }
 
-  handleSchulteStaircase(trial) {
+  handleSchulteStaircase(success, responseTime) {
     const params = this.config.getLevelParams(this.currentLevel)
     
-    if (trial.success) {
+    if (success) {
       this.consecutiveCorrect++
       
       // 2-down/1-up: level up after 2 consecutive successes within target time
       if (this.consecutiveCorrect >= 2) {
-        if (trial.responseTime && trial.responseTime <= params.targetTime && this.currentLevel < this.config.maxLevel) {
+        if (responseTime && responseTime <= params.targetTime && this.currentLevel < this.config.maxLevel) {
           this.currentLevel++
           this.consecutiveCorrect = 0
           return true
@@ -186,7 +177,7 @@ export class EnhancedAdaptiveDifficulty {
     }
 
     // Level down if time exceeded significantly
-    if (trial.responseTime && trial.responseTime > params.targetTime * 1.5) {
+    if (responseTime && responseTime > params.targetTime * 1.5) {
       this.consecutiveCorrect = 0
       if (this.currentLevel > 1) {
         this.currentLevel--
@@ -197,11 +188,11 @@ export class EnhancedAdaptiveDifficulty {
     return false
   }
 
-  handleParImparStaircase(trial) {
+  handleParImparStaircase(success, metadata) {
     const params = this.config.getLevelParams(this.currentLevel)
-    const { accuracy = 0, meanRt = 0 } = trial.metadata
+    const { accuracy = 0, meanRt = 0 } = metadata
     
-    if (trial.success && accuracy >= 0.85) {
+    if (success && accuracy >= 0.85) {
       this.consecutiveCorrect++
       
       // Level up: 3 consecutive with ≥85% accuracy AND mean RT ≤ goal_rt
@@ -237,28 +228,17 @@ export class EnhancedAdaptiveDifficulty {
   setLevel(level) {
     this.currentLevel = Math.max(1, Math.min(this.config.maxLevel, level))
     this.consecutiveCorrect = 0
-    this.recentTrials = []
+    this.recentTrials.clear()
   }
 
   getStats() {
-    const recentSuccessRate = this.recentTrials.length > 0 
-      ? this.recentTrials.filter(t => t.success).length / this.recentTrials.length 
-      : 0
-    
-    const recentRt = this.recentTrials
-      .filter(t => t.responseTime)
-      .map(t => t.responseTime)
-    
-    const meanRt = recentRt.length > 0 
-      ? recentRt.reduce((sum, rt) => sum + rt, 0) / recentRt.length 
-      : 0
-
     return {
       currentLevel: this.currentLevel,
       consecutiveCorrect: this.consecutiveCorrect,
-      recentTrials: this.recentTrials.length,
-      successRate: recentSuccessRate,
-      meanResponseTime: meanRt,
+      recentTrials: this.recentTrials.size,
+      successRate: this.recentTrials.successRate(),
+      meanResponseTime: this.recentTrials.meanRt(),
+      medianResponseTime: this.recentTrials.medianRt(),
       gameParameters: this.getGameParameters()
     }
   }
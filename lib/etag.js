@@ -0,0 +1,105 @@
+/**
+ * ETag / If-None-Match helpers for conditional GET responses
+ *
+ * ETags are derived from a cheap row version (settings.updated_at, the newest
+ * game run's created_at/id) plus the query variant, so a revalidation only
+ * needs a one-row version probe and a 304 carries no body.
+ *
+ * A strong ETag names one exact representation, so a compressed body gets
+ * the encoding appended ("...-br", "...-gzip", see encodedEtag). If-None-Match
+ * compares without that suffix: every encoding of a version is unchanged
+ * together.
+ */
+
+import crypto from 'crypto'
+
+const ENCODING_SUFFIX = /-(br|gzip)"$/
+
+/**
+ * Build a strong ETag from a row version and the request variant
+ */
+export function makeEtag(...parts) {
+  const digest = crypto
+    .createHash('sha1')
+    .update(parts.map(part => (part === null || part === undefined ? '' : String(part))).join('|'))
+    .digest('base64url')
+  return `"${digest}"`
+}
+
+/**
+ * ETag of the `encoding` (br, gzip) representation of a strong ETag; weak
+ * ETags already allow byte differences and are returned as is
+ */
+export function encodedEtag(etag, encoding) {
+  if (!etag || !encoding || etag.startsWith('W/')) {
+    return etag
+  }
+  return `${etag.slice(0, -1)}-${encoding}"`
+}
+
+/**
+ * Stable description of the query parameters that shape the response body
+ */
+export function requestVariant(searchParams) {
+  return [...searchParams.entries()]
+    .sort(([a], [b]) => a.localeCompare(b))
+    .map(([key, value]) => `${key}=${value}`)
+    .join('&')
+}
+
+/**
+ * The If-None-Match entry that matches the current ETag in any encoding
+ * (the tag the client holds, to send back on the 304), or null
+ */
+export function matchingEtag(request, etag) {
+  const header = request.headers.get('if-none-match')
+  if (!header || !etag) {
+    return null
+  }
+
+  if (header.trim() === '*') {
+    return etag
+  }
+
+  // If-None-Match uses the weak comparison function (RFC 9110 §13.1.2)
+  const opaque = etag.replace(/^W\//, '')
+  return header
+    .split(',')
+    .map(tag => tag.trim())
+    .find(tag => tag.replace(/^W\//, '').replace(ENCODING_SUFFIX, '"') === opaque) || null
+}
+
+/**
+ * True when the request's If-None-Match matches the current ETag
+ */
+export function isNotModified(request, etag) {
+  return matchingEtag(request, etag) !== null
+}
+
+/**
+ * True when the client sent any If-None-Match (worth a version probe)
+ */
+export function hasConditional(request) {
+  return Boolean(request.headers.get('if-none-match'))
+}
+
+/**
+ * Headers attached to every conditional-capable response
+ */
+export function etagHeaders(etag) {
+  return {
+    ETag: etag,
+    'Cache-Control': 'private, no-cache',
+    'Access-Control-Expose-Headers': 'ETag'
+  }
+}
+
+/**
+ * Empty 304 response for a matching If-None-Match
+ */
+export function notModified(etag, headers = {}) {
+  return new Response(null, {
+    status: 304,
+    headers: { ...headers, ...etagHeaders(etag) }
+  })
+}
@@ -20,34 +20,13 @@ export function calculateXpGain(score) {
   return Math.max(0, Math.min(300, Math.floor(score)));
 }
 
-// Update user profile with XP gain
+// Update user profile with XP gain (atomic increment in the database,
+// see award_xp in supabase/migrations/20261019120400_atomic_xp_streak.sql)
 export async function updateUserProfile(userId, xpGain) {
   try {
-    // Get current profile
-    const { data: profile, error: fetchError } = await supabase
-      .from('profiles')
-      .select('*')
-      .eq('user_id', userId)
-      .single();
-
-    if (fetchError && fetchError.code !== 'PGRST116') {
-      console.error('Error fetching profile:', fetchError);
-      return null;
-    }
-
-    const currentXp = profile?.xp || 0;
-    const newXp = currentXp + xpGain;
-    const newLevel = calculateLevel(newXp);
-
-    // Upsert profile
     const { data, error } = await supabase
-      .from('profiles')
-      .upsert({
-        user_id: userId,
-        xp: newXp,
-        level: newLevel,
-        updated_at: new Date().toISOString()
-      });
+      .rpc('award_xp', { target_user_id: userId, xp_gain: xpGain })
+      .single();
 
     if (error) {
       console.error('Error updating profile:', error);
@@ -55,10 +34,10 @@ export async function updateUserProfile(userId, xpGain) {
     }
 
     return {
-      xp: newXp,
-      level: newLevel,
+      xp: data.xp,
+      level: data.level,
       xpGain,
-      levelUp: profile ? newLevel > calculateLevel(currentXp) : false
+      levelUp: data.level_up
     };
   } catch (error) {
     console.error('Error in updateUserProfile:', error);
@@ -66,54 +45,18 @@ export async function updateUserProfile(userId, xpGain) {
   }
 }
 
-// Update streak
+// Update streak (advanced/reset atomically by advance_streak)
 export async function updateStreak(userId, isValidRun = true) {
   try {
     const today = new Date().toISOString().split('T')[0];
-    
-    // Get current streak
-    const { data: streak, error: fetchError } = await supabase
-      .from('streaks')
-      .select('*')
-      .eq('user_id', userId)
-      .single();
 
-    if (fetchError && fetchError.code !== 'PGRST116') {
-      console.error('Error fetching streak:', fetchError);
-      return null;
-    }
-
-    let newCurrent = 0;
-    let newLongest = streak?.longest || 0;
-
-    if (isValidRun) {
-      if (streak && streak.last_activity_date === today) {
-        // Same day, don't increment
-        newCurrent = streak.current;
-      } else if (streak && streak.last_activity_date === getPreviousDate(today)) {
-        // Consecutive day
-        newCurrent = streak.current + 1;
-      } else {
-        // First day or broken streak
-        newCurrent = 1;
-      }
-      
-      newLongest = Math.max(newLongest, newCurrent);
-    } else {
-      // Invalid run breaks streak
-      newCurrent = 0;
-    }
-
-    // Upsert streak
     const { data, error } = await supabase
-      .from('streaks')
-      .upsert({
-        user_id: userId,
-        current: newCurrent,
-        longest: newLongest,
-        last_activity_date: today,
-        updated_at: new Date().toISOString()
-      });
+      .rpc('advance_streak', {
+        target_user_id: userId,
+        is_valid: isValidRun,
+        activity_date: today
+      })
+      .single();
 
     if (error) {
       console.error('Error updating streak:', error);
@@ -121,9 +64,9 @@ export async function updateStreak(userId, isValidRun = true) {
     }
 
     return {
-      current: newCurrent,
-      longest: newLongest,
-      increased: isValidRun && newCurrent > (streak?.current || 0)
+      current: data.current,
+      longest: data.longest,
+      increased: data.increased
     };
   } catch (error) {
     console.error('Error in updateStreak:', error);
@@ -131,174 +74,166 @@ export async function updateStreak(userId, isValidRun = true) {
   }
 }
 
-// Helper function to get previous date
-function getPreviousDate(dateString) {
-  const date = new Date(dateString);
-  date.setDate(date.getDate() - 1);
-  return date.toISOString().split('T')[0];
-}
-
-// Check and unlock achievements
-export async function checkAchievements(userId, gameData) {
-  try {
-    const achievements = [];
-    
-    // Get existing achievements
-    const { data: existing, error: fetchError } = await supabase
-      .from('achievements')
-      .select('achievement_type')
-      .eq('user_id', userId);
-
-    if (fetchError) {
-      console.error('Error fetching achievements:', fetchError);
-      return [];
-    }
-
-    const existingTypes = existing?.map(a => a.achievement_type) || [];
-
-    // Check first_run achievement
-    if (!existingTypes.includes('first_run')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'first_run',
-        title: 'Primer Entrenamiento',
-        description: 'Completaste tu primera sesión de entrenamiento',
-        icon: '🎯',
-        unlocked_at: new Date().toISOString()
-      });
-    }
-
-    // EXISTING ACHIEVEMENTS (Phase 1-2)
-    
-    // Check speed achievements
-    if (gameData.game === 'rsvp' && gameData.metrics?.wpm_end >= 600 && !existingTypes.includes('speed_600_wpm')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'speed_600_wpm',
-        title: 'Velocidad Supersónica',
-        description: 'Alcanzaste 600 WPM en lectura rápida',
-        icon: '⚡',
-        unlocked_at: new Date().toISOString()
-      });
-    }
-
-    // Check Schulte achievements
-    if (gameData.game === 'shuttle' && gameData.metrics?.difficulty_level >= 7 && !existingTypes.includes('schulte_7x7')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'schulte_7x7',
-        title: 'Maestro Schulte',
-        description: 'Completaste una tabla Schulte 7x7',
-        icon: '🎯',
-        unlocked_at: new Date().toISOString()
-      });
-    }
+// Achievement rules, evaluated in declaration order.
+// `game: '*'` rules apply to every run; `test` receives the run and the
+// user's achievement state ({ unlocked: Set, streak }). Streak requirements
+// are declared as `minStreak` so complete_game can check them in the database.
+export const ACHIEVEMENT_RULES = [
+  {
+    type: 'first_run',
+    game: '*',
+    title: 'Primer Entrenamiento',
+    description: 'Completaste tu primera sesión de entrenamiento',
+    icon: '🎯',
+    test: () => true
+  },
+
+  // EXISTING ACHIEVEMENTS (Phase 1-2)
+  {
+    type: 'speed_600_wpm',
+    game: 'rsvp',
+    title: 'Velocidad Supersónica',
+    description: 'Alcanzaste 600 WPM en lectura rápida',
+    icon: '⚡',
+    test: (run) => run.metrics?.wpm_end >= 600
+  },
+  {
+    type: 'schulte_7x7',
+    game: 'shuttle',
+    title: 'Maestro Schulte',
+    description: 'Completaste una tabla Schulte 7x7',
+    icon: '🎯',
+    test: (run) => run.metrics?.difficulty_level >= 7
+  },
+  {
+    type: 'digits_7',
+    game: 'memory_digits',
+    title: 'Memoria Excepcional',
+    description: 'Recordaste una secuencia de 7 dígitos',
+    icon: '🧠',
+    test: (run) => run.metrics?.max_digits >= 7
+  },
+  {
+    type: 'twinwords_90acc',
+    game: 'twin_words',
+    title: 'Ojo de Águila',
+    description: 'Logaste 90% de precisión en Twin Words',
+    icon: '👁️',
+    test: (run) => run.metrics?.accuracy >= 90
+  },
+
+  // NEW PHASE 3 GAME ACHIEVEMENTS
+  {
+    type: 'runningwords_lvl10',
+    game: 'running_words',
+    title: 'Memoria Secuencial',
+    description: 'Alcanzaste nivel 10 en Running Words',
+    icon: '🏃',
+    test: (run) => run.difficulty_level >= 10
+  },
+  {
+    type: 'letters_grid_15',
+    game: 'letters_grid',
+    title: 'Vista de Águila',
+    description: 'Completaste una cuadrícula 15x15 en Letters Grid',
+    icon: '🎯',
+    test: (run) => run.metrics?.N >= 15
+  },
+  {
+    type: 'wordsearch_10_words',
+    game: 'word_search',
+    title: 'Cazador de Palabras',
+    description: 'Encontraste 10 o más palabras en una sola partida',
+    icon: '🔍',
+    test: (run) => run.metrics?.wordsFound >= 10
+  },
+  {
+    type: 'anagram_7len',
+    game: 'anagrams',
+    title: 'Descifrador Experto',
+    description: 'Resolviste un anagrama de 7 o más letras',
+    icon: '🔤',
+    test: (run) => run.metrics?.length >= 7 && run.metrics?.solved === true
+  },
+
+  // NEW AI ACHIEVEMENT (Phase 2)
+  {
+    type: 'reading_quiz_5of5',
+    game: 'reading_quiz',
+    title: 'Comprensión Perfecta',
+    description: 'Acertaste 5 de 5 preguntas en el quiz de comprensión',
+    icon: '🧠',
+    test: (run) => run.metrics?.correct === run.metrics?.total && run.metrics?.total >= 5
+  },
+
+  // Streak achievements
+  {
+    type: 'week_streak_7',
+    game: '*',
+    title: 'Constancia Semanal',
+    description: 'Mantuviste una racha de 7 días',
+    icon: '🔥',
+    minStreak: 7,
+    test: () => true
+  }
+];
 
-    // Check Memory Digits achievements
-    if (gameData.game === 'memory_digits' && gameData.metrics?.max_digits >= 7 && !existingTypes.includes('digits_7')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'digits_7',
-        title: 'Memoria Excepcional',
-        description: 'Recordaste una secuencia de 7 dígitos',
-        icon: '🧠',
-        unlocked_at: new Date().toISOString()
-      });
-    }
+// Rules per game (game-specific + '*'), built on first use for each game
+const rulesByGame = new Map();
 
-    // Check Twin Words achievements
-    if (gameData.game === 'twin_words' && gameData.metrics?.accuracy >= 90 && !existingTypes.includes('twinwords_90acc')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'twinwords_90acc',
-        title: 'Ojo de Águila',
-        description: 'Logaste 90% de precisión en Twin Words',
-        icon: '👁️',
-        unlocked_at: new Date().toISOString()
-      });
-    }
+export function getRulesForGame(game) {
+  if (!rulesByGame.has(game)) {
+    rulesByGame.set(game, ACHIEVEMENT_RULES.filter(rule => rule.game === '*' || rule.game === game));
+  }
+  return rulesByGame.get(game);
+}
 
-    // NEW PHASE 3 GAME ACHIEVEMENTS
-    
-    // Running Words - Level 10 achievement
-    if (gameData.game === 'running_words' && gameData.difficulty_level >= 10 && !existingTypes.includes('runningwords_lvl10')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'runningwords_lvl10',
-        title: 'Memoria Secuencial',
-        description: 'Alcanzaste nivel 10 en Running Words',
-        icon: '🏃',
-        unlocked_at: new Date().toISOString()
-      });
-    }
+// Evaluate the rules for one run against the user's achievement state
+export function evaluateAchievements(userId, gameData, state) {
+  const unlockedAt = new Date().toISOString();
+
+  return getRulesForGame(gameData.game)
+    .filter(rule =>
+      !state.unlocked.has(rule.type) &&
+      state.streak >= (rule.minStreak || 0) &&
+      rule.test(gameData, state)
+    )
+    .map(rule => ({
+      user_id: userId,
+      achievement_type: rule.type,
+      title: rule.title,
+      description: rule.description,
+      icon: rule.icon,
+      unlocked_at: unlockedAt
+    }));
+}
 
-    // Letters Grid - N>=15 achievement
-    if (gameData.game === 'letters_grid' && gameData.metrics?.N >= 15 && !existingTypes.includes('letters_grid_15')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'letters_grid_15',
-        title: 'Vista de Águila',
-        description: 'Completaste una cuadrícula 15x15 en Letters Grid',
-        icon: '🎯',
-        unlocked_at: new Date().toISOString()
-      });
-    }
+// Fetch unlocked achievement types and current streak in one round-trip
+export async function getAchievementState(userId) {
+  const { data, error } = await supabase
+    .rpc('get_achievement_state', { target_user_id: userId })
+    .single();
 
-    // Word Search - 10+ words in one run
-    if (gameData.game === 'word_search' && gameData.metrics?.wordsFound >= 10 && !existingTypes.includes('wordsearch_10_words')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'wordsearch_10_words',
-        title: 'Cazador de Palabras',
-        description: 'Encontraste 10 o más palabras en una sola partida',
-        icon: '🔍',
-        unlocked_at: new Date().toISOString()
-      });
-    }
+  if (error) {
+    console.error('Error fetching achievement state:', error);
+    return null;
+  }
 
-    // Anagrams - 7+ letter word solved
-    if (gameData.game === 'anagrams' && gameData.metrics?.length >= 7 && gameData.metrics?.solved === true && !existingTypes.includes('anagram_7len')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'anagram_7len',
-        title: 'Descifrador Experto',
-        description: 'Resolviste un anagrama de 7 o más letras',
-        icon: '🔤',
-        unlocked_at: new Date().toISOString()
-      });
-    }
+  return {
+    unlocked: new Set(data?.unlocked || []),
+    streak: data?.streak_current || 0
+  };
+}
 
-    // NEW AI ACHIEVEMENT (Phase 2)
-    
-    // Reading Quiz - Perfect 5/5 score
-    if (gameData.game === 'reading_quiz' && gameData.metrics?.correct === gameData.metrics?.total && gameData.metrics?.total >= 5 && !existingTypes.includes('reading_quiz_5of5')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'reading_quiz_5of5',
-        title: 'Comprensión Perfecta',
-        description: 'Acertaste 5 de 5 preguntas en el quiz de comprensión',
-        icon: '🧠',
-        unlocked_at: new Date().toISOString()
-      });
+// Check and unlock achievements
+export async function checkAchievements(userId, gameData) {
+  try {
+    const state = await getAchievementState(userId);
+    if (!state) {
+      return [];
     }
 
-    // Check streak achievements
-    const { data: streak } = await supabase
-      .from('streaks')
-      .select('current')
-      .eq('user_id', userId)
-      .single();
-
-    if (streak?.current >= 7 && !existingTypes.includes('week_streak_7')) {
-      achievements.push({
-        user_id: userId,
-        achievement_type: 'week_streak_7',
-        title: 'Constancia Semanal',
-        description: 'Mantuviste una racha de 7 días',
-        icon: '🔥',
-        unlocked_at: new Date().toISOString()
-      });
-    }
+    const achievements = evaluateAchievements(userId, gameData, state);
 
     // Insert new achievements
     if (achievements.length > 0) {
@@ -319,43 +254,134 @@ export async function checkAchievements(userId, gameData) {
   }
 }
 
-// Get user stats
+// Types of the rules whose run-based test passes, as complete_game candidates
+// (the game, already unlocked types and minStreak are checked in the database
+// against achievement_definitions)
+export function getAchievementCandidates(gameData) {
+  return getRulesForGame(gameData.game)
+    .filter(rule => rule.test(gameData))
+    .map(rule => rule.type);
+}
+
+// Record a finished game in one transaction: run insert, progress merge, XP,
+// streak and achievements (see supabase/migrations/20261019120500_complete_game.sql).
+// Validity and XP are computed by complete_game. Server-side: the API route
+// passes a client carrying the caller's access token (supabaseForRequest).
+export async function completeGame(userId, gameData, progress = null, client = supabase) {
+  try {
+    const { data, error } = await client.rpc('complete_game', {
+      target_user_id: userId,
+      run: {
+        game: gameData.game,
+        score: gameData.score || 0,
+        duration_ms: gameData.duration_ms || 0,
+        difficulty_level: gameData.difficulty_level || 1,
+        metrics: gameData.metrics || {}
+      },
+      progress,
+      activity_date: new Date().toISOString().split('T')[0],
+      candidates: getAchievementCandidates(gameData)
+    });
+
+    if (error) {
+      console.error('Error completing game:', error);
+      return null;
+    }
+
+    return {
+      run: data.run,
+      progress: data.progress,
+      isValid: data.is_valid,
+      xp: data.xp && {
+        xp: data.xp.xp,
+        level: data.xp.level,
+        xpGain: data.xp.xp_gain_applied,
+        levelUp: data.xp.level_up
+      },
+      streak: data.streak,
+      achievements: data.achievements || []
+    };
+  } catch (error) {
+    console.error('Error in completeGame:', error);
+    return null;
+  }
+}
+
+// Browser side of completeGame: POST /api/completeGame, so the service worker
+// drops the cached reads it changes. Sends the signed-in user's access token.
+export async function submitGameCompletion(userId, gameData, progress = null) {
+  try {
+    const { data: { session } } = await supabase.auth.getSession();
+    const response = await fetch('/api/completeGame', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(session?.access_token && { Authorization: `Bearer ${session.access_token}` })
+      },
+      body: JSON.stringify({ userId, ...gameData, progress })
+    });
+
+    if (!response.ok) {
+      console.error('Error completing game:', response.status);
+      return null;
+    }
+
+    return await response.json();
+  } catch (error) {
+    console.error('Error in submitGameCompletion:', error);
+    return null;
+  }
+}
+
+function emptyUserStats() {
+  return {
+    profile: { xp: 0, level: 1 },
+    streak: { current: 0, longest: 0 },
+    achievements: [],
+    games: {
+      totalRuns: 0,
+      totalTimeMs: 0,
+      runsPerGame: {},
+      bestScorePerGame: {},
+      lastPlayedAt: null
+    }
+  };
+}
+
+// Get user stats from the user_stats aggregate (single primary-key lookup;
+// kept current by triggers on game_runs, profiles, streaks and achievements)
 export async function getUserStats(userId) {
   try {
-    // Get profile
-    const { data: profile } = await supabase
-      .from('profiles')
+    const { data, error } = await supabase
+      .from('user_stats')
       .select('*')
       .eq('user_id', userId)
       .single();
 
-    // Get streak
-    const { data: streak } = await supabase
-      .from('streaks')
-      .select('*')
-      .eq('user_id', userId)
-      .single();
+    if (error && error.code !== 'PGRST116') {
+      console.error('Error fetching user stats:', error);
+      return emptyUserStats();
+    }
 
-    // Get recent achievements
-    const { data: achievements } = await supabase
-      .from('achievements')
-      .select('*')
-      .eq('user_id', userId)
-      .order('unlocked_at', { ascending: false })
-      .limit(10);
+    if (!data) {
+      return emptyUserStats();
+    }
 
     return {
-      profile: profile || { xp: 0, level: 1 },
-      streak: streak || { current: 0, longest: 0 },
-      achievements: achievements || []
+      profile: { xp: data.xp, level: data.level },
+      streak: { current: data.streak_current, longest: data.streak_longest },
+      achievements: data.recent_achievements || [],
+      games: {
+        totalRuns: data.total_runs,
+        totalTimeMs: data.total_time_ms,
+        runsPerGame: data.runs_per_game || {},
+        bestScorePerGame: data.best_score_per_game || {},
+        lastPlayedAt: data.last_played_at
+      }
     };
   } catch (error) {
     console.error('Error getting user stats:', error);
-    return {
-      profile: { xp: 0, level: 1 },
-      streak: { current: 0, longest: 0 },
-      achievements: []
-    };
+    return emptyUserStats();
   }
 }
 
@@ -0,0 +1,249 @@
+/**
+ * Idempotency-Key support for POST endpoints
+ * Supports Upstash Redis (shared across instances) and an in-memory LRU (fallback)
+ *
+ * A request with an `Idempotency-Key` header runs once per key and path.
+ * Retries within IDEMPOTENCY_TTL_MS get the stored status and body back with
+ * `Idempotent-Replayed: true`.
+ *
+ * - Reusing a key with a different body: 422
+ * - Retry while the first request is still running: waits for it on the same
+ *   instance, 409 with Retry-After when another instance holds the key (Redis)
+ * - 5xx responses are not stored, so they can be retried for real
+ */
+
+import crypto from 'crypto'
+import { NextResponse } from 'next/server'
+
+export const IDEMPOTENCY_TTL_MS = 24 * 60 * 60 * 1000 // 24 hours
+const IN_FLIGHT_TTL_MS = 60 * 1000 // claim lifetime if an instance dies mid-request
+const MAX_MEMORY_ENTRIES = 10000
+const MAX_KEY_LENGTH = 255
+
+// In-memory LRU store for fallback (Map keeps insertion order; hits move to the end)
+const memoryStore = new Map()
+
+// Requests currently running on this instance, by store key
+const inFlight = new Map()
+
+/**
+ * Redis client setup (Upstash REST, single-command JSON array requests)
+ */
+let redisClient = null
+
+async function getRedisClient() {
+  if (redisClient) return redisClient
+
+  const redisUrl = process.env.UPSTASH_REDIS_REST_URL
+  const redisToken = process.env.UPSTASH_REDIS_REST_TOKEN
+
+  if (!redisUrl || !redisToken) {
+    return null
+  }
+
+  const command = async (...args) => {
+    const response = await fetch(redisUrl, {
+      method: 'POST',
+      headers: {
+        Authorization: `Bearer ${redisToken}`,
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify(args)
+    })
+    const data = await response.json()
+    if (data.error) throw new Error(data.error)
+    return data.result
+  }
+
+  redisClient = {
+    async get(key) {
+      const value = await command('GET', key)
+      return value ? JSON.parse(value) : null
+    },
+
+    // Resolves to false when `nx` is set and the key already exists
+    async set(key, value, { px, nx = false } = {}) {
+      const args = ['SET', key, JSON.stringify(value), 'PX', String(px)]
+      if (nx) args.push('NX')
+      return (await command(...args)) === 'OK'
+    },
+
+    async del(key) {
+      return command('DEL', key)
+    }
+  }
+  return redisClient
+}
+
+function memoryGet(storeKey) {
+  const entry = memoryStore.get(storeKey)
+  if (!entry) return null
+
+  memoryStore.delete(storeKey)
+  if (entry.expiresAt <= Date.now()) return null
+  memoryStore.set(storeKey, entry)
+  return entry
+}
+
+function memorySet(storeKey, entry) {
+  memoryStore.delete(storeKey)
+  memoryStore.set(storeKey, entry)
+  while (memoryStore.size > MAX_MEMORY_ENTRIES) {
+    memoryStore.delete(memoryStore.keys().next().value)
+  }
+}
+
+async function loadEntry(storeKey, redis) {
+  const entry = memoryGet(storeKey)
+  if (entry || !redis) return entry
+
+  try {
+    return await redis.get(storeKey)
+  } catch (error) {
+    console.error('Redis idempotency read error:', error)
+    return null
+  }
+}
+
+async function saveEntry(storeKey, entry, redis) {
+  memorySet(storeKey, entry)
+  if (!redis) return
+
+  try {
+    await redis.set(storeKey, entry, { px: IDEMPOTENCY_TTL_MS })
+  } catch (error) {
+    console.error('Redis idempotency write error:', error)
+  }
+}
+
+async function releaseClaim(storeKey, redis) {
+  if (!redis) return
+  try {
+    await redis.del(storeKey)
+  } catch (error) {
+    console.error('Redis idempotency release error:', error)
+  }
+}
+
+function replay(entry, fingerprint, headers) {
+  if (entry.fingerprint !== fingerprint) {
+    return NextResponse.json(
+      { error: 'Idempotency-Key was already used with a different request body', code: 'IDEMPOTENCY_KEY_REUSED' },
+      { status: 422, headers }
+    )
+  }
+
+  return new NextResponse(entry.body, {
+    status: entry.status,
+    headers: {
+      ...headers,
+      'Content-Type': entry.contentType,
+      'Idempotent-Replayed': 'true',
+      'Access-Control-Expose-Headers': 'Idempotent-Replayed'
+    }
+  })
+}
+
+function inProgress(headers) {
+  return NextResponse.json(
+    { error: 'A request with this Idempotency-Key is still in progress', code: 'IDEMPOTENCY_KEY_IN_PROGRESS' },
+    { status: 409, headers: { ...headers, 'Retry-After': '1' } }
+  )
+}
+
+/**
+ * Run `handler` at most once per Idempotency-Key; requests without the
+ * header go straight to the handler. `headers` are added to responses
+ * produced here (replays and errors).
+ */
+export async function withIdempotency(request, handler, { headers = {} } = {}) {
+  const key = request.headers.get('idempotency-key')
+  if (!key) {
+    return handler()
+  }
+
+  if (key.length > MAX_KEY_LENGTH) {
+    return NextResponse.json(
+      { error: `Idempotency-Key must be at most ${MAX_KEY_LENGTH} characters` },
+      { status: 400, headers }
+    )
+  }
+
+  const fingerprint = crypto
+    .createHash('sha1')
+    .update(await request.clone().text())
+    .digest('base64url')
+  const storeKey = `idempotency:${new URL(request.url).pathname}:${key}`
+
+  // Same instance: wait for the request already running with this key. The
+  // slot is taken synchronously after the loop, so only one waiter proceeds.
+  while (inFlight.has(storeKey)) {
+    const entry = await inFlight.get(storeKey)
+    if (entry) return replay(entry, fingerprint, headers)
+  }
+
+  let settle
+  inFlight.set(storeKey, new Promise(resolve => { settle = resolve }))
+
+  let entry = null
+  let redis = null
+  try {
+    redis = await getRedisClient()
+    const stored = await loadEntry(storeKey, redis)
+    if (stored?.pending) return inProgress(headers)
+    if (stored) {
+      entry = stored
+      return replay(stored, fingerprint, headers)
+    }
+
+    // Claim the key across instances before running the handler
+    if (redis) {
+      try {
+        const claimed = await redis.set(storeKey, { pending: true, fingerprint }, { px: IN_FLIGHT_TTL_MS, nx: true })
+        if (!claimed) return inProgress(headers)
+      } catch (error) {
+        console.error('Redis idempotency claim error:', error)
+      }
+    }
+
+    const response = await handler()
+
+    if (response.status < 500) {
+      entry = {
+        fingerprint,
+        status: response.status,
+        body: await response.clone().text(),
+        contentType: response.headers.get('content-type') || 'application/json',
+        expiresAt: Date.now() + IDEMPOTENCY_TTL_MS
+      }
+      await saveEntry(storeKey, entry, redis)
+    } else {
+      await releaseClaim(storeKey, redis)
+    }
+
+    return response
+  } catch (error) {
+    await releaseClaim(storeKey, redis)
+    throw error
+  } finally {
+    inFlight.delete(storeKey)
+    settle(entry)
+  }
+}
+
+/**
+ * Clean up expired entries from memory store (periodic cleanup)
+ */
+export function cleanupIdempotencyStore() {
+  const now = Date.now()
+  for (const [storeKey, entry] of memoryStore.entries()) {
+    if (entry.expiresAt <= now) {
+      memoryStore.delete(storeKey)
+    }
+  }
+}
+
+// Auto cleanup every 5 minutes
+if (typeof setInterval !== 'undefined') {
+  setInterval(cleanupIdempotencyStore, 5 * 60 * 1000)
+}
@@ -0,0 +1,74 @@
+/**
+ * Time-ordered row IDs
+ *
+ * uuidv7() returns RFC 9562 version 7 UUIDs: a 48-bit Unix millisecond
+ * timestamp followed by random bits. They fit the existing uuid columns, sort
+ * by creation time and keep new primary keys at the right edge of the B-tree.
+ * uuid_generate_v7() (supabase/migrations/20261019120700_uuidv7_ids.sql)
+ * produces the same layout for rows that rely on column defaults.
+ *
+ * IDs from one process are strictly increasing: within a millisecond the
+ * 12-bit rand_a field is used as a counter (RFC 9562 section 6.2, method 1).
+ */
+
+const HEX = Array.from({ length: 256 }, (_, i) => i.toString(16).padStart(2, '0'))
+const COUNTER_MAX = 0xfff
+
+let lastMs = -1
+let counter = 0
+
+function randomBytes(length) {
+  const bytes = new Uint8Array(length)
+  if (globalThis.crypto?.getRandomValues) {
+    globalThis.crypto.getRandomValues(bytes)
+  } else {
+    for (let i = 0; i < length; i++) {
+      bytes[i] = Math.floor(Math.random() * 256)
+    }
+  }
+  return bytes
+}
+
+// Random counter start below half the range, leaving room to increment
+function seedCounter(bytes) {
+  return ((bytes[6] & 0x07) << 8) | bytes[7]
+}
+
+export function uuidv7(now = Date.now()) {
+  const bytes = randomBytes(16)
+
+  // Never go backwards if the clock does
+  let ms = Math.max(now, lastMs)
+  if (ms === lastMs) {
+    counter++
+    if (counter > COUNTER_MAX) {
+      ms++
+      counter = seedCounter(bytes)
+    }
+  } else {
+    counter = seedCounter(bytes)
+  }
+  lastMs = ms
+
+  bytes[0] = Math.floor(ms / 2 ** 40) & 0xff
+  bytes[1] = Math.floor(ms / 2 ** 32) & 0xff
+  bytes[2] = (ms >>> 24) & 0xff
+  bytes[3] = (ms >>> 16) & 0xff
+  bytes[4] = (ms >>> 8) & 0xff
+  bytes[5] = ms & 0xff
+  bytes[6] = 0x70 | (counter >>> 8)
+  bytes[7] = counter & 0xff
+  bytes[8] = 0x80 | (bytes[8] & 0x3f)
+
+  let id = ''
+  for (let i = 0; i < 16; i++) {
+    if (i === 4 || i === 6 || i === 8 || i === 10) id += '-'
+    id += HEX[bytes[i]]
+  }
+  return id
+}
+
+// Creation time (ms since epoch) encoded in a uuidv7() id
+export function uuidv7Timestamp(id) {
+  return parseInt(id.replace(/-/g, '').slice(0, 12), 16)
+}
@@ -0,0 +1,380 @@
+/**
+ * Append-only ingestion queue for game runs
+ *
+ * With GAME_RUNS_INGEST=queue, POST /api/gameRuns appends the run to a local
+ * log and answers 202 instead of waiting on a single-row insert. A background
+ * flusher bulk-inserts the log in batches when INGEST_FLUSH_SIZE runs are
+ * pending or every INGEST_FLUSH_MS milliseconds.
+ *
+ * - Durability: appends are group-committed (one write + fdatasync for every
+ *   append waiting at that moment) before the request is answered. The log is
+ *   split into numbered segments; the flusher seals the active segment, inserts
+ *   it and deletes it. Segments left by a crash are flushed after restart.
+ * - Replays are safe: runs get their uuidv7 id before they are appended and
+ *   are upserted with ignoreDuplicates.
+ * - Bad rows: runs are checked against the game_runs constraints before they
+ *   are appended (validateGameRun). A batch the database still rejects for
+ *   its rows is split in halves until the rejected rows are alone; those go
+ *   to the dead-letter log (game_runs.dead.log) and the rest is inserted, so
+ *   one bad row never holds up a segment.
+ * - Read-your-writes: runs not yet flushed are kept in memory per user and
+ *   merged into the first page of GET /api/gameRuns. This only holds on the
+ *   server that accepted the write, so use one long-lived server per log
+ *   directory (INGEST_QUEUE_DIR).
+ */
+
+import { promises as fs } from 'fs'
+import os from 'os'
+import path from 'path'
+import { supabase } from './supabase'
+
+export const INGEST_MODE = process.env.GAME_RUNS_INGEST === 'queue' ? 'queue' : 'direct'
+
+const QUEUE_DIR = process.env.INGEST_QUEUE_DIR || path.join(os.tmpdir(), 'spiread-ingest')
+const FLUSH_SIZE = parseInt(process.env.INGEST_FLUSH_SIZE || '500', 10)
+const FLUSH_INTERVAL_MS = parseInt(process.env.INGEST_FLUSH_MS || '250', 10)
+
+const SEGMENT_PATTERN = /^game_runs\.(\d+)\.log$/
+const DEAD_LETTER_NAME = 'game_runs.dead.log'
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i
+const INT_COLUMNS = ['score', 'duration_ms', 'difficulty_level']
+const MAX_INT = 2147483647
+
+// Values allowed by game_runs_game_check
+export const GAME_RUN_GAMES = [
+  'rsvp', 'shuttle', 'twin_words', 'par_impar', 'memory_digits',
+  'running_words', 'letters_grid', 'word_search', 'anagrams', 'reading_quiz'
+]
+
+export class InvalidGameRunError extends Error {
+  constructor(message = 'Invalid game run') {
+    super(message)
+    this.name = 'InvalidGameRunError'
+  }
+}
+
+/**
+ * Check a built game_runs row against the table's columns and constraints;
+ * throws InvalidGameRunError for a row the database would reject
+ */
+export function validateGameRun(row) {
+  if (!UUID_PATTERN.test(row?.id || '')) {
+    throw new InvalidGameRunError('id must be a UUID')
+  }
+  if (!UUID_PATTERN.test(row.user_id || '')) {
+    throw new InvalidGameRunError('userId must be a UUID')
+  }
+  if (!GAME_RUN_GAMES.includes(row.game)) {
+    throw new InvalidGameRunError(`game must be one of: ${GAME_RUN_GAMES.join(', ')}`)
+  }
+  for (const column of INT_COLUMNS) {
+    if (!Number.isInteger(row[column]) || Math.abs(row[column]) > MAX_INT) {
+      throw new InvalidGameRunError(`${column} must be an integer`)
+    }
+  }
+  if (!row.metrics || typeof row.metrics !== 'object' || Array.isArray(row.metrics)) {
+    throw new InvalidGameRunError('metrics must be an object')
+  }
+  if (Number.isNaN(Date.parse(row.created_at))) {
+    throw new InvalidGameRunError('created_at must be a timestamp')
+  }
+  return row
+}
+
+// Data exceptions (22xxx) and constraint violations (23xxx) are caused by the
+// rows; anything else (network, auth) is worth retrying as is
+function isRowError(error) {
+  return error instanceof InvalidGameRunError || /^2[23]/.test(error?.code || '')
+}
+
+function segmentFile(dir, segment) {
+  return path.join(dir, `game_runs.${String(segment).padStart(12, '0')}.log`)
+}
+
+// Parse a segment, skipping a torn last line from an interrupted write
+async function readSegment(file) {
+  const text = await fs.readFile(file, 'utf8')
+  const runs = []
+  for (const line of text.split('\n')) {
+    if (!line) continue
+    try {
+      runs.push(JSON.parse(line))
+    } catch (error) {
+      console.warn(`Skipping unreadable line in ${file}`)
+    }
+  }
+  return runs
+}
+
+// Newest first, matching the (created_at desc, id desc) page order
+function compareNewest(a, b) {
+  const byTime = Date.parse(b.created_at) - Date.parse(a.created_at)
+  if (byTime !== 0) return byTime
+  return a.id < b.id ? 1 : a.id > b.id ? -1 : 0
+}
+
+async function insertGameRuns(runs) {
+  const { error } = await supabase
+    .from('game_runs')
+    .upsert(runs, { onConflict: 'id', ignoreDuplicates: true })
+
+  if (error) {
+    throw error
+  }
+}
+
+export class IngestQueue {
+  constructor({
+    dir = QUEUE_DIR,
+    flushSize = FLUSH_SIZE,
+    flushIntervalMs = FLUSH_INTERVAL_MS,
+    insertBatch = insertGameRuns
+  } = {}) {
+    this.dir = dir
+    this.flushSize = flushSize
+    this.flushIntervalMs = flushIntervalMs
+    this.insertBatch = insertBatch
+    this.deadLetterFile = path.join(dir, DEAD_LETTER_NAME)
+
+    this.segment = 0
+    this.handle = null // { segment, file } for the segment being appended to
+    this.waiting = [] // appends waiting for the next group commit
+    this.writing = null
+    this.flushing = null
+    this.ready = null
+    this.timer = null
+
+    this.pending = new Map() // user_id -> Map(id -> run) not yet flushed
+    this.pendingCount = 0
+  }
+
+  start() {
+    if (!this.ready) {
+      this.ready = this.recover()
+      this.timer = setInterval(() => {
+        this.flush().catch(error => console.error('Error flushing ingest queue:', error))
+      }, this.flushIntervalMs)
+      this.timer.unref?.()
+    }
+    return this.ready
+  }
+
+  async stop() {
+    clearInterval(this.timer)
+    while (this.pendingCount > 0) {
+      if ((await this.flush()) === 0) break
+    }
+    if (this.handle) {
+      await this.handle.file.close()
+      this.handle = null
+    }
+  }
+
+  // Track runs from segments a previous process left behind and continue
+  // numbering after them
+  async recover() {
+    await fs.mkdir(this.dir, { recursive: true })
+    const segments = await this.listSegments()
+    for (const { file } of segments) {
+      for (const run of await readSegment(file)) {
+        this.track(run)
+      }
+    }
+    this.segment = segments.length > 0 ? segments[segments.length - 1].segment + 1 : 0
+  }
+
+  async listSegments() {
+    const names = await fs.readdir(this.dir)
+    return names
+      .map(name => SEGMENT_PATTERN.exec(name))
+      .filter(Boolean)
+      .map(match => ({ segment: parseInt(match[1], 10), file: path.join(this.dir, match[0]) }))
+      .sort((a, b) => a.segment - b.segment)
+  }
+
+  async append(run) {
+    validateGameRun(run)
+    await this.start()
+    // Tracked before the write so a flush can never untrack it first
+    this.track(run)
+    try {
+      await new Promise((resolve, reject) => {
+        this.waiting.push({ line: `${JSON.stringify(run)}\n`, resolve, reject })
+        this.scheduleWrite()
+      })
+    } catch (error) {
+      this.untrack(run)
+      throw error
+    }
+
+    if (this.pendingCount >= this.flushSize) {
+      this.flush().catch(error => console.error('Error flushing ingest queue:', error))
+    }
+    return run
+  }
+
+  scheduleWrite() {
+    if (this.writing) return // picked up when the running commit finishes
+    this.writing = this.writeWaiting().finally(() => {
+      this.writing = null
+      if (this.waiting.length > 0) this.scheduleWrite()
+    })
+  }
+
+  async writeWaiting() {
+    const batch = this.waiting
+    this.waiting = []
+    try {
+      if (!this.handle || this.handle.segment !== this.segment) {
+        const segment = this.segment
+        this.handle = { segment, file: await fs.open(segmentFile(this.dir, segment), 'a') }
+      }
+      await this.handle.file.write(batch.map(entry => entry.line).join(''))
+      await this.handle.file.datasync()
+      batch.forEach(entry => entry.resolve())
+    } catch (error) {
+      batch.forEach(entry => entry.reject(error))
+    }
+  }
+
+  // Route new appends to a fresh segment and close the previous one once its
+  // last group commit has finished
+  async seal() {
+    this.segment++
+    while (this.writing) {
+      await this.writing
+    }
+    const previous = this.handle
+    if (previous && previous.segment < this.segment) {
+      this.handle = null
+      await previous.file.close()
+    }
+  }
+
+  flush() {
+    if (!this.flushing) {
+      this.flushing = this.flushSealed().finally(() => {
+        this.flushing = null
+      })
+      // Keep going while a backlog is left; failures wait for the next tick
+      this.flushing.then(flushed => {
+        if (flushed > 0 && this.pendingCount >= this.flushSize) {
+          this.flush().catch(error => console.error('Error flushing ingest queue:', error))
+        }
+      }, () => {})
+    }
+    return this.flushing
+  }
+
+  async flushSealed() {
+    await this.start()
+    if (this.pendingCount === 0) return 0
+
+    await this.seal()
+    let flushed = 0
+    for (const { segment, file } of await this.listSegments()) {
+      if (segment >= this.segment) continue
+
+      // On a transient error the segment stays on disk and is retried on the
+      // next tick (rows dead-lettered before it may be dead-lettered again)
+      const runs = await readSegment(file)
+      const valid = []
+      for (const run of runs) {
+        try {
+          valid.push(validateGameRun(run))
+        } catch (error) {
+          await this.deadLetter(run, error)
+        }
+      }
+      for (let i = 0; i < valid.length; i += this.flushSize) {
+        await this.insertIsolating(valid.slice(i, i + this.flushSize))
+      }
+      await fs.unlink(file)
+      runs.forEach(run => this.untrack(run))
+      flushed += runs.length
+    }
+    return flushed
+  }
+
+  // Insert a batch; when the database rejects it for its rows, bisect it
+  // until each rejected row is alone and dead-letter those
+  async insertIsolating(runs) {
+    try {
+      await this.insertBatch(runs)
+    } catch (error) {
+      if (!isRowError(error)) throw error
+      if (runs.length === 1) {
+        await this.deadLetter(runs[0], error)
+        return
+      }
+      const middle = runs.length >> 1
+      await this.insertIsolating(runs.slice(0, middle))
+      await this.insertIsolating(runs.slice(middle))
+    }
+  }
+
+  async deadLetter(run, error) {
+    console.error(`Dead-lettering game run ${run?.id}:`, error.message)
+    const entry = { run, error: error.message, code: error.code || null, at: new Date().toISOString() }
+    await fs.appendFile(this.deadLetterFile, `${JSON.stringify(entry)}\n`)
+  }
+
+  track(run) {
+    if (!this.pending.has(run.user_id)) {
+      this.pending.set(run.user_id, new Map())
+    }
+    const runs = this.pending.get(run.user_id)
+    if (!runs.has(run.id)) {
+      runs.set(run.id, run)
+      this.pendingCount++
+    }
+  }
+
+  untrack(run) {
+    const runs = this.pending.get(run.user_id)
+    if (runs?.delete(run.id)) {
+      this.pendingCount--
+      if (runs.size === 0) this.pending.delete(run.user_id)
+    }
+  }
+
+  pendingFor(userId) {
+    const runs = this.pending.get(userId)
+    return runs ? [...runs.values()].sort(compareNewest) : []
+  }
+}
+
+let queue = null
+
+function getQueue() {
+  if (!queue) {
+    queue = new IngestQueue()
+    queue.start()
+  }
+  return queue
+}
+
+/**
+ * Durably append a fully built game_runs row (id and created_at included);
+ * throws InvalidGameRunError for a row that fails validateGameRun
+ */
+export function enqueueGameRun(row) {
+  return getQueue().append(row)
+}
+
+/**
+ * Runs accepted for a user that have not been flushed yet, newest first
+ */
+export function pendingGameRuns(userId) {
+  return queue ? queue.pendingFor(userId) : []
+}
+
+/**
+ * Merge pending runs into a page of rows read from the database, newest
+ * first and without duplicates (a run may be in both while a flush finishes)
+ */
+export function mergePendingRuns(pendingRuns, rows) {
+  if (pendingRuns.length === 0) return rows
+  const seen = new Set((rows || []).map(row => row.id))
+  return [...pendingRuns.filter(run => !seen.has(run.id)), ...(rows || [])].sort(compareNewest)
+}
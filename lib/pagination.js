@@ -0,0 +1,102 @@
+/**
+ * Keyset (cursor) pagination helpers for list endpoints
+ *
+ * Pages are ordered by (created_at desc, id desc) so every page fetch is a
+ * bounded range scan on the (user_id, created_at desc) indexes, independent of
+ * how deep into the history the client is. Cursors are opaque base64url tokens
+ * holding the (created_at, id) of the last row of the previous page.
+ */
+
+export const DEFAULT_PAGE_SIZE = 50
+export const MAX_PAGE_SIZE = 200
+
+export class InvalidCursorError extends Error {
+  constructor(message = 'Invalid cursor') {
+    super(message)
+    this.name = 'InvalidCursorError'
+  }
+}
+
+/**
+ * Encode the sort key of a row into an opaque cursor token
+ */
+export function encodeCursor(row, column = 'created_at') {
+  const payload = JSON.stringify([row[column], row.id])
+  return Buffer.from(payload, 'utf8').toString('base64url')
+}
+
+/**
+ * Decode a cursor token back into its { value, id } sort key
+ */
+export function decodeCursor(token) {
+  try {
+    const [value, id] = JSON.parse(Buffer.from(token, 'base64url').toString('utf8'))
+    if (typeof value !== 'string' || Number.isNaN(Date.parse(value)) || id === undefined || id === null) {
+      throw new InvalidCursorError()
+    }
+    return { value, id: String(id) }
+  } catch (error) {
+    throw new InvalidCursorError()
+  }
+}
+
+/**
+ * Read `limit` and `cursor` from the query string, clamping the page size
+ */
+export function parsePageParams(searchParams, { defaultLimit = DEFAULT_PAGE_SIZE, maxLimit = MAX_PAGE_SIZE } = {}) {
+  const rawLimit = parseInt(searchParams.get('limit') || '', 10)
+  const limit = Number.isFinite(rawLimit) && rawLimit > 0
+    ? Math.min(rawLimit, maxLimit)
+    : defaultLimit
+
+  const token = searchParams.get('cursor')
+  const cursor = token ? decodeCursor(token) : null
+
+  return { limit, cursor }
+}
+
+/**
+ * Apply keyset ordering, the "older than cursor" predicate and the page limit
+ * to a Supabase query. One extra row is requested to detect a next page.
+ */
+export function applyKeyset(query, { limit, cursor }, column = 'created_at') {
+  let pageQuery = query
+
+  if (cursor) {
+    // The redundant lte bound gives the planner an index range to scan;
+    // the or() then breaks ties on id within the same timestamp
+    pageQuery = pageQuery.lte(column, cursor.value).or(
+      `${column}.lt."${cursor.value}",and(${column}.eq."${cursor.value}",id.lt."${cursor.id}")`
+    )
+  }
+
+  return pageQuery
+    .order(column, { ascending: false })
+    .order('id', { ascending: false })
+    .limit(limit + 1)
+}
+
+/**
+ * Split the fetched rows into the page items and the next cursor (if any)
+ */
+export function buildPage(rows, limit, column = 'created_at') {
+  const items = rows || []
+  const hasMore = items.length > limit
+  const pageItems = hasMore ? items.slice(0, limit) : items
+
+  return {
+    items: pageItems,
+    nextCursor: hasMore ? encodeCursor(pageItems[pageItems.length - 1], column) : null
+  }
+}
+
+/**
+ * Response headers advertising the next page to the client
+ */
+export function pageHeaders(nextCursor) {
+  const headers = { 'Access-Control-Expose-Headers': 'X-Next-Cursor' }
+  if (nextCursor) {
+    headers['X-Next-Cursor'] = nextCursor
+  }
+  return headers
+}
@@ -0,0 +1,71 @@
+/**
+ * Seeded pseudo-random numbers for reproducible puzzles
+ *
+ * createRng(seed) returns a mulberry32 generator: fast, 32 bits of state and
+ * good enough statistical quality for shuffling and grid filling. The same
+ * seed gives the same sequence on every platform, so a puzzle generated on
+ * the server and one generated in the browser from the same seed match.
+ */
+
+/**
+ * 32-bit seed from a number or string (FNV-1a over the string form)
+ */
+export function hashSeed(value) {
+  const text = String(value)
+  let hash = 0x811c9dc5
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i)
+    hash = Math.imul(hash, 0x01000193)
+  }
+  return hash >>> 0
+}
+
+/**
+ * Random 32-bit seed for callers that do not need reproducibility
+ */
+export function randomSeed() {
+  if (typeof crypto !== 'undefined' && crypto.getRandomValues) {
+    return crypto.getRandomValues(new Uint32Array(1))[0]
+  }
+  return Math.floor(Math.random() * 0x100000000)
+}
+
+export function createRng(seed) {
+  let state = (typeof seed === 'number' ? seed : hashSeed(seed)) >>> 0
+
+  // Float in [0, 1), like Math.random()
+  const next = () => {
+    state = (state + 0x6d2b79f5) | 0
+    let t = Math.imul(state ^ (state >>> 15), 1 | state)
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296
+  }
+
+  return {
+    next,
+
+    // Integer in [0, n)
+    int(n) {
+      return Math.floor(next() * n)
+    },
+
+    chance(probability) {
+      return next() < probability
+    },
+
+    pick(items) {
+      return items[Math.floor(next() * items.length)]
+    },
+
+    // Fisher-Yates, in place
+    shuffle(items) {
+      for (let i = items.length - 1; i > 0; i--) {
+        const j = Math.floor(next() * (i + 1))
+        const tmp = items[i]
+        items[i] = items[j]
+        items[j] = tmp
+      }
+      return items
+    }
+  }
+}
@@ -1,7 +1,7 @@
 // Progress Tracking Utilities for Sprint Juegos
 // Handles settings.progress persistence and game resume functionality
 
-import { supabase } from './supabase'
+import { supabase, getScoreSeries } from './supabase'
 
 // Utility functions for level persistence (PR A - Core UX)
 export function getLastLevel(gameKey) {
@@ -173,68 +173,27 @@ export function getDefaultProgress(gameType) {
   return defaults[gameType] || defaults.memory_digits
 }
 
-// Get historical scores for charts (from game_runs)
+// Get historical scores for charts: one pre-binned entry per day from the
+// game_daily_stats rollup ({ date, runs, best, avg }; best/avg null on days
+// without runs)
 export async function getHistoricalScores(userId, gameType, days = 30) {
   try {
-    const cutoffDate = new Date()
-    cutoffDate.setDate(cutoffDate.getDate() - days)
-
-    const { data, error } = await supabase
-      .from('game_runs')
-      .select('score, created_at, duration_ms, metrics')
-      .eq('user_id', userId)
-      .eq('game', gameType)
-      .gte('created_at', cutoffDate.toISOString())
-      .order('created_at', { ascending: true })
-
-    if (error) {
-      console.error('Error fetching historical scores:', error)
-      return []
-    }
-
-    return data || []
+    return await getScoreSeries(userId, gameType, days)
   } catch (error) {
     console.error('Error getting historical scores:', error)
     return []
   }
 }
 
-// Process historical data for charts
-export function processScoresForChart(scores, days = 30) {
-  if (!scores.length) return { labels: [], data: [] }
-
-  // Group scores by date
-  const scoresByDate = {}
-  scores.forEach(score => {
-    const date = new Date(score.created_at).toISOString().split('T')[0]
-    if (!scoresByDate[date]) {
-      scoresByDate[date] = []
-    }
-    scoresByDate[date].push(score.score)
-  })
-
-  // Generate date range
-  const labels = []
-  const data = []
-  const startDate = new Date()
-  startDate.setDate(startDate.getDate() - days)
+// Process historical data for charts (best score of each day)
+export function processScoresForChart(series, days = 30) {
+  if (!series.length) return { labels: [], data: [] }
 
-  for (let i = 0; i < days; i++) {
-    const currentDate = new Date(startDate)
-    currentDate.setDate(startDate.getDate() + i)
-    const dateStr = currentDate.toISOString().split('T')[0]
-    
-    labels.push(formatDateForChart(currentDate))
-    
-    if (scoresByDate[dateStr]) {
-      // Use best score of the day
-      data.push(Math.max(...scoresByDate[dateStr]))
-    } else {
-      data.push(null) // No score for this date
-    }
+  const bins = series.slice(-days)
+  return {
+    labels: bins.map(bin => formatDateForChart(new Date(`${bin.date}T00:00:00Z`))),
+    data: bins.map(bin => bin.best)
   }
-
-  return { labels, data }
 }
 
 // Format date for chart display
@@ -320,7 +279,26 @@ export function calculateAccuracy(selections, targets, rule) {
 
 // Generate Schulte table numbers
 export function generateSchulteNumbers(n, mode = 'numbers') {
-  let values = []
+  const sequence = getSchulteSequence(n, mode)
+  
+  // Shuffled copy of the values (inside-out Fisher-Yates, one pass)
+  const values = new Array(sequence.length)
+  for (let i = 0; i < sequence.length; i++) {
+    const j = Math.floor(Math.random() * (i + 1))
+    values[i] = values[j]
+    values[j] = sequence[i]
+  }
+  
+  return values
+}
+
+// Ordered values of a Schulte table, memoized per (mode, n); do not mutate
+const schulteSequences = new Map()
+
+export function getSchulteSequence(n, mode = 'numbers') {
+  const key = `${mode}:${n}`
+  let values = schulteSequences.get(key)
+  if (values) return values
   
   switch (mode) {
     case 'letters':
@@ -330,68 +308,88 @@ export function generateSchulteNumbers(n, mode = 'numbers') {
       break
       
     case 'descending':
-      values = Array.from({ length: n }, (_, i) => n - i)
+      values = Uint32Array.from({ length: n }, (_, i) => n - i)
       break
       
     case 'multiples':
       // Multiples of 3
-      values = Array.from({ length: n }, (_, i) => (i + 1) * 3)
+      values = Uint32Array.from({ length: n }, (_, i) => (i + 1) * 3)
       break
       
     case 'primes':
       // First n prime numbers
-      values = generatePrimes(n)
+      values = firstPrimes(n)
       break
       
     case 'fibonacci':
-      // Fibonacci sequence
-      values = generateFibonacci(n)
+      // Distinct Fibonacci numbers 1, 2, 3, 5, ..., at most
+      // MAX_FIBONACCI_CELLS of them
+      values = firstFibonacci(n)
       break
       
     default:
-      values = Array.from({ length: n }, (_, i) => i + 1)
-  }
-  
-  // Shuffle the values
-  for (let i = values.length - 1; i > 0; i--) {
-    const j = Math.floor(Math.random() * (i + 1));
-    [values[i], values[j]] = [values[j], values[i]]
+      values = Uint32Array.from({ length: n }, (_, i) => i + 1)
   }
   
+  schulteSequences.set(key, values)
   return values
 }
 
-// Generate first n prime numbers
-function generatePrimes(n) {
-  const primes = []
-  let num = 2
-  
-  while (primes.length < n) {
-    if (isPrime(num)) {
-      primes.push(num)
-    }
-    num++
+/**
+ * Smallest value of a strictly ascending table (numbers, multiples, primes,
+ * fibonacci) greater than `current`, or Infinity after the last one
+ */
+export function nextSchulteValue(current, n, mode = 'numbers') {
+  const values = getSchulteSequence(n, mode)
+  let low = 0
+  let high = values.length
+  while (low < high) {
+    const mid = (low + high) >> 1
+    if (values[mid] <= current) low = mid + 1
+    else high = mid
   }
-  
-  return primes
+  return low < values.length ? values[low] : Infinity
+}
+
+// Primes below primeLimit from a sieve of Eratosthenes, regrown to at least
+// double the limit whenever more primes are needed
+let primes = new Uint32Array(0)
+let primeLimit = 0
+
+// Upper bound on the nth prime: n (ln n + ln ln n) for n >= 6
+function nthPrimeBound(n) {
+  return n < 6 ? 15 : Math.ceil(n * (Math.log(n) + Math.log(Math.log(n)))) + 1
 }
 
-// Check if number is prime
-function isPrime(num) {
-  if (num < 2) return false
-  for (let i = 2; i <= Math.sqrt(num); i++) {
-    if (num % i === 0) return false
+// First n prime numbers
+function firstPrimes(n) {
+  if (primes.length < n) {
+    const limit = Math.max(nthPrimeBound(n), primeLimit * 2)
+    const composite = new Uint8Array(limit)
+    const found = []
+    for (let i = 2; i < limit; i++) {
+      if (composite[i]) continue
+      found.push(i)
+      for (let j = i * i; j < limit; j += i) composite[j] = 1
+    }
+    primes = Uint32Array.from(found)
+    primeLimit = limit
   }
-  return true
+  return primes.slice(0, n)
 }
 
-// Generate first n Fibonacci numbers
-function generateFibonacci(n) {
-  const fib = [1, 1]
-  
-  while (fib.length < n) {
-    fib.push(fib[fib.length - 1] + fib[fib.length - 2])
+// Fibonacci tables stop at F(78), the largest Fibonacci number a double
+// holds exactly; the sequence skips the second 1, so that is 77 cells
+const MAX_FIBONACCI_CELLS = 77
+let fibonacci = null
+
+// First n distinct Fibonacci numbers, capped at MAX_FIBONACCI_CELLS
+function firstFibonacci(n) {
+  if (!fibonacci) {
+    fibonacci = new Float64Array(MAX_FIBONACCI_CELLS)
+    fibonacci[0] = 1
+    fibonacci[1] = 2
+    for (let i = 2; i < fibonacci.length; i++) fibonacci[i] = fibonacci[i - 1] + fibonacci[i - 2]
   }
-  
-  return fib.slice(0, n)
-}
\ No newline at end of file
+  return fibonacci.slice(0, Math.min(n, MAX_FIBONACCI_CELLS))
+}
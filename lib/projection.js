@@ -0,0 +1,97 @@
+/**
+ * Field projection for GET list endpoints
+ *
+ * Clients can ask for a subset of columns with `fields=a,b,c` (validated
+ * against a per-table allowlist) or for a lightweight `view=summary` that
+ * omits heavy columns such as documents.content and game_runs.metrics.
+ * Without either parameter the full row is returned, as before.
+ */
+
+// Columns clients may request, per table (see supabase-tables.sql)
+export const FIELD_ALLOWLIST = {
+  game_runs: [
+    'id', 'user_id', 'game', 'score', 'duration_ms', 'difficulty_level', 'metrics', 'created_at',
+    'client_created_at'
+  ],
+  sessions: [
+    'id', 'user_id', 'wpm_start', 'wpm_end', 'comprehension_score', 'exercise_type',
+    'duration_seconds', 'text_length', 'date', 'created_at'
+  ],
+  documents: ['id', 'user_id', 'title', 'content', 'word_count', 'language', 'source_type', 'created_at'],
+  settings: [
+    'user_id', 'wpm_target', 'chunk_size', 'theme', 'language', 'font_size',
+    'sound_enabled', 'show_instructions', 'progress', 'updated_at'
+  ]
+}
+
+// Summary views: everything a list/overview needs, minus the heavy columns
+export const SUMMARY_FIELDS = {
+  game_runs: ['id', 'game', 'score', 'duration_ms', 'difficulty_level', 'created_at'],
+  sessions: [
+    'id', 'wpm_start', 'wpm_end', 'comprehension_score', 'exercise_type',
+    'duration_seconds', 'created_at'
+  ],
+  documents: ['id', 'title', 'word_count', 'language', 'source_type', 'created_at'],
+  settings: [
+    'user_id', 'wpm_target', 'chunk_size', 'theme', 'language', 'font_size',
+    'sound_enabled', 'show_instructions', 'updated_at'
+  ]
+}
+
+// Columns that must always be selected (keyset sort key, ETag row version)
+const REQUIRED_FIELDS = {
+  game_runs: ['id', 'created_at'],
+  sessions: ['id', 'created_at'],
+  documents: ['id', 'created_at'],
+  settings: ['updated_at']
+}
+
+export class InvalidProjectionError extends Error {
+  constructor(message) {
+    super(message)
+    this.name = 'InvalidProjectionError'
+  }
+}
+
+/**
+ * Build the Supabase select() string for a table from `fields` / `view`
+ */
+export function resolveSelect(table, searchParams) {
+  const allowed = FIELD_ALLOWLIST[table]
+  const fieldsParam = searchParams.get('fields')
+  const view = searchParams.get('view')
+
+  let fields = null
+
+  if (fieldsParam) {
+    fields = fieldsParam.split(',').map(field => field.trim()).filter(Boolean)
+    const unknown = fields.filter(field => !allowed.includes(field))
+    if (fields.length === 0 || unknown.length > 0) {
+      throw new InvalidProjectionError(
+        `Invalid fields for ${table}: ${unknown.join(', ') || '(empty)'}`
+      )
+    }
+  } else if (view === 'summary') {
+    fields = SUMMARY_FIELDS[table]
+  } else if (view && view !== 'full') {
+    throw new InvalidProjectionError(`Unknown view: ${view}`)
+  }
+
+  if (!fields) {
+    return '*'
+  }
+
+  const required = (REQUIRED_FIELDS[table] || []).filter(field => !fields.includes(field))
+  return [...fields, ...required].join(',')
+}
+
+/**
+ * Apply a resolveSelect() column list to rows built in memory
+ */
+export function projectRows(rows, select) {
+  if (select === '*') {
+    return rows
+  }
+  const columns = select.split(',')
+  return rows.map(row => Object.fromEntries(columns.map(column => [column, row[column]])))
+}
@@ -0,0 +1,26 @@
+// Puzzle Generation Web Worker
+//
+// Runs the seeded generators from lib/puzzles.js off the main thread, for
+// puzzle pages the API could not serve. Created by generatePuzzlesInWorker()
+// as a module worker, so it shares the generator code (and its results) with
+// the server.
+
+import { generatePuzzles } from './puzzles'
+
+self.addEventListener('message', function(e) {
+  const { type, payload } = e.data
+
+  switch (type) {
+    case 'GENERATE': {
+      // The word bank shard is fetched (and kept) by the worker itself
+      const { id, game, level, locale, seeds } = payload
+      generatePuzzles(game, level, locale, seeds)
+        .then(puzzles => self.postMessage({ type: 'GENERATED', payload: { id, puzzles } }))
+        .catch(error => self.postMessage({ type: 'GENERATE_FAILED', payload: { id, error: error.message } }))
+      break
+    }
+
+    default:
+      console.warn('Unknown message type:', type)
+  }
+})
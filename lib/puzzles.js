@@ -0,0 +1,589 @@
+/**
+ * Seeded puzzle generation and the pregenerated puzzle pool
+ *
+ * Every WordSearch and LettersGrid puzzle is a pure function of
+ * (game, level, locale, seed), so the server can pregenerate a pool of
+ * PUZZLE_POOL_SIZE seeds per game/level/locale and serve them from
+ * GET /api/puzzles, and two players given the same seed get the same grid.
+ * Responses never change for a given generator version, so they are cached
+ * by the service worker and HTTP caches; the version is part of the URL.
+ *
+ * In the browser, createPuzzleQueue() prefetches a page of the pool so a
+ * round starts with a lookup. If the API is unreachable, the same seeds are
+ * generated in a Web Worker (lib/puzzle-worker.js) with identical results.
+ * Generators take their words from the game's word bank shard (see
+ * lib/word-bank-shards.js).
+ */
+
+import { createRng, hashSeed, randomSeed } from './prng'
+import { WORD_BANK_LOCALES, loadWordBank, getLoadedWordBank } from './word-bank-shards'
+
+export const PUZZLE_GENERATOR_VERSION = 3
+export const PUZZLE_POOL_SIZE = 64 // seeds 0..63 per game, level and locale
+export const PUZZLE_PAGE_SIZE = 8
+const MAX_CACHED_POOLS = 80
+
+export const PUZZLE_LOCALES = WORD_BANK_LOCALES
+
+export const WORD_SEARCH_LEVELS = {
+  1: { gridSize: 8, wordsCount: 3, diagonals: false, reverse: false, goalTimePerWord: 8000 },
+  2: { gridSize: 8, wordsCount: 3, diagonals: false, reverse: false, goalTimePerWord: 7500 },
+  3: { gridSize: 9, wordsCount: 4, diagonals: false, reverse: false, goalTimePerWord: 7000 },
+  4: { gridSize: 9, wordsCount: 4, diagonals: false, reverse: false, goalTimePerWord: 6500 },
+  5: { gridSize: 10, wordsCount: 5, diagonals: false, reverse: false, goalTimePerWord: 6000 },
+  6: { gridSize: 10, wordsCount: 5, diagonals: false, reverse: false, goalTimePerWord: 5500 },
+  7: { gridSize: 11, wordsCount: 6, diagonals: false, reverse: false, goalTimePerWord: 5000 },
+  8: { gridSize: 11, wordsCount: 6, diagonals: true, reverse: true, goalTimePerWord: 5000 },
+  9: { gridSize: 12, wordsCount: 7, diagonals: true, reverse: true, goalTimePerWord: 4500 },
+  10: { gridSize: 12, wordsCount: 7, diagonals: true, reverse: true, goalTimePerWord: 4000 },
+  11: { gridSize: 12, wordsCount: 8, diagonals: true, reverse: true, goalTimePerWord: 4000 },
+  12: { gridSize: 13, wordsCount: 8, diagonals: true, reverse: true, goalTimePerWord: 3500 },
+  13: { gridSize: 13, wordsCount: 9, diagonals: true, reverse: true, goalTimePerWord: 3500 },
+  14: { gridSize: 13, wordsCount: 9, diagonals: true, reverse: true, goalTimePerWord: 3000 },
+  15: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 3000 },
+  16: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2800 },
+  17: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2600 },
+  18: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2400 },
+  19: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2200 },
+  20: { gridSize: 14, wordsCount: 10, diagonals: true, reverse: true, goalTimePerWord: 2000 }
+}
+
+export const LETTERS_GRID_LEVELS = {
+  1: { N: 5, targets: 1, exposureTotal: 12000, goalRT: 2000 },
+  2: { N: 6, targets: 1, exposureTotal: 11000, goalRT: 1900 },
+  3: { N: 6, targets: 1, exposureTotal: 10000, goalRT: 1800 },
+  4: { N: 7, targets: 2, exposureTotal: 10000, goalRT: 1800 },
+  5: { N: 7, targets: 2, exposureTotal: 9000, goalRT: 1700 },
+  6: { N: 8, targets: 2, exposureTotal: 9000, goalRT: 1700 },
+  7: { N: 8, targets: 2, exposureTotal: 8000, goalRT: 1600 },
+  8: { N: 9, targets: 2, exposureTotal: 8000, goalRT: 1600 },
+  9: { N: 9, targets: 2, exposureTotal: 7000, goalRT: 1500 },
+  10: { N: 10, targets: 3, exposureTotal: 7000, goalRT: 1500, useConfusables: true },
+  11: { N: 10, targets: 3, exposureTotal: 6500, goalRT: 1400, useConfusables: true },
+  12: { N: 11, targets: 3, exposureTotal: 6000, goalRT: 1400, useConfusables: true },
+  13: { N: 11, targets: 3, exposureTotal: 5500, goalRT: 1300, useConfusables: true },
+  14: { N: 12, targets: 3, exposureTotal: 5500, goalRT: 1300, useConfusables: true },
+  15: { N: 12, targets: 3, exposureTotal: 5000, goalRT: 1200, useConfusables: true },
+  16: { N: 13, targets: 3, exposureTotal: 5000, goalRT: 1200, useConfusables: true },
+  17: { N: 13, targets: 3, exposureTotal: 4500, goalRT: 1100, useConfusables: true },
+  18: { N: 14, targets: 3, exposureTotal: 4500, goalRT: 1100, useConfusables: true },
+  19: { N: 14, targets: 3, exposureTotal: 4200, goalRT: 1000, useConfusables: true },
+  20: { N: 15, targets: 3, exposureTotal: 4000, goalRT: 1000, useConfusables: true }
+}
+
+const WORD_SEARCH_DIRECTIONS = [[0, 1], [1, 0]] // horizontal, vertical
+const WORD_SEARCH_DIAGONALS = [[1, 1], [-1, 1]] // down, up
+const ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+function clampLevel(level) {
+  return Math.max(1, Math.min(20, Math.floor(level) || 1))
+}
+
+// Generator state for one puzzle: the seed is mixed with everything that
+// identifies the puzzle, so seed 0 at level 3 is unrelated to seed 0 at level 4
+function puzzleRng(game, level, locale, seed) {
+  return createRng(hashSeed(`${PUZZLE_GENERATOR_VERSION}:${game}:${level}:${locale}:${seed}`))
+}
+
+const RANDOM_PLACEMENT_ATTEMPTS = 50 // random spots tried per word before searching
+const MAX_PLACEMENT_STEPS = 5000 // candidate placements tried before swapping out a word
+
+// Valid first cell coordinates along one axis for a word of `length`
+function startRange(step, length, gridSize) {
+  return step > 0 ? [0, gridSize - length] : step < 0 ? [length - 1, gridSize - 1] : [0, gridSize - 1]
+}
+
+/**
+ * All placements of `letters` (char codes) that agree with the grid, as
+ * numbers that rank them: most letters shared with words already placed,
+ * then the word's preferred reading direction, then a seeded random order.
+ * The low 16 bits hold (start cell * directions + direction) * 2 + reversed.
+ */
+function placementCandidates(cells, gridSize, letters, directions, orientations, preferReversed, rng) {
+  const length = letters.length
+  const candidates = new Float64Array(cells.length * directions.length * orientations)
+  const salt = rng.int(0x4000) // seeded tie-break order for this word
+  let count = 0
+
+  for (let d = 0; d < directions.length; d++) {
+    const [dr, dc] = directions[d]
+    const [minRow, maxRow] = startRange(dr, length, gridSize)
+    const [minCol, maxCol] = startRange(dc, length, gridSize)
+    const stride = dr * gridSize + dc
+
+    for (let row = minRow; row <= maxRow; row++) {
+      for (let col = minCol; col <= maxCol; col++) {
+        const start = row * gridSize + col
+        // Overlap of the word read forwards and backwards (-1 on a conflict)
+        let forward = 0
+        let backward = orientations > 1 ? 0 : -1
+        for (let i = 0; i < length && (forward >= 0 || backward >= 0); i++) {
+          const cell = cells[start + i * stride]
+          if (cell === 0) continue
+          if (forward >= 0) forward = cell === letters[i] ? forward + 1 : -1
+          if (backward >= 0) backward = cell === letters[length - 1 - i] ? backward + 1 : -1
+        }
+
+        const code = (start * directions.length + d) * 2
+        const tie = (Math.imul(code + 1, 0x9e3779b1) ^ salt) & 0x3fff
+        if (forward >= 0) {
+          candidates[count++] = (forward * 2 + (preferReversed ? 0 : 1)) * 0x40000000 + tie * 0x10000 + code
+        }
+        if (backward >= 0) {
+          candidates[count++] = (backward * 2 + (preferReversed ? 1 : 0)) * 0x40000000 + (tie ^ 0x2000) * 0x10000 + code + 1
+        }
+      }
+    }
+  }
+
+  return candidates.subarray(0, count)
+}
+
+// Remove and return the best of the first `count` candidates. Most words are
+// placed at their first choice, so selecting beats sorting every list.
+function takeBestCandidate(candidates, count) {
+  let best = 0
+  for (let i = 1; i < count; i++) {
+    if (candidates[i] > candidates[best]) best = i
+  }
+  const value = candidates[best]
+  candidates[best] = candidates[count - 1]
+  return value
+}
+
+// Write a placement code's letters into the empty cells it covers and
+// return those cells, so the placement can be undone
+function writePlacement(cells, gridSize, directions, word, code) {
+  const reversed = code % 2
+  const d = Math.floor(code / 2) % directions.length
+  const start = Math.floor(code / 2 / directions.length)
+  const [dr, dc] = directions[d]
+  const stride = dr * gridSize + dc
+  const filled = []
+  for (let i = 0; i < word.length; i++) {
+    const cell = start + i * stride
+    if (cells[cell] === 0) {
+      cells[cell] = word[reversed ? word.length - 1 - i : i]
+      filled.push(cell)
+    }
+  }
+  return filled
+}
+
+/**
+ * Place each word at the first of up to RANDOM_PLACEMENT_ATTEMPTS random
+ * spots that agrees with the grid, in the word's preferred reading
+ * direction. This is enough for nearly every grid and costs a fraction of
+ * ranking all candidates. Returns the placement codes, or null with the
+ * grid cleared when some word found no spot.
+ */
+function placeWordsRandomly(cells, gridSize, letters, directions, preferReversed, rng) {
+  const chosen = []
+  for (let w = 0; w < letters.length; w++) {
+    const word = letters[w]
+    const reversed = preferReversed[w]
+    let code = -1
+    for (let attempt = 0; attempt < RANDOM_PLACEMENT_ATTEMPTS && code < 0; attempt++) {
+      const d = rng.int(directions.length)
+      const [dr, dc] = directions[d]
+      const [minRow, maxRow] = startRange(dr, word.length, gridSize)
+      const [minCol, maxCol] = startRange(dc, word.length, gridSize)
+      if (maxRow < minRow || maxCol < minCol) continue
+      const start = (minRow + rng.int(maxRow - minRow + 1)) * gridSize + minCol + rng.int(maxCol - minCol + 1)
+      const stride = dr * gridSize + dc
+      let fits = true
+      for (let i = 0; i < word.length && fits; i++) {
+        const cell = cells[start + i * stride]
+        fits = cell === 0 || cell === word[reversed ? word.length - 1 - i : i]
+      }
+      if (fits) code = (start * directions.length + d) * 2 + reversed
+    }
+    if (code < 0) {
+      cells.fill(0)
+      return null
+    }
+    writePlacement(cells, gridSize, directions, word, code)
+    chosen.push(code)
+  }
+  return chosen
+}
+
+// The placed words with their [row, col] cells, in placement order
+function placedWords(words, chosen, gridSize, directions) {
+  return words.map((word, index) => {
+    const code = chosen[index]
+    const d = Math.floor(code / 2) % directions.length
+    const start = Math.floor(code / 2 / directions.length)
+    const [dr, dc] = directions[d]
+    const positions = []
+    for (let i = 0; i < word.length; i++) {
+      const cell = start + i * (dr * gridSize + dc)
+      positions.push([Math.floor(cell / gridSize), cell % gridSize])
+    }
+    return { word, positions }
+  })
+}
+
+/**
+ * Place every word, longest first. placeWordsRandomly() is tried first;
+ * when a word finds no random spot, a depth-first search tries each word at
+ * its candidate placements in order, backtracking into the previous word
+ * when none fits. A search that takes more than MAX_PLACEMENT_STEPS
+ * placements swaps the word that failed most often for the shortest unused
+ * word in `spares` and starts over, so generation time is bounded and the
+ * puzzle always gets its full word count while spares last. Returns the
+ * placed words with their cells, in placement order.
+ */
+function placeWords(cells, gridSize, words, spares, directions, reverse, rng) {
+  const orientations = reverse ? 2 : 1
+
+  for (;;) {
+    // Seeded order among equal lengths comes from the caller's shuffle
+    words.sort((a, b) => b.length - a.length)
+    const letters = words.map(word => Array.from(word.toUpperCase(), ch => ch.charCodeAt(0)))
+    const preferReversed = words.map(() => (reverse && rng.chance(0.3) ? 1 : 0))
+
+    const placed = placeWordsRandomly(cells, gridSize, letters, directions, preferReversed, rng)
+    if (placed) return placedWords(words, placed, gridSize, directions)
+
+    const candidates = []
+    const remaining = [] // untried candidates of each word
+    const chosen = [] // placement of each placed word
+    const written = [] // cells each placed word filled, for undo
+    const failures = new Uint32Array(words.length)
+    let steps = 0
+    let depth = 0
+    cells.fill(0)
+
+    while (depth >= 0 && depth < words.length && steps < MAX_PLACEMENT_STEPS) {
+      if (candidates[depth] === undefined) {
+        candidates[depth] = placementCandidates(cells, gridSize, letters[depth], directions, orientations, preferReversed[depth], rng)
+        remaining[depth] = candidates[depth].length
+      }
+
+      if (remaining[depth] === 0) {
+        // No placement left for this word: undo the previous word and move it
+        failures[depth]++
+        candidates[depth] = undefined
+        depth--
+        if (depth >= 0) {
+          for (const cell of written[depth]) cells[cell] = 0
+        }
+        continue
+      }
+
+      const code = takeBestCandidate(candidates[depth], remaining[depth]--) % 0x10000
+      chosen[depth] = code
+      written[depth] = writePlacement(cells, gridSize, directions, letters[depth], code)
+      steps++
+      depth++
+    }
+
+    if (depth === words.length) {
+      return placedWords(words, chosen, gridSize, directions)
+    }
+
+    // Out of steps (or no arrangement exists): replace the hardest word
+    let hardest = 0
+    for (let i = 1; i < words.length; i++) {
+      if (failures[i] >= failures[hardest]) hardest = i
+    }
+    if (spares.length > 0) {
+      spares.sort((a, b) => a.length - b.length)
+      words[hardest] = spares.shift()
+    } else {
+      words.splice(hardest, 1)
+    }
+  }
+}
+
+/**
+ * WordSearch puzzle: `grid` rows as strings, the words that were placed and
+ * the [row, col] cells of each. `wordsData` is the locale's wordSearch
+ * word bank (words by length).
+ */
+export function generateWordSearch({ level = 1, locale = 'es', seed = 0 }, wordsData) {
+  level = clampLevel(level)
+  const config = WORD_SEARCH_LEVELS[level]
+  const rng = puzzleRng('word_search', level, locale, seed)
+
+  // Words of 4-8 letters for variety. Checked by actual length, since some
+  // word bank buckets hold longer words that would not fit an 8x8 grid.
+  const { gridSize } = config
+  const candidates = []
+  for (let length = 4; length <= 8; length++) {
+    for (const word of wordsData[length] || []) {
+      if (word.length >= 4 && word.length <= Math.min(8, gridSize)) candidates.push(word)
+    }
+  }
+  rng.shuffle(candidates)
+  const roundWords = candidates.slice(0, config.wordsCount)
+  const spares = candidates.slice(config.wordsCount)
+
+  const cells = new Uint16Array(gridSize * gridSize) // char codes, 0 = empty
+  const directions = config.diagonals ? [...WORD_SEARCH_DIRECTIONS, ...WORD_SEARCH_DIAGONALS] : WORD_SEARCH_DIRECTIONS
+  const placed = placeWords(cells, gridSize, roundWords, spares, directions, config.reverse, rng)
+
+  const grid = []
+  for (let row = 0; row < gridSize; row++) {
+    let line = ''
+    for (let col = 0; col < gridSize; col++) {
+      const code = cells[row * gridSize + col]
+      line += code ? String.fromCharCode(code) : ALPHABET[rng.int(ALPHABET.length)]
+    }
+    grid.push(line)
+  }
+
+  const positions = {}
+  for (const { word, positions: wordCells } of placed) {
+    positions[word] = wordCells
+  }
+
+  return {
+    game: 'word_search',
+    level,
+    locale,
+    seed,
+    grid,
+    words: placed.map(({ word }) => word),
+    positions
+  }
+}
+
+/**
+ * LettersGrid puzzle: `grid` rows as arrays of letters, the target letters
+ * and the [row, col] cells holding each. Targets occupy distinct cells and
+ * filler letters never repeat a target, so every target cell is marked.
+ * `lettersData` is the locale's lettersGrid word bank.
+ */
+export function generateLettersGrid({ level = 1, locale = 'es', seed = 0 }, lettersData) {
+  level = clampLevel(level)
+  const { N, targets: targetCount, useConfusables } = LETTERS_GRID_LEVELS[level]
+  const rng = puzzleRng('letters_grid', level, locale, seed)
+
+  // Target letters, with the odd confusable added on hard levels
+  const picked = []
+  for (let i = 0; i < targetCount; i++) {
+    picked.push(rng.pick(lettersData.targets))
+  }
+  if (useConfusables) {
+    for (const letter of [...picked]) {
+      const confusables = lettersData.confusables[letter]
+      if (confusables && rng.chance(0.3)) {
+        const confusable = rng.pick(confusables)
+        if (rng.chance(0.5)) picked.push(confusable)
+      }
+    }
+  }
+  const targets = [...new Set(picked)]
+
+  // 3-5 cells per target letter, all distinct
+  const cells = rng.shuffle(Array.from({ length: N * N }, (_, i) => i))
+  const grid = Array.from({ length: N }, () => Array(N).fill(''))
+  const targetPositions = {}
+  let next = 0
+  for (const letter of targets) {
+    const count = Math.min(3 + rng.int(3), cells.length - next)
+    targetPositions[letter] = []
+    for (let i = 0; i < count; i++) {
+      const cell = cells[next++]
+      const row = Math.floor(cell / N)
+      const col = cell % N
+      grid[row][col] = letter
+      targetPositions[letter].push([row, col])
+    }
+  }
+
+  // Fill the rest, leaning on confusables of the targets when enabled
+  const targetSet = new Set(targets)
+  const fillers = lettersData.targets.filter(letter => !targetSet.has(letter))
+  const confusableFillers = {}
+  for (const letter of targets) {
+    confusableFillers[letter] = (lettersData.confusables[letter] || []).filter(c => !targetSet.has(c))
+  }
+  for (; next < cells.length; next++) {
+    const cell = cells[next]
+    let letter = null
+    if (useConfusables && rng.chance(0.4)) {
+      const confusables = confusableFillers[rng.pick(targets)]
+      if (confusables.length > 0 && rng.chance(0.6)) letter = rng.pick(confusables)
+    }
+    grid[Math.floor(cell / N)][cell % N] = letter || rng.pick(fillers)
+  }
+
+  return {
+    game: 'letters_grid',
+    level,
+    locale,
+    seed,
+    grid,
+    targets,
+    targetPositions
+  }
+}
+
+export const PUZZLE_GENERATORS = {
+  word_search: generateWordSearch,
+  letters_grid: generateLettersGrid
+}
+
+// Word bank shard each generator draws from
+export const PUZZLE_WORD_BANKS = {
+  word_search: 'wordSearch',
+  letters_grid: 'lettersGrid'
+}
+
+/**
+ * Generate one puzzle. Uses the already loaded word bank shard unless
+ * `words` is given; see generatePuzzles() to load it first.
+ */
+export function generatePuzzle(game, options, words = getLoadedWordBank(PUZZLE_WORD_BANKS[game], options.locale)) {
+  const generator = PUZZLE_GENERATORS[game]
+  if (!generator) throw new Error(`Unknown puzzle game: ${game}`)
+  if (!words) throw new Error(`Word bank for ${game} (${options.locale}) is not loaded`)
+  return generator(options, words)
+}
+
+/**
+ * Generate the puzzles for `seeds`, loading the word bank shard if needed
+ */
+export async function generatePuzzles(game, level, locale, seeds) {
+  if (!PUZZLE_GENERATORS[game]) throw new Error(`Unknown puzzle game: ${game}`)
+  const words = await loadWordBank(PUZZLE_WORD_BANKS[game], locale)
+  return seeds.map(seed => generatePuzzle(game, { level, locale, seed }, words))
+}
+
+// Server-side pool: whole pools generated on first use, least recently used
+// pools dropped past MAX_CACHED_POOLS (Map keeps insertion order)
+const pools = new Map() // key -> Promise of the pool's puzzles
+
+/**
+ * Pool puzzles for seeds [from, from + count)
+ */
+export async function getPuzzlePage(game, level, locale, from = 0, count = PUZZLE_PAGE_SIZE) {
+  level = clampLevel(level)
+  const key = `${game}:${level}:${locale}`
+  let pool = pools.get(key)
+  if (pool) {
+    pools.delete(key)
+  } else {
+    pool = generatePuzzles(game, level, locale, Array.from({ length: PUZZLE_POOL_SIZE }, (_, seed) => seed))
+    pool.catch(() => pools.delete(key))
+    while (pools.size >= MAX_CACHED_POOLS) {
+      pools.delete(pools.keys().next().value)
+    }
+  }
+  pools.set(key, pool)
+
+  const start = Math.max(0, Math.min(from, PUZZLE_POOL_SIZE))
+  return (await pool).slice(start, Math.min(PUZZLE_POOL_SIZE, start + count))
+}
+
+export function puzzlePageUrl(game, level, locale, from, count = PUZZLE_PAGE_SIZE) {
+  const params = new URLSearchParams({ game, level: String(level), locale, from: String(from), count: String(count), v: String(PUZZLE_GENERATOR_VERSION) })
+  return `/api/puzzles?${params}`
+}
+
+let puzzleWorker = null
+let generationId = 0
+const pendingGenerations = new Map() // id -> { resolve, game, level, locale, seeds }
+
+function generateOnMainThread({ game, level, locale, seeds }) {
+  return generatePuzzles(game, level, locale, seeds)
+}
+
+function getPuzzleWorker() {
+  if (!puzzleWorker && typeof Worker !== 'undefined') {
+    try {
+      puzzleWorker = new Worker(new URL('./puzzle-worker.js', import.meta.url))
+      puzzleWorker.addEventListener('message', e => {
+        const { type, payload } = e.data
+        const request = pendingGenerations.get(payload.id)
+        if (!request) return
+        pendingGenerations.delete(payload.id)
+        request.resolve(type === 'GENERATED' ? payload.puzzles : generateOnMainThread(request))
+      })
+      puzzleWorker.addEventListener('error', () => {
+        // Worker unusable: finish what it had on the main thread
+        puzzleWorker.terminate()
+        puzzleWorker = null
+        for (const request of pendingGenerations.values()) {
+          request.resolve(generateOnMainThread(request))
+        }
+        pendingGenerations.clear()
+      })
+    } catch (error) {
+      puzzleWorker = null
+    }
+  }
+  return puzzleWorker
+}
+
+/**
+ * Generate puzzles for `seeds` in the puzzle worker (on the main thread
+ * where workers are unavailable)
+ */
+export function generatePuzzlesInWorker(game, level, locale, seeds) {
+  const request = { game, level, locale, seeds }
+  const worker = getPuzzleWorker()
+  if (!worker) {
+    return generateOnMainThread(request)
+  }
+
+  return new Promise(resolve => {
+    const id = ++generationId
+    pendingGenerations.set(id, { ...request, resolve })
+    worker.postMessage({ type: 'GENERATE', payload: { id, ...request } })
+  })
+}
+
+/**
+ * Client-side queue of pool puzzles for one game/level/locale. Starts at a
+ * random page of the pool and walks it in order. Pages the API cannot serve
+ * are generated in the puzzle worker; next() is synchronous and only
+ * generates on the main thread if the page is still loading. Call next()
+ * once the first prefetch() has resolved, so the word bank shard it would
+ * generate from is loaded.
+ */
+export function createPuzzleQueue(game, level, locale) {
+  const pageOf = seed => seed - (seed % PUZZLE_PAGE_SIZE)
+  let seed = pageOf(randomSeed() % PUZZLE_POOL_SIZE)
+  const loaded = new Map() // seed -> puzzle
+  let loading = null
+
+  const load = from => {
+    if (loading || loaded.has(from)) return loading
+    const seeds = Array.from({ length: PUZZLE_PAGE_SIZE }, (_, i) => from + i)
+    loading = fetch(puzzlePageUrl(game, level, locale, from))
+      .then(response => (response.ok ? response.json() : null))
+      .catch(() => null)
+      .then(data => (data?.version === PUZZLE_GENERATOR_VERSION
+        ? data.puzzles
+        : generatePuzzlesInWorker(game, level, locale, seeds)))
+      .then(puzzles => {
+        for (const puzzle of puzzles) loaded.set(puzzle.seed, puzzle)
+      })
+      .catch(error => console.warn('Failed to load puzzles:', error))
+      .finally(() => { loading = null })
+    return loading
+  }
+
+  return {
+    // Load the page the next puzzle comes from, and the word bank shard
+    prefetch() {
+      return Promise.all([
+        load(pageOf(seed)),
+        loadWordBank(PUZZLE_WORD_BANKS[game], locale).catch(error => console.warn('Failed to load words:', error))
+      ])
+    },
+
+    next() {
+      const puzzle = loaded.get(seed) || generatePuzzle(game, { level, locale, seed })
+      loaded.delete(seed)
+      seed = (seed + 1) % PUZZLE_POOL_SIZE
+      // Keep the current page loaded and the following one ready
+      load(loaded.has(seed) ? pageOf(seed + PUZZLE_PAGE_SIZE) % PUZZLE_POOL_SIZE : pageOf(seed))
+      return puzzle
+    }
+  }
+}
@@ -1,5 +1,6 @@
 import { create } from 'zustand'
 import { persist } from 'zustand/middleware'
+import { getTokenizedDocument, sliceWords } from './tokenizer'
 
 // Main app store
 export const useAppStore = create(
@@ -100,7 +101,8 @@ export const useAppStore = create(
 export const useRSVPStore = create((set, get) => ({
   // RSVP state
   isActive: false,
-  words: [],
+  doc: null, // tokenized text (lib/tokenizer.js)
+  wordCount: 0,
   currentIndex: 0,
   wpm: 250,
   chunkSize: 1,
@@ -111,9 +113,9 @@ export const useRSVPStore = create((set, get) => ({
   fontFamily: 'system-ui',
   
   // Actions
-  loadText: (text) => {
-    const words = text.match(/\S+/g) || []
-    set({ words, currentIndex: 0 })
+  loadText: async (text) => {
+    const doc = await getTokenizedDocument(text)
+    set({ doc, wordCount: doc.count, currentIndex: 0 })
   },
   
   start: () => set({ isActive: true }),
@@ -126,13 +128,13 @@ export const useRSVPStore = create((set, get) => ({
   
   getNextChunk: () => {
     const state = get()
-    const { words, currentIndex, chunkSize } = state
+    const { doc, wordCount, currentIndex, chunkSize } = state
     
-    if (currentIndex >= words.length) {
+    if (currentIndex >= wordCount) {
       return null
     }
     
-    const chunk = words.slice(currentIndex, currentIndex + chunkSize).join(' ')
+    const chunk = sliceWords(doc, currentIndex, currentIndex + chunkSize).join(' ')
     return chunk
   },
   
@@ -140,8 +142,8 @@ export const useRSVPStore = create((set, get) => ({
     const state = get()
     const newIndex = state.currentIndex + state.chunkSize
     
-    if (newIndex >= state.words.length) {
-      set({ isActive: false, currentIndex: state.words.length })
+    if (newIndex >= state.wordCount) {
+      set({ isActive: false, currentIndex: state.wordCount })
       return false
     }
     
@@ -151,7 +153,7 @@ export const useRSVPStore = create((set, get) => ({
   
   getProgress: () => {
     const state = get()
-    return state.words.length > 0 ? (state.currentIndex / state.words.length) * 100 : 0
+    return state.wordCount > 0 ? (state.currentIndex / state.wordCount) * 100 : 0
   }
 }))
 
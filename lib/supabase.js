@@ -1,10 +1,22 @@
 import { createClient } from '@supabase/supabase-js'
+import { uuidv7 } from './ids'
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
 const supabaseAnonKey = process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY
 
 export const supabase = createClient(supabaseUrl, supabaseAnonKey)
 
+// Client acting as the caller of an API request: with the user's access token
+// from the Authorization header, database functions see them as auth.uid()
+export const supabaseForRequest = (request) => {
+  const authorization = request.headers.get('authorization')
+  if (!authorization?.startsWith('Bearer ')) return supabase
+  return createClient(supabaseUrl, supabaseAnonKey, {
+    global: { headers: { Authorization: authorization } },
+    auth: { persistSession: false, autoRefreshToken: false }
+  })
+}
+
 // Database initialization function
 export const initializeDatabase = async () => {
   try {
@@ -38,7 +50,7 @@ export const saveReadingSession = async (userId, sessionData) => {
     const { data, error } = await supabase
       .from('sessions')
       .insert([{
-        id: `session_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+        id: uuidv7(),
         user_id: userId,
         wpm_start: sessionData.wpmStart,
         wpm_end: sessionData.wpmEnd,
@@ -69,7 +81,7 @@ export const saveDocument = async (userId, documentData) => {
     const { data, error } = await supabase
       .from('documents')
       .insert([{
-        id: `doc_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+        id: uuidv7(),
         user_id: userId,
         title: documentData.title,
         content: documentData.content,
@@ -139,4 +151,112 @@ export const updateUserSettings = async (userId, settings) => {
     console.error('Error in updateUserSettings:', error)
     throw error
   }
-}
\ No newline at end of file
+}
+
+// Row versions for conditional GETs (see lib/etag.js)
+export const getSettingsVersion = async (userId) => {
+  const { data, error } = await supabase
+    .from('settings')
+    .select('updated_at')
+    .eq('user_id', userId)
+    .single()
+
+  if (error && error.code !== 'PGRST116') {
+    console.error('Error fetching settings version:', error)
+    throw error
+  }
+
+  return data?.updated_at || null
+}
+
+export const getGameRunsVersion = async (userId) => {
+  const { data, error } = await supabase
+    .from('game_runs')
+    .select('id, created_at')
+    .eq('user_id', userId)
+    .order('created_at', { ascending: false })
+    .order('id', { ascending: false })
+    .limit(1)
+
+  if (error) {
+    console.error('Error fetching game runs version:', error)
+    throw error
+  }
+
+  return data && data.length > 0 ? `${data[0].created_at}/${data[0].id}` : null
+}
+
+// Daily score bins from game_daily_stats, one entry per day ending at endDate
+// (YYYY-MM-DD, UTC; defaults to today)
+export const getScoreSeries = async (userId, game, days = 30, endDate = null) => {
+  const { data, error } = await supabase.rpc('get_score_series', {
+    target_user_id: userId,
+    target_game: game,
+    days,
+    ...(endDate ? { end_date: endDate } : {})
+  })
+
+  if (error) {
+    console.error('Error fetching score series:', error)
+    throw error
+  }
+
+  return (data || []).map(row => ({
+    date: row.day,
+    runs: row.runs,
+    best: row.best_score,
+    avg: row.avg_score === null ? null : Number(row.avg_score)
+  }))
+}
+
+// Dictionary words of a language by length range, read in pages through the
+// (language, length) index on word_bank
+export const getDictionaryWords = async (language, minLength = 1, maxLength = 32) => {
+  const pageSize = 1000
+  const words = []
+
+  for (let from = 0; ; from += pageSize) {
+    const { data, error } = await supabase
+      .from('word_bank')
+      .select('word')
+      .eq('language', language)
+      .gte('length', minLength)
+      .lte('length', maxLength)
+      .order('id', { ascending: true })
+      .range(from, from + pageSize - 1)
+
+    if (error) {
+      console.error('Error fetching dictionary words:', error)
+      throw error
+    }
+
+    for (const row of data || []) words.push(row.word)
+    if (!data || data.length < pageSize) return words
+  }
+}
+
+// word_bank rows of one language and length with sample_key in
+// [fromKey, toKey), in sample_key order (idx_word_bank_sample, or
+// idx_word_bank_band_sample when a frequency band is given)
+export const getWordWindow = async ({ language, length, band = null, fromKey, toKey = null, limit }) => {
+  let query = supabase
+    .from('word_bank')
+    .select('word, frequency_rank')
+    .eq('language', language)
+    .eq('length', length)
+
+  if (band !== null) query = query.eq('frequency_band', band)
+  query = query.gte('sample_key', fromKey)
+  if (toKey !== null) query = query.lt('sample_key', toKey)
+
+  const { data, error } = await query
+    .order('sample_key', { ascending: true })
+    .limit(limit)
+
+  if (error) {
+    console.error('Error fetching word window:', error)
+    throw error
+  }
+
+  return data || []
+}
@@ -0,0 +1,262 @@
+/**
+ * Compact tokenized documents for the RSVP and accelerator readers
+ *
+ * A text is tokenized once into a few typed arrays instead of an array of
+ * word strings:
+ * - chars: Uint16Array with the UTF-16 code units of the text
+ * - offsets: Uint32Array with a [start, end) pair into chars per word
+ * - weights: Float32Array with the relative display time of each word (1 per
+ *   word, more for long words and for the pause after punctuation)
+ * - flags: Uint8Array with WORD_FLAG (has letters or digits) and BREAK_FLAG
+ *   (ends a sentence or clause, so a chunk should end there)
+ *
+ * Plain typed arrays can be stored in IndexedDB as they are and posted to a
+ * worker with their buffers transferred instead of copied. Documents are
+ * cached in IndexedDB by content, so reopening a text skips tokenization.
+ */
+
+export const TOKENIZER_VERSION = 1
+export const WORD_FLAG = 1
+export const BREAK_FLAG = 2
+
+const DOCUMENT_DB = 'spiread-documents'
+const DOCUMENT_STORE = 'tokenized'
+const MAX_CACHED_DOCUMENTS = 20
+
+// Kept whole: their period does not end a sentence
+const ABBREVIATIONS = new Set(['sr.', 'sra.', 'dr.', 'dra.', 'ing.', 'prof.', 'p.ej.', 'etc.'])
+
+// Closing quotes and brackets are skipped when looking for end punctuation,
+// opening ones when looking up abbreviations
+const CLOSERS = new Set([0x22, 0x27, 0x29, 0x5D, 0xBB, 0x2019, 0x201D]) // " ' ) ] » ’ ”
+const OPENERS = /^["'(\[«¿¡‘“]+/
+const LETTER_OR_DIGIT = /[\p{L}\p{N}]/u
+
+// Lazily filled per UTF-16 code unit: 0 unknown, 1 letter or digit, 2 neither
+const letterTable = new Uint8Array(0x10000)
+
+const utf16 = typeof TextDecoder !== 'undefined' ? new TextDecoder('utf-16le') : null
+
+// Same characters as \s
+function isSpace(code) {
+  return code === 32 || (code >= 9 && code <= 13) || code === 160 || code === 0x1680 ||
+    (code >= 0x2000 && code <= 0x200A) || code === 0x2028 || code === 0x2029 ||
+    code === 0x202F || code === 0x205F || code === 0x3000 || code === 0xFEFF
+}
+
+function isLetterOrDigit(code) {
+  if (code < 128) {
+    return (code >= 48 && code <= 57) || ((code | 32) >= 97 && (code | 32) <= 122)
+  }
+  if (letterTable[code] === 0) {
+    // Surrogate halves count as letters (emoji and rare scripts)
+    letterTable[code] = (code >= 0xD800 && code <= 0xDFFF) || LETTER_OR_DIGIT.test(String.fromCharCode(code)) ? 1 : 2
+  }
+  return letterTable[code] === 1
+}
+
+function isAbbreviation(text, start, end) {
+  return end - start <= 8 && ABBREVIATIONS.has(text.slice(start, end).replace(OPENERS, '').toLowerCase())
+}
+
+/**
+ * Number of whitespace-separated words, without building an array
+ */
+export function countWords(text) {
+  let count = 0
+  let inWord = false
+  for (let i = 0; i < text.length; i++) {
+    const space = isSpace(text.charCodeAt(i))
+    if (!space && !inWord) count++
+    inWord = !space
+  }
+  return count
+}
+
+/**
+ * Tokenize a text into the compact representation described above
+ */
+export function tokenizeDocument(text) {
+  const length = text.length
+  const chars = new Uint16Array(length)
+  for (let i = 0; i < length; i++) {
+    chars[i] = text.charCodeAt(i)
+  }
+
+  const count = countWords(text)
+  const offsets = new Uint32Array(count * 2)
+  const weights = new Float32Array(count)
+  const flags = new Uint8Array(count)
+
+  let index = 0
+  let start = -1
+  for (let i = 0; i <= length; i++) {
+    const space = i === length || isSpace(chars[i])
+    if (!space && start < 0) {
+      start = i
+    } else if (space && start >= 0) {
+      let letters = 0
+      for (let j = start; j < i; j++) {
+        if (isLetterOrDigit(chars[j])) letters++
+      }
+      let weight = letters > 0 ? 1 + Math.max(0, letters - 8) * 0.1 : 0 // +10% per letter past 8
+      let flag = letters > 0 ? WORD_FLAG : 0
+
+      let last = i - 1
+      while (last > start && CLOSERS.has(chars[last])) last--
+      const tail = chars[last]
+      if (tail === 0x21 || tail === 0x3F || tail === 0x2026 || (tail === 0x2E && !isAbbreviation(text, start, i))) {
+        // . ! ? … end a sentence
+        weight += 1
+        flag |= BREAK_FLAG
+      } else if (tail === 0x3A) {
+        // : ends a clause
+        weight += 0.5
+        flag |= BREAK_FLAG
+      } else if (tail === 0x2C || tail === 0x3B) {
+        // , ; pause
+        weight += 0.5
+      }
+
+      offsets[index * 2] = start
+      offsets[index * 2 + 1] = i
+      weights[index] = weight
+      flags[index] = flag
+      index++
+      start = -1
+    }
+  }
+
+  return { id: documentId(text), count, chars, offsets, weights, flags }
+}
+
+/**
+ * Text of word `index`
+ */
+export function wordAt(doc, index) {
+  const chars = doc.chars.subarray(doc.offsets[index * 2], doc.offsets[index * 2 + 1])
+  return utf16 ? utf16.decode(chars) : String.fromCharCode.apply(null, chars)
+}
+
+/**
+ * Words [from, to) as strings
+ */
+export function sliceWords(doc, from, to) {
+  const words = []
+  for (let i = Math.max(0, from); i < Math.min(to, doc.count); i++) {
+    words.push(wordAt(doc, i))
+  }
+  return words
+}
+
+/**
+ * Buffers to pass as the transfer list when posting a document to a worker.
+ * The document is unusable on the sending side afterwards.
+ */
+export function transferList(doc) {
+  return [doc.chars.buffer, doc.offsets.buffer, doc.weights.buffer, doc.flags.buffer]
+}
+
+// Cache key: tokenizer version, length and FNV-1a hash of the text
+function documentId(text) {
+  let hash = 0x811c9dc5
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i)
+    hash = Math.imul(hash, 0x01000193)
+  }
+  return `${TOKENIZER_VERSION}:${text.length}:${(hash >>> 0).toString(16)}`
+}
+
+function sameText(chars, text) {
+  if (chars.length !== text.length) return false
+  for (let i = 0; i < chars.length; i++) {
+    if (chars[i] !== text.charCodeAt(i)) return false
+  }
+  return true
+}
+
+let documentDbPromise = null
+
+function openDocumentDb() {
+  if (!documentDbPromise) {
+    documentDbPromise = new Promise((resolve, reject) => {
+      const request = indexedDB.open(DOCUMENT_DB, 1)
+      request.onupgradeneeded = () => {
+        const store = request.result.createObjectStore(DOCUMENT_STORE, { keyPath: 'id' })
+        store.createIndex('by_stored', 'storedAt')
+      }
+      request.onsuccess = () => resolve(request.result)
+      request.onerror = () => reject(request.error)
+    }).catch(error => {
+      documentDbPromise = null
+      throw error
+    })
+  }
+  return documentDbPromise
+}
+
+async function readCachedDocument(id, text) {
+  const db = await openDocumentDb()
+  const record = await new Promise((resolve, reject) => {
+    const request = db.transaction(DOCUMENT_STORE, 'readonly').objectStore(DOCUMENT_STORE).get(id)
+    request.onsuccess = () => resolve(request.result)
+    request.onerror = () => reject(request.error)
+  })
+  if (!record || !sameText(record.chars, text)) return null
+
+  const { storedAt, ...doc } = record
+  return doc
+}
+
+// Store a document, dropping the oldest ones past MAX_CACHED_DOCUMENTS
+async function writeCachedDocument(doc) {
+  const db = await openDocumentDb()
+  const transaction = db.transaction(DOCUMENT_STORE, 'readwrite')
+  const store = transaction.objectStore(DOCUMENT_STORE)
+  store.put({ ...doc, storedAt: Date.now() })
+
+  const countRequest = store.count()
+  countRequest.onsuccess = () => {
+    let excess = countRequest.result - MAX_CACHED_DOCUMENTS
+    if (excess <= 0) return
+    const cursorRequest = store.index('by_stored').openCursor()
+    cursorRequest.onsuccess = () => {
+      const cursor = cursorRequest.result
+      if (!cursor || excess-- <= 0) return
+      cursor.delete()
+      cursor.continue()
+    }
+  }
+
+  await new Promise((resolve, reject) => {
+    transaction.oncomplete = () => resolve()
+    transaction.onerror = () => reject(transaction.error)
+    transaction.onabort = () => reject(transaction.error)
+  })
+}
+
+/**
+ * Tokenized document for `text`, from the IndexedDB cache when it was seen
+ * before. Every call returns its own copy, so the result can be transferred.
+ */
+export async function getTokenizedDocument(text) {
+  if (typeof indexedDB === 'undefined') {
+    return tokenizeDocument(text)
+  }
+
+  try {
+    const cached = await readCachedDocument(documentId(text), text)
+    if (cached) return cached
+  } catch (error) {
+    console.warn('Tokenized document cache unavailable:', error)
+  }
+
+  const doc = tokenizeDocument(text)
+  try {
+    // put() copies the buffers, so `doc` stays usable (and transferable)
+    await writeCachedDocument(doc)
+  } catch (error) {
+    console.warn('Failed to cache tokenized document:', error)
+  }
+  return doc
+}
@@ -0,0 +1,140 @@
+/**
+ * Fixed-size window of recent trials for the difficulty engines
+ *
+ * Success, response time and level of the last `capacity` trials are kept in
+ * typed-array ring buffers. Success and response time sums are updated as
+ * trials enter and leave the window, and the response times are also kept
+ * sorted for the median, so recording a trial and reading the statistics
+ * take constant time (linear in the small window for the median) and do not
+ * allocate.
+ *
+ * A response time of null, undefined or NaN means "not measured": the trial
+ * counts for accuracy but not for the response time statistics.
+ */
+
+export class TrialWindow {
+  constructor(capacity) {
+    this.capacity = capacity
+    this.successes = new Uint8Array(capacity)
+    this.responseTimes = new Float64Array(capacity) // NaN when not measured
+    this.levels = new Uint8Array(capacity)
+    this.sortedRts = new Float64Array(capacity) // measured times in the window, ascending
+    this.clear()
+  }
+
+  clear() {
+    this.start = 0 // slot of the oldest trial
+    this.size = 0
+    this.successCount = 0
+    this.rtCount = 0
+    this.rtSum = 0
+  }
+
+  /**
+   * Add a trial, dropping the oldest one when the window is full
+   */
+  push(success, responseTime = null, level = 0) {
+    let slot
+    if (this.size === this.capacity) {
+      slot = this.start
+      this.start = (this.start + 1) % this.capacity
+      this.successCount -= this.successes[slot]
+      const oldRt = this.responseTimes[slot]
+      if (oldRt === oldRt) this.removeRt(oldRt) // not NaN
+    } else {
+      slot = (this.start + this.size) % this.capacity
+      this.size++
+    }
+
+    const rt = responseTime === null || responseTime === undefined ? NaN : +responseTime
+    this.successes[slot] = success ? 1 : 0
+    this.responseTimes[slot] = rt
+    this.levels[slot] = level
+    this.successCount += this.successes[slot]
+    if (rt === rt) this.insertRt(rt)
+  }
+
+  // Slot of the trial `back` trials before the latest (0 = latest)
+  slot(back) {
+    return (this.start + this.size - 1 - back) % this.capacity
+  }
+
+  lastSuccess() {
+    return this.size > 0 ? this.successes[this.slot(0)] === 1 : null
+  }
+
+  successRate() {
+    return this.size > 0 ? this.successCount / this.size : 0
+  }
+
+  meanRt() {
+    return this.rtCount > 0 ? this.rtSum / this.rtCount : 0
+  }
+
+  medianRt() {
+    if (this.rtCount === 0) return 0
+    const mid = this.rtCount >> 1
+    return this.rtCount % 2 === 1
+      ? this.sortedRts[mid]
+      : (this.sortedRts[mid - 1] + this.sortedRts[mid]) / 2
+  }
+
+  /**
+   * Mean response time of the last `count` successful trials in the window
+   * (unmeasured times count as 0), or null if there are fewer than `count`
+   */
+  recentSuccessMeanRt(count) {
+    let found = 0
+    let sum = 0
+    for (let back = 0; back < this.size && found < count; back++) {
+      const slot = this.slot(back)
+      if (this.successes[slot] === 1) {
+        const rt = this.responseTimes[slot]
+        sum += rt === rt ? rt : 0
+        found++
+      }
+    }
+    return found === count ? sum / count : null
+  }
+
+  insertRt(rt) {
+    let low = 0
+    let high = this.rtCount
+    while (low < high) {
+      const mid = (low + high) >> 1
+      if (this.sortedRts[mid] <= rt) low = mid + 1
+      else high = mid
+    }
+    this.sortedRts.copyWithin(low + 1, low, this.rtCount)
+    this.sortedRts[low] = rt
+    this.rtCount++
+    this.rtSum += rt
+  }
+
+  removeRt(rt) {
+    let low = 0
+    let high = this.rtCount - 1
+    while (low < high) {
+      const mid = (low + high) >> 1
+      if (this.sortedRts[mid] < rt) low = mid + 1
+      else high = mid
+    }
+    this.sortedRts.copyWithin(low, low + 1, this.rtCount)
+    this.rtCount--
+    // Reset when no times are left so rounding error cannot carry over
+    this.rtSum = this.rtCount > 0 ? this.rtSum - rt : 0
+  }
+
+  /**
+   * Trials oldest first, for persistence
+   */
+  toArray() {
+    const trials = []
+    for (let back = this.size - 1; back >= 0; back--) {
+      const slot = this.slot(back)
+      const rt = this.responseTimes[slot]
+      trials.push({ success: this.successes[slot] === 1, responseTime: rt === rt ? rt : null, level: this.levels[slot] })
+    }
+    return trials
+  }
+}
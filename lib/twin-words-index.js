@@ -0,0 +1,326 @@
+/**
+ * TwinWords pair index
+ *
+ * TwinWords shows two words that are either identical or almost identical,
+ * and a round is harder the closer the "different" pairs are. A
+ * TwinWordsIndex precomputes every candidate pair of a locale's word bank
+ * once, grouped by kind, so a round draws fresh pairs with array reads
+ * instead of searching the dictionary:
+ *
+ * - edit1, edit2, edit3: two dictionary words at that edit (Levenshtein)
+ *   distance. Words are compared in length order, only within the length
+ *   difference the distance allows, after a letter-set lower bound, with a
+ *   banded Levenshtein that stops once the limit is exceeded.
+ * - accent: a word and the same word without its accents (médico/medico)
+ * - visual: a word with one letter or letter group swapped for a lookalike
+ *   from the lettersGrid confusables map (tiempo/tiernpo, claro/daro), at
+ *   most MAX_VISUAL_PER_WORD per word so misprints don't crowd out the rest
+ * - case: a word and its upper-case or capitalized form, made on the fly
+ *
+ * The word banks are small (about 90 words per locale), so some kinds have
+ * only a handful of pairs; drawPairs tops a round up from the nearest kinds
+ * (KIND_FALLBACKS) when the requested ones run out.
+ *
+ * getTwinWordsIndex(locale) builds the index from the locale's word bank
+ * shards (lib/word-bank-shards.js), once per locale.
+ */
+
+import { WORD_BANK_LOCALES, loadWordBank } from './word-bank-shards'
+import { normalizeWord } from './anagram-index'
+
+export const TWIN_WORDS_LOCALES = WORD_BANK_LOCALES
+export const MAX_PAIR_DISTANCE = 3
+export const PAIR_KINDS = ['edit1', 'edit2', 'edit3', 'accent', 'visual', 'case']
+const MIN_WORD_LENGTH = 3
+const MAX_DRAW_ATTEMPTS = 20
+const MAX_VISUAL_PER_WORD = 2
+const WORD_PATTERN = /^\p{L}+$/u
+
+// Pair kinds by subtletyLevel (see getTwinWordsParameters), easiest first
+const KINDS_BY_SUBTLETY = [
+  ['edit3', 'edit2', 'case'],
+  ['edit2', 'case', 'accent'],
+  ['edit2', 'edit1', 'accent'],
+  ['edit1', 'accent', 'visual'],
+  ['edit1', 'visual']
+]
+
+// Kinds of a similar subtlety, nearest first, used when a kind runs out
+const KIND_FALLBACKS = {
+  edit1: ['visual', 'accent', 'edit2'],
+  edit2: ['edit1', 'edit3', 'accent'],
+  edit3: ['edit2', 'case'],
+  accent: ['visual', 'edit1'],
+  visual: ['edit1', 'accent'],
+  case: ['edit3', 'accent']
+}
+
+export function pairKindsForSubtlety(subtletyLevel) {
+  const tier = Math.min(KINDS_BY_SUBTLETY.length, Math.max(1, Math.round(subtletyLevel) || 1))
+  return KINDS_BY_SUBTLETY[tier - 1]
+}
+
+export function stripAccents(word) {
+  return word.normalize('NFD').replace(/\p{M}/gu, '').normalize('NFC')
+}
+
+// One bit per letter (folded to 32 bits, which only weakens the bound)
+function letterMask(word) {
+  let mask = 0
+  for (let i = 0; i < word.length; i++) mask |= 1 << (word.charCodeAt(i) & 31)
+  return mask
+}
+
+function popcount(x) {
+  x -= (x >>> 1) & 0x55555555
+  x = (x & 0x33333333) + ((x >>> 2) & 0x33333333)
+  return (((x + (x >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24
+}
+
+// Every letter one word has and the other lacks takes its own edit
+function maskLowerBound(a, b) {
+  return Math.max(popcount(a & ~b), popcount(b & ~a))
+}
+
+export class TwinWordsIndex {
+  /**
+   * `confusables` maps a letter or letter group to the ones it can be
+   * mistaken for, as in WORD_BANK.lettersGrid[locale].confusables
+   */
+  constructor(words, confusables = {}) {
+    const unique = new Set()
+    for (const word of words) {
+      const normalized = normalizeWord(word)
+      if (normalized.length >= MIN_WORD_LENGTH && WORD_PATTERN.test(normalized)) unique.add(normalized)
+    }
+    this.words = [...unique].sort()
+    this.masks = Int32Array.from(this.words, letterMask)
+    // Word ids by length, for scanning only the lengths within reach
+    this.byLength = Int32Array.from(this.words.keys()).sort((a, b) => this.words[a].length - this.words[b].length)
+
+    // Levenshtein rows, reused by every distance() call
+    const longest = this.words.reduce((max, word) => Math.max(max, word.length), 0)
+    this.previousRow = new Uint16Array(longest + 1)
+    this.currentRow = new Uint16Array(longest + 1)
+
+    this.buildEditPairs()
+    this.buildVariantPairs(confusables)
+  }
+
+  get size() {
+    return this.words.length
+  }
+
+  /**
+   * Edit distance between two words, or `limit + 1` as soon as it is known
+   * to be above `limit`. Only the diagonal band |i - j| <= limit is filled.
+   */
+  distance(a, b, limit = Infinity) {
+    if (a.length < b.length) [a, b] = [b, a]
+    const m = a.length
+    const n = b.length
+    if (m - n > limit) return limit + 1
+    const band = Math.min(limit, m)
+    const outside = band + 1
+    if (this.previousRow.length <= n + 1) {
+      this.previousRow = new Uint16Array(n + 2)
+      this.currentRow = new Uint16Array(n + 2)
+    }
+    let previous = this.previousRow
+    let current = this.currentRow
+    for (let j = 0; j <= n; j++) previous[j] = j <= band ? j : outside
+    previous[n + 1] = outside
+
+    for (let i = 1; i <= m; i++) {
+      const lo = Math.max(1, i - band)
+      const hi = Math.min(n, i + band)
+      current[lo - 1] = lo === 1 ? (i <= band ? i : outside) : outside
+      let rowMin = current[lo - 1]
+      const char = a.charCodeAt(i - 1)
+      for (let j = lo; j <= hi; j++) {
+        const substitution = previous[j - 1] + (char === b.charCodeAt(j - 1) ? 0 : 1)
+        const value = Math.min(substitution, previous[j] + 1, current[j - 1] + 1, outside)
+        current[j] = value
+        if (value < rowMin) rowMin = value
+      }
+      current[hi + 1] = outside
+      if (rowMin > limit) return limit + 1
+      const swap = previous
+      previous = current
+      current = swap
+    }
+    return previous[n] > limit ? limit + 1 : previous[n]
+  }
+
+  // Ids of the words within maxDistance of `word` (not the word itself), with their distances
+  search(word, maxDistance) {
+    const found = []
+    const mask = letterMask(word)
+    for (const wordId of this.byLength) {
+      const other = this.words[wordId]
+      if (other.length > word.length + maxDistance) break
+      if (other.length < word.length - maxDistance || maskLowerBound(mask, this.masks[wordId]) > maxDistance) continue
+      const distance = this.distance(word, other, maxDistance)
+      if (distance > 0 && distance <= maxDistance) found.push([wordId, distance])
+    }
+    return found
+  }
+
+  /**
+   * Dictionary words within maxDistance edits of `word`, closest first
+   */
+  within(word, maxDistance = 1) {
+    return this.search(normalizeWord(word), maxDistance)
+      .map(([wordId, distance]) => ({ word: this.words[wordId], distance }))
+      .sort((a, b) => a.distance - b.distance || (a.word < b.word ? -1 : 1))
+  }
+
+  /**
+   * Word id pairs at each distance, flattened: [a0, b0, a1, b1, ...]. A pair
+   * must keep at least half of the shorter word, or it is just two words.
+   */
+  buildEditPairs() {
+    const pairs = Array.from({ length: MAX_PAIR_DISTANCE }, () => [])
+    const { byLength, masks, words } = this
+    for (let i = 0; i < byLength.length; i++) {
+      const wordId = byLength[i]
+      const word = words[wordId]
+      // The shorter word (this one) bounds the distance
+      const radius = Math.min(MAX_PAIR_DISTANCE, word.length >> 1)
+      for (let k = i + 1; k < byLength.length; k++) {
+        const otherId = byLength[k]
+        const other = words[otherId]
+        if (other.length - word.length > radius) break
+        if (maskLowerBound(masks[wordId], masks[otherId]) > radius) continue
+        const distance = this.distance(word, other, radius)
+        if (distance <= radius) {
+          pairs[distance - 1].push(Math.min(wordId, otherId), Math.max(wordId, otherId))
+        }
+      }
+    }
+    this.editPairs = pairs.map(ids => Int32Array.from(ids))
+  }
+
+  // Accent and lookalike variants: variantWords[kind][i] is the word id of variants[kind][i]
+  buildVariantPairs(confusables) {
+    const accent = { wordIds: [], variants: [] }
+    const visual = { wordIds: [], variants: [] }
+    const dictionary = new Set(this.words)
+    const groups = Object.keys(confusables)
+
+    this.words.forEach((word, wordId) => {
+      const unaccented = stripAccents(word)
+      if (unaccented !== word) {
+        accent.wordIds.push(wordId)
+        accent.variants.push(unaccented)
+      }
+
+      const seen = new Set()
+      for (const group of groups) {
+        for (let at = word.indexOf(group); at !== -1 && seen.size < MAX_VISUAL_PER_WORD; at = word.indexOf(group, at + 1)) {
+          for (const lookalike of confusables[group]) {
+            const variant = word.slice(0, at) + lookalike + word.slice(at + group.length)
+            // A real word is an edit pair, not a misprint
+            if (variant === word || seen.has(variant) || dictionary.has(variant)) continue
+            seen.add(variant)
+            visual.wordIds.push(wordId)
+            visual.variants.push(variant)
+            if (seen.size === MAX_VISUAL_PER_WORD) break
+          }
+        }
+      }
+    })
+
+    this.variantWords = { accent: Int32Array.from(accent.wordIds), visual: Int32Array.from(visual.wordIds) }
+    this.variants = { accent: accent.variants, visual: visual.variants }
+  }
+
+  pairCount(kind) {
+    if (kind.startsWith('edit')) return (this.editPairs[Number(kind.slice(4)) - 1]?.length || 0) / 2
+    if (kind === 'case') return this.words.length
+    return this.variants[kind]?.length || 0
+  }
+
+  // One pair of the given kind, in random order; null if there is none
+  randomPair(kind, random) {
+    const count = this.pairCount(kind)
+    if (count === 0) return null
+    const i = Math.floor(random() * count)
+    let word1
+    let word2
+    if (kind.startsWith('edit')) {
+      const ids = this.editPairs[Number(kind.slice(4)) - 1]
+      word1 = this.words[ids[2 * i]]
+      word2 = this.words[ids[2 * i + 1]]
+    } else if (kind === 'case') {
+      word1 = this.words[i]
+      word2 = random() < 0.5 ? word1.toUpperCase() : word1[0].toUpperCase() + word1.slice(1)
+    } else {
+      word1 = this.words[this.variantWords[kind][i]]
+      word2 = this.variants[kind][i]
+    }
+    return random() < 0.5 ? { word1, word2, kind } : { word1: word2, word2: word1, kind }
+  }
+
+  /**
+   * Up to `count` different pairs of the given kinds, each kind as likely
+   * as the others, with no word used twice. Kinds without pairs are skipped;
+   * if they can't fill the round, it is topped up from their KIND_FALLBACKS.
+   */
+  drawPairs(kinds, count, random = Math.random) {
+    const used = new Set()
+    const pairs = []
+    const fallbacks = [...new Set(kinds.flatMap(kind => KIND_FALLBACKS[kind] || []))]
+      .filter(kind => !kinds.includes(kind))
+    for (const group of [kinds, fallbacks]) {
+      const available = group.filter(kind => this.pairCount(kind) > 0)
+      for (let attempt = 0; pairs.length < count && available.length > 0 && attempt < count * MAX_DRAW_ATTEMPTS; attempt++) {
+        const pair = this.randomPair(available[Math.floor(random() * available.length)], random)
+        const base1 = normalizeWord(pair.word1)
+        const base2 = normalizeWord(pair.word2)
+        if (used.has(base1) || used.has(base2)) continue
+        used.add(base1)
+        used.add(base2)
+        pairs.push(pair)
+      }
+    }
+    return pairs
+  }
+
+  /**
+   * `count` different dictionary words, none of them in `exclude`
+   */
+  drawWords(count, random = Math.random, exclude = new Set()) {
+    const words = []
+    const picked = new Set(exclude)
+    for (let attempt = 0; words.length < count && attempt < count * MAX_DRAW_ATTEMPTS; attempt++) {
+      const word = this.words[Math.floor(random() * this.words.length)]
+      if (word === undefined || picked.has(word)) continue
+      picked.add(word)
+      words.push(word)
+    }
+    return words
+  }
+}
+
+// Words of the word bank games for a locale (lists, or lists by length)
+async function bundledWords(locale) {
+  const banks = await Promise.all(['anagrams', 'wordSearch', 'runningWords'].map(game => loadWordBank(game, locale)))
+  return banks.flatMap(bank => (Array.isArray(bank) ? bank : Object.values(bank).flat()))
+}
+
+const indexes = new Map()
+
+/**
+ * Promise of the pair index of the word bank for a locale, built once per locale
+ */
+export function getTwinWordsIndex(locale = 'es') {
+  let index = indexes.get(locale)
+  if (!index) {
+    index = Promise.all([bundledWords(locale), loadWordBank('lettersGrid', locale)])
+      .then(([words, lettersGrid]) => new TwinWordsIndex(words, lettersGrid?.confusables))
+    index.catch(() => indexes.delete(locale))
+    indexes.set(locale, index)
+  }
+  return index
+}
@@ -0,0 +1,23 @@
+// Auto-generated by scripts/seed-word-bank.js: word bank shard URLs
+// (public/word-bank/) by game and locale
+
+export const WORD_BANK_LOCALES = ["es","en"];
+
+export const WORD_BANK_SHARDS = {
+  "lettersGrid": {
+    "es": "/word-bank/lettersGrid.es.97129735.json",
+    "en": "/word-bank/lettersGrid.en.7b21bc95.json"
+  },
+  "wordSearch": {
+    "es": "/word-bank/wordSearch.es.23f515c8.json",
+    "en": "/word-bank/wordSearch.en.0a03959c.json"
+  },
+  "anagrams": {
+    "es": "/word-bank/anagrams.es.1831b1ab.json",
+    "en": "/word-bank/anagrams.en.9b9cf747.json"
+  },
+  "runningWords": {
+    "es": "/word-bank/runningWords.es.4c94007b.json",
+    "en": "/word-bank/runningWords.en.d0769f7b.json"
+  }
+};
@@ -0,0 +1,77 @@
+/**
+ * Word bank shards, loaded on demand
+ *
+ * scripts/seed-word-bank.js writes each game's words for each locale to a
+ * minified JSON file under public/word-bank/, named by a hash of its content
+ * (the URLs are in lib/word-bank-manifest.js). A game fetches only its own
+ * shard instead of importing the whole of lib/word-bank.js into its route,
+ * and JSON.parse of a shard is cheaper than parsing the same object literal
+ * as JavaScript. A shard URL never changes content, so the service worker
+ * serves shards cache-first and precaches them for offline play.
+ *
+ * On the server, and in the browser when a shard cannot be fetched, the data
+ * comes from lib/word-bank.js, imported lazily so it stays out of the client
+ * bundles.
+ */
+
+import { WORD_BANK_LOCALES, WORD_BANK_SHARDS } from './word-bank-manifest'
+
+export { WORD_BANK_LOCALES }
+
+const IN_BROWSER = typeof window !== 'undefined' || typeof WorkerGlobalScope !== 'undefined'
+
+const shards = new Map() // `${game}.${locale}` -> { data, promise }
+
+function shardKey(game, locale) {
+  return `${game}.${WORD_BANK_SHARDS[game][locale] ? locale : 'es'}`
+}
+
+async function fetchShard(game, locale) {
+  if (IN_BROWSER) {
+    try {
+      const response = await fetch(WORD_BANK_SHARDS[game][locale])
+      if (response.ok) return await response.json()
+      console.warn(`Word bank shard ${game}.${locale} returned ${response.status}`)
+    } catch (error) {
+      console.warn(`Failed to load word bank shard ${game}.${locale}:`, error)
+    }
+  }
+
+  const { WORD_BANK } = await import('./word-bank')
+  return WORD_BANK[game][locale]
+}
+
+/**
+ * Words of one game and locale (the WORD_BANK[game][locale] entry), fetched
+ * once per page. Unknown locales fall back to Spanish.
+ */
+export function loadWordBank(game, locale = 'es') {
+  if (!WORD_BANK_SHARDS[game]) {
+    return Promise.reject(new Error(`Unknown word bank: ${game}`))
+  }
+
+  const key = shardKey(game, locale)
+  let shard = shards.get(key)
+  if (!shard) {
+    shard = { data: null, promise: null }
+    shard.promise = fetchShard(game, key.slice(game.length + 1))
+      .then(data => {
+        shard.data = data
+        return data
+      })
+      .catch(error => {
+        shards.delete(key)
+        throw error
+      })
+    shards.set(key, shard)
+  }
+  return shard.promise
+}
+
+/**
+ * The shard if it has already loaded, otherwise null
+ */
+export function getLoadedWordBank(game, locale = 'es') {
+  if (!WORD_BANK_SHARDS[game]) return null
+  return shards.get(shardKey(game, locale))?.data || null
+}
@@ -0,0 +1,139 @@
+/**
+ * Random word samples from the word_bank table by frequency band
+ *
+ * Each word_bank row has a fixed random sample_key (see
+ * supabase/migrations/20261019120900_word_bank_sampling.sql). A window is the
+ * WINDOW_SIZE rows of one language, length and band at or after a random
+ * key, read in index order and wrapping around to key 0, so the database
+ * never sorts the table and reads only the rows it returns. Windows are
+ * cached in the process for WINDOW_TTL_MS and requests sample from them in
+ * memory; every new window starts at a new random key, so over time every
+ * word comes up.
+ *
+ * When the table has too few words for a request, or cannot be reached, the
+ * rest come from the word bank shards (lib/word-bank-shards.js), which have
+ * no frequency ranks.
+ */
+
+import { loadWordBank } from './word-bank-shards'
+
+// frequency_band values (generated from frequency_rank); null = any band
+export const WORD_FREQUENCY_BANDS = {
+  any: null,
+  unranked: 0,
+  common: 1, // rank 1-2000
+  intermediate: 2, // rank 2001-10000
+  rare: 3 // rank above 10000
+}
+export const MAX_SAMPLE_SIZE = 100
+export const MAX_WORD_LENGTH = 16
+const WINDOW_SIZE = 400
+const WINDOW_TTL_MS = 5 * 60 * 1000
+const MAX_CACHED_WINDOWS = 256
+
+// key -> { words: Promise of the window's words, loadedAt }; Map order is LRU
+const windows = new Map()
+
+function getWindow(language, length, band, fetchWindow, random) {
+  const key = `${language}:${length}:${band}`
+  const cached = windows.get(key)
+  if (cached) {
+    windows.delete(key)
+    if (Date.now() - cached.loadedAt < WINDOW_TTL_MS) {
+      windows.set(key, cached)
+      return cached.words
+    }
+  }
+
+  const fromKey = random()
+  const query = { language, length, band: WORD_FREQUENCY_BANDS[band] }
+  const words = fetchWindow({ ...query, fromKey, limit: WINDOW_SIZE })
+    .then(async rows => {
+      if (rows.length === WINDOW_SIZE || fromKey === 0) return rows
+      // Past the last key: continue from the start, up to where we began
+      const wrapped = await fetchWindow({ ...query, fromKey: 0, toKey: fromKey, limit: WINDOW_SIZE - rows.length })
+      return [...rows, ...wrapped]
+    })
+    .then(rows => rows.map(row => row.word))
+  words.catch(() => windows.delete(key))
+
+  while (windows.size >= MAX_CACHED_WINDOWS) {
+    windows.delete(windows.keys().next().value)
+  }
+  windows.set(key, { words, loadedAt: Date.now() })
+  return words
+}
+
+// Word bank shard words of the given lengths (by actual length)
+async function bundledWords(language, minLength, maxLength) {
+  const banks = await Promise.all(['anagrams', 'wordSearch', 'runningWords'].map(game => loadWordBank(game, language)))
+  return banks
+    .flatMap(bank => (Array.isArray(bank) ? bank : Object.values(bank).flat()))
+    .filter(word => word.length >= minLength && word.length <= maxLength)
+}
+
+// `count` distinct items drawn uniformly (partial Fisher-Yates on a copy)
+function pickDistinct(items, count, random) {
+  const pool = [...items]
+  const picked = Math.min(count, pool.length)
+  for (let i = 0; i < picked; i++) {
+    const j = i + Math.floor(random() * (pool.length - i))
+    const tmp = pool[i]
+    pool[i] = pool[j]
+    pool[j] = tmp
+  }
+  return pool.slice(0, picked)
+}
+
+/**
+ * Up to `count` distinct words of `language` with minLength to maxLength
+ * letters in the given band. `fetchWindow(query)` reads word_bank rows (see
+ * getWordWindow in lib/supabase.js). `source` tells where the words came
+ * from: 'word_bank', 'bundled' or 'mixed'.
+ */
+export async function sampleWords({ language, minLength, maxLength, band = 'any', count }, fetchWindow, random = Math.random) {
+  let sampled = []
+  try {
+    const lengths = Array.from({ length: maxLength - minLength + 1 }, (_, i) => minLength + i)
+    const lists = await Promise.all(lengths.map(length => getWindow(language, length, band, fetchWindow, random)))
+    sampled = pickDistinct(new Set(lists.flat()), count, random)
+  } catch (error) {
+    console.error('Error sampling word_bank:', error)
+  }
+
+  if (sampled.length === count) return { words: sampled, source: 'word_bank' }
+
+  const have = new Set(sampled)
+  const extra = (await bundledWords(language, minLength, maxLength)).filter(word => !have.has(word))
+  const words = [...sampled, ...pickDistinct(new Set(extra), count - sampled.length, random)]
+  return { words, source: sampled.length > 0 ? 'mixed' : 'bundled' }
+}
+
+// Common words on early levels, rarer ones as the level rises
+export function bandForLevel(level) {
+  if (level <= 7) return 'common'
+  if (level <= 14) return 'intermediate'
+  return 'any'
+}
+
+/**
+ * Client side: a sample from GET /api/words, or null if it failed
+ */
+export async function fetchWordSample({ locale, minLength, maxLength, band = 'any', count }) {
+  const params = new URLSearchParams({
+    locale,
+    min_length: String(minLength),
+    max_length: String(maxLength),
+    band,
+    count: String(count)
+  })
+  try {
+    const response = await fetch(`/api/words?${params}`)
+    if (!response.ok) return null
+    const data = await response.json()
+    return data.words
+  } catch (error) {
+    console.warn('Failed to load word sample:', error)
+    return null
+  }
+}
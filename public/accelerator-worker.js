@@ -1,105 +1,327 @@
 // Accelerator Reading Web Worker
-let chunks = []
+//
+// Chunks are shown on absolute deadlines (performance.now()) instead of a
+// setInterval, so timer lateness is corrected on the next chunk rather than
+// accumulating. Each chunk gets its own duration: long words and punctuation
+// get more time, short chunks less, scaled so the average still matches the
+// requested WPM. Timing statistics are reported back as STATS messages.
+//
+// The text arrives as a tokenized document from lib/tokenizer.js (typed
+// arrays, transferred rather than copied). The worker splits it into chunks
+// itself, so a new chunk size needs no new document, and TICK carries the
+// words of the current chunk and its neighbours for display.
+
+// Token flags, as in lib/tokenizer.js
+const WORD_FLAG = 1
+const BREAK_FLAG = 2
+const CONTEXT_CHUNKS = 3 // neighbours on each side sent with every TICK
+
+const utf16 = new TextDecoder('utf-16le')
+
+let doc = null // { count, chars, offsets, weights, flags }
+let chunkStarts = new Uint32Array(1) // first word of each chunk, then doc.count
+let chunkCount = 0
 let currentIndex = 0
 let wpm = 250
 let chunkSize = 1
 let isRunning = false
-let intervalId = null
+let timeoutId = null
+
+// Per-chunk durations (ms) and word counts for the current chunks and WPM
+let durations = new Float64Array(0)
+let wordCounts = new Uint16Array(0)
+
+// Scheduling state
+let nextDeadline = 0 // performance.now() time the next chunk is due
+let shownAt = 0 // when the current chunk was shown
+
+const EARLY_WAKE_MS = 1 // re-arm when a timer fires this early
+const STALL_MS = 250 // later than this (throttled tab, long GC) restarts the timeline
+const STATS_EVERY_TICKS = 50
+const LATENESS_SAMPLES = 512
+
+// Timing statistics since INIT
+let stats = createStats()
+
+function createStats() {
+  return {
+    ticks: 0,
+    stalls: 0,
+    words: 0,
+    activeMs: 0,
+    lateness: new Float64Array(LATENESS_SAMPLES), // ring buffer of recent tick lateness (ms)
+    latenessSum: 0,
+    latenessMax: 0
+  }
+}
 
 // Message handling from main thread
 self.addEventListener('message', function(e) {
   const { type, payload } = e.data
-  
+
   switch (type) {
     case 'INIT':
-      chunks = payload.chunks || []
+      doc = payload.document
       currentIndex = 0
-      wpm = payload.wpm || 250
-      chunkSize = payload.chunkSize || 1
+      wpm = payload.wpm || wpm
+      chunkSize = payload.chunkSize || chunkSize
+      buildChunks()
+      computeDurations()
+      stats = createStats()
+      sendLoaded()
+      if (isRunning && chunkCount > 0) {
+        // New text while playing: continue from its first chunk
+        showChunk(performance.now())
+      } else {
+        pauseReading()
+        sendTick()
+      }
       break
-      
+
     case 'PLAY':
-      if (!isRunning && chunks.length > 0) {
+      if (!isRunning && chunkCount > 0) {
         startReading()
       }
       break
-      
+
     case 'PAUSE':
-      pauseReading()
+      if (isRunning) {
+        pauseReading()
+        sendStats()
+      }
       break
-      
+
     case 'SEEK':
-      currentIndex = Math.max(0, Math.min(chunks.length - 1, payload.index))
+      currentIndex = Math.max(0, Math.min(chunkCount - 1, payload.index))
       if (isRunning) {
+        showChunk(performance.now())
+      } else {
         sendTick()
       }
       break
-      
+
     case 'SET_WPM':
       wpm = payload.wpm
+      computeDurations()
       if (isRunning) {
-        // Restart with new WPM
-        pauseReading()
-        startReading()
+        // Keep the timeline; only the current chunk's deadline moves
+        nextDeadline = shownAt + durations[currentIndex]
+        schedule()
       }
       break
-      
+
     case 'SET_CHUNK_SIZE':
       chunkSize = payload.chunkSize
+      if (doc) {
+        // Stay on the chunk holding the word currently shown
+        const word = chunkStarts[currentIndex]
+        buildChunks()
+        currentIndex = chunkOfWord(word)
+        computeDurations()
+        sendLoaded()
+        sendTick()
+        if (isRunning) {
+          nextDeadline = shownAt + durations[currentIndex]
+          schedule()
+        }
+      }
+      break
+
+    case 'GET_STATS':
+      sendStats()
       break
-      
+
     default:
       console.warn('Unknown message type:', type)
   }
 })
 
+// Split the document into chunks of up to chunkSize words, ending a chunk
+// early at the end of a sentence or clause
+function buildChunks() {
+  const starts = new Uint32Array(doc.count + 1)
+  let count = 0
+  let size = 0
+  for (let i = 0; i < doc.count; i++) {
+    if (size === 0) starts[count++] = i
+    size++
+    if (size >= chunkSize || (doc.flags[i] & BREAK_FLAG)) size = 0
+  }
+  starts[count] = doc.count
+  chunkStarts = starts.subarray(0, count + 1)
+  chunkCount = count
+}
+
+// Index of the chunk containing word `word` (binary search over chunkStarts)
+function chunkOfWord(word) {
+  let low = 0
+  let high = chunkCount - 1
+  while (low < high) {
+    const mid = (low + high + 1) >> 1
+    if (chunkStarts[mid] <= word) low = mid
+    else high = mid - 1
+  }
+  return Math.max(0, low)
+}
+
+function chunkWords(index) {
+  const words = []
+  for (let i = chunkStarts[index]; i < chunkStarts[index + 1]; i++) {
+    words.push(utf16.decode(doc.chars.subarray(doc.offsets[i * 2], doc.offsets[i * 2 + 1])))
+  }
+  return words
+}
+
+// Spread the time the requested WPM allows for the whole text over the chunks
+// by weight, so the WPM is met on average while each chunk gets what it needs
+// (punctuation-only chunks still flash briefly)
+function computeDurations() {
+  durations = new Float64Array(chunkCount)
+  wordCounts = new Uint16Array(chunkCount)
+  let totalWords = 0
+  let totalWeight = 0
+
+  for (let c = 0; c < chunkCount; c++) {
+    let weight = 0
+    for (let i = chunkStarts[c]; i < chunkStarts[c + 1]; i++) {
+      weight += doc.weights[i]
+      if (doc.flags[i] & WORD_FLAG) wordCounts[c]++
+    }
+    durations[c] = Math.max(weight, 0.5)
+    totalWords += wordCounts[c]
+    totalWeight += durations[c]
+  }
+
+  const totalMs = (Math.max(totalWords, 1) * 60000) / wpm
+  for (let c = 0; c < chunkCount; c++) {
+    durations[c] = (durations[c] / totalWeight) * totalMs
+  }
+}
+
 function startReading() {
   if (isRunning) return
-  
+
   isRunning = true
-  
-  // Calculate interval based on WPM and chunk size
-  const wordsPerSecond = wpm / 60
-  const intervalMs = (1000 * chunkSize) / wordsPerSecond
-  
-  sendTick() // Send immediate tick
-  
-  intervalId = setInterval(() => {
-    currentIndex++
-    
-    if (currentIndex >= chunks.length) {
-      // Reading finished
-      pauseReading()
-      self.postMessage({ type: 'END' })
-      return
-    }
-    
-    sendTick()
-  }, intervalMs)
+  showChunk(performance.now()) // Send immediate tick
 }
 
 function pauseReading() {
   isRunning = false
-  if (intervalId) {
-    clearInterval(intervalId)
-    intervalId = null
+  if (timeoutId) {
+    clearTimeout(timeoutId)
+    timeoutId = null
+  }
+}
+
+// Show the current chunk at `now` and set the deadline for the next one
+function showChunk(now) {
+  shownAt = now
+  nextDeadline = now + durations[currentIndex]
+  sendTick()
+  schedule()
+}
+
+function schedule() {
+  if (timeoutId) clearTimeout(timeoutId)
+  timeoutId = setTimeout(onTimer, Math.max(0, nextDeadline - performance.now()))
+}
+
+function onTimer() {
+  timeoutId = null
+  if (!isRunning) return
+
+  const now = performance.now()
+  if (nextDeadline - now > EARLY_WAKE_MS) {
+    schedule()
+    return
   }
+
+  // The chunk on screen has been read
+  const lateness = now - nextDeadline
+  recordTick(lateness, now - shownAt, wordCounts[currentIndex])
+  currentIndex++
+
+  if (currentIndex >= chunkCount) {
+    // Reading finished
+    pauseReading()
+    sendStats()
+    self.postMessage({ type: 'END' })
+    return
+  }
+
+  // Start the next chunk at its deadline so lateness does not accumulate,
+  // unless we are so late that catching up would flash chunks
+  const startAt = lateness > STALL_MS ? now : nextDeadline
+  if (lateness > STALL_MS) stats.stalls++
+
+  shownAt = startAt
+  nextDeadline = startAt + durations[currentIndex]
+  sendTick()
+  schedule()
+
+  if (stats.ticks % STATS_EVERY_TICKS === 0) {
+    sendStats()
+  }
+}
+
+function recordTick(lateness, shownMs, words) {
+  stats.lateness[stats.ticks % LATENESS_SAMPLES] = lateness
+  stats.ticks++
+  stats.latenessSum += lateness
+  stats.latenessMax = Math.max(stats.latenessMax, lateness)
+  stats.words += words
+  stats.activeMs += shownMs
 }
 
 function sendTick() {
-  if (currentIndex < chunks.length) {
-    const chunk = chunks[currentIndex]
+  if (currentIndex < chunkCount) {
+    const context = []
+    const last = Math.min(chunkCount - 1, currentIndex + CONTEXT_CHUNKS)
+    for (let index = Math.max(0, currentIndex - CONTEXT_CHUNKS); index <= last; index++) {
+      context.push({ index, words: chunkWords(index) })
+    }
     self.postMessage({
       type: 'TICK',
       payload: {
         index: currentIndex,
-        chunk: chunk,
-        progress: (currentIndex / chunks.length) * 100
+        chunk: chunkWords(currentIndex),
+        context,
+        progress: (currentIndex / chunkCount) * 100
       }
     })
   }
 }
 
+function sendLoaded() {
+  self.postMessage({
+    type: 'LOADED',
+    payload: { chunkCount, wordCount: doc.count }
+  })
+}
+
+// Achieved vs target WPM and tick lateness (p50/p95 over the last
+// LATENESS_SAMPLES ticks)
+function sendStats() {
+  if (stats.ticks === 0) return
+
+  const samples = stats.lateness.slice(0, Math.min(stats.ticks, LATENESS_SAMPLES)).sort()
+  const percentile = p => samples[Math.min(samples.length - 1, Math.floor(p * samples.length))]
+
+  self.postMessage({
+    type: 'STATS',
+    payload: {
+      targetWpm: wpm,
+      achievedWpm: stats.activeMs > 0 ? Math.round((stats.words * 60000) / stats.activeMs) : 0,
+      ticks: stats.ticks,
+      stalls: stats.stalls,
+      latenessMeanMs: +(stats.latenessSum / stats.ticks).toFixed(2),
+      latenessP50Ms: +percentile(0.5).toFixed(2),
+      latenessP95Ms: +percentile(0.95).toFixed(2),
+      latenessMaxMs: +stats.latenessMax.toFixed(2)
+    }
+  })
+}
+
 // Handle visibility change (when tab loses focus)
 self.addEventListener('message', function(e) {
   if (e.data.type === 'VISIBILITY_CHANGE' && !e.data.payload.visible && isRunning) {
@@ -111,4 +333,4 @@ self.addEventListener('message', function(e) {
       }
     }, 2000)
   }
-})
\ No newline at end of file
+})
@@ -19,10 +19,67 @@ const APP_SHELL_URLS = [
   '/accelerator-worker.js'
 ]
 
-// Offline queue for background sync with exponential backoff
-let offlineQueue = {
-  game_runs: [],
-  session_schedules: []
+// IndexedDB database shared by the offline queue and the data cache index
+const SW_DB = 'spiread-sw'
+const SW_DB_VERSION = 3
+
+// Offline queue for background sync. Each queued action is one record keyed
+// by its idempotency key, so queuing the same action twice keeps a single
+// copy and replays can be retried safely.
+const QUEUE_STORE = 'offline_queue'
+const QUEUE_TYPES = ['game_runs', 'session_schedules']
+const REPLAY_CONCURRENCY = 4 // requests in flight while replaying
+// Records the server rejects for good are moved here, out of the replay
+const DEAD_LETTER_STORE = 'offline_dead_letter'
+
+// The data cache is bounded: least recently used entries are evicted past
+// these limits. Size and access time of each entry are kept in CACHE_META_STORE.
+const CACHE_META_STORE = 'cache_meta'
+const DATA_CACHE_MAX_ENTRIES = 200
+const DATA_CACHE_MAX_BYTES = 5 * 1024 * 1024 // 5 MB
+const DATA_CACHE_MAX_ENTRY_BYTES = 512 * 1024 // larger responses are not cached
+
+// Caching strategy per API read (first match wins); other reads are
+// network-only. Stale-while-revalidate answers from cache and refreshes in
+// the background unless the entry is younger than freshMs; entries older than
+// maxStaleMs wait for the network (and are only used offline).
+const API_READ_ROUTES = [
+  {
+    pattern: /^\/api\/(progress\/get|settings|gameRuns|scoreHistory)$/,
+    strategy: 'stale-while-revalidate',
+    freshMs: 30 * 1000,
+    maxStaleMs: 24 * 60 * 60 * 1000
+  },
+  { pattern: /^\/api\/(ai\/)?health$/, strategy: 'network-first' },
+  // Puzzle pages never change for a given URL (seed and generator version)
+  { pattern: /^\/api\/puzzles$/, strategy: 'cache-first' }
+]
+
+// Writes are network-only; a successful write drops the cached reads it changes
+const API_WRITE_INVALIDATES = {
+  '/api/settings': ['/api/settings', '/api/progress/get'],
+  '/api/gameRuns': ['/api/gameRuns', '/api/scoreHistory', '/api/progress/get'],
+  '/api/completeGame': ['/api/gameRuns', '/api/scoreHistory', '/api/settings', '/api/progress/get']
+}
+
+// How each queue type is replayed: game runs go in batches through
+// POST /api/gameRuns { runs }, session schedules one per request
+const REPLAY = {
+  game_runs: {
+    batchSize: 50,
+    request: records => ({
+      url: '/api/gameRuns',
+      body: { runs: records.map(record => ({ ...record.payload, id: record.key })) }
+    })
+  },
+  session_schedules: {
+    batchSize: 1,
+    request: ([record]) => ({
+      url: '/api/session_schedules',
+      idempotencyKey: record.key,
+      body: { ...record.payload, id: record.key }
+    })
+  }
 }
 
 // Pre-cache offline: app shell + 9 games (assets mínimos para cargar cada juego) + últimos N=5 documentos y resultados de quiz
@@ -37,13 +94,16 @@ const OFFLINE_GAME_ASSETS = [
   '/_next/static/chunks/pages/components/games/WordSearch.js',
   '/_next/static/chunks/pages/components/games/Anagrams.js',
   '/_next/static/chunks/pages/components/games/GameWrapper.js',
-  // Game data and logic
-  '/lib/word-bank.js',
+  // Game data and logic (word lists are precached from WORD_BANK_INDEX)
   '/lib/gamification.js',
   '/lib/adaptive-difficulty.js',
   '/lib/enhanced-difficulty.js'
 ]
 
+// Word bank shards (public/word-bank/, written by scripts/seed-word-bank.js).
+// File names carry a content hash, so cached shards never go stale.
+const WORD_BANK_INDEX = '/word-bank/index.json'
+
 // Cache for recent documents and quiz results (N=5)
 let cachedDocuments = []
 let cachedQuizResults = []
@@ -52,7 +112,7 @@ let cachedQuizResults = []
 const GAME_ASSETS_PATTERNS = [
   // Game components and data will be cached dynamically
   /\/components\/games\//,
-  /\/lib\/word-bank\.js/,
+  /^\/word-bank\//,
   /\/lib\/gamification\.js/,
   /\/lib\/adaptive-difficulty\.js/
 ]
@@ -72,6 +132,7 @@ self.addEventListener('install', event => {
         const assetsCache = await caches.open(CACHES.assets)
         // Note: Game assets will be cached dynamically as they are accessed
         // since Next.js generates hashed filenames that we can't predict
+        await precacheWordBankShards(assetsCache)
         
         // Initialize data cache for documents and quiz results  
         const dataCache = await caches.open(CACHES.data)
@@ -111,6 +172,11 @@ self.addEventListener('activate', event => {
             })
         )
         
+        // Drop data cache entries without size/access records (cached before the
+        // cache was bounded) and records whose entry is gone
+        await migrateLegacyOfflineQueue()
+        await reconcileDataCache()
+        
         // Claim all clients immediately for GA deployment
         console.log(`[SW] Claiming all clients immediately for GA v${SW_BUILD}`)
         await self.clients.claim()
@@ -128,14 +194,32 @@ self.addEventListener('fetch', event => {
   const { request } = event
   const url = new URL(request.url)
   
-  // Skip non-GET requests and chrome-extension requests
-  if (request.method !== 'GET' || url.protocol === 'chrome-extension:') {
+  // Skip chrome-extension requests
+  if (url.protocol === 'chrome-extension:') {
     return
   }
   
-  // API requests - network-first with cache fallback
+  // Writes go straight to the network; the ones that change cached reads
+  // are watched so those entries can be dropped
+  if (request.method !== 'GET') {
+    if (API_WRITE_INVALIDATES[url.pathname]) {
+      event.respondWith(handleAPIWrite(request, event))
+    }
+    return
+  }
+  
+  // API requests - strategy per route (see API_READ_ROUTES)
   if (url.pathname.startsWith('/api/')) {
-    event.respondWith(handleAPIRequest(request))
+    const route = API_READ_ROUTES.find(({ pattern }) => pattern.test(url.pathname))
+    if (route?.strategy === 'stale-while-revalidate') {
+      event.respondWith(handleStaleWhileRevalidate(request, route, event))
+    } else if (route?.strategy === 'cache-first') {
+      event.respondWith(handleCacheFirstAPI(request))
+    } else if (route) {
+      event.respondWith(handleAPIRequest(request))
+    } else {
+      event.respondWith(fetch(request).catch(() => offlineAPIResponse()))
+    }
     return
   }
   
@@ -160,48 +244,123 @@ async function handleAPIRequest(request) {
   const url = new URL(request.url)
   
   try {
-    // Try network first with timeout
-    const networkResponse = await Promise.race([
-      fetch(request),
-      new Promise((_, reject) => 
-        setTimeout(() => reject(new Error('Network timeout')), 5000)
-      )
-    ])
-    
-    // Cache successful responses for offline use (stale-while-revalidate for recent data)
-    if (networkResponse.ok && shouldCacheAPI(url.pathname)) {
-      const cache = await caches.open(CACHES.data)
-      await cache.put(request, networkResponse.clone())
+    const networkResponse = await fetchWithRevalidation(request)
+    if (networkResponse.ok) {
+      await putDataCache(request, networkResponse.clone())
     }
-    
     return networkResponse
     
   } catch (error) {
     console.log(`[SW] Network failed for ${url.pathname}, trying cache...`)
     
     // Network failed - try cache
-    const cachedResponse = await caches.match(request)
+    const cachedResponse = await matchDataCache(request)
     if (cachedResponse) {
       return cachedResponse
     }
     
-    // No cache - return offline response
-    if (url.pathname.startsWith('/api/')) {
-      return new Response(
-        JSON.stringify({
-          error: 'Offline',
-          message: 'Network unavailable. Some features may be limited.',
-          offline: true
-        }),
-        {
-          status: 503,
-          headers: { 'Content-Type': 'application/json' }
-        }
-      )
+    return offlineAPIResponse()
+  }
+}
+
+// API reads - stale-while-revalidate: answer from cache right away and
+// refresh the entry in the background
+async function handleStaleWhileRevalidate(request, route, event) {
+  const cachedResponse = await matchDataCache(request)
+  const age = cachedResponse ? cacheAge(cachedResponse) : Infinity
+  
+  const refresh = () => fetchWithRevalidation(request, cachedResponse).then(async networkResponse => {
+    if (networkResponse.ok && networkResponse !== cachedResponse) {
+      await putDataCache(request, networkResponse.clone())
+      if (cachedResponse) await notifyCacheUpdated(request.url)
     }
-    
-    throw error
+    return networkResponse
+  })
+  
+  if (cachedResponse && age <= route.maxStaleMs) {
+    if (age > route.freshMs) {
+      event.waitUntil(refresh().catch(error => {
+        console.log(`[SW] Background revalidation failed for ${request.url}:`, error.message)
+      }))
+    }
+    return withFreshness(cachedResponse, age, age > route.freshMs ? 'stale' : 'fresh')
+  }
+  
+  try {
+    const networkResponse = await refresh()
+    return networkResponse === cachedResponse ? withFreshness(cachedResponse, 0, 'fresh') : networkResponse
+  } catch (error) {
+    console.log(`[SW] Network failed for ${new URL(request.url).pathname}, trying cache...`)
+    return cachedResponse ? withFreshness(cachedResponse, age, 'stale') : offlineAPIResponse()
+  }
+}
+
+// Immutable API reads: the data cache answers without a request once filled
+async function handleCacheFirstAPI(request) {
+  const cachedResponse = await matchDataCache(request)
+  if (cachedResponse) {
+    return cachedResponse
+  }
+  
+  try {
+    const networkResponse = await fetch(request)
+    if (networkResponse.ok) {
+      await putDataCache(request, networkResponse.clone())
+    }
+    return networkResponse
+  } catch (error) {
+    console.log(`[SW] Network failed for ${new URL(request.url).pathname}`)
+    return offlineAPIResponse()
+  }
+}
+
+// API writes - network-only, then drop the cached reads they change
+async function handleAPIWrite(request, event) {
+  const response = await fetch(request)
+  if (response.ok) {
+    event.waitUntil(invalidateDataCache(API_WRITE_INVALIDATES[new URL(request.url).pathname]))
+  }
+  return response
+}
+
+// Fetch with a timeout, revalidating the cached copy with If-None-Match so
+// unchanged reads come back as empty 304s (answered with the cached copy)
+async function fetchWithRevalidation(request, cached = undefined) {
+  const cachedForRevalidation = cached === undefined ? await matchDataCache(request, { touch: false }) : cached
+  const cachedEtag = cachedForRevalidation?.headers.get('ETag')
+  const networkRequest = cachedEtag && !request.headers.has('If-None-Match')
+    ? withIfNoneMatch(request, cachedEtag)
+    : request
+
+  const networkResponse = await Promise.race([
+    fetch(networkRequest),
+    new Promise((_, reject) => 
+      setTimeout(() => reject(new Error('Network timeout')), 5000)
+    )
+  ])
+  
+  // Not modified - the cached body is still current; store it again to
+  // restart its age (from a separate copy, the caller may be reading this one)
+  if (networkResponse.status === 304 && cachedForRevalidation && networkRequest !== request) {
+    const current = await matchDataCache(request, { touch: false })
+    if (current) await putDataCache(request, current)
+    return cachedForRevalidation
   }
+  return networkResponse
+}
+
+function offlineAPIResponse() {
+  return new Response(
+    JSON.stringify({
+      error: 'Offline',
+      message: 'Network unavailable. Some features may be limited.',
+      offline: true
+    }),
+    {
+      status: 503,
+      headers: { 'Content-Type': 'application/json' }
+    }
+  )
 }
 
 // Static assets - cache-first with network fallback
@@ -263,15 +422,13 @@ async function handleAppShell(request) {
 
 // Default strategy - stale-while-revalidate
 async function handleDefault(request) {
-  const cache = await caches.open(CACHES.data)
-  
   // Get cached version immediately
-  const cachedResponse = await cache.match(request)
+  const cachedResponse = await matchDataCache(request)
   
-  // Fetch new version in background
-  const networkPromise = fetch(request).then(response => {
-    if (response.ok) {
-      cache.put(request, response.clone())
+  // Fetch new version in background (same-origin, cacheable responses only)
+  const networkPromise = fetch(request).then(async response => {
+    if (response.ok && response.type === 'basic' && !/no-store/.test(response.headers.get('Cache-Control') || '')) {
+      await putDataCache(request, response.clone())
     }
     return response
   }).catch(() => null)
@@ -285,55 +442,80 @@ self.addEventListener('sync', event => {
   console.log(`[SW] Background sync triggered: ${event.tag}`)
   
   if (event.tag === 'background-sync-spiread') {
-    event.waitUntil(processOfflineQueueWithBackoff())
+    event.waitUntil(processOfflineQueue())
   }
 })
 
-// Process offline queue with exponential backoff and persistence in IndexedDB
+// Replay the offline queue: records are read from IndexedDB in key order one
+// batch at a time, sent with bounded concurrency and deleted per batch on
+// success. Failed batches stay queued for the next sync.
 async function processOfflineQueue() {
-  try {
-    // Process game runs
-    for (const gameRun of offlineQueue.game_runs) {
-      try {
-        const response = await fetch('/api/progress/save', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify(gameRun)
-        })
-        
-        if (response.ok) {
-          offlineQueue.game_runs = offlineQueue.game_runs.filter(item => item !== gameRun)
-          console.log('[SW] Game run synced successfully')
-        }
-      } catch (error) {
-        console.log('[SW] Failed to sync game run:', error)
-      }
-    }
-    
-    // Process session schedules
-    for (const session of offlineQueue.session_schedules) {
-      try {
-        const response = await fetch('/api/sessions', {
-          method: 'POST', 
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify(session)
-        })
-        
-        if (response.ok) {
-          offlineQueue.session_schedules = offlineQueue.session_schedules.filter(item => item !== session)
-          console.log('[SW] Session schedule synced successfully')
-        }
-      } catch (error) {
-        console.log('[SW] Failed to sync session schedule:', error)
+  const synced = {}
+
+  for (const type of QUEUE_TYPES) {
+    const { batchSize } = REPLAY[type]
+    const inFlight = new Set()
+    let after = null
+    synced[type] = 0
+
+    while (true) {
+      const records = await readQueueBatch(type, batchSize, after)
+      if (records.length === 0) break
+      after = records[records.length - 1]
+
+      const task = replayBatch(type, records)
+        .then(count => { synced[type] += count })
+        .finally(() => inFlight.delete(task))
+      inFlight.add(task)
+
+      if (inFlight.size >= REPLAY_CONCURRENCY) {
+        await Promise.race(inFlight)
       }
     }
-    
-    // Persist queue state
-    await persistOfflineQueue()
-    
+
+    await Promise.all(inFlight)
+  }
+
+  console.log('[SW] Offline queue replayed:', synced)
+  return synced
+}
+
+// Send one batch (with exponential backoff) and dequeue it. Client errors
+// other than 408/429 (including rows the database rejects) will not succeed
+// on retry: the batch is split until the rejected records are alone, and
+// those are dead-lettered so the rest still syncs.
+async function replayBatch(type, records) {
+  const { url, body, idempotencyKey } = REPLAY[type].request(records)
+  const headers = { 'Content-Type': 'application/json' }
+  if (idempotencyKey) headers['Idempotency-Key'] = idempotencyKey
+
+  try {
+    await retryWithBackoff(async () => {
+      const response = await fetch(url, { method: 'POST', headers, body: JSON.stringify(body) })
+      if (response.ok) return response
+
+      const error = new Error(`HTTP ${response.status}: ${response.statusText}`)
+      error.permanent = response.status >= 400 && response.status < 500 &&
+        response.status !== 408 && response.status !== 429
+      throw error
+    }, 3, 1000, error => !error.permanent)
   } catch (error) {
-    console.error('[SW] Background sync failed:', error)
+    if (!error.permanent) {
+      console.log(`[SW] Failed to sync ${records.length} ${type} after retries:`, error)
+      return 0
+    }
+    if (records.length > 1) {
+      const middle = records.length >> 1
+      return (await replayBatch(type, records.slice(0, middle))) +
+        (await replayBatch(type, records.slice(middle)))
+    }
+    console.warn(`[SW] Dead-lettering ${type} ${records[0].key} rejected by the server:`, error)
+    await deadLetterQueued(records[0], error)
+    return 0
   }
+
+  await deleteQueued(records.map(record => record.key))
+  return records.length
 }
 
 // Message handler - communicate with main thread (for debug endpoint)
@@ -342,42 +524,38 @@ self.addEventListener('message', event => {
   
   switch (action) {
     case 'GET_SW_STATUS':
-      event.ports[0].postMessage({
-        version: SW_VERSION,
-        build: SW_BUILD,
-        caches: Object.keys(CACHES),
-        queueLengths: {
-          game_runs: offlineQueue.game_runs.length,
-          session_schedules: offlineQueue.session_schedules.length
-        }
+      getQueueLengths().then(queueLengths => {
+        event.ports[0].postMessage({
+          version: SW_VERSION,
+          build: SW_BUILD,
+          caches: Object.keys(CACHES),
+          queueLengths
+        })
       })
       break
     
     case 'GET_PWA_STATUS':
       // For debug endpoint - return detailed PWA status
-      getCacheStats().then(cacheStats => {
+      Promise.all([getCacheStats(), getQueueLengths()]).then(([cacheStats, queueLengths]) => {
         event.ports[0].postMessage({
           swVersion: SW_VERSION,
           installed: true, // SW is installed if we're responding
           caches: cacheStats,
           bgSync: {
-            queueLengths: {
-              game_runs: offlineQueue.game_runs.length,
-              session_schedules: offlineQueue.session_schedules.length
-            }
+            queueLengths
           }
         })
       })
       break
       
     case 'QUEUE_OFFLINE_ACTION':
-      if (data.type === 'game_run') {
-        offlineQueue.game_runs.push(data.payload)
-      } else if (data.type === 'session_schedule') {
-        offlineQueue.session_schedules.push(data.payload)
+      const queueType = { game_run: 'game_runs', session_schedule: 'session_schedules' }[data.type]
+      if (queueType) {
+        event.waitUntil(
+          enqueueOffline(queueType, data.payload)
+            .then(() => console.log(`[SW] Queued offline action: ${data.type}`))
+        )
       }
-      console.log(`[SW] Queued offline action: ${data.type}`)
-      persistOfflineQueue()
       break
       
     case 'CLEAR_CACHES':
@@ -410,6 +588,8 @@ async function getCacheStats() {
       const keys = await cache.keys()
       stats[key] = keys.length
     }
+    const records = await readCacheMeta()
+    stats.dataBytes = records.reduce((total, record) => total + record.bytes, 0)
   } catch (error) {
     console.error('[SW] Failed to get cache stats:', error)
     stats = { shell: 0, assets: 0, data: 0 }
@@ -418,33 +598,318 @@ async function getCacheStats() {
   return stats
 }
 
-// Persist offline queue (simplified - in production use IndexedDB)
-async function persistOfflineQueue() {
+// IndexedDB access for the offline queue and the data cache index
+let queueDbPromise = null
+
+function openSwDb() {
+  if (!queueDbPromise) {
+    queueDbPromise = new Promise((resolve, reject) => {
+      const request = indexedDB.open(SW_DB, SW_DB_VERSION)
+      request.onupgradeneeded = event => {
+        const db = request.result
+        if (event.oldVersion < 1) {
+          const store = db.createObjectStore(QUEUE_STORE, { keyPath: 'key' })
+          // Replay order within a type; key breaks ties between equal timestamps
+          store.createIndex('by_type', ['type', 'queuedAt', 'key'])
+        }
+        if (event.oldVersion < 2) {
+          const meta = db.createObjectStore(CACHE_META_STORE, { keyPath: 'url' })
+          // Eviction order, least recently used first
+          meta.createIndex('by_access', 'lastAccess')
+        }
+        if (event.oldVersion < 3) {
+          db.createObjectStore(DEAD_LETTER_STORE, { keyPath: 'key' })
+        }
+      }
+      request.onsuccess = () => resolve(request.result)
+      request.onerror = () => reject(request.error)
+    }).catch(error => {
+      queueDbPromise = null
+      throw error
+    })
+  }
+  return queueDbPromise
+}
+
+function idbDone(transaction) {
+  return new Promise((resolve, reject) => {
+    transaction.oncomplete = () => resolve()
+    transaction.onerror = () => reject(transaction.error)
+    transaction.onabort = () => reject(transaction.error)
+  })
+}
+
+// Store an action under its idempotency key (payload.id when the client
+// assigned one, otherwise a new UUID)
+async function enqueueOffline(type, payload, queuedAt = Date.now()) {
+  const db = await openSwDb()
+  const transaction = db.transaction(QUEUE_STORE, 'readwrite')
+  const key = payload.idempotencyKey || payload.id || self.crypto.randomUUID()
+  transaction.objectStore(QUEUE_STORE).put({ key, type, payload, queuedAt })
+  await idbDone(transaction)
+  return key
+}
+
+// Up to `limit` records of one type, in queue order, after the `after` record
+async function readQueueBatch(type, limit, after = null) {
+  const db = await openSwDb()
+  const transaction = db.transaction(QUEUE_STORE, 'readonly')
+  const range = after
+    ? IDBKeyRange.bound([type, after.queuedAt, after.key], [type, []], true, false)
+    : IDBKeyRange.bound([type], [type, []])
+  const records = []
+
+  await new Promise((resolve, reject) => {
+    const request = transaction.objectStore(QUEUE_STORE).index('by_type').openCursor(range)
+    request.onsuccess = () => {
+      const cursor = request.result
+      if (!cursor) return resolve()
+      records.push(cursor.value)
+      if (records.length >= limit) return resolve()
+      cursor.continue()
+    }
+    request.onerror = () => reject(request.error)
+  })
+
+  return records
+}
+
+async function deleteQueued(keys) {
+  const db = await openSwDb()
+  const transaction = db.transaction(QUEUE_STORE, 'readwrite')
+  const store = transaction.objectStore(QUEUE_STORE)
+  keys.forEach(key => store.delete(key))
+  await idbDone(transaction)
+}
+
+// Move a rejected record from the queue to the dead-letter store
+async function deadLetterQueued(record, error) {
+  const db = await openSwDb()
+  const transaction = db.transaction([QUEUE_STORE, DEAD_LETTER_STORE], 'readwrite')
+  transaction.objectStore(DEAD_LETTER_STORE).put({ ...record, error: error.message, failedAt: Date.now() })
+  transaction.objectStore(QUEUE_STORE).delete(record.key)
+  await idbDone(transaction)
+}
+
+async function getQueueLengths() {
+  const lengths = {}
   try {
-    // Store in cache as a simple persistence mechanism
-    const dataCache = await caches.open(CACHES.data)
-    const queueResponse = new Response(JSON.stringify(offlineQueue), {
-      headers: { 'Content-Type': 'application/json' }
+    const db = await openSwDb()
+    const index = db.transaction(QUEUE_STORE, 'readonly').objectStore(QUEUE_STORE).index('by_type')
+    for (const type of QUEUE_TYPES) {
+      lengths[type] = await new Promise((resolve, reject) => {
+        const request = index.count(IDBKeyRange.bound([type], [type, []]))
+        request.onsuccess = () => resolve(request.result)
+        request.onerror = () => reject(request.error)
+      })
+    }
+    lengths.dead_letter = await new Promise((resolve, reject) => {
+      const request = db.transaction(DEAD_LETTER_STORE, 'readonly').objectStore(DEAD_LETTER_STORE).count()
+      request.onsuccess = () => resolve(request.result)
+      request.onerror = () => reject(request.error)
     })
-    await dataCache.put('__offline_queue__', queueResponse)
   } catch (error) {
-    console.error('[SW] Failed to persist offline queue:', error)
+    console.error('[SW] Failed to count offline queue:', error)
   }
+  return lengths
 }
 
-// Load offline queue on startup
-async function loadOfflineQueue() {
+// Move a queue persisted by earlier versions (JSON in the data cache) into
+// IndexedDB
+async function migrateLegacyOfflineQueue() {
   try {
     const dataCache = await caches.open(CACHES.data)
     const queueResponse = await dataCache.match('__offline_queue__')
-    
-    if (queueResponse) {
-      const queue = await queueResponse.json()
-      offlineQueue = { ...offlineQueue, ...queue }
-      console.log('[SW] Loaded offline queue:', offlineQueue)
+    if (!queueResponse) return
+
+    const legacyQueue = await queueResponse.json()
+    let queuedAt = Date.now()
+    for (const type of QUEUE_TYPES) {
+      for (const payload of legacyQueue[type] || []) {
+        await enqueueOffline(type, payload, queuedAt++)
+      }
+    }
+    await dataCache.delete('__offline_queue__')
+    console.log('[SW] Migrated legacy offline queue to IndexedDB')
+  } catch (error) {
+    console.error('[SW] Failed to migrate offline queue:', error)
+  }
+}
+
+// Bounded data cache. Entries carry an X-SW-Cached-At header; a record in
+// CACHE_META_STORE holds their size and last access for LRU eviction.
+async function putDataCache(request, response) {
+  try {
+    const body = await response.arrayBuffer()
+    if (body.byteLength > DATA_CACHE_MAX_ENTRY_BYTES) return
+
+    const cachedAt = Date.now()
+    const headers = new Headers(response.headers)
+    headers.set('X-SW-Cached-At', String(cachedAt))
+    const url = cacheUrl(request)
+
+    const cache = await caches.open(CACHES.data)
+    await cache.put(request, new Response(body, {
+      status: response.status,
+      statusText: response.statusText,
+      headers
+    }))
+    await writeCacheMeta({ url, bytes: body.byteLength, cachedAt, lastAccess: cachedAt })
+    await evictDataCache()
+  } catch (error) {
+    console.error('[SW] Failed to cache response:', error)
+  }
+}
+
+async function matchDataCache(request, { touch = true } = {}) {
+  const cache = await caches.open(CACHES.data)
+  const response = await cache.match(request)
+  if (response && touch) {
+    touchCacheMeta(cacheUrl(request), { lastAccess: Date.now() })
+  }
+  return response
+}
+
+// Absolute URL a data cache entry is indexed under
+function cacheUrl(request) {
+  return new URL(typeof request === 'string' ? request : request.url, self.location.origin).href
+}
+
+// Milliseconds since the entry was stored or last revalidated
+function cacheAge(response) {
+  const cachedAt = parseInt(response.headers.get('X-SW-Cached-At') || '0', 10)
+  return cachedAt ? Date.now() - cachedAt : Infinity
+}
+
+// Cached response annotated with X-SW-Cache (fresh/stale) and Age
+function withFreshness(response, age, freshness) {
+  const headers = new Headers(response.headers)
+  headers.set('X-SW-Cache', freshness)
+  if (Number.isFinite(age)) headers.set('Age', String(Math.floor(age / 1000)))
+  return new Response(response.body, {
+    status: response.status,
+    statusText: response.statusText,
+    headers
+  })
+}
+
+async function notifyCacheUpdated(url) {
+  const clients = await self.clients.matchAll({ type: 'window' })
+  clients.forEach(client => client.postMessage({ type: 'API_CACHE_UPDATED', url }))
+}
+
+async function writeCacheMeta(record) {
+  const db = await openSwDb()
+  const transaction = db.transaction(CACHE_META_STORE, 'readwrite')
+  transaction.objectStore(CACHE_META_STORE).put(record)
+  await idbDone(transaction)
+}
+
+async function touchCacheMeta(url, fields) {
+  try {
+    const db = await openSwDb()
+    const transaction = db.transaction(CACHE_META_STORE, 'readwrite')
+    const store = transaction.objectStore(CACHE_META_STORE)
+    const request = store.get(url)
+    request.onsuccess = () => {
+      if (request.result) store.put({ ...request.result, ...fields })
     }
+    await idbDone(transaction)
   } catch (error) {
-    console.error('[SW] Failed to load offline queue:', error)
+    console.error('[SW] Failed to update cache index:', error)
+  }
+}
+
+async function readCacheMeta() {
+  const db = await openSwDb()
+  const transaction = db.transaction(CACHE_META_STORE, 'readonly')
+  return new Promise((resolve, reject) => {
+    const request = transaction.objectStore(CACHE_META_STORE).index('by_access').getAll()
+    request.onsuccess = () => resolve(request.result)
+    request.onerror = () => reject(request.error)
+  })
+}
+
+async function deleteDataCacheEntries(urls) {
+  const cache = await caches.open(CACHES.data)
+  await Promise.all(urls.map(url => cache.delete(url)))
+  const db = await openSwDb()
+  const transaction = db.transaction(CACHE_META_STORE, 'readwrite')
+  const store = transaction.objectStore(CACHE_META_STORE)
+  urls.forEach(url => store.delete(url))
+  await idbDone(transaction)
+}
+
+// Trims run one after another so concurrent puts never double-count
+let evictionChain = Promise.resolve()
+
+function evictDataCache() {
+  evictionChain = evictionChain.then(trimDataCache).catch(error => {
+    console.error('[SW] Failed to trim data cache:', error)
+  })
+  return evictionChain
+}
+
+async function trimDataCache() {
+  const records = await readCacheMeta() // least recently used first
+  let entries = records.length
+  let bytes = records.reduce((total, record) => total + record.bytes, 0)
+  const evicted = []
+
+  for (const record of records) {
+    if (entries <= DATA_CACHE_MAX_ENTRIES && bytes <= DATA_CACHE_MAX_BYTES) break
+    evicted.push(record.url)
+    entries--
+    bytes -= record.bytes
+  }
+
+  if (evicted.length > 0) {
+    await deleteDataCacheEntries(evicted)
+    console.log(`[SW] Evicted ${evicted.length} data cache entries (${entries} entries, ${bytes} bytes left)`)
+  }
+}
+
+// Drop cached reads under the given API paths (any query string)
+async function invalidateDataCache(pathnames) {
+  try {
+    const records = await readCacheMeta()
+    const stale = records
+      .filter(record => pathnames.includes(new URL(record.url).pathname))
+      .map(record => record.url)
+    if (stale.length > 0) await deleteDataCacheEntries(stale)
+  } catch (error) {
+    console.error('[SW] Failed to invalidate data cache:', error)
+  }
+}
+
+// Make the cache and its index agree, then apply the limits
+async function reconcileDataCache() {
+  try {
+    const cache = await caches.open(CACHES.data)
+    const cachedUrls = new Set((await cache.keys()).map(request => request.url))
+    const indexedUrls = new Set((await readCacheMeta()).map(record => record.url))
+
+    await Promise.all([...cachedUrls]
+      .filter(url => !indexedUrls.has(url))
+      .map(url => cache.delete(url)))
+    const orphaned = [...indexedUrls].filter(url => !cachedUrls.has(url))
+    if (orphaned.length > 0) await deleteDataCacheEntries(orphaned)
+
+    await evictDataCache()
+  } catch (error) {
+    console.error('[SW] Failed to reconcile data cache:', error)
+  }
+}
+
+// Every game's word lists, so word games work offline from the first visit
+async function precacheWordBankShards(cache) {
+  try {
+    const response = await fetch(WORD_BANK_INDEX, { cache: 'no-cache' })
+    if (!response.ok) return
+    const { shards } = await response.json()
+    await cache.addAll(shards)
+  } catch (error) {
+    console.warn('[SW] Failed to precache word bank shards:', error)
   }
 }
 
@@ -468,12 +933,16 @@ function isAppShellRequest(pathname) {
          APP_SHELL_URLS.includes(pathname)
 }
 
-function shouldCacheAPI(pathname) {
-  // Cache for stale-while-revalidate strategy (recent docs/quiz data)
-  return pathname.includes('/api/health') ||
-         pathname.includes('/api/progress/get') ||
-         pathname.includes('/api/settings') ||
-         pathname.includes('/api/ai/health')
+// Copy of a GET request carrying a conditional If-None-Match header
+function withIfNoneMatch(request, etag) {
+  const headers = new Headers(request.headers)
+  headers.set('If-None-Match', etag)
+  return new Request(request.url, {
+    method: 'GET',
+    headers,
+    credentials: request.credentials,
+    cache: 'no-store'
+  })
 }
 
 async function clearAllCaches() {
@@ -489,14 +958,12 @@ async function clearAllCaches() {
 // Pre-cache offline: últimos N=5 documentos para lectura offline
 async function cacheRecentDocuments(documents) {
   try {
-    const dataCache = await caches.open(CACHES.data)
-    
     for (const doc of documents) {
       const cacheKey = `/offline/documents/${doc.id}`
       const response = new Response(JSON.stringify(doc), {
         headers: { 'Content-Type': 'application/json' }
       })
-      await dataCache.put(cacheKey, response)
+      await putDataCache(cacheKey, response)
     }
     
     cachedDocuments = documents
@@ -509,14 +976,12 @@ async function cacheRecentDocuments(documents) {
 // Pre-cache offline: últimos N=5 resultados de quiz para análisis offline
 async function cacheRecentQuizResults(quizResults) {
   try {
-    const dataCache = await caches.open(CACHES.data)
-    
     for (const result of quizResults) {
       const cacheKey = `/offline/quiz-results/${result.id}`
       const response = new Response(JSON.stringify(result), {
         headers: { 'Content-Type': 'application/json' }
       })
-      await dataCache.put(cacheKey, response)
+      await putDataCache(cacheKey, response)
     }
     
     cachedQuizResults = quizResults
@@ -527,12 +992,12 @@ async function cacheRecentQuizResults(quizResults) {
 }
 
 // BG Sync: reintentos exponenciales con backoff
-async function retryWithBackoff(fn, maxRetries = 3, baseDelay = 1000) {
+async function retryWithBackoff(fn, maxRetries = 3, baseDelay = 1000, shouldRetry = () => true) {
   for (let attempt = 0; attempt < maxRetries; attempt++) {
     try {
       return await fn()
     } catch (error) {
-      if (attempt === maxRetries - 1) throw error
+      if (attempt === maxRetries - 1 || !shouldRetry(error)) throw error
       
       const delay = baseDelay * Math.pow(2, attempt) // Exponential backoff
       console.log(`[SW] Retry attempt ${attempt + 1} failed, waiting ${delay}ms...`)
@@ -541,73 +1006,8 @@ async function retryWithBackoff(fn, maxRetries = 3, baseDelay = 1000) {
   }
 }
 
-// Enhanced background sync with exponential backoff
-async function processOfflineQueueWithBackoff() {
-  try {
-    // Process game runs with exponential backoff
-    for (const gameRun of [...offlineQueue.game_runs]) {
-      try {
-        await retryWithBackoff(async () => {
-          const response = await fetch('/api/progress/save', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(gameRun)
-          })
-          
-          if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`)
-          }
-          
-          return response
-        })
-        
-        // Success - remove from queue
-        offlineQueue.game_runs = offlineQueue.game_runs.filter(item => item !== gameRun)
-        console.log('[SW] Game run synced successfully with backoff')
-        
-      } catch (error) {
-        console.log('[SW] Failed to sync game run after retries:', error)
-        // Keep in queue for next sync attempt
-      }
-    }
-    
-    // Process session schedules with exponential backoff
-    for (const session of [...offlineQueue.session_schedules]) {
-      try {
-        await retryWithBackoff(async () => {
-          const response = await fetch('/api/sessions', {
-            method: 'POST', 
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(session)
-          })
-          
-          if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`)
-          }
-          
-          return response
-        })
-        
-        // Success - remove from queue
-        offlineQueue.session_schedules = offlineQueue.session_schedules.filter(item => item !== session)
-        console.log('[SW] Session schedule synced successfully with backoff')
-        
-      } catch (error) {
-        console.log('[SW] Failed to sync session schedule after retries:', error)
-        // Keep in queue for next sync attempt
-      }
-    }
-    
-    // Persist updated queue state
-    await persistOfflineQueue()
-    
-  } catch (error) {
-    console.error('[SW] Background sync with backoff failed:', error)
-  }
-}
-
-// Load offline queue when SW starts
-loadOfflineQueue()
+// Pick up a queue left by earlier versions when SW starts
+migrateLegacyOfflineQueue()
 
 // Notify clients when SW is ready
 console.log(`[SW] ${SW_VERSION} (${SW_BUILD}) ready for offline use`)
\ No newline at end of file
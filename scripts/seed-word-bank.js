@@ -1,14 +1,24 @@
 /**
  * Word Bank Seed Script for Phase 3 Games
  * Generates word lists for Letters Grid, Word Search, and Anagrams
+ *
+ * Writes lib/word-bank.js (the whole bank, used on the server) and one
+ * minified JSON shard per game and locale under public/word-bank/, which the
+ * games load on demand (see lib/word-bank-shards.js). Shard file names carry
+ * a hash of their content and are listed in lib/word-bank-manifest.js.
  * 
  * Usage:
  * node scripts/seed-word-bank.js
  */
 
+const crypto = require('crypto');
 const fs = require('fs');
 const path = require('path');
 
+const SHARDS_DIR = path.join(__dirname, '..', 'public', 'word-bank');
+const SHARDS_URL = '/word-bank';
+const SHARD_GAMES = ['lettersGrid', 'wordSearch', 'anagrams', 'runningWords'];
+
 // Letters Grid - Target letters and confusables
 const LETTERS_GRID_DATA = {
   es: {
@@ -152,11 +162,47 @@ export default WORD_BANK;
   return outputPath;
 }
 
+// Save one shard per game and locale, plus the manifest the loader imports
+// and the index.json the service worker precaches from
+function saveWordBankShards(wordBank = generateWordBank()) {
+  fs.rmSync(SHARDS_DIR, { recursive: true, force: true });
+  fs.mkdirSync(SHARDS_DIR, { recursive: true });
+
+  const shards = {};
+  const urls = [];
+  for (const game of SHARD_GAMES) {
+    shards[game] = {};
+    for (const [locale, data] of Object.entries(wordBank[game])) {
+      const content = JSON.stringify(data);
+      const hash = crypto.createHash('sha256').update(content).digest('hex').slice(0, 8);
+      const fileName = `${game}.${locale}.${hash}.json`;
+      fs.writeFileSync(path.join(SHARDS_DIR, fileName), content, 'utf8');
+      shards[game][locale] = `${SHARDS_URL}/${fileName}`;
+      urls.push(shards[game][locale]);
+    }
+  }
+  fs.writeFileSync(path.join(SHARDS_DIR, 'index.json'), JSON.stringify({ shards: urls }), 'utf8');
+
+  const manifestPath = path.join(__dirname, '..', 'lib', 'word-bank-manifest.js');
+  const manifestContent = `// Auto-generated by scripts/seed-word-bank.js: word bank shard URLs
+// (public/word-bank/) by game and locale
+
+export const WORD_BANK_LOCALES = ${JSON.stringify(Object.keys(wordBank.anagrams))};
+
+export const WORD_BANK_SHARDS = ${JSON.stringify(shards, null, 2)};
+`;
+  fs.writeFileSync(manifestPath, manifestContent, 'utf8');
+  console.log(`✅ Word bank shards generated: ${urls.length} files in ${SHARDS_DIR}`);
+
+  return manifestPath;
+}
+
 // Main execution
 if (require.main === module) {
   try {
     console.log('🚀 Generating word bank for Phase 3 games...');
     const outputPath = saveWordBank();
+    saveWordBankShards();
     console.log('✅ Word bank generation completed successfully!');
   } catch (error) {
     console.error('❌ Error generating word bank:', error);
@@ -164,4 +210,4 @@ if (require.main === module) {
   }
 }
 
-module.exports = { generateWordBank, saveWordBank };
\ No newline at end of file
+module.exports = { generateWordBank, saveWordBank, saveWordBankShards };
\ No newline at end of file
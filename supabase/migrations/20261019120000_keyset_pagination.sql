@@ -0,0 +1,8 @@
+-- Keyset pagination for list endpoints
+-- GET gameRuns/sessions/documents page on (created_at desc, id desc)
+
+-- game_runs and documents already have (user_id, created_at desc) indexes:
+--   idx_game_runs_user_created, idx_documents_user_created
+-- sessions was only indexed by (user_id, date), which cannot serve the
+-- created_at ordering used by the cursor
+create index if not exists idx_sessions_user_created on sessions(user_id, created_at desc, id desc);
@@ -0,0 +1,7 @@
+-- Pre-compressed AI cache entries
+-- ai_cache rows are immutable once written, so the cache-hit response body is
+-- compressed once at save time (Brotli q11 / gzip -9) and served as stored
+-- bytes. Values are base64; null when the body is below the 1 KB threshold.
+
+alter table ai_cache add column if not exists output_br text;
+alter table ai_cache add column if not exists output_gzip text;
@@ -0,0 +1,22 @@
+-- Achievement evaluation state in one round-trip
+-- checkAchievements in lib/gamification.js needs the user's unlocked
+-- achievement types and current streak; both are returned by a single call.
+-- Runs as the caller, so the achievements/streaks RLS policies still apply.
+
+create or replace function get_achievement_state(target_user_id uuid)
+returns table(unlocked text[], streak_current int)
+language sql
+stable
+as $$
+  select
+    coalesce(
+      (select array_agg(a.achievement_type) from achievements a where a.user_id = target_user_id),
+      '{}'::text[]
+    ) as unlocked,
+    coalesce(
+      (select s.current from streaks s where s.user_id = target_user_id),
+      0
+    ) as streak_current;
+$$;
+
+grant execute on function get_achievement_state(uuid) to anon, authenticated;
@@ -0,0 +1,187 @@
+-- Incrementally maintained per-user stats aggregate
+-- getUserStats in lib/gamification.js reads one user_stats row by primary key
+-- instead of querying profiles, streaks, achievements and game_runs on every
+-- render. Triggers on those tables keep the row current as data is written.
+
+create table if not exists user_stats (
+  user_id uuid primary key references auth.users(id) on delete cascade,
+  total_runs int not null default 0,
+  total_time_ms bigint not null default 0,
+  runs_per_game jsonb not null default '{}'::jsonb,   -- { game: count }
+  best_score_per_game jsonb not null default '{}'::jsonb, -- { game: score }
+  last_played_at timestamptz,
+  xp int not null default 0,
+  level int not null default 1,
+  streak_current int not null default 0,
+  streak_longest int not null default 0,
+  recent_achievements jsonb not null default '[]'::jsonb, -- newest first, max 10
+  updated_at timestamptz not null default now()
+);
+
+alter table user_stats enable row level security;
+drop policy if exists "user_stats_select" on user_stats;
+create policy "user_stats_select" on user_stats for select using (auth.uid() = user_id);
+
+-- game_runs insert: bump counters for the run's game
+create or replace function user_stats_on_game_run()
+returns trigger
+language plpgsql
+security definer
+as $$
+begin
+  insert into user_stats as us (
+    user_id, total_runs, total_time_ms, runs_per_game, best_score_per_game, last_played_at, updated_at
+  )
+  values (
+    new.user_id, 1, new.duration_ms,
+    jsonb_build_object(new.game, 1),
+    jsonb_build_object(new.game, new.score),
+    new.created_at, now()
+  )
+  on conflict (user_id) do update set
+    total_runs = us.total_runs + 1,
+    total_time_ms = us.total_time_ms + new.duration_ms,
+    runs_per_game = us.runs_per_game || jsonb_build_object(
+      new.game, coalesce((us.runs_per_game ->> new.game)::int, 0) + 1
+    ),
+    best_score_per_game = us.best_score_per_game || jsonb_build_object(
+      new.game, greatest(coalesce((us.best_score_per_game ->> new.game)::int, new.score), new.score)
+    ),
+    last_played_at = greatest(us.last_played_at, new.created_at),
+    updated_at = now();
+  return new;
+end;
+$$;
+
+drop trigger if exists user_stats_game_run on game_runs;
+create trigger user_stats_game_run
+  after insert on game_runs
+  for each row
+  execute function user_stats_on_game_run();
+
+-- profiles insert/update: mirror xp and level
+create or replace function user_stats_on_profile()
+returns trigger
+language plpgsql
+security definer
+as $$
+begin
+  insert into user_stats as us (user_id, xp, level, updated_at)
+  values (new.user_id, new.xp, new.level, now())
+  on conflict (user_id) do update set
+    xp = excluded.xp,
+    level = excluded.level,
+    updated_at = now();
+  return new;
+end;
+$$;
+
+drop trigger if exists user_stats_profile on profiles;
+create trigger user_stats_profile
+  after insert or update of xp, level on profiles
+  for each row
+  execute function user_stats_on_profile();
+
+-- streaks insert/update: mirror current and longest
+create or replace function user_stats_on_streak()
+returns trigger
+language plpgsql
+security definer
+as $$
+begin
+  insert into user_stats as us (user_id, streak_current, streak_longest, updated_at)
+  values (new.user_id, new.current, new.longest, now())
+  on conflict (user_id) do update set
+    streak_current = excluded.streak_current,
+    streak_longest = excluded.streak_longest,
+    updated_at = now();
+  return new;
+end;
+$$;
+
+drop trigger if exists user_stats_streak on streaks;
+create trigger user_stats_streak
+  after insert or update of current, longest on streaks
+  for each row
+  execute function user_stats_on_streak();
+
+-- achievements insert: keep the 10 most recent, newest first
+create or replace function user_stats_on_achievement()
+returns trigger
+language plpgsql
+security definer
+as $$
+declare
+  entry jsonb := to_jsonb(new) - 'user_id';
+begin
+  insert into user_stats as us (user_id, recent_achievements, updated_at)
+  values (new.user_id, jsonb_build_array(entry), now())
+  on conflict (user_id) do update set
+    recent_achievements = (
+      select coalesce(jsonb_agg(a.value order by a.ordinality), '[]'::jsonb)
+      from jsonb_array_elements(jsonb_build_array(entry) || us.recent_achievements)
+        with ordinality as a(value, ordinality)
+      where a.ordinality <= 10
+    ),
+    updated_at = now();
+  return new;
+end;
+$$;
+
+drop trigger if exists user_stats_achievement on achievements;
+create trigger user_stats_achievement
+  after insert on achievements
+  for each row
+  execute function user_stats_on_achievement();
+
+-- Backfill existing users
+insert into user_stats (
+  user_id, total_runs, total_time_ms, runs_per_game, best_score_per_game, last_played_at,
+  xp, level, streak_current, streak_longest, recent_achievements
+)
+select
+  u.user_id,
+  coalesce(r.total_runs, 0),
+  coalesce(r.total_time_ms, 0),
+  coalesce(r.runs_per_game, '{}'::jsonb),
+  coalesce(r.best_score_per_game, '{}'::jsonb),
+  r.last_played_at,
+  coalesce(p.xp, 0),
+  coalesce(p.level, 1),
+  coalesce(s.current, 0),
+  coalesce(s.longest, 0),
+  coalesce(a.recent, '[]'::jsonb)
+from (
+  select user_id from game_runs
+  union select user_id from profiles
+  union select user_id from streaks
+  union select user_id from achievements
+) u
+left join (
+  select
+    g.user_id,
+    sum(g.runs)::int as total_runs,
+    sum(g.time_ms)::bigint as total_time_ms,
+    jsonb_object_agg(g.game, g.runs) as runs_per_game,
+    jsonb_object_agg(g.game, g.best) as best_score_per_game,
+    max(g.last_played) as last_played_at
+  from (
+    select user_id, game, count(*) as runs, sum(duration_ms) as time_ms,
+           max(score) as best, max(created_at) as last_played
+    from game_runs
+    group by user_id, game
+  ) g
+  group by g.user_id
+) r on r.user_id = u.user_id
+left join profiles p on p.user_id = u.user_id
+left join streaks s on s.user_id = u.user_id
+left join lateral (
+  select jsonb_agg(to_jsonb(x) - 'user_id' order by x.unlocked_at desc) as recent
+  from (
+    select * from achievements ach
+    where ach.user_id = u.user_id
+    order by ach.unlocked_at desc
+    limit 10
+  ) x
+) a on true
+on conflict (user_id) do nothing;
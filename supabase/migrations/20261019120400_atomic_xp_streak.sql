@@ -0,0 +1,102 @@
+-- Atomic XP and streak updates
+-- updateUserProfile / updateStreak in lib/gamification.js used to SELECT the
+-- row, compute the new values in JavaScript and UPSERT them back, so two
+-- concurrent game completions could overwrite each other's XP. These
+-- functions do the read-modify-write under the row lock taken by
+-- insert ... on conflict do update, in a single call.
+--
+-- Both run as definer to write profiles and streaks, so they only
+-- touch the caller's own row (auth.uid()), unless called with the service
+-- role key (the API routes).
+
+-- Increment XP and recompute the level with calculateLevel's formula
+-- (floor(xp / 1000) + 1). xp_gain is clamped to 0..300, the range of
+-- calculateXpGain.
+create or replace function award_xp(target_user_id uuid, xp_gain int)
+returns table(xp int, level int, xp_gain_applied int, level_up boolean)
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  gain int := least(greatest(coalesce(xp_gain, 0), 0), 300);
+  new_xp int;
+  new_level int;
+begin
+  if auth.role() is distinct from 'service_role' and target_user_id is distinct from auth.uid() then
+    raise exception 'award_xp: not allowed for user %', target_user_id using errcode = '42501';
+  end if;
+
+  insert into profiles as p (user_id, xp, level, updated_at)
+  values (target_user_id, gain, (gain / 1000) + 1, now())
+  on conflict (user_id) do update set
+    xp = p.xp + excluded.xp,
+    level = ((p.xp + excluded.xp) / 1000) + 1,
+    updated_at = now()
+  returning p.xp, p.level into new_xp, new_level;
+
+  return query
+  select new_xp, new_level, gain, new_level > ((new_xp - gain) / 1000) + 1;
+end;
+$$;
+
+-- Advance, keep or reset the daily streak relative to last_activity_date
+create or replace function advance_streak(
+  target_user_id uuid,
+  is_valid boolean default true,
+  activity_date date default current_date
+)
+returns table(current int, longest int, increased boolean)
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  old_current int;
+  new_current int;
+  new_longest int;
+begin
+  if auth.role() is distinct from 'service_role' and target_user_id is distinct from auth.uid() then
+    raise exception 'advance_streak: not allowed for user %', target_user_id using errcode = '42501';
+  end if;
+
+  -- Lock the existing row (if any) so concurrent calls serialize here
+  select s.current into old_current
+  from streaks s
+  where s.user_id = target_user_id
+  for update;
+
+  insert into streaks as s (user_id, current, longest, last_activity_date, updated_at)
+  values (
+    target_user_id,
+    case when is_valid then 1 else 0 end,
+    case when is_valid then 1 else 0 end,
+    activity_date,
+    now()
+  )
+  on conflict (user_id) do update set
+    current = case
+      when not is_valid then 0
+      when s.last_activity_date = activity_date then s.current
+      when s.last_activity_date = activity_date - 1 then s.current + 1
+      else 1
+    end,
+    longest = greatest(s.longest, case
+      when not is_valid then 0
+      when s.last_activity_date = activity_date then s.current
+      when s.last_activity_date = activity_date - 1 then s.current + 1
+      else 1
+    end),
+    last_activity_date = activity_date,
+    updated_at = now()
+  returning s.current, s.longest into new_current, new_longest;
+
+  return query
+  select new_current, new_longest, is_valid and new_current > coalesce(old_current, 0);
+end;
+$$;
+
+revoke execute on function award_xp(uuid, int) from public, anon;
+revoke execute on function advance_streak(uuid, boolean, date) from public, anon;
+grant execute on function award_xp(uuid, int) to authenticated, service_role;
+grant execute on function advance_streak(uuid, boolean, date) to authenticated, service_role;
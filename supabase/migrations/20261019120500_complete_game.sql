@@ -0,0 +1,163 @@
+-- One-shot game completion
+-- Finishing a game used to take a game_runs insert, a settings read + upsert
+-- for progress, award_xp, advance_streak, get_achievement_state and an
+-- achievements insert as separate round-trips. complete_game does all of it in
+-- one call, and therefore one transaction: either everything is recorded or
+-- nothing is.
+--
+-- Validity and XP are computed here from the run, not taken from the caller.
+-- Achievement rules live in lib/gamification.js; the caller sends the types
+-- whose run-based test passed (`candidates`) and this function keeps only the
+-- ones defined in achievement_definitions for the run's game, not already
+-- unlocked and whose min_streak is reached after the streak update. Titles,
+-- descriptions and icons come from achievement_definitions. advance_streak
+-- locks the user's streaks row until commit, so concurrent completions for
+-- the same user serialize before that check.
+
+-- Mirror of ACHIEVEMENT_RULES (type, game, title, description, icon,
+-- minStreak); keep the two in sync
+create table if not exists achievement_definitions (
+  achievement_type text primary key,
+  game text not null,
+  title text not null,
+  description text not null,
+  icon text not null default '🏆',
+  min_streak int not null default 0
+);
+
+alter table achievement_definitions enable row level security;
+
+insert into achievement_definitions (achievement_type, game, title, description, icon, min_streak) values
+  ('first_run', '*', 'Primer Entrenamiento', 'Completaste tu primera sesión de entrenamiento', '🎯', 0),
+  ('speed_600_wpm', 'rsvp', 'Velocidad Supersónica', 'Alcanzaste 600 WPM en lectura rápida', '⚡', 0),
+  ('schulte_7x7', 'shuttle', 'Maestro Schulte', 'Completaste una tabla Schulte 7x7', '🎯', 0),
+  ('digits_7', 'memory_digits', 'Memoria Excepcional', 'Recordaste una secuencia de 7 dígitos', '🧠', 0),
+  ('twinwords_90acc', 'twin_words', 'Ojo de Águila', 'Logaste 90% de precisión en Twin Words', '👁️', 0),
+  ('runningwords_lvl10', 'running_words', 'Memoria Secuencial', 'Alcanzaste nivel 10 en Running Words', '🏃', 0),
+  ('letters_grid_15', 'letters_grid', 'Vista de Águila', 'Completaste una cuadrícula 15x15 en Letters Grid', '🎯', 0),
+  ('wordsearch_10_words', 'word_search', 'Cazador de Palabras', 'Encontraste 10 o más palabras en una sola partida', '🔍', 0),
+  ('anagram_7len', 'anagrams', 'Descifrador Experto', 'Resolviste un anagrama de 7 o más letras', '🔤', 0),
+  ('reading_quiz_5of5', 'reading_quiz', 'Comprensión Perfecta', 'Acertaste 5 de 5 preguntas en el quiz de comprensión', '🧠', 0),
+  ('week_streak_7', '*', 'Constancia Semanal', 'Mantuviste una racha de 7 días', '🔥', 7)
+on conflict (achievement_type) do update set
+  game = excluded.game,
+  title = excluded.title,
+  description = excluded.description,
+  icon = excluded.icon,
+  min_streak = excluded.min_streak;
+
+-- isValidGameRun in lib/gamification.js
+create or replace function is_valid_game_run(run jsonb)
+returns boolean
+language sql
+immutable
+as $$
+  select case
+    when run ->> 'game' in ('rsvp', 'reading_quiz') then
+      case when jsonb_typeof(run #> '{metrics,total_tokens}') = 'number'
+        then (run #>> '{metrics,total_tokens}')::numeric >= 100 else false end
+      or case when jsonb_typeof(run #> '{metrics,total}') = 'number'
+        then (run #>> '{metrics,total}')::numeric >= 1 else false end
+    -- Phase 3 games are 60-second sessions (5s tolerance)
+    when run ->> 'game' in ('running_words', 'letters_grid', 'word_search', 'anagrams') then
+      coalesce((run ->> 'duration_ms')::int, 0) >= 55000
+    else
+      coalesce((run ->> 'duration_ms')::int, 0) >= 30000
+  end;
+$$;
+
+-- Earlier signature, which took is_valid, xp_gain and full candidate rows
+drop function if exists complete_game(uuid, jsonb, jsonb, boolean, int, date, jsonb);
+
+create or replace function complete_game(
+  target_user_id uuid,
+  run jsonb,
+  progress jsonb default null,
+  activity_date date default current_date,
+  candidates text[] default '{}'
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  new_run game_runs;
+  game_progress jsonb;
+  xp_result jsonb;
+  streak_result jsonb;
+  new_streak int;
+  is_valid boolean := is_valid_game_run(run);
+  unlocked jsonb := '[]'::jsonb;
+begin
+  if auth.role() is distinct from 'service_role' and target_user_id is distinct from auth.uid() then
+    raise exception 'complete_game: not allowed for user %', target_user_id using errcode = '42501';
+  end if;
+
+  insert into game_runs (user_id, game, score, duration_ms, difficulty_level, metrics)
+  values (
+    target_user_id,
+    run ->> 'game',
+    coalesce((run ->> 'score')::int, 0),
+    coalesce((run ->> 'duration_ms')::int, 0),
+    coalesce((run ->> 'difficulty_level')::int, 1),
+    coalesce(run -> 'metrics', '{}'::jsonb)
+  )
+  returning * into new_run;
+
+  -- Same merge as /api/progress/save: settings.progress[game] += progress
+  if progress is not null then
+    insert into settings as st (user_id, progress, updated_at)
+    values (
+      target_user_id,
+      jsonb_build_object(new_run.game, progress || jsonb_build_object('updatedAt', now())),
+      now()
+    )
+    on conflict (user_id) do update set
+      progress = st.progress || jsonb_build_object(
+        new_run.game,
+        coalesce(st.progress -> new_run.game, '{}'::jsonb) || progress || jsonb_build_object('updatedAt', now())
+      ),
+      updated_at = now()
+    returning st.progress -> new_run.game into game_progress;
+  end if;
+
+  if is_valid then
+    -- calculateXpGain: the score, clamped to 0..300
+    select to_jsonb(x) into xp_result
+    from award_xp(target_user_id, least(greatest(new_run.score, 0), 300)) x;
+  end if;
+
+  select to_jsonb(s), s.current into streak_result, new_streak
+  from advance_streak(target_user_id, is_valid, activity_date) s;
+
+  if is_valid then
+    with inserted as (
+      insert into achievements (user_id, achievement_type, title, description, icon)
+      select target_user_id, d.achievement_type, d.title, d.description, d.icon
+      from achievement_definitions d
+      where d.achievement_type = any(candidates)
+        and d.game in ('*', new_run.game)
+        and d.min_streak <= new_streak
+        and not exists (
+          select 1 from achievements a
+          where a.user_id = target_user_id and a.achievement_type = d.achievement_type
+        )
+      returning achievement_type, title, description, icon, unlocked_at
+    )
+    select coalesce(jsonb_agg(to_jsonb(inserted)), '[]'::jsonb) into unlocked from inserted;
+  end if;
+
+  return jsonb_build_object(
+    'run', to_jsonb(new_run),
+    'progress', game_progress,
+    'is_valid', is_valid,
+    'xp', xp_result,
+    'streak', streak_result,
+    'achievements', unlocked
+  );
+end;
+$$;
+
+revoke execute on function complete_game(uuid, jsonb, jsonb, date, text[]) from public, anon;
+grant execute on function complete_game(uuid, jsonb, jsonb, date, text[]) to authenticated, service_role;
@@ -0,0 +1,89 @@
+-- Daily score rollups for history charts
+-- getHistoricalScores in lib/progress-tracking.js used to download every
+-- game_runs row in the range (metrics included) and bin it by day in the
+-- browser. game_daily_stats keeps one row per user, game and UTC day,
+-- maintained on insert, and get_score_series returns the pre-binned series
+-- for any range, one row per day.
+
+create table if not exists game_daily_stats (
+  user_id uuid not null references auth.users(id) on delete cascade,
+  game text not null,
+  day date not null, -- UTC day of game_runs.created_at
+  runs int not null default 0,
+  best_score int not null default 0,
+  total_score bigint not null default 0,
+  total_duration_ms bigint not null default 0,
+  primary key (user_id, game, day)
+);
+
+alter table game_daily_stats enable row level security;
+drop policy if exists "game_daily_stats_select" on game_daily_stats;
+create policy "game_daily_stats_select" on game_daily_stats for select using (auth.uid() = user_id);
+
+create or replace function game_daily_stats_on_game_run()
+returns trigger
+language plpgsql
+security definer
+as $$
+begin
+  insert into game_daily_stats as gds (user_id, game, day, runs, best_score, total_score, total_duration_ms)
+  values (
+    new.user_id, new.game, (new.created_at at time zone 'UTC')::date,
+    1, new.score, new.score, new.duration_ms
+  )
+  on conflict (user_id, game, day) do update set
+    runs = gds.runs + 1,
+    best_score = greatest(gds.best_score, excluded.best_score),
+    total_score = gds.total_score + excluded.total_score,
+    total_duration_ms = gds.total_duration_ms + excluded.total_duration_ms;
+  return new;
+end;
+$$;
+
+drop trigger if exists game_daily_stats_game_run on game_runs;
+create trigger game_daily_stats_game_run
+  after insert on game_runs
+  for each row
+  execute function game_daily_stats_on_game_run();
+
+-- One row per day in [end_date - days + 1, end_date]; days without runs have
+-- runs = 0 and null scores. Runs as the caller, so the RLS policy applies.
+create or replace function get_score_series(
+  target_user_id uuid,
+  target_game text,
+  days int default 30,
+  end_date date default (now() at time zone 'UTC')::date
+)
+returns table(day date, runs int, best_score int, avg_score numeric)
+language sql
+stable
+as $$
+  select
+    d.day,
+    coalesce(g.runs, 0),
+    g.best_score,
+    round(g.total_score::numeric / nullif(g.runs, 0), 1)
+  from (
+    select (end_date - i) as day
+    from generate_series(0, greatest(days, 1) - 1) as i
+  ) d
+  left join game_daily_stats g
+    on g.user_id = target_user_id and g.game = target_game and g.day = d.day
+  order by d.day;
+$$;
+
+grant execute on function get_score_series(uuid, text, int, date) to anon, authenticated;
+
+-- Backfill from existing runs
+insert into game_daily_stats (user_id, game, day, runs, best_score, total_score, total_duration_ms)
+select
+  user_id,
+  game,
+  (created_at at time zone 'UTC')::date,
+  count(*),
+  max(score),
+  sum(score),
+  sum(duration_ms)
+from game_runs
+group by user_id, game, (created_at at time zone 'UTC')::date
+on conflict (user_id, game, day) do nothing;
@@ -0,0 +1,39 @@
+-- Time-ordered primary keys
+-- Random (v4) UUIDs scatter inserts across the whole primary key index, so
+-- every insert touches a random leaf page once tables outgrow memory.
+-- uuid_generate_v7() builds RFC 9562 version 7 UUIDs (48-bit millisecond
+-- timestamp + random bits), the same layout as uuidv7() in lib/ids.js, so new
+-- keys are appended at the right edge of the index. Existing v4 ids stay
+-- valid; both are plain uuid values.
+
+create or replace function uuid_generate_v7()
+returns uuid
+language sql
+volatile
+as $$
+  -- Overwrite the first 48 bits of a v4 UUID with the millisecond timestamp
+  -- and flip the version nibble from 4 (0100) to 7 (0111); the variant bits
+  -- are already set by gen_random_uuid()
+  select encode(
+    set_bit(
+      set_bit(
+        overlay(
+          uuid_send(gen_random_uuid())
+          placing substring(int8send(floor(extract(epoch from clock_timestamp()) * 1000)::bigint) from 3)
+          from 1 for 6
+        ),
+        52, 1
+      ),
+      53, 1
+    ),
+    'hex'
+  )::uuid;
+$$;
+
+grant execute on function uuid_generate_v7() to anon, authenticated;
+
+alter table game_runs alter column id set default uuid_generate_v7();
+alter table sessions alter column id set default uuid_generate_v7();
+alter table documents alter column id set default uuid_generate_v7();
+alter table session_schedules alter column id set default uuid_generate_v7();
+alter table achievements alter column id set default uuid_generate_v7();
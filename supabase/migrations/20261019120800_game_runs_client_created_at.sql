@@ -0,0 +1,7 @@
+-- Client-side creation time of game runs
+-- game_runs.created_at is set by the server when the run is accepted, so a
+-- run replayed from the offline queue lands on top of the user's history and
+-- changes the gameRuns version (and ETag) like any new run. The time the run
+-- was played on the device, when the client sent one, is kept here.
+
+alter table game_runs add column if not exists client_created_at timestamptz;
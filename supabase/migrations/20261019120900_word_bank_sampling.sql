@@ -0,0 +1,24 @@
+-- Random samples from word_bank without ORDER BY random()
+-- GET /api/words samples words by language, length and frequency band.
+-- ORDER BY random() reads and sorts every matching row. Instead each word
+-- gets a fixed random sample_key, and a sample is the next rows at or after a
+-- random key in index order (see lib/word-sampler.js), so it reads only the
+-- rows it returns.
+
+alter table word_bank add column if not exists sample_key double precision not null default random();
+
+-- Frequency bands used by the API (frequency_rank 1 = most frequent, 0 or
+-- null = unranked); keep in sync with WORD_FREQUENCY_BANDS in lib/word-sampler.js
+alter table word_bank add column if not exists frequency_band smallint
+  generated always as (
+    case
+      when frequency_rank is null or frequency_rank <= 0 then 0
+      when frequency_rank <= 2000 then 1
+      when frequency_rank <= 10000 then 2
+      else 3
+    end
+  ) stored;
+
+-- Any band, and one band
+create index if not exists idx_word_bank_sample on word_bank(language, length, sample_key);
+create index if not exists idx_word_bank_band_sample on word_bank(language, length, frequency_band, sample_key);
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+CONCURRENT XP AWARD CHECK
+
+Fires 100 concurrent game completions for one user and checks that the final
+XP equals the sum of the awards.
+
+--api mode calls the award_xp database function through Supabase's REST RPC
+endpoint (NEXT_PUBLIC_SUPABASE_URL plus SUPABASE_SERVICE_ROLE_KEY; award_xp
+only awards another user's XP to the service role). Stand-in mode runs the same workload with
+threads against a SQLite file, comparing the previous read-then-upsert flow of
+updateUserProfile (which loses updates) with the single-statement increment.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.perf.harness import base_parser, write_results
+
+XP_PER_RUN = 120
+
+
+def calculate_level(xp):
+    return xp // 1000 + 1
+
+
+def stand_in_connection(path):
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("pragma journal_mode=wal")
+    return conn
+
+
+def read_then_upsert(path, user_id, barrier):
+    """The old updateUserProfile: SELECT, compute in the client, UPSERT"""
+    conn = stand_in_connection(path)
+    barrier.wait()
+    row = conn.execute("select xp from profiles where user_id = ?", (user_id,)).fetchone()
+    new_xp = (row[0] if row else 0) + XP_PER_RUN
+    time.sleep(0.001)  # network round-trip between the two requests
+    conn.execute(
+        "insert into profiles (user_id, xp, level) values (?, ?, ?) "
+        "on conflict (user_id) do update set xp = excluded.xp, level = excluded.level",
+        (user_id, new_xp, calculate_level(new_xp)),
+    )
+    conn.close()
+
+
+def atomic_award(path, user_id, barrier):
+    """award_xp: one statement increments under the row lock"""
+    conn = stand_in_connection(path)
+    barrier.wait()
+    conn.execute(
+        "insert into profiles (user_id, xp, level) values (?, ?, ?) "
+        "on conflict (user_id) do update set xp = xp + excluded.xp, "
+        "level = (xp + excluded.xp) / 1000 + 1",
+        (user_id, XP_PER_RUN, calculate_level(XP_PER_RUN)),
+    )
+    conn.close()
+
+
+def run_stand_in(args):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stand_in.db")
+        conn = stand_in_connection(path)
+        conn.execute("create table profiles (user_id text primary key, xp int not null default 0, level int not null default 1)")
+        conn.close()
+
+        for name, fn in (("read_then_upsert", read_then_upsert), ("award_xp", atomic_award)):
+            user_id = f"{args.user_id}_{name}"
+            barrier = threading.Barrier(args.completions)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.completions) as pool:
+                for future in [pool.submit(fn, path, user_id, barrier) for _ in range(args.completions)]:
+                    future.result()
+            elapsed = (time.perf_counter() - start) * 1000
+            conn = stand_in_connection(path)
+            xp, level = conn.execute("select xp, level from profiles where user_id = ?", (user_id,)).fetchone()
+            conn.close()
+            results[name] = {"final_xp": xp, "level": level, "expected_xp": args.completions * XP_PER_RUN,
+                             "ms": round(elapsed, 1)}
+    return results
+
+
+def run_api(args):
+    import requests
+
+    url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key or not args.uuid:
+        print("❌ --api mode needs NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY and --uuid")
+        sys.exit(1)
+
+    headers = {"apikey": key, "Authorization": f"Bearer {key}", "Content-Type": "application/json"}
+    user_id = args.uuid
+    rpc = f"{url}/rest/v1/rpc/award_xp"
+
+    def award(_):
+        response = requests.post(rpc, json={"target_user_id": user_id, "xp_gain": XP_PER_RUN},
+                                 headers=headers, timeout=30)
+        response.raise_for_status()
+        return response.json()[0]["xp"]
+
+    before = requests.post(rpc, json={"target_user_id": user_id, "xp_gain": 0}, headers=headers, timeout=30)
+    before.raise_for_status()
+    base_xp = before.json()[0]["xp"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.completions) as pool:
+        returned = list(pool.map(award, range(args.completions)))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    final = requests.post(rpc, json={"target_user_id": user_id, "xp_gain": 0}, headers=headers, timeout=30)
+    final_xp = final.json()[0]["xp"]
+    return {"award_xp": {
+        "final_xp": final_xp - base_xp, "expected_xp": args.completions * XP_PER_RUN,
+        "distinct_returned": len(set(returned)), "ms": round(elapsed, 1),
+    }}
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--completions", type=int, default=100, help="concurrent completions")
+    parser.add_argument("--uuid", help="--api mode: id of an existing auth user (profiles references auth.users)")
+    args = parser.parse_args()
+
+    results = run_api(args) if args.api else run_stand_in(args)
+
+    print()
+    print(f"📊 {args.completions} concurrent completions of {XP_PER_RUN} XP")
+    ok = True
+    for name, result in results.items():
+        correct = result["final_xp"] == result["expected_xp"]
+        ok = ok and (correct or name == "read_then_upsert")
+        # read_then_upsert is the previous behaviour and is expected to lose XP
+        mark = "✅" if correct else ("⚠️" if name == "read_then_upsert" else "❌")
+        print(f"  {mark} {name}: final XP {result['final_xp']} / expected {result['expected_xp']} ({result['ms']} ms)")
+
+    write_results(args.json_out, results)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+RESPONSE COMPRESSION BENCHMARK
+
+Measures CPU cost versus bytes saved for the encodings negotiated by
+lib/compression.js on representative JSON payloads (game run and document
+lists, AI question sets):
+
+- dynamic: gzip level 6 / Brotli quality 4, compressed on every response
+- stored: gzip level 9 / Brotli quality 11, compressed once at saveToCache
+
+Brotli rows require the optional `brotli` package and are skipped otherwise.
+In --api mode the live endpoints are requested with each Accept-Encoding and
+the compressed bytes on the wire are reported.
+"""
+
+import gzip
+import json
+import random
+import sys
+import uuid
+
+from tests.perf.harness import (
+    api_request,
+    base_parser,
+    print_table,
+    summarize,
+    time_call,
+    write_results,
+)
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Mirrors COMPRESSION_THRESHOLD, DYNAMIC_LEVELS and STORED_LEVELS
+THRESHOLD = 1024
+DYNAMIC = {"gzip": 6, "br": 4}
+STORED = {"gzip": 9, "br": 11}
+
+WORDS = ("lectura rápida comprensión memoria atención palabra texto velocidad "
+         "entrenamiento ojo campo visual movimiento fijación idea principal").split()
+
+
+def sentence(n):
+    return " ".join(random.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def game_runs_payload():
+    return [
+        {
+            "id": str(uuid.uuid4()), "user_id": "perf_user_001", "game": "schulte",
+            "score": random.randint(0, 300), "duration_ms": 60000, "difficulty_level": random.randint(1, 20),
+            "metrics": {"accuracy": round(random.random(), 3),
+                        "rts": [random.randint(300, 2500) for _ in range(30)]},
+            "created_at": "2025-01-01T00:00:00+00:00",
+        }
+        for _ in range(50)
+    ]
+
+
+def documents_payload():
+    return [
+        {"id": str(uuid.uuid4()), "title": f"Documento {i}", "content": sentence(800),
+         "word_count": 800, "language": "es", "created_at": "2025-01-01T00:00:00+00:00"}
+        for i in range(20)
+    ]
+
+
+def questions_payload():
+    return {
+        "items": [
+            {"qid": f"q{i}", "type": "detail", "q": sentence(12) + "?",
+             "choices": [sentence(6) for _ in range(4)], "correctIndex": random.randint(0, 3),
+             "explain": sentence(25), "evidence": {"quote": sentence(15), "charStart": 0, "charEnd": 90}}
+            for i in range(10)
+        ],
+        "meta": {"docId": "doc_1", "locale": "es", "chunkIds": ["chunk_0", "chunk_1"], "model": "gpt-4o-mini"},
+        "cached": True,
+    }
+
+
+def compressors(levels):
+    result = {"gzip": lambda data: gzip.compress(data, compresslevel=levels["gzip"])}
+    if brotli:
+        result["br"] = lambda data: brotli.compress(data, quality=levels["br"], mode=brotli.MODE_TEXT)
+    return result
+
+
+def run_stand_in(args):
+    payloads = {
+        "gameRuns (50)": game_runs_payload(),
+        "documents (20)": documents_payload(),
+        "ai questions (10)": questions_payload(),
+    }
+    results = []
+    for name, payload in payloads.items():
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        for mode, levels in (("dynamic", DYNAMIC), ("stored", STORED)):
+            for encoding, compress in compressors(levels).items():
+                compressed = compress(body)
+                timing = summarize(time_call(lambda: compress(body), args.repeat))
+                results.append({
+                    "payload": name, "mode": mode, "encoding": encoding,
+                    "raw_bytes": len(body), "encoded_bytes": len(compressed),
+                    "cpu_ms": timing["p50_ms"],
+                })
+    if not brotli:
+        print("⚠️ brotli not installed, reporting gzip only (pip install brotli)")
+    print_table(
+        f"CPU cost vs bytes saved (threshold {THRESHOLD} B)",
+        ["payload", "mode", "enc", "raw B", "encoded B", "saved", "cpu p50 ms"],
+        [
+            (r["payload"], r["mode"], r["encoding"], r["raw_bytes"], r["encoded_bytes"],
+             f"{(1 - r['encoded_bytes'] / r['raw_bytes']) * 100:.1f}%", r["cpu_ms"])
+            for r in results
+        ],
+    )
+    return results
+
+
+def wire_bytes(path, params, encoding):
+    response, elapsed = api_request(
+        "GET", path, params=params, headers={"Accept-Encoding": encoding}, stream=True
+    )
+    raw = response.raw.read(decode_content=False)
+    return response.headers.get("Content-Encoding", "identity"), len(raw), elapsed
+
+
+def run_api(args):
+    results = []
+    for endpoint in ("gameRuns", "documents", "sessions"):
+        for encoding in ("identity", "gzip", "br"):
+            used, size, elapsed = wire_bytes(f"/{endpoint}", {"user_id": args.user_id}, encoding)
+            results.append({"endpoint": endpoint, "accept": encoding, "content_encoding": used,
+                            "wire_bytes": size, "ms": round(elapsed, 2)})
+    print_table(
+        "Bytes on the wire by Accept-Encoding",
+        ["endpoint", "accept", "served", "wire bytes", "ms"],
+        [(r["endpoint"], r["accept"], r["content_encoding"], r["wire_bytes"], r["ms"]) for r in results],
+    )
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    args = parser.parse_args()
+
+    results = run_api(args) if args.api else run_stand_in(args)
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+CONDITIONAL GET (ETag / 304) HARNESS CHECK
+
+Simulates the polling pattern of GameShell and the stats panels: repeated
+reads of settings, progress and gameRuns with occasional writes in between.
+
+--api mode issues real requests, replaying the ETag of the previous response
+in If-None-Match the way public/sw.js does, and reports the 304 rate, bytes
+received and latency of conditional vs unconditional reads. Stand-in mode
+compares the database-side cost of the version probe used for revalidation
+against the full row read it replaces.
+"""
+
+import hashlib
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+from tests.perf.harness import (
+    api_request,
+    base_parser,
+    open_stand_in,
+    print_table,
+    summarize,
+    time_call,
+    write_results,
+)
+
+ENDPOINTS = {
+    "settings": ("/settings", "user_id"),
+    "progress": ("/progress/get", "userId"),
+    "gameRuns": ("/gameRuns", "user_id"),
+}
+
+
+def poll_endpoint(args, name):
+    path, user_param = ENDPOINTS[name]
+    params = {user_param: args.user_id}
+
+    plain = []
+    for _ in range(args.repeat):
+        response, elapsed = api_request("GET", path, params=params)
+        plain.append((response.status_code, len(response.content), elapsed))
+
+    conditional = []
+    etag = None
+    for i in range(args.repeat):
+        if args.write_every and i and i % args.write_every == 0:
+            write(args, name)
+        headers = {"If-None-Match": etag} if etag else {}
+        response, elapsed = api_request("GET", path, params=params, headers=headers)
+        if response.status_code == 200:
+            etag = response.headers.get("ETag") or etag
+        conditional.append((response.status_code, len(response.content), elapsed))
+
+    revalidations = conditional[1:]
+    not_modified = [c for c in revalidations if c[0] == 304]
+    return {
+        "endpoint": name,
+        "plain": summarize([c[2] for c in plain]),
+        "conditional": summarize([c[2] for c in revalidations]),
+        "rate_304": len(not_modified) / len(revalidations) if revalidations else 0.0,
+        "plain_bytes": sum(c[1] for c in plain),
+        "conditional_bytes": sum(c[1] for c in conditional),
+    }
+
+
+def write(args, name):
+    """Touch the resource so the next revalidation must return 200"""
+    if name == "gameRuns":
+        api_request("POST", "/gameRuns", json={
+            "userId": args.user_id, "game": "schulte", "score": random.randint(0, 300),
+            "durationMs": 60000, "metrics": {},
+        })
+    else:
+        api_request("POST", "/progress/save", json={
+            "userId": args.user_id, "game": "schulte",
+            "progress": {"lastLevel": random.randint(1, 20), "lastBestScore": 100},
+        })
+
+
+def run_api(args):
+    results = [poll_endpoint(args, name) for name in ENDPOINTS]
+    print_table(
+        f"Conditional reads ({args.repeat} polls, write every {args.write_every or '-'})",
+        ["endpoint", "304 rate", "plain p50", "cond p50", "plain bytes", "cond bytes"],
+        [
+            (r["endpoint"], f"{r['rate_304'] * 100:.0f}%", r["plain"]["p50_ms"], r["conditional"]["p50_ms"],
+             r["plain_bytes"], r["conditional_bytes"])
+            for r in results
+        ],
+    )
+    return results
+
+
+def run_stand_in(args):
+    conn = open_stand_in()
+    progress = {
+        game: {"lastLevel": random.randint(1, 20), "lastBestScore": random.randint(0, 300),
+               "history": [random.randint(0, 300) for _ in range(200)]}
+        for game in ["schulte", "twin_words", "par_impar", "memory_digits", "running_words",
+                     "letters_grid", "word_search", "anagrams"]
+    }
+    updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(10_000):
+        conn.execute(
+            "insert into settings (user_id, progress, updated_at) values (?, ?, ?)",
+            (f"user_{i}", json.dumps(progress), (updated_at + timedelta(seconds=i)).isoformat()),
+        )
+    conn.execute("insert into settings (user_id, progress, updated_at) values (?, ?, ?)",
+                 (args.user_id, json.dumps(progress), updated_at.isoformat()))
+    conn.commit()
+
+    def etag(*parts):
+        return hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+
+    def full_read():
+        row = conn.execute("select * from settings where user_id = ?", (args.user_id,)).fetchone()
+        body = json.dumps({"progress": json.loads(row["progress"])}).encode()
+        return etag("progress", row["updated_at"]), body
+
+    def probe():
+        row = conn.execute("select updated_at from settings where user_id = ?", (args.user_id,)).fetchone()
+        return etag("progress", row["updated_at"])
+
+    full = summarize(time_call(full_read, args.repeat))
+    revalidate = summarize(time_call(probe, args.repeat))
+    body_bytes = len(full_read()[1])
+
+    # Polling workload: a write lands with probability p between polls
+    served_304 = 0
+    current = probe()
+    client_etag = None
+    for _ in range(args.repeat):
+        if random.random() < args.write_rate:
+            conn.execute("update settings set updated_at = ? where user_id = ?",
+                         (datetime.now(timezone.utc).isoformat(), args.user_id))
+            current = probe()
+        if client_etag == current:
+            served_304 += 1
+        else:
+            client_etag = full_read()[0]
+
+    results = {
+        "full_read": full,
+        "version_probe": revalidate,
+        "body_bytes": body_bytes,
+        "rate_304": served_304 / args.repeat,
+    }
+    print_table(
+        f"Progress read cost per poll (write rate {args.write_rate})",
+        ["path", "p50 ms", "p95 ms", "bytes"],
+        [
+            ("200 full read", full["p50_ms"], full["p95_ms"], body_bytes),
+            ("304 version probe", revalidate["p50_ms"], revalidate["p95_ms"], 0),
+        ],
+    )
+    print(f"  304 rate: {results['rate_304'] * 100:.1f}%")
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--write-every", type=int, default=0,
+                        help="--api mode: write between every N polls (0 = read only)")
+    parser.add_argument("--write-rate", type=float, default=0.05,
+                        help="stand-in mode: probability of a write between polls")
+    args = parser.parse_args()
+
+    results = run_api(args) if args.api else run_stand_in(args)
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+PRIMARY KEY INSERT THROUGHPUT BENCHMARK
+
+Inserts --rows rows (default 10M) into a file-backed SQLite stand-in with each
+ID scheme and reports insert rate (overall and for the last 10% of rows, when
+the index is largest) plus primary key index size and page fill:
+
+- legacy: `session_<ms>_<base36>` strings previously built in route.js
+- uuid4: random 16-byte UUIDs (the gen_random_uuid() default)
+- uuidv7: 16-byte time-ordered UUIDs, same layout as uuidv7() in lib/ids.js
+
+Index sizes come from SQLite's dbstat table. ID generation happens in the
+client, so there is no --api mode.
+"""
+
+import os
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+import time
+import uuid
+
+from tests.perf.harness import base_parser, print_table, write_results
+
+BASE36 = string.digits + string.ascii_lowercase
+
+
+class UUIDv7:
+    """Monotonic UUIDv7 generator mirroring lib/ids.js"""
+
+    def __init__(self):
+        self.last_ms = -1
+        self.counter = 0
+
+    def __call__(self):
+        rand = bytearray(os.urandom(16))
+        ms = max(time.time_ns() // 1_000_000, self.last_ms)
+        seed = ((rand[6] & 0x07) << 8) | rand[7]
+        if ms == self.last_ms:
+            self.counter += 1
+            if self.counter > 0xFFF:
+                ms += 1
+                self.counter = seed
+        else:
+            self.counter = seed
+        self.last_ms = ms
+
+        rand[0:6] = ms.to_bytes(6, "big")
+        rand[6] = 0x70 | (self.counter >> 8)
+        rand[7] = self.counter & 0xFF
+        rand[8] = 0x80 | (rand[8] & 0x3F)
+        return bytes(rand)
+
+
+def legacy_id():
+    suffix = "".join(random.choice(BASE36) for _ in range(9))
+    return f"session_{time.time_ns() // 1_000_000}_{suffix}"
+
+
+def uuid4_id():
+    return uuid.uuid4().bytes
+
+
+SCHEMES = {
+    "legacy": legacy_id,
+    "uuid4": uuid4_id,
+    "uuidv7": UUIDv7(),
+}
+
+
+def run_scheme(path, make_id, rows, batch, user_id):
+    conn = sqlite3.connect(path)
+    conn.execute("pragma journal_mode=off")
+    conn.execute("pragma synchronous=off")
+    conn.execute("pragma cache_size=-65536")  # 64 MB, well below the 10M-row index
+    conn.execute("create table game_runs (id blob primary key, user_id text not null, created_at text not null)")
+
+    created_at = "2025-01-01T00:00:00+00:00"
+    batch_rates = []
+    inserted = 0
+    start = time.perf_counter()
+    while inserted < rows:
+        size = min(batch, rows - inserted)
+        data = [(make_id(), user_id, created_at) for _ in range(size)]
+        begin = time.perf_counter()
+        conn.executemany("insert into game_runs values (?, ?, ?)", data)
+        conn.commit()
+        batch_rates.append((size, time.perf_counter() - begin))
+        inserted += size
+    total_s = time.perf_counter() - start
+
+    index = conn.execute(
+        "select sum(pgsize), sum(unused), count(*) from dbstat where name like 'sqlite_autoindex_game_runs%'"
+    ).fetchone()
+    conn.close()
+
+    tail = batch_rates[-max(1, len(batch_rates) // 10):]
+    tail_rows = sum(n for n, _ in tail)
+    tail_s = sum(s for _, s in tail)
+    return {
+        "rows": rows,
+        "rows_per_s": round(rows / total_s),
+        "tail_rows_per_s": round(tail_rows / tail_s) if tail_s else 0,
+        "index_bytes": index[0],
+        "index_pages": index[2],
+        "index_fill": round(1 - index[1] / index[0], 3) if index[0] else 0.0,
+    }
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000, help="rows inserted per scheme")
+    parser.add_argument("--batch", type=int, default=10_000, help="rows per insert transaction")
+    args = parser.parse_args()
+
+    if args.api:
+        print("⚠️ IDs are generated client-side; only the stand-in mode is available")
+        return 1
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make_id in SCHEMES.items():
+            print(f"⏱️ {name}: inserting {args.rows} rows...")
+            results[name] = run_scheme(os.path.join(tmp, f"{name}.db"), make_id, args.rows, args.batch, args.user_id)
+
+    print_table(
+        f"Primary key inserts at {args.rows} rows",
+        ["scheme", "rows/s", "last 10% rows/s", "index MB", "index fill"],
+        [
+            (name, r["rows_per_s"], r["tail_rows_per_s"], round(r["index_bytes"] / 2 ** 20, 1), r["index_fill"])
+            for name, r in results.items()
+        ],
+    )
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
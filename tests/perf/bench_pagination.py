@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+KEYSET PAGINATION SCALING BENCHMARK
+
+Seeds 100k game runs for a single user and measures the latency of fetching a
+page at increasing depths of the history:
+
+- keyset: WHERE created_at <= c AND (created_at, id) < cursor
+  ORDER BY created_at DESC, id DESC LIMIT n — the query shape applyKeyset()
+  in lib/pagination.js sends
+- offset: ORDER BY created_at DESC LIMIT n OFFSET depth — for comparison
+
+Keyset fetches should stay flat regardless of depth while offset grows
+linearly. In --api mode the script walks GET /api/gameRuns page by page using
+the X-Next-Cursor header and reports per-page latency.
+"""
+
+import json
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from tests.perf.harness import (
+    api_request,
+    base_parser,
+    open_stand_in,
+    print_table,
+    summarize,
+    time_call,
+    write_results,
+)
+
+GAMES = ["schulte", "twin_words", "par_impar", "memory_digits", "running_words",
+         "letters_grid", "word_search", "anagrams"]
+DEPTHS = [0, 1_000, 10_000, 50_000, 99_000]
+
+
+def seed_runs(conn, user_id, count):
+    """Insert `count` runs for one user plus background noise from other users"""
+    print(f"🌱 Seeding {count} game runs for {user_id}...")
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(count):
+        created = start + timedelta(seconds=i * 37)
+        rows.append((
+            str(uuid.uuid4()), user_id, random.choice(GAMES), random.randint(0, 300),
+            60000, random.randint(1, 20), json.dumps({"accuracy": random.random()}),
+            created.isoformat(),
+        ))
+    for i in range(count // 10):
+        rows.append((
+            str(uuid.uuid4()), f"other_{i % 100}", random.choice(GAMES), 0, 60000, 1, "{}",
+            (start + timedelta(seconds=i * 11)).isoformat(),
+        ))
+    conn.executemany(
+        "insert into game_runs (id, user_id, game, score, duration_ms, difficulty_level, metrics, created_at) "
+        "values (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.execute("analyze")
+
+
+def cursor_at_depth(conn, user_id, depth):
+    """(created_at, id) of the row just before `depth` — what the client would hold"""
+    if depth == 0:
+        return None
+    row = conn.execute(
+        "select created_at, id from game_runs where user_id = ? "
+        "order by created_at desc, id desc limit 1 offset ?",
+        (user_id, depth - 1),
+    ).fetchone()
+    return (row["created_at"], row["id"])
+
+
+def keyset_page(conn, user_id, cursor, limit):
+    if cursor is None:
+        return conn.execute(
+            "select * from game_runs where user_id = ? "
+            "order by created_at desc, id desc limit ?",
+            (user_id, limit + 1),
+        ).fetchall()
+    return conn.execute(
+        "select * from game_runs where user_id = ? "
+        "and created_at <= ? and (created_at < ? or (created_at = ? and id < ?)) "
+        "order by created_at desc, id desc limit ?",
+        (user_id, cursor[0], cursor[0], cursor[0], cursor[1], limit + 1),
+    ).fetchall()
+
+
+def offset_page(conn, user_id, depth, limit):
+    return conn.execute(
+        "select * from game_runs where user_id = ? "
+        "order by created_at desc, id desc limit ? offset ?",
+        (user_id, limit, depth),
+    ).fetchall()
+
+
+def run_stand_in(args):
+    conn = open_stand_in()
+    seed_runs(conn, args.user_id, args.runs)
+
+    results = []
+    rows = []
+    for depth in [d for d in DEPTHS if d < args.runs]:
+        cursor = cursor_at_depth(conn, args.user_id, depth)
+        keyset = summarize(time_call(lambda: keyset_page(conn, args.user_id, cursor, args.limit), args.repeat))
+        offset = summarize(time_call(lambda: offset_page(conn, args.user_id, depth, args.limit), args.repeat))
+        results.append({"depth": depth, "keyset": keyset, "offset": offset})
+        rows.append((depth, keyset["p50_ms"], keyset["p95_ms"], offset["p50_ms"], offset["p95_ms"]))
+
+    print_table(
+        f"Page fetch latency by depth ({args.runs} runs, page size {args.limit})",
+        ["depth", "keyset p50", "keyset p95", "offset p50", "offset p95"],
+        rows,
+    )
+    return results
+
+
+def run_api(args):
+    print(f"🔍 Walking GET /api/gameRuns for {args.user_id} (page size {args.limit})...")
+    results = []
+    cursor = None
+    page = 0
+    while page < args.max_pages:
+        params = {"user_id": args.user_id, "limit": args.limit}
+        if cursor:
+            params["cursor"] = cursor
+        response, elapsed = api_request("GET", "/gameRuns", params=params)
+        if response.status_code != 200:
+            print(f"  ❌ Page {page}: {response.status_code} - {response.text[:100]}")
+            break
+        results.append({"page": page, "rows": len(response.json()), "ms": round(elapsed, 2)})
+        cursor = response.headers.get("X-Next-Cursor")
+        page += 1
+        if not cursor:
+            break
+
+    buckets = [results[i:i + 10] for i in range(0, len(results), 10)]
+    print_table(
+        "Per-page latency (grouped by 10 pages)",
+        ["pages", "rows", "p50 ms", "p95 ms"],
+        [
+            (f"{b[0]['page']}-{b[-1]['page']}", sum(r["rows"] for r in b),
+             summarize([r["ms"] for r in b])["p50_ms"], summarize([r["ms"] for r in b])["p95_ms"])
+            for b in buckets
+        ],
+    )
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100_000, help="runs seeded for the user (stand-in mode)")
+    parser.add_argument("--limit", type=int, default=50, help="page size")
+    parser.add_argument("--max-pages", type=int, default=2_000, help="page cap for --api mode")
+    args = parser.parse_args()
+
+    results = run_api(args) if args.api else run_stand_in(args)
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+PAYLOAD SIZE BENCHMARK FOR GET LIST ENDPOINTS
+
+Reports bytes-on-the-wire and JSON serialization time per endpoint for the
+full rows (select('*'), the previous behaviour) versus the view=summary
+projection from lib/projection.js.
+
+In stand-in mode rows are read from the SQLite stand-in with the same column
+lists as FIELD_ALLOWLIST / SUMMARY_FIELDS and serialized the way
+NextResponse.json does. In --api mode the live endpoints are fetched with and
+without view=summary.
+"""
+
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from tests.perf.harness import (
+    api_request,
+    base_parser,
+    open_stand_in,
+    print_table,
+    write_results,
+)
+
+# Mirrors SUMMARY_FIELDS in lib/projection.js
+SUMMARY_FIELDS = {
+    "game_runs": ["id", "game", "score", "duration_ms", "difficulty_level", "created_at"],
+    "sessions": ["id", "wpm_start", "wpm_end", "comprehension_score", "exercise_type",
+                 "duration_seconds", "created_at"],
+    "documents": ["id", "title", "word_count", "language", "source_type", "created_at"],
+}
+
+# endpoint -> (table, default page size in the catch-all route)
+ENDPOINTS = {
+    "gameRuns": ("game_runs", 50),
+    "sessions": ("sessions", 50),
+    "documents": ("documents", 20),
+}
+
+WORDS = ("lectura rápida comprensión memoria atención palabra texto velocidad "
+         "entrenamiento ojo campo visual movimiento sacádico fijación").split()
+
+
+def seed(conn, user_id):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(200):
+        metrics = {
+            "accuracy": round(random.random(), 3),
+            "rts": [random.randint(300, 2500) for _ in range(40)],
+            "levels": [random.randint(1, 20) for _ in range(10)],
+        }
+        conn.execute(
+            "insert into game_runs values (?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(uuid.uuid4()), user_id, "schulte", random.randint(0, 300), 60000,
+             random.randint(1, 20), json.dumps(metrics), (start + timedelta(minutes=i)).isoformat()),
+        )
+        conn.execute(
+            "insert into sessions values (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(uuid.uuid4()), user_id, 250, 320, 80, "rsvp", 300, 1500,
+             (start + timedelta(minutes=i)).isoformat()),
+        )
+    for i in range(40):
+        content = " ".join(random.choice(WORDS) for _ in range(3000))
+        conn.execute(
+            "insert into documents values (?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(uuid.uuid4()), user_id, f"Documento {i}", content, 3000, "es", "text",
+             (start + timedelta(hours=i)).isoformat()),
+        )
+    conn.commit()
+
+
+def fetch_rows(conn, table, user_id, columns, limit):
+    select = ", ".join(columns) if columns else "*"
+    rows = conn.execute(
+        f"select {select} from {table} where user_id = ? order by created_at desc, id desc limit ?",
+        (user_id, limit),
+    ).fetchall()
+    result = []
+    for row in rows:
+        item = dict(row)
+        if "metrics" in item:
+            item["metrics"] = json.loads(item["metrics"])
+        result.append(item)
+    return result
+
+
+def serialize(rows, repeat):
+    """Return (bytes, mean serialization ms) for the JSON body"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return len(body), (time.perf_counter() - start) * 1000 / repeat
+
+
+def run_stand_in(args):
+    conn = open_stand_in()
+    seed(conn, args.user_id)
+
+    results = []
+    for endpoint, (table, limit) in ENDPOINTS.items():
+        full_bytes, full_ms = serialize(fetch_rows(conn, table, args.user_id, None, limit), args.repeat)
+        summary_bytes, summary_ms = serialize(
+            fetch_rows(conn, table, args.user_id, SUMMARY_FIELDS[table], limit), args.repeat
+        )
+        results.append({
+            "endpoint": endpoint,
+            "full_bytes": full_bytes,
+            "summary_bytes": summary_bytes,
+            "full_serialize_ms": round(full_ms, 3),
+            "summary_serialize_ms": round(summary_ms, 3),
+        })
+    return results
+
+
+def run_api(args):
+    results = []
+    for endpoint in ENDPOINTS:
+        full, full_ms = api_request("GET", f"/{endpoint}", params={"user_id": args.user_id})
+        summary, summary_ms = api_request(
+            "GET", f"/{endpoint}", params={"user_id": args.user_id, "view": "summary"}
+        )
+        if full.status_code != 200 or summary.status_code != 200:
+            print(f"  ❌ {endpoint}: {full.status_code}/{summary.status_code}")
+            continue
+        results.append({
+            "endpoint": endpoint,
+            "full_bytes": len(full.content),
+            "summary_bytes": len(summary.content),
+            "full_request_ms": round(full_ms, 2),
+            "summary_request_ms": round(summary_ms, 2),
+        })
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    args = parser.parse_args()
+
+    results = run_api(args) if args.api else run_stand_in(args)
+    timing = "request_ms" if args.api else "serialize_ms"
+    print_table(
+        "Bytes on the wire per endpoint (full → view=summary)",
+        ["endpoint", "full bytes", "summary bytes", "saved", f"full {timing}", f"summary {timing}"],
+        [
+            (r["endpoint"], r["full_bytes"], r["summary_bytes"],
+             f"{(1 - r['summary_bytes'] / r['full_bytes']) * 100:.1f}%" if r["full_bytes"] else "-",
+             r[f"full_{timing}"], r[f"summary_{timing}"])
+            for r in results
+        ],
+    )
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+SCHULTE TABLE GENERATION BENCHMARK
+
+Times generateSchulteNumbers (lib/progress-tracking.js) for the sequence
+modes of levels 15-20 (multiples, primes, fibonacci) and larger tables, up
+to n = 10000 (--sizes), three ways:
+
+- fresh: the previous generator, which computed the sequence on every
+  table (primes by trial division) and shuffled it
+- cold: the first table of a (mode, n) on an empty cache, which fills the
+  sequence cache (and sieves the primes)
+- cached: every later table of that (mode, n): a cache read and a one-pass
+  shuffled copy
+
+Fibonacci tables hold the distinct Fibonacci numbers 1, 2, 3, 5, ... and
+stop at 77 cells (F(78), the last one exact in a double), so the fibonacci
+rows for n above 77 all time a 77-cell table.
+
+These are Python ports of the JS; absolute times are Python's, the
+comparison between them is what carries over. Tables are generated in the
+browser, so there is no --api mode.
+"""
+
+import math
+import random
+import sys
+import time
+
+from tests.perf.harness import base_parser, print_table, summarize, time_call, write_results
+
+MODES = ("multiples", "primes", "fibonacci")
+MAX_FIBONACCI_CELLS = 77
+
+
+def is_prime(num):
+    if num < 2:
+        return False
+    for i in range(2, math.isqrt(num) + 1):
+        if num % i == 0:
+            return False
+    return True
+
+
+def fresh_sequence(n, mode):
+    if mode == "multiples":
+        return [(i + 1) * 3 for i in range(n)]
+    if mode == "primes":
+        primes, num = [], 2
+        while len(primes) < n:
+            if is_prime(num):
+                primes.append(num)
+            num += 1
+        return primes
+    fib = [1.0, 2.0]
+    while len(fib) < min(n, MAX_FIBONACCI_CELLS):
+        fib.append(fib[-1] + fib[-2])
+    return fib[:n]
+
+
+def fresh_generate(n, mode, rng):
+    values = fresh_sequence(n, mode)
+    for i in range(len(values) - 1, 0, -1):
+        j = rng.randrange(i + 1)
+        values[i], values[j] = values[j], values[i]
+    return values
+
+
+class SequenceCache:
+    """Port of getSchulteSequence and its prime sieve and Fibonacci cache"""
+
+    def __init__(self):
+        self.sequences, self.primes, self.prime_limit, self.fibonacci = {}, [], 0, None
+
+    def first_primes(self, n):
+        if len(self.primes) < n:
+            bound = 15 if n < 6 else math.ceil(n * (math.log(n) + math.log(math.log(n)))) + 1
+            limit = max(bound, self.prime_limit * 2)
+            composite = bytearray(limit)
+            found = []
+            for i in range(2, limit):
+                if composite[i]:
+                    continue
+                found.append(i)
+                for j in range(i * i, limit, i):
+                    composite[j] = 1
+            self.primes, self.prime_limit = found, limit
+        return self.primes[:n]
+
+    def first_fibonacci(self, n):
+        if self.fibonacci is None:
+            fib = [1.0, 2.0]
+            while len(fib) < MAX_FIBONACCI_CELLS:
+                fib.append(fib[-1] + fib[-2])
+            self.fibonacci = fib
+        return self.fibonacci[:n]
+
+    def sequence(self, n, mode):
+        key = (mode, n)
+        if key not in self.sequences:
+            if mode == "multiples":
+                self.sequences[key] = [(i + 1) * 3 for i in range(n)]
+            elif mode == "primes":
+                self.sequences[key] = self.first_primes(n)
+            else:
+                self.sequences[key] = self.first_fibonacci(n)
+        return self.sequences[key]
+
+    def generate(self, n, mode, rng):
+        sequence = self.sequence(n, mode)
+        values = [None] * len(sequence)
+        for i, value in enumerate(sequence):
+            j = rng.randrange(i + 1)
+            values[i] = values[j]
+            values[j] = value
+        return values
+
+
+def run_stand_in(args):
+    rng = random.Random(args.seed)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = {}
+    for mode in MODES:
+        for n in sizes:
+            cache = SequenceCache()
+            start = time.perf_counter()
+            values = cache.generate(n, mode, rng)
+            cold_ms = (time.perf_counter() - start) * 1000
+            assert sorted(values) == sorted(fresh_generate(n, mode, rng))
+            fresh = summarize(time_call(lambda: fresh_generate(n, mode, rng), args.repeat))
+            cached = summarize(time_call(lambda: cache.generate(n, mode, rng), args.repeat))
+            results[f"{mode}_{n}"] = {
+                "fresh_mean_ms": fresh["mean_ms"],
+                "cold_ms": round(cold_ms, 3),
+                "cached_mean_ms": cached["mean_ms"],
+                "speedup": round(fresh["mean_ms"] / cached["mean_ms"], 1) if cached["mean_ms"] else None,
+            }
+
+    print_table(
+        f"Schulte table generation ({args.repeat} tables per size)",
+        ["mode", "n", "fresh ms", "cold ms", "cached ms", "speedup"],
+        [(mode, n, r["fresh_mean_ms"], r["cold_ms"], r["cached_mean_ms"], r["speedup"])
+         for mode in MODES for n in sizes for r in [results[f"{mode}_{n}"]]],
+    )
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="49,100,1000,10000", help="table sizes (n), comma separated")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    args = parser.parse_args()
+    if args.api:
+        parser.error("Schulte tables are generated in the browser; there is no API to time")
+
+    write_results(args.json_out, run_stand_in(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+SCORE HISTORY CHART BENCHMARK
+
+Compares the previous chart load (every game_runs row in the range, metrics
+included, binned by day on the client as processScoresForChart did) against
+the pre-binned series read from the game_daily_stats rollup, for 7, 30 and
+365 day ranges. Reports rows and bytes transferred and end-to-end latency.
+
+The stand-in maintains game_daily_stats with an insert trigger equivalent to
+game_daily_stats_on_game_run() in
+supabase/migrations/20261019120600_game_daily_stats.sql. --api mode times
+GET /api/scoreHistory for each range.
+"""
+
+import json
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from tests.perf.harness import (
+    api_request,
+    base_parser,
+    open_stand_in,
+    print_table,
+    summarize,
+    time_call,
+    write_results,
+)
+
+GAME = "schulte"
+RANGES = [7, 30, 365]
+
+DAILY_STATS_SCHEMA = """
+create table game_daily_stats (
+  user_id text not null,
+  game text not null,
+  day text not null,
+  runs int not null default 0,
+  best_score int not null default 0,
+  total_score int not null default 0,
+  total_duration_ms int not null default 0,
+  primary key (user_id, game, day)
+);
+create trigger game_daily_stats_game_run after insert on game_runs
+begin
+  insert into game_daily_stats (user_id, game, day, runs, best_score, total_score, total_duration_ms)
+  values (new.user_id, new.game, substr(new.created_at, 1, 10), 1, new.score, new.score, new.duration_ms)
+  on conflict (user_id, game, day) do update set
+    runs = runs + 1,
+    best_score = max(best_score, excluded.best_score),
+    total_score = total_score + excluded.total_score,
+    total_duration_ms = total_duration_ms + excluded.total_duration_ms;
+end;
+"""
+
+
+def seed(conn, user_id, runs_per_day, today):
+    rows = []
+    for day in range(365):
+        base = today - timedelta(days=day)
+        for _ in range(runs_per_day):
+            created = base + timedelta(seconds=random.randint(0, 86399))
+            metrics = {"accuracy": round(random.random(), 3),
+                       "rts": [random.randint(300, 2500) for _ in range(25)]}
+            rows.append((str(uuid.uuid4()), user_id, GAME, random.randint(0, 300), 60000,
+                         random.randint(1, 20), json.dumps(metrics), created.isoformat()))
+    conn.executemany("insert into game_runs values (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    return len(rows)
+
+
+def day_list(today, days):
+    return [(today - timedelta(days=days - 1 - i)).strftime("%Y-%m-%d") for i in range(days)]
+
+
+def per_run(conn, user_id, today, days):
+    """The old path: fetch every run in range, then group by day"""
+    cutoff = (today - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    rows = conn.execute(
+        "select score, created_at, duration_ms, metrics from game_runs "
+        "where user_id = ? and game = ? and created_at >= ? order by created_at",
+        (user_id, GAME, cutoff),
+    ).fetchall()
+    payload = json.dumps([dict(r) for r in rows])
+    runs = json.loads(payload)
+
+    scores_by_date = {}
+    for run in runs:
+        date = datetime.fromisoformat(run["created_at"]).strftime("%Y-%m-%d")
+        scores_by_date.setdefault(date, []).append(run["score"])
+    data = [max(scores_by_date[d]) if d in scores_by_date else None for d in day_list(today, days)]
+    return len(rows), len(payload), data
+
+
+def rollup(conn, user_id, today, days):
+    """The new path: one row per day from game_daily_stats"""
+    days_wanted = day_list(today, days)
+    rows = conn.execute(
+        "select day, runs, best_score, round(1.0 * total_score / runs, 1) as avg_score "
+        "from game_daily_stats where user_id = ? and game = ? and day between ? and ?",
+        (user_id, GAME, days_wanted[0], days_wanted[-1]),
+    ).fetchall()
+    by_day = {r["day"]: r for r in rows}
+    series = [
+        {"date": d, "runs": by_day[d]["runs"] if d in by_day else 0,
+         "best": by_day[d]["best_score"] if d in by_day else None,
+         "avg": by_day[d]["avg_score"] if d in by_day else None}
+        for d in days_wanted
+    ]
+    payload = json.dumps({"game": GAME, "days": days, "series": series})
+    return len(series), len(payload), [s["best"] for s in series]
+
+
+def run_stand_in(args):
+    conn = open_stand_in()
+    conn.executescript(DAILY_STATS_SCHEMA)
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    total = seed(conn, args.user_id, args.runs_per_day, today)
+    print(f"🌱 Seeded {total} runs ({args.runs_per_day}/day over 365 days)")
+
+    results = []
+    for days in RANGES:
+        old_rows, old_bytes, old_data = per_run(conn, args.user_id, today, days)
+        new_rows, new_bytes, new_data = rollup(conn, args.user_id, today, days)
+        assert old_data == new_data, f"series differ for {days} days"
+        old = summarize(time_call(lambda: per_run(conn, args.user_id, today, days), args.repeat))
+        new = summarize(time_call(lambda: rollup(conn, args.user_id, today, days), args.repeat))
+        results.append({
+            "days": days,
+            "per_run": {"rows": old_rows, "bytes": old_bytes, **old},
+            "rollup": {"rows": new_rows, "bytes": new_bytes, **new},
+        })
+
+    print_table(
+        "Chart load: per-run rows vs daily rollup",
+        ["days", "rows (old)", "rows (new)", "bytes (old)", "bytes (new)", "p50 old ms", "p50 new ms"],
+        [
+            (r["days"], r["per_run"]["rows"], r["rollup"]["rows"], r["per_run"]["bytes"],
+             r["rollup"]["bytes"], r["per_run"]["p50_ms"], r["rollup"]["p50_ms"])
+            for r in results
+        ],
+    )
+    return results
+
+
+def run_api(args):
+    results = []
+    for days in RANGES:
+        params = {"user_id": args.user_id, "game": GAME, "days": days}
+        samples = []
+        size = 0
+        for _ in range(args.repeat):
+            response, elapsed = api_request("GET", "/scoreHistory", params=params)
+            if response.status_code != 200:
+                print(f"❌ scoreHistory {days}d: {response.status_code} - {response.text[:100]}")
+                return None
+            samples.append(elapsed)
+            size = len(response.content)
+        results.append({"days": days, "bytes": size, **summarize(samples)})
+
+    print_table(
+        "GET /api/scoreHistory",
+        ["days", "bytes", "p50 ms", "p95 ms"],
+        [(r["days"], r["bytes"], r["p50_ms"], r["p95_ms"]) for r in results],
+    )
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs-per-day", type=int, default=20, help="stand-in: runs seeded per day")
+    args = parser.parse_args()
+
+    results = run_api(args) if args.api else run_stand_in(args)
+    if results is None:
+        return 1
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
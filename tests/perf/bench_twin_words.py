@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+TWIN WORDS PAIR BENCHMARK
+
+Draws TwinWords rounds of 8 "different" pairs of dictionary words at one
+edit distance (1-3) and reports the time per round, three ways:
+
+- scan: for a random word, compute the distance to every dictionary word
+  and pick a partner at the requested distance (an on-the-fly search; runs
+  a tenth of --repeat rounds)
+- pruned: the same search, but only over words within the length difference
+  the distance allows and past the letter-set lower bound, with a banded
+  distance that stops at the limit (the candidate filter of
+  lib/twin-words-index.js)
+- indexed: the pairs precomputed per distance by lib/twin-words-index.js,
+  so a round is array reads; the one-off build time is reported as well
+
+The dictionary is the locale's word bank words plus synthetic words (made by
+one or two random edits of existing ones, so they cluster like a real
+dictionary) up to --words. These are Python ports; absolute times are
+Python's, the comparison between them is what carries over. Pairs are built
+in the browser, so there is no --api mode.
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from tests.perf.harness import base_parser, print_table, summarize, write_results
+
+ROOT = Path(__file__).resolve().parents[2]
+
+PAIRS_PER_ROUND = 8
+MAX_PAIR_DISTANCE = 3  # mirrors lib/twin-words-index.js
+MIN_WORD_LENGTH = 3
+MAX_DRAW_ATTEMPTS = 20
+
+
+def load_words(locale):
+    """Words of the anagrams, wordSearch and runningWords banks in lib/word-bank.js"""
+    source = (ROOT / "lib" / "word-bank.js").read_text(encoding="utf-8")
+    bank = json.loads(source[source.index("{"):source.rindex("export default")].strip().rstrip(";"))
+    words = set()
+    for game in ("anagrams", "wordSearch", "runningWords"):
+        entry = bank[game].get(locale) or bank[game]["es"]
+        for word in entry if isinstance(entry, list) else sum(entry.values(), []):
+            if len(word) >= MIN_WORD_LENGTH and word.isalpha():
+                words.add(word.lower())
+    return sorted(words)
+
+
+def grow_dictionary(words, size, rng):
+    letters = "abcdefghijlmnopqrstuvz"
+    known = set(words)
+    grown = list(words)
+    while len(grown) < size:
+        word = rng.choice(grown)
+        for _ in range(rng.randint(1, 2)):
+            at = rng.randrange(len(word))
+            edit = rng.randrange(3)
+            if edit == 0:
+                word = word[:at] + rng.choice(letters) + word[at + 1:]
+            elif edit == 1:
+                word = word[:at] + rng.choice(letters) + word[at:]
+            elif len(word) > MIN_WORD_LENGTH:
+                word = word[:at] + word[at + 1:]
+        if word not in known:
+            known.add(word)
+            grown.append(word)
+    return sorted(grown)
+
+
+def full_distance(a, b):
+    """Plain Levenshtein distance (the scan strategy)"""
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j - 1] + (char != other), previous[j] + 1, current[j - 1] + 1))
+        previous = current
+    return previous[-1]
+
+
+def distance(a, b, limit):
+    """Edit distance over the band |i - j| <= limit, or limit + 1 once above it"""
+    if len(a) < len(b):
+        a, b = b, a
+    m, n = len(a), len(b)
+    if m - n > limit:
+        return limit + 1
+    band = min(limit, m)
+    outside = band + 1
+    previous = [j if j <= band else outside for j in range(n + 2)]
+    previous[n + 1] = outside
+    current = [outside] * (n + 2)
+    for i in range(1, m + 1):
+        lo, hi = max(1, i - band), min(n, i + band)
+        current[lo - 1] = (i if i <= band else outside) if lo == 1 else outside
+        row_min = current[lo - 1]
+        char = a[i - 1]
+        for j in range(lo, hi + 1):
+            value = min(previous[j - 1] + (char != b[j - 1]), previous[j] + 1, current[j - 1] + 1, outside)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        current[hi + 1] = outside
+        if row_min > limit:
+            return limit + 1
+        previous, current = current, previous
+    return previous[n] if previous[n] <= limit else limit + 1
+
+
+def letter_mask(word):
+    mask = 0
+    for char in word:
+        mask |= 1 << (ord(char) & 31)
+    return mask
+
+
+def mask_lower_bound(a, b):
+    return max(bin(a & ~b).count("1"), bin(b & ~a).count("1"))
+
+
+def keeps_half(a, b, d):
+    return 2 * d <= min(len(a), len(b))
+
+
+class PairIndex:
+    """Port of buildEditPairs/search in lib/twin-words-index.js"""
+
+    def __init__(self, words):
+        self.words = words
+        self.masks = [letter_mask(word) for word in words]
+        self.by_length = sorted(range(len(words)), key=lambda i: len(words[i]))
+        self.pairs = {d: [] for d in range(1, MAX_PAIR_DISTANCE + 1)}
+        for i, word_id in enumerate(self.by_length):
+            word = words[word_id]
+            radius = min(MAX_PAIR_DISTANCE, len(word) // 2)
+            for other_id in self.by_length[i + 1:]:
+                other = words[other_id]
+                if len(other) - len(word) > radius:
+                    break
+                if mask_lower_bound(self.masks[word_id], self.masks[other_id]) > radius:
+                    continue
+                d = distance(word, other, radius)
+                if d <= radius:
+                    self.pairs[d].append((min(word_id, other_id), max(word_id, other_id)))
+
+    def search(self, word, max_distance):
+        found, mask = [], letter_mask(word)
+        for word_id in self.by_length:
+            other = self.words[word_id]
+            if len(other) > len(word) + max_distance:
+                break
+            if len(other) < len(word) - max_distance or mask_lower_bound(mask, self.masks[word_id]) > max_distance:
+                continue
+            d = distance(word, other, max_distance)
+            if 0 < d <= max_distance:
+                found.append((word_id, d))
+        return found
+
+
+def draw_round(partners_of, words, d, rng):
+    """Pairs at distance d with no word used twice, partners from partners_of(word)"""
+    used, pairs = set(), []
+    for _ in range(PAIRS_PER_ROUND * MAX_DRAW_ATTEMPTS):
+        if len(pairs) == PAIRS_PER_ROUND:
+            break
+        word = rng.choice(words)
+        if word in used:
+            continue
+        partners = [w for w in partners_of(word) if w not in used]
+        if partners:
+            partner = rng.choice(partners)
+            used.update((word, partner))
+            pairs.append((word, partner))
+    return pairs
+
+
+def run_stand_in(args):
+    rng = random.Random(args.seed)
+    words = grow_dictionary(load_words(args.locale), args.words, rng)
+
+    start = time.perf_counter()
+    index = PairIndex(words)
+    build_ms = (time.perf_counter() - start) * 1000
+    pairs = index.pairs
+    print(f"🌱 {len(words)} words, index built in {build_ms:.0f} ms: "
+          + ", ".join(f"{len(p)} pairs at distance {d}" for d, p in pairs.items()))
+
+    def scan(d):
+        return lambda word: [w for w in words if full_distance(word, w) == d and keeps_half(word, w, d)]
+
+    def pruned(d):
+        return lambda word: [words[i] for i, found in index.search(word, d) if found == d and keeps_half(word, words[i], d)]
+
+    def indexed(d):
+        def draw():
+            used, drawn = set(), []
+            for _ in range(PAIRS_PER_ROUND * MAX_DRAW_ATTEMPTS):
+                if len(drawn) == PAIRS_PER_ROUND or not pairs[d]:
+                    break
+                a, b = pairs[d][rng.randrange(len(pairs[d]))]
+                if a in used or b in used:
+                    continue
+                used.update((a, b))
+                drawn.append((words[a], words[b]))
+            return drawn
+        return draw
+
+    results = {"words": len(words), "build_ms": round(build_ms, 1)}
+    for d in range(1, MAX_PAIR_DISTANCE + 1):
+        strategies = {
+            "scan": lambda: draw_round(scan(d), words, d, rng),
+            "pruned": lambda: draw_round(pruned(d), words, d, rng),
+            "indexed": indexed(d),
+        }
+        for name, draw in strategies.items():
+            drawn = []
+            repeat = args.repeat if name != "scan" else max(1, args.repeat // 10)
+            samples = []
+            for _ in range(repeat):
+                begin = time.perf_counter()
+                drawn.append(len(draw()))
+                samples.append((time.perf_counter() - begin) * 1000)
+            results[f"{name}_d{d}"] = {**summarize(samples), "pairs_per_round": round(sum(drawn) / repeat, 2)}
+
+    print_table(
+        f"Rounds of {PAIRS_PER_ROUND} pairs ({args.locale}, {len(words)} words)",
+        ["distance", "strategy", "mean ms", "p99 ms", "pairs/round"],
+        [(d, name, r["mean_ms"], r["p99_ms"], r["pairs_per_round"])
+         for d in range(1, MAX_PAIR_DISTANCE + 1) for name in ("scan", "pruned", "indexed")
+         for r in [results[f"{name}_d{d}"]]],
+    )
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=1_000, help="dictionary size, grown from the word bank")
+    parser.add_argument("--locale", default="es", help="word bank locale")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    args = parser.parse_args()
+    if args.api:
+        parser.error("TwinWords pairs are built in the browser; there is no API to time")
+
+    write_results(args.json_out, run_stand_in(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
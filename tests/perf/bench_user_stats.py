@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+USER STATS READ LATENCY BENCHMARK
+
+Compares the previous on-demand getUserStats (profile, streak, recent
+achievements and a game_runs aggregation per read) against a single primary
+key lookup of the user_stats aggregate, at 10, 1k and 100k runs per user.
+
+The stand-in maintains user_stats with an insert trigger equivalent to
+user_stats_on_game_run() in
+supabase/migrations/20261019120300_user_stats_aggregate.sql, so seeding also reports the per-insert maintenance overhead. getUserStats is a
+client-side Supabase call with no API route, so there is no --api mode.
+"""
+
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from tests.perf.harness import (
+    base_parser,
+    open_stand_in,
+    print_table,
+    summarize,
+    time_call,
+    write_results,
+)
+
+GAMES = ["schulte", "twin_words", "par_impar", "memory_digits", "running_words",
+         "letters_grid", "word_search", "anagrams"]
+SIZES = [10, 1_000, 100_000]
+
+USER_STATS_SCHEMA = """
+create table user_stats (
+  user_id text primary key,
+  total_runs int not null default 0,
+  total_time_ms int not null default 0,
+  runs_per_game text not null default '{}',
+  best_score_per_game text not null default '{}',
+  last_played_at text,
+  xp int not null default 0,
+  level int not null default 1,
+  streak_current int not null default 0,
+  streak_longest int not null default 0,
+  recent_achievements text not null default '[]',
+  updated_at text
+);
+create trigger user_stats_game_run after insert on game_runs
+begin
+  insert into user_stats (user_id, total_runs, total_time_ms, runs_per_game, best_score_per_game, last_played_at)
+  values (new.user_id, 1, new.duration_ms, json_object(new.game, 1), json_object(new.game, new.score), new.created_at)
+  on conflict (user_id) do update set
+    total_runs = total_runs + 1,
+    total_time_ms = total_time_ms + new.duration_ms,
+    runs_per_game = json_set(runs_per_game, '$.' || new.game,
+      coalesce(json_extract(runs_per_game, '$.' || new.game), 0) + 1),
+    best_score_per_game = json_set(best_score_per_game, '$.' || new.game,
+      max(coalesce(json_extract(best_score_per_game, '$.' || new.game), new.score), new.score)),
+    last_played_at = max(last_played_at, new.created_at);
+end;
+"""
+
+
+def seed_user(conn, user_id, runs):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        (str(uuid.uuid4()), user_id, random.choice(GAMES), random.randint(0, 300), 60000,
+         random.randint(1, 20), "{}", (start + timedelta(seconds=i * 61)).isoformat())
+        for i in range(runs)
+    ]
+    begin = time.perf_counter()
+    conn.executemany("insert into game_runs values (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    insert_ms = (time.perf_counter() - begin) * 1000
+
+    conn.execute("insert into profiles (user_id, xp, level) values (?, ?, ?)", (user_id, runs * 50, runs * 50 // 1000 + 1))
+    conn.execute("insert into streaks (user_id, current, longest) values (?, 3, 12)", (user_id,))
+    for i, game in enumerate(GAMES):
+        conn.execute(
+            "insert into achievements values (?, ?, ?, ?, ?, '🏆', ?)",
+            (str(uuid.uuid4()), user_id, f"{game}_badge", game, "desc", (start + timedelta(days=i)).isoformat()),
+        )
+    conn.execute(
+        "update user_stats set xp = ?, level = ?, streak_current = 3, streak_longest = 12, "
+        "recent_achievements = (select json_group_array(json_object('achievement_type', achievement_type, 'title', title)) "
+        "from (select * from achievements where user_id = ? order by unlocked_at desc limit 10)) where user_id = ?",
+        (runs * 50, runs * 50 // 1000 + 1, user_id, user_id),
+    )
+    conn.commit()
+    return insert_ms
+
+
+def on_demand(conn, user_id):
+    """The old read path: four independent queries per render"""
+    profile = conn.execute("select * from profiles where user_id = ?", (user_id,)).fetchone()
+    streak = conn.execute("select * from streaks where user_id = ?", (user_id,)).fetchone()
+    achievements = conn.execute(
+        "select * from achievements where user_id = ? order by unlocked_at desc limit 10", (user_id,)
+    ).fetchall()
+    games = conn.execute(
+        "select game, count(*), max(score), sum(duration_ms), max(created_at) "
+        "from game_runs where user_id = ? group by game", (user_id,)
+    ).fetchall()
+    return profile, streak, achievements, games
+
+
+def aggregate(conn, user_id):
+    """The new read path: one primary-key lookup"""
+    row = conn.execute("select * from user_stats where user_id = ?", (user_id,)).fetchone()
+    return json.loads(row["runs_per_game"]), json.loads(row["recent_achievements"])
+
+
+def run_stand_in(args):
+    conn = open_stand_in()
+    conn.executescript(USER_STATS_SCHEMA)
+
+    results = []
+    for size in SIZES:
+        user_id = f"{args.user_id}_{size}"
+        insert_ms = seed_user(conn, user_id, size)
+        old = summarize(time_call(lambda: on_demand(conn, user_id), args.repeat))
+        new = summarize(time_call(lambda: aggregate(conn, user_id), args.repeat))
+        check = conn.execute("select total_runs from user_stats where user_id = ?", (user_id,)).fetchone()[0]
+        assert check == size, f"aggregate drifted: {check} != {size}"
+        results.append({
+            "runs": size, "on_demand": old, "aggregate": new,
+            "insert_us_per_run": round(insert_ms * 1000 / size, 2),
+        })
+
+    print_table(
+        "getUserStats latency by runs per user",
+        ["runs", "on-demand p50", "on-demand p95", "aggregate p50", "aggregate p95", "insert µs/run"],
+        [
+            (r["runs"], r["on_demand"]["p50_ms"], r["on_demand"]["p95_ms"],
+             r["aggregate"]["p50_ms"], r["aggregate"]["p95_ms"], r["insert_us_per_run"])
+            for r in results
+        ],
+    )
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    args = parser.parse_args()
+
+    if args.api:
+        print("⚠️ getUserStats is a client-side Supabase call; only the stand-in mode is available")
+        return 1
+
+    results = run_stand_in(args)
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
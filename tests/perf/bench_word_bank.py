@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+WORD BANK SHARD BENCHMARK
+
+Reports, per game route, the word bank bytes it loads and the time to parse
+them: the whole of lib/word-bank.js (an object literal bundled into every
+word game route, the previous behaviour) versus the JSON shards the route
+now fetches from public/word-bank/ (see lib/word-bank-shards.js).
+
+- stand-in: reads the files from disk. Bytes are raw and gzip level 6.
+  Parse times come from Node (`node` on PATH): the word bank module source is
+  compiled and run as a script, and the shards go through JSON.parse. A
+  comment unique to each run keeps V8 from reusing compiled code. Without
+  Node only the bytes are reported.
+- --api: fetches each route's shards from the running server (after
+  `node scripts/seed-word-bank.js`) and reports bytes on the wire and latency.
+"""
+
+import gzip
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from tests.perf.harness import BASE_URL, base_parser, print_table, write_results
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Shards each game route loads, mirrored from the components
+# (Anagrams also builds its dictionary index from wordSearch and runningWords)
+ROUTE_SHARDS = {
+    "anagrams": ["anagrams", "wordSearch", "runningWords"],
+    "running_words": ["runningWords"],
+    "word_search": ["wordSearch"],
+    "letters_grid": ["lettersGrid"],
+}
+
+# Node timing script: argv = [repeat, kind, path...]; prints the median µs
+NODE_TIMER = r"""
+const fs = require('fs')
+const vm = require('vm')
+const [repeat, kind, ...paths] = process.argv.slice(1)
+const texts = paths.map(path => fs.readFileSync(path, 'utf8'))
+const samples = []
+for (let i = 0; i < Number(repeat); i++) {
+  const start = process.hrtime.bigint()
+  if (kind === 'module') {
+    const source = texts[0].replace(/^export default .*$/m, '').replace(/^export /gm, '')
+    new vm.Script(`{\n${source}\n}\n// run ${i}`).runInThisContext()
+  } else {
+    for (const text of texts) JSON.parse(text)
+  }
+  samples.push(Number(process.hrtime.bigint() - start) / 1000)
+}
+samples.sort((a, b) => a - b)
+console.log(samples[samples.length >> 1].toFixed(1))
+"""
+
+
+def load_manifest():
+    """WORD_BANK_SHARDS from lib/word-bank-manifest.js"""
+    source = (ROOT / "lib" / "word-bank-manifest.js").read_text(encoding="utf-8")
+    start = source.index("WORD_BANK_SHARDS = ") + len("WORD_BANK_SHARDS = ")
+    return json.loads(source[start:source.rindex("}") + 1])
+
+
+def sizes(paths):
+    data = b"".join(path.read_bytes() for path in paths)
+    return len(data), len(gzip.compress(data, compresslevel=6))
+
+
+def node_parse_us(kind, paths, repeat):
+    if not shutil.which("node"):
+        return "n/a"
+    output = subprocess.run(
+        ["node", "-e", NODE_TIMER, str(repeat), kind, *map(str, paths)],
+        check=True, capture_output=True, text=True,
+    )
+    return float(output.stdout.strip())
+
+
+def run_stand_in(args):
+    shards = load_manifest()
+    module = ROOT / "lib" / "word-bank.js"
+    module_bytes, module_gzip = sizes([module])
+    module_us = node_parse_us("module", [module], args.repeat)
+    if module_us == "n/a":
+        print("⚠️ node not found, reporting bytes only")
+
+    results = {}
+    for route, games in ROUTE_SHARDS.items():
+        paths = [ROOT / "public" / shards[game][args.locale].lstrip("/") for game in games]
+        shard_bytes, shard_gzip = sizes(paths)
+        results[route] = {
+            "module_bytes": module_bytes,
+            "module_gzip_bytes": module_gzip,
+            "module_parse_us": module_us,
+            "shard_bytes": shard_bytes,
+            "shard_gzip_bytes": shard_gzip,
+            "shard_parse_us": node_parse_us("json", paths, args.repeat),
+        }
+
+    print_table(
+        f"Word bank loaded per game route ({args.locale}, median of {args.repeat} parses)",
+        ["route", "module bytes", "gzip", "parse µs", "shard bytes", "gzip", "parse µs"],
+        [(route, r["module_bytes"], r["module_gzip_bytes"], r["module_parse_us"],
+          r["shard_bytes"], r["shard_gzip_bytes"], r["shard_parse_us"])
+         for route, r in results.items()],
+    )
+    return results
+
+
+def run_api(args):
+    import requests  # only needed in --api mode
+
+    shards = load_manifest()
+    results = {}
+    for route, games in ROUTE_SHARDS.items():
+        wire, elapsed = 0, 0.0
+        for game in games:
+            start = time.perf_counter()
+            response = requests.get(f"{BASE_URL}{shards[game][args.locale]}",
+                                    headers={"Accept-Encoding": "gzip, br"}, stream=True, timeout=10)
+            response.raise_for_status()
+            wire += len(response.raw.read(decode_content=False))
+            elapsed += (time.perf_counter() - start) * 1000
+        results[route] = {"shards": len(games), "wire_bytes": wire, "ms": round(elapsed, 1)}
+
+    print_table(
+        f"Word bank shards per game route from {BASE_URL} ({args.locale})",
+        ["route", "shards", "wire bytes", "ms"],
+        [(route, r["shards"], r["wire_bytes"], r["ms"]) for route, r in results.items()],
+    )
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--locale", default="es", help="word bank locale")
+    args = parser.parse_args()
+
+    results = run_api(args) if args.api else run_stand_in(args)
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
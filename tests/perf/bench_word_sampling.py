@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+WORD SAMPLING BENCHMARK
+
+Samples 20 words of 4-8 letters in a --band (any by default) from a
+word_bank with --words rows per locale, three ways:
+
+- order_by_random: ORDER BY random() LIMIT n over the matching rows (reads
+  and sorts every one of them)
+- sample_key: one window of rows per length at or after a random
+  sample_key, read in index order with wrap-around, then sampled in memory
+  (the queries getWordWindow in lib/supabase.js issues)
+- cached: the same windows behind the in-process cache of
+  lib/word-sampler.js, so most requests touch no rows
+
+The stand-in mirrors word_bank with the sample_key and frequency_band columns
+and indexes from supabase/migrations/20261019120900_word_bank_sampling.sql.
+--api mode times GET /api/words and reports how many distinct words the
+samples covered.
+"""
+
+import random
+import sys
+import time
+
+from tests.perf.harness import (
+    api_request,
+    base_parser,
+    open_stand_in,
+    print_table,
+    summarize,
+    time_call,
+    write_results,
+)
+
+MIN_LENGTH, MAX_LENGTH, COUNT = 4, 8, 20
+BANDS = {"any": None, "unranked": 0, "common": 1, "intermediate": 2, "rare": 3}  # WORD_FREQUENCY_BANDS
+WINDOW_SIZE = 400  # mirrors lib/word-sampler.js
+WINDOW_TTL_S = 5 * 60
+
+WORD_BANK_SCHEMA = """
+create table word_bank (
+  id integer primary key,
+  word text not null,
+  language text not null,
+  length int not null,
+  frequency_rank int default 0,
+  frequency_band int not null,
+  sample_key real not null
+);
+create index idx_word_bank_lang_len on word_bank(language, length);
+create index idx_word_bank_sample on word_bank(language, length, sample_key);
+create index idx_word_bank_band_sample on word_bank(language, length, frequency_band, sample_key);
+"""
+
+
+def band_of(rank):
+    if rank <= 0:
+        return 0
+    return 1 if rank <= 2000 else 2 if rank <= 10000 else 3
+
+
+def seed(conn, words_per_locale, rng):
+    letters = "abcdefghijlmnopqrstuv"
+    rows = []
+    for language in ("es", "en"):
+        for rank in range(1, words_per_locale + 1):
+            word = "".join(rng.choice(letters) for _ in range(rng.randint(3, 12)))
+            rows.append((word, language, len(word), rank, band_of(rank), rng.random()))
+    conn.executemany(
+        "insert into word_bank (word, language, length, frequency_rank, frequency_band, sample_key) "
+        "values (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    return len(rows)
+
+
+def band_filter(band):
+    return ("", ()) if band is None else (" and frequency_band = ?", (band,))
+
+
+def order_by_random(conn, rng, band):
+    where, params = band_filter(band)
+    rows = conn.execute(
+        f"select word from word_bank where language = 'es' and length between ? and ?{where} "
+        "order by random() limit ?",
+        (MIN_LENGTH, MAX_LENGTH, *params, COUNT),
+    ).fetchall()
+    return [r["word"] for r in rows]
+
+
+def read_window(conn, length, rng, band):
+    where, params = band_filter(band)
+    query = (f"select word from word_bank where language = 'es' and length = ?{where} "
+             "and sample_key >= ? and sample_key < ? order by sample_key limit ?")
+    from_key = rng.random()
+    rows = conn.execute(query, (length, *params, from_key, 2.0, WINDOW_SIZE)).fetchall()
+    if len(rows) < WINDOW_SIZE:
+        rows += conn.execute(query, (length, *params, 0.0, from_key, WINDOW_SIZE - len(rows))).fetchall()
+    return [r["word"] for r in rows]
+
+
+def sample_key(conn, rng, band):
+    pool = {w for length in range(MIN_LENGTH, MAX_LENGTH + 1) for w in read_window(conn, length, rng, band)}
+    return rng.sample(sorted(pool), min(COUNT, len(pool)))
+
+
+class WindowCache:
+    """Port of the window cache in lib/word-sampler.js"""
+
+    def __init__(self, conn, rng, band):
+        self.conn, self.rng, self.band, self.windows, self.reads = conn, rng, band, {}, 0
+
+    def sample(self):
+        now = time.monotonic()
+        pool = set()
+        for length in range(MIN_LENGTH, MAX_LENGTH + 1):
+            cached = self.windows.get(length)
+            if not cached or now - cached[1] >= WINDOW_TTL_S:
+                self.reads += 1
+                cached = (read_window(self.conn, length, self.rng, self.band), now)
+                self.windows[length] = cached
+            pool.update(cached[0])
+        return self.rng.sample(sorted(pool), min(COUNT, len(pool)))
+
+
+def run_stand_in(args):
+    rng = random.Random(args.seed)
+    conn = open_stand_in()
+    conn.executescript(WORD_BANK_SCHEMA)
+    total = seed(conn, args.words, rng)
+    band = BANDS[args.band]
+    where, params = band_filter(band)
+    matching = conn.execute(
+        f"select count(*) from word_bank where language = 'es' and length between ? and ?{where}",
+        (MIN_LENGTH, MAX_LENGTH, *params),
+    ).fetchone()[0]
+    print(f"🌱 Seeded {total} words ({args.words} per locale), {matching} match the sample")
+
+    cache = WindowCache(conn, rng, band)
+    strategies = {
+        "order_by_random": lambda: order_by_random(conn, rng, band),
+        "sample_key": lambda: sample_key(conn, rng, band),
+        "cached": cache.sample,
+    }
+    results = {}
+    for name, fn in strategies.items():
+        seen = set()
+        samples = time_call(lambda: seen.update(fn()), args.repeat)
+        results[name] = {**summarize(samples), "distinct_words": len(seen)}
+    results["cached"]["window_reads"] = cache.reads
+
+    print_table(
+        f"Sample {COUNT} words, {MIN_LENGTH}-{MAX_LENGTH} letters, {args.band} band ({args.repeat} requests)",
+        ["strategy", "mean ms", "p50 ms", "p99 ms", "distinct words"],
+        [(name, r["mean_ms"], r["p50_ms"], r["p99_ms"], r["distinct_words"]) for name, r in results.items()],
+    )
+    return results
+
+
+def run_api(args):
+    params = {"locale": "es", "min_length": MIN_LENGTH, "max_length": MAX_LENGTH, "band": args.band, "count": COUNT}
+    samples, seen, sources = [], set(), set()
+    for _ in range(args.repeat):
+        response, elapsed = api_request("GET", "/words", params=params)
+        if response.status_code != 200:
+            print(f"❌ words: {response.status_code} - {response.text[:100]}")
+            return None
+        samples.append(elapsed)
+        data = response.json()
+        seen.update(data["words"])
+        sources.add(data["source"])
+    results = {**summarize(samples), "distinct_words": len(seen), "sources": sorted(sources)}
+
+    print_table(
+        "GET /api/words",
+        ["requests", "p50 ms", "p95 ms", "distinct words", "source"],
+        [(args.repeat, results["p50_ms"], results["p95_ms"], results["distinct_words"], ", ".join(results["sources"]))],
+    )
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=50_000, help="stand-in: words seeded per locale")
+    parser.add_argument("--band", choices=BANDS, default="any", help="frequency band to sample")
+    parser.add_argument("--seed", type=int, default=1, help="stand-in: random seed")
+    args = parser.parse_args()
+
+    results = run_api(args) if args.api else run_stand_in(args)
+    if results is None:
+        return 1
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+WORD SEARCH GENERATION BENCHMARK
+
+Generates --grids WordSearch puzzles per level and reports generation time
+(mean/p99) and placement success (puzzles with every word placed, share of
+words placed).
+
+- stand-in: runs generateWordSearch() from lib/puzzles.js in Node (`node`
+  on PATH) over seeds 0..--grids-1, with the locale's wordSearch shard from
+  public/word-bank/. The lib modules are copied to a temporary directory as
+  .mjs files so Node can import them without a bundler.
+- --api: fetches every level's pool from GET /api/puzzles (the JS generator
+  itself) and reports request latency and placement success per level.
+"""
+
+import json
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from tests.perf.harness import api_request, base_parser, print_table, summarize, write_results
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Node script: argv = [puzzles module, shard path, locale, grids, levels];
+# prints {level: {wordsCount, samples, placed}} as JSON
+NODE_RUNNER = r"""
+const fs = require('fs')
+const [modulePath, shardPath, locale, grids, levels] = process.argv.slice(1)
+import(modulePath).then(({ generateWordSearch, WORD_SEARCH_LEVELS }) => {
+  const words = JSON.parse(fs.readFileSync(shardPath, 'utf8'))
+  const results = {}
+  for (const level of JSON.parse(levels)) {
+    const samples = []
+    const placed = []
+    for (let seed = 0; seed < Number(grids); seed++) {
+      const start = process.hrtime.bigint()
+      const puzzle = generateWordSearch({ level, locale, seed }, words)
+      samples.push(Number(process.hrtime.bigint() - start) / 1e6)
+      placed.push(puzzle.words.length)
+    }
+    results[level] = { wordsCount: WORD_SEARCH_LEVELS[level].wordsCount, samples, placed }
+  }
+  console.log(JSON.stringify(results))
+})
+"""
+
+# Extensionless relative imports, as the bundler resolves them
+RELATIVE_IMPORT = re.compile(r"""((?:from\s+|import\()(['"])\./[\w-]+)\2""")
+
+
+def load_manifest():
+    """WORD_BANK_SHARDS from lib/word-bank-manifest.js"""
+    source = (ROOT / "lib" / "word-bank-manifest.js").read_text(encoding="utf-8")
+    start = source.index("WORD_BANK_SHARDS = ") + len("WORD_BANK_SHARDS = ")
+    return json.loads(source[start:source.rindex("}") + 1])
+
+
+def copy_lib_as_modules(target):
+    """lib/*.js as .mjs files with their relative imports pointing at each other"""
+    for path in (ROOT / "lib").glob("*.js"):
+        source = path.read_text(encoding="utf-8")
+        (target / f"{path.stem}.mjs").write_text(RELATIVE_IMPORT.sub(r"\1.mjs\2", source), encoding="utf-8")
+    return target / "puzzles.mjs"
+
+
+def run_stand_in(args, levels):
+    if not shutil.which("node"):
+        print("⚠️ node not found; run with --api against a running server instead")
+        return None
+
+    shard = ROOT / "public" / load_manifest()["wordSearch"][args.locale].lstrip("/")
+    print(f"⏱️ generateWordSearch: levels {args.levels}, {args.grids} grids each...")
+    with tempfile.TemporaryDirectory() as tmp:
+        module = copy_lib_as_modules(Path(tmp))
+        output = subprocess.run(
+            ["node", "-e", NODE_RUNNER, str(module), str(shard), args.locale, str(args.grids), json.dumps(levels)],
+            check=True, capture_output=True, text=True,
+        )
+    runs = json.loads(output.stdout)
+
+    results = {}
+    for level in levels:
+        run = runs[str(level)]
+        count = run["wordsCount"]
+        results[level] = {
+            **summarize(run["samples"]),
+            "complete_rate": round(sum(placed == count for placed in run["placed"]) / args.grids, 4),
+            "words_placed_rate": round(sum(run["placed"]) / (args.grids * count), 4),
+        }
+
+    print_table(
+        f"WordSearch generation, {args.grids} grids per level (Node, {args.locale})",
+        ["level", "mean ms", "p99 ms", "all placed", "words placed"],
+        [(level, r["mean_ms"], r["p99_ms"], r["complete_rate"], r["words_placed_rate"])
+         for level, r in results.items()],
+    )
+    return results
+
+
+# (gridSize, wordsCount) per level, mirrored from WORD_SEARCH_LEVELS in
+# lib/puzzles.js for checking API responses
+LEVELS = {
+    1: (8, 3), 2: (8, 3), 3: (9, 4), 4: (9, 4), 5: (10, 5), 6: (10, 5), 7: (11, 6), 8: (11, 6),
+    9: (12, 7), 10: (12, 7), 11: (12, 8), 12: (13, 8), 13: (13, 9), 14: (13, 9), 15: (14, 10),
+    16: (14, 10), 17: (14, 10), 18: (14, 10), 19: (14, 10), 20: (14, 10),
+}
+
+
+def run_api(args, levels):
+    results = {}
+    for level in levels:
+        size, count = LEVELS[level]
+        params = {"game": "word_search", "level": level, "locale": args.locale, "from": 0, "count": 64}
+        response, ms = api_request("GET", "/puzzles", params=params)
+        response.raise_for_status()
+        puzzles = response.json()["puzzles"]
+        results[level] = {
+            "first_request_ms": round(ms, 1),
+            "puzzles": len(puzzles),
+            "complete_rate": round(sum(len(p["words"]) == count for p in puzzles) / len(puzzles), 4),
+            "words_placed_rate": round(sum(len(p["words"]) for p in puzzles) / (len(puzzles) * count), 4),
+            "grid_ok": all(len(p["grid"]) == size for p in puzzles),
+        }
+
+    print_table(
+        f"GET /api/puzzles word_search pools ({args.locale})",
+        ["level", "first request ms", "puzzles", "all placed", "words placed", "grid ok"],
+        [(level, r["first_request_ms"], r["puzzles"], r["complete_rate"], r["words_placed_rate"], r["grid_ok"])
+         for level, r in results.items()],
+    )
+    return results
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--grids", type=int, default=10_000, help="stand-in: grids generated per level")
+    parser.add_argument("--levels", default="1-20", help="levels to run, e.g. 1-20 or 1,8,15")
+    parser.add_argument("--locale", default="es", help="word list locale")
+    args = parser.parse_args()
+
+    levels = []
+    for part in args.levels.split(","):
+        low, _, high = part.partition("-")
+        levels.extend(range(int(low), int(high or low) + 1))
+
+    results = run_api(args, levels) if args.api else run_stand_in(args, levels)
+    if results is None:
+        return 1
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
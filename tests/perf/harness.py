@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Spiread performance harness
+
+Run a benchmark from the repository root, e.g.:
+    python -m tests.perf.bench_pagination [--api]
+
+Every benchmark in tests/perf can run in two modes:
+- against a running server (--api), using the same BASE_URL convention as the
+  backend_test*.py scripts
+- against a local SQLite stand-in that mirrors the Supabase tables and
+  indexes from supabase-tables.sql, so query shapes can be compared without a
+  database connection
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import time
+
+# Configuration
+BASE_URL = os.environ.get("SPIREAD_BASE_URL", "http://localhost:3000")
+API_BASE = f"{BASE_URL}/api"
+TIMEOUT = 10
+
+# Subset of supabase-tables.sql needed by the benchmarks (uuid/jsonb → text)
+STAND_IN_SCHEMA = """
+create table if not exists game_runs (
+  id text primary key,
+  user_id text not null,
+  game text not null,
+  score int not null default 0,
+  duration_ms int not null default 0,
+  difficulty_level int not null default 1,
+  metrics text not null default '{}',
+  created_at text not null
+);
+create table if not exists sessions (
+  id text primary key,
+  user_id text not null,
+  wpm_start int not null default 0,
+  wpm_end int not null default 0,
+  comprehension_score int default 0,
+  exercise_type text not null,
+  duration_seconds int not null default 0,
+  text_length int default 0,
+  created_at text not null
+);
+create table if not exists documents (
+  id text primary key,
+  user_id text not null,
+  title text not null,
+  content text not null,
+  word_count int not null default 0,
+  language text not null default 'es',
+  source_type text not null default 'text',
+  created_at text not null
+);
+create table if not exists settings (
+  user_id text primary key,
+  wpm_target int not null default 300,
+  chunk_size int not null default 1,
+  theme text not null default 'light',
+  language text not null default 'es',
+  font_size int not null default 16,
+  sound_enabled int not null default 0,
+  show_instructions int not null default 1,
+  progress text not null default '{}',
+  updated_at text not null
+);
+create table if not exists profiles (
+  user_id text primary key,
+  xp int not null default 0,
+  level int not null default 1,
+  updated_at text
+);
+create table if not exists streaks (
+  user_id text primary key,
+  current int not null default 0,
+  longest int not null default 0,
+  last_activity_date text,
+  updated_at text
+);
+create table if not exists achievements (
+  id text primary key,
+  user_id text not null,
+  achievement_type text not null,
+  title text not null,
+  description text not null,
+  icon text not null default '🏆',
+  unlocked_at text not null
+);
+create index if not exists idx_achievements_user_type on achievements(user_id, achievement_type);
+create index if not exists idx_game_runs_user_created on game_runs(user_id, created_at desc);
+create index if not exists idx_sessions_user_created on sessions(user_id, created_at desc, id desc);
+create index if not exists idx_documents_user_created on documents(user_id, created_at desc);
+"""
+
+
+def base_parser(description):
+    """Argument parser with the options shared by every benchmark"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--api", action="store_true",
+                        help=f"run against the live API at {API_BASE} instead of the SQLite stand-in")
+    parser.add_argument("--user-id", default="perf_user_001",
+                        help="user id used for seeding and reads")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="samples per measurement")
+    parser.add_argument("--json", dest="json_out",
+                        help="write raw results to this JSON file")
+    return parser
+
+
+def open_stand_in(path=":memory:"):
+    """Open the SQLite stand-in database with the mirrored schema"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(STAND_IN_SCHEMA)
+    return conn
+
+
+def api_request(method, path, **kwargs):
+    """Issue an API request and return (response, elapsed_ms)"""
+    import requests  # only needed in --api mode
+
+    kwargs.setdefault("timeout", TIMEOUT)
+    start = time.perf_counter()
+    response = requests.request(method, f"{API_BASE}{path}", **kwargs)
+    return response, (time.perf_counter() - start) * 1000
+
+
+def time_call(fn, repeat):
+    """Run fn `repeat` times and return the list of elapsed milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Mean/p50/p95/p99 summary of latency samples in milliseconds"""
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
+
+
+def print_table(title, headers, rows):
+    """Print results as an aligned text table"""
+    print()
+    print(f"📊 {title}")
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) if rows else len(str(h))
+              for i, h in enumerate(headers)]
+    print("  " + "  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  " + "  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  " + "  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
+
+
+def write_results(path, results):
+    """Dump raw results as JSON when --json was given"""
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+    print(f"💾 Results written to {path}")
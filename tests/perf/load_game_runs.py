@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+GAME RUN INGEST LOAD DRIVER
+
+Simulates the end of a SessionRunner block: --clients clients start together
+and POST game runs back to back for --duration seconds. Reports sustained
+accepted runs/s and request latency.
+
+- --api: POSTs to /api/gameRuns on a running server (start it with
+  GAME_RUNS_INGEST=queue to measure the ingestion queue, or without for
+  direct inserts). Every --check-every requests the client reads its first
+  gameRuns page to verify read-your-writes.
+- stand-in: compares direct single-row inserts (one fsync'd transaction per
+  request) with a Python port of lib/ingest-queue.js (group-committed append
+  log plus a background flusher doing bulk inserts) against SQLite files, and
+  reports how long the flusher takes to drain after the burst.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from tests.perf.harness import (
+    STAND_IN_SCHEMA,
+    api_request,
+    base_parser,
+    print_table,
+    summarize,
+    write_results,
+)
+
+GAMES = ["shuttle", "twin_words", "par_impar", "memory_digits", "running_words",
+         "letters_grid", "word_search", "anagrams"]
+
+
+def make_run(user_id, i):
+    return {
+        "id": str(uuid.uuid4()), "user_id": user_id, "game": GAMES[i % len(GAMES)],
+        "score": 120, "duration_ms": 60000, "difficulty_level": 3,
+        "metrics": json.dumps({"accuracy": 0.9}),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def insert_rows(conn, runs):
+    conn.executemany(
+        "insert or ignore into game_runs (id, user_id, game, score, duration_ms, difficulty_level, metrics, created_at) "
+        "values (:id, :user_id, :game, :score, :duration_ms, :difficulty_level, :metrics, :created_at)",
+        runs,
+    )
+    conn.commit()
+
+
+def open_db(path):
+    conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+    conn.execute("pragma journal_mode=wal")
+    conn.execute("pragma synchronous=full")
+    return conn
+
+
+class StandInQueue:
+    """Group-committed segment log with a bulk-inserting flusher (lib/ingest-queue.js)"""
+
+    def __init__(self, log_dir, db_path, flush_size, flush_ms):
+        self.log_dir = log_dir
+        self.db_path = db_path
+        self.flush_size = flush_size
+        self.flush_ms = flush_ms
+        self.segment = 0
+        self.pending = 0
+        self.waiting = []
+        self.cond = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.running = True
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.flusher = threading.Thread(target=self.flush_loop, daemon=True)
+        self.writer.start()
+        self.flusher.start()
+
+    def segment_path(self, segment):
+        return os.path.join(self.log_dir, f"game_runs.{segment:012d}.log")
+
+    def append(self, run):
+        done = threading.Event()
+        with self.cond:
+            self.waiting.append((json.dumps(run) + "\n", done))
+            self.cond.notify_all()
+        done.wait()
+
+    def write_loop(self):
+        handle, handle_segment = None, None
+        while True:
+            with self.cond:
+                while not self.waiting and self.running:
+                    self.cond.wait()
+                if not self.waiting:
+                    break
+                batch, self.waiting = self.waiting, []
+            with self.write_lock:
+                if handle_segment != self.segment:
+                    if handle:
+                        handle.close()
+                    handle_segment = self.segment
+                    handle = open(self.segment_path(handle_segment), "a", encoding="utf-8")
+                handle.write("".join(line for line, _ in batch))
+                handle.flush()
+                os.fdatasync(handle.fileno())
+                self.pending += len(batch)
+            for _, done in batch:
+                done.set()
+        if handle:
+            handle.close()
+
+    def flush_once(self, conn):
+        with self.write_lock:
+            sealed = self.segment
+            self.segment += 1
+        flushed = 0
+        for name in sorted(os.listdir(self.log_dir)):
+            segment = int(name.split(".")[1])
+            if segment > sealed:
+                continue
+            path = os.path.join(self.log_dir, name)
+            with open(path, encoding="utf-8") as fh:
+                runs = [json.loads(line) for line in fh if line.strip()]
+            for i in range(0, len(runs), self.flush_size):
+                insert_rows(conn, runs[i:i + self.flush_size])
+            os.unlink(path)
+            flushed += len(runs)
+        with self.write_lock:
+            self.pending -= flushed
+        return flushed
+
+    def flush_loop(self):
+        conn = open_db(self.db_path)
+        while self.running or self.pending:
+            deadline = time.perf_counter() + self.flush_ms / 1000
+            while time.perf_counter() < deadline and self.pending < self.flush_size and self.running:
+                time.sleep(0.005)
+            if self.pending:
+                self.flush_once(conn)
+        conn.close()
+
+    def drain(self):
+        self.running = False
+        with self.cond:
+            self.cond.notify_all()
+        self.writer.join()
+        self.flusher.join()
+
+
+def drive(clients, duration, post):
+    """Run `clients` threads calling post(client, i) until `duration` elapses"""
+    latencies = [[] for _ in range(clients)]
+    errors = [0] * clients
+    barrier = threading.Barrier(clients)
+
+    def client(c):
+        barrier.wait()
+        stop_at = time.perf_counter() + duration
+        i = 0
+        while time.perf_counter() < stop_at:
+            begin = time.perf_counter()
+            try:
+                post(c, i)
+                latencies[c].append((time.perf_counter() - begin) * 1000)
+            except Exception:
+                errors[c] += 1
+            i += 1
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    samples = [ms for per_client in latencies for ms in per_client]
+    return {"accepted": len(samples), "errors": sum(errors),
+            "runs_per_s": round(len(samples) / elapsed, 1), **summarize(samples)}
+
+
+def run_stand_in(args):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Direct: every request is its own insert transaction
+        direct_path = os.path.join(tmp, "direct.db")
+        setup = sqlite3.connect(direct_path)
+        setup.executescript(STAND_IN_SCHEMA)
+        setup.close()
+        local = threading.local()
+
+        def direct_post(c, i):
+            if not hasattr(local, "conn"):
+                local.conn = open_db(direct_path)
+            insert_rows(local.conn, [make_run(f"{args.user_id}_{c}", i)])
+
+        print(f"⏱️ direct: {args.clients} clients for {args.duration}s...")
+        results["direct"] = drive(args.clients, args.duration, direct_post)
+
+        # Queue: durable append, background bulk insert
+        queue_path = os.path.join(tmp, "queue.db")
+        setup = sqlite3.connect(queue_path)
+        setup.executescript(STAND_IN_SCHEMA)
+        setup.close()
+        log_dir = os.path.join(tmp, "ingest")
+        os.mkdir(log_dir)
+        queue = StandInQueue(log_dir, queue_path, args.flush_size, args.flush_ms)
+
+        print(f"⏱️ queue: {args.clients} clients for {args.duration}s...")
+        results["queue"] = drive(args.clients, args.duration,
+                                 lambda c, i: queue.append(make_run(f"{args.user_id}_{c}", i)))
+        begin = time.perf_counter()
+        queue.drain()
+        results["queue"]["drain_ms"] = round((time.perf_counter() - begin) * 1000, 1)
+
+        check = sqlite3.connect(queue_path)
+        stored = check.execute("select count(*) from game_runs").fetchone()[0]
+        check.close()
+        results["queue"]["stored"] = stored
+        assert stored == results["queue"]["accepted"], f"queue lost runs: {stored} != {results['queue']['accepted']}"
+
+    print_table(
+        f"Sustained ingest, {args.clients} clients x {args.duration}s",
+        ["mode", "runs/s", "p50 ms", "p95 ms", "p99 ms", "errors", "drain ms"],
+        [(name, r["runs_per_s"], r["p50_ms"], r["p95_ms"], r["p99_ms"], r["errors"], r.get("drain_ms", "-"))
+         for name, r in results.items()],
+    )
+    return results
+
+
+def run_api(args):
+    ryw = {"checked": 0, "missing": 0}
+    lock = threading.Lock()
+
+    def post(c, i):
+        # game_runs.user_id is a uuid; one stable id per client
+        user_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{args.user_id}_{c}"))
+        body = {"userId": user_id, "game": GAMES[i % len(GAMES)], "difficultyLevel": 3,
+                "durationMs": 60000, "score": 120, "metrics": {"accuracy": 0.9}}
+        response, _ = api_request("POST", "/gameRuns", json=body)
+        if response.status_code not in (200, 202):
+            raise RuntimeError(f"{response.status_code}: {response.text[:100]}")
+        if args.check_every and i % args.check_every == 0:
+            run_id = response.json().get("id")
+            page, _ = api_request("GET", "/gameRuns", params={"user_id": user_id, "limit": 50})
+            with lock:
+                ryw["checked"] += 1
+                if page.status_code != 200 or run_id not in {r.get("id") for r in page.json()}:
+                    ryw["missing"] += 1
+
+    print(f"⏱️ POST /api/gameRuns: {args.clients} clients for {args.duration}s...")
+    result = drive(args.clients, args.duration, post)
+    result["read_your_writes"] = ryw
+    print_table(
+        f"Sustained ingest, {args.clients} clients x {args.duration}s",
+        ["runs/s", "p50 ms", "p95 ms", "p99 ms", "errors", "ryw checked", "ryw missing"],
+        [(result["runs_per_s"], result["p50_ms"], result["p95_ms"], result["p99_ms"], result["errors"],
+          ryw["checked"], ryw["missing"])],
+    )
+    return result
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of sustained load")
+    parser.add_argument("--flush-size", type=int, default=500, help="stand-in: INGEST_FLUSH_SIZE")
+    parser.add_argument("--flush-ms", type=int, default=250, help="stand-in: INGEST_FLUSH_MS")
+    parser.add_argument("--check-every", type=int, default=20,
+                        help="--api: verify read-your-writes every N requests per client (0 to disable)")
+    args = parser.parse_args()
+
+    results = run_api(args) if args.api else run_stand_in(args)
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+ADAPTIVE DIFFICULTY STAIRCASE SIMULATOR
+
+Replays the staircase rules of lib/adaptive-difficulty.js (AdaptiveDifficulty,
+used by GameShell games such as twin_words) and lib/enhanced-difficulty.js
+(EnhancedAdaptiveDifficulty for memory_digits, schulte and par_impar) over
+--players simulated players for --trials trials each. All players advance one
+trial at a time as NumPy arrays, --batch players at a time.
+
+Reports per game:
+- convergence: trials until a player first comes within ±1 level of the level
+  it settles at (mean level over the second half of its trials), and the share
+  of players that stay within ±2 levels of it over the second half
+- final level distribution
+- success rate over the second half against the rule's nominal target
+  (3-down/1-up ≈ 79.4%, 2-down/1-up ≈ 70.7%) and level changes per trial
+
+Response models:
+- synthetic (default): per-game psychometric models in GAME_MODELS. Player
+  ability is drawn in level units; success probability is a logistic of
+  ability minus level with guess and lapse rates, and times are log-normal
+  around the level's goal time.
+- empirical (--export FILE, or --api for --user-id's runs): trials are drawn
+  from per-level pools built from game_runs.metrics (memory_digits/par_impar
+  rounds, schulte tables), using the nearest level with data. FILE is a JSON
+  array of game_runs rows as returned by GET /api/gameRuns.
+
+Requires NumPy.
+"""
+
+import json
+import sys
+import time
+
+import numpy as np
+
+from tests.perf.harness import api_request, base_parser, print_table, write_results
+
+# Level tables mirrored from lib/enhanced-difficulty.js (index = level)
+MEMORY_DIGITS_LEN = np.array([0, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10, 11, 11, 12, 12])
+MEMORY_DIGITS_GOAL_RT = 3500 + 200 * (MEMORY_DIGITS_LEN - 3)
+SCHULTE_TARGET_TIME = np.array([
+    0, 15000, 16000, 20000, 22000, 25000, 28000, 30000, 33000, 35000, 38000,
+    28000, 30000, 28000, 32000, 35000, 38000, 33000, 36000, 30000, 33000,
+])
+_PAR_IMPAR_LEVELS = np.arange(21)
+PAR_IMPAR_K = np.minimum(20, 8 + (_PAR_IMPAR_LEVELS - 1) // 2)
+PAR_IMPAR_GOAL_RT = np.maximum(600, 900 - ((_PAR_IMPAR_LEVELS - 1) // 3) * 50)
+
+# Rules: which staircase a game uses, its level range and its nominal target
+RULES = {
+    "adaptive": {"levels": (1, 10), "target": 0.794},  # AdaptiveDifficulty, 3-down/1-up
+    "memory_digits": {"levels": (1, 20), "target": 0.794},  # 3-down/1-up + goal RT
+    "schulte": {"levels": (1, 20), "target": 0.707},  # 2-down/1-up + target time
+    "par_impar": {"levels": (1, 20), "target": 0.794},  # 3-down/1-up on accuracy + RT
+}
+
+# Synthetic response models. ability: (mean, sd) in level units; slope: width
+# of the psychometric curve in levels; rt_slope: log-time change per level
+# above ability; rt_sigma: trial-to-trial log-time noise
+GAME_MODELS = {
+    "twin_words": {"rule": "adaptive", "start": 3, "ability": (6.0, 2.0), "slope": 1.0,
+                   "guess": 0.05, "lapse": 0.03},
+    "memory_digits": {"rule": "memory_digits", "start": 1, "ability": (9.0, 3.0), "slope": 1.5,
+                      "guess": 0.0, "lapse": 0.03, "rt_slope": 0.08, "rt_sigma": 0.25},
+    "schulte": {"rule": "schulte", "start": 1, "ability": (8.0, 3.0), "rt_slope": 0.12,
+                "rt_sigma": 0.2, "mistake_rate": 0.4},
+    "par_impar": {"rule": "par_impar", "start": 1, "ability": (10.0, 3.5), "slope": 2.0,
+                  "guess": 0.5, "lapse": 0.02, "rt_slope": 0.05, "rt_sigma": 0.15},
+}
+
+
+class State:
+    """Staircase state for a batch of players (one array entry per player)"""
+
+    def __init__(self, n, start, rule):
+        low, high = RULES[rule]["levels"]
+        self.level = np.full(n, min(max(start, low), high), dtype=np.int16)
+        self.consecutive = np.zeros(n, dtype=np.int16)
+        self.recent_rt = np.zeros((n, 3), dtype=np.float32)  # last 3 response times (memory_digits)
+        self.trial = 0
+
+
+def step_adaptive(state, success, rt, accuracy):
+    """AdaptiveDifficulty.recordTrial: up after 3 consecutive successes, down on any failure"""
+    low, high = RULES["adaptive"]["levels"]
+    state.consecutive = np.where(success, state.consecutive + 1, 0).astype(np.int16)
+    up = success & (state.consecutive >= 3) & (state.level < high)
+    down = ~success & (state.level > low)
+    state.level += up.astype(np.int16) - down.astype(np.int16)
+    state.consecutive[up | down] = 0
+
+
+def step_memory_digits(state, success, rt, accuracy):
+    """handleMemoryDigitsStaircase: 3 correct with mean RT ≤ goal up; failure or RT > 1.25× goal down"""
+    low, high = RULES["memory_digits"]["levels"]
+    goal = MEMORY_DIGITS_GOAL_RT[state.level]
+    state.recent_rt[:, state.trial % 3] = rt
+    state.consecutive = np.where(success, state.consecutive + 1, 0).astype(np.int16)
+
+    # With 3+ consecutive successes the last 3 trials are the last 3 correct ones
+    up = success & (state.consecutive >= 3) & (state.recent_rt.mean(axis=1) <= goal) & (state.level < high)
+    down = ~success & (state.level > low)
+    slow = ~(up | down) & (rt > goal * 1.25)
+    state.consecutive[up | slow] = 0
+    down |= slow & (state.level > low)
+    state.level += up.astype(np.int16) - down.astype(np.int16)
+
+
+def step_schulte(state, success, rt, accuracy):
+    """handleSchulteStaircase: 2 successes within target time up; failure or time > 1.5× target down"""
+    low, high = RULES["schulte"]["levels"]
+    target = SCHULTE_TARGET_TIME[state.level]
+    state.consecutive = np.where(success, state.consecutive + 1, 0).astype(np.int16)
+
+    up = success & (state.consecutive >= 2) & (rt > 0) & (rt <= target) & (state.level < high)
+    down = ~success & (state.level > low)
+    slow = ~(up | down) & (rt > target * 1.5)
+    state.consecutive[up | slow] = 0
+    down |= slow & (state.level > low)
+    state.level += up.astype(np.int16) - down.astype(np.int16)
+
+
+def step_par_impar(state, success, rt, accuracy):
+    """handleParImparStaircase: 3 rounds ≥85% accuracy with mean RT ≤ goal up; <65% or RT > 1.25× goal down"""
+    low, high = RULES["par_impar"]["levels"]
+    goal = PAR_IMPAR_GOAL_RT[state.level]
+    good = success & (accuracy >= 0.85)
+    # A round that is neither good nor bad keeps the streak, as in the JS
+    state.consecutive = np.where(good, state.consecutive + 1, state.consecutive).astype(np.int16)
+
+    up = good & (state.consecutive >= 3) & (rt <= goal) & (state.level < high)
+    bad = ~good & ((accuracy < 0.65) | (rt > goal * 1.25))
+    state.consecutive[up | bad] = 0
+    down = bad & (state.level > low)
+    state.level += up.astype(np.int16) - down.astype(np.int16)
+
+
+STEPS = {
+    "adaptive": step_adaptive,
+    "memory_digits": step_memory_digits,
+    "schulte": step_schulte,
+    "par_impar": step_par_impar,
+}
+
+
+def psychometric(model, ability, level):
+    """P(success) at `level` for players of `ability`"""
+    core = 1.0 / (1.0 + np.exp(-(ability - level) / model["slope"]))
+    return model["guess"] + (1.0 - model["guess"] - model["lapse"]) * core
+
+
+def log_normal_time(rng, model, ability, level, reference):
+    """Response time around `reference` ms, slower above the player's ability"""
+    noise = rng.standard_normal(len(level)).astype(np.float32)
+    return reference * np.exp(model["rt_slope"] * (level - ability) + model["rt_sigma"] * noise)
+
+
+class SyntheticResponses:
+    """Trial outcomes from the psychometric model of GAME_MODELS[game]"""
+
+    def __init__(self, game, rng):
+        self.game = game
+        self.model = GAME_MODELS[game]
+        self.rng = rng
+
+    def players(self, n):
+        mean, sd = self.model["ability"]
+        return self.rng.normal(mean, sd, n).astype(np.float32)
+
+    def trial(self, ability, level):
+        """Return (success, response time or mean RT in ms, accuracy) arrays"""
+        rng, model, n = self.rng, self.model, len(level)
+        if self.game == "memory_digits":
+            success = rng.random(n) < psychometric(model, ability, level)
+            rt = log_normal_time(rng, model, ability, level, MEMORY_DIGITS_GOAL_RT[level] * 0.85)
+            return success, rt, success.astype(np.float32)
+        if self.game == "schulte":
+            # ShuttleTable: success = time within target and at most one mistake
+            rt = log_normal_time(rng, model, ability, level, SCHULTE_TARGET_TIME[level] * 0.85)
+            mistakes = rng.poisson(model["mistake_rate"] * np.exp(0.5 * (level - ability)))
+            success = (rt <= SCHULTE_TARGET_TIME[level]) & (mistakes <= 1)
+            return success, rt, success.astype(np.float32)
+        if self.game == "par_impar":
+            # ParImpar: a round of k numbers; good = accuracy ≥ 85% and mean RT within goal
+            k = PAR_IMPAR_K[level]
+            accuracy = (rng.binomial(k, psychometric(model, ability, level)) / k).astype(np.float32)
+            rt = log_normal_time(rng, model, ability, level, PAR_IMPAR_GOAL_RT[level] * 0.9)
+            success = (accuracy >= 0.85) & (rt <= PAR_IMPAR_GOAL_RT[level])
+            return success, rt, accuracy
+        success = rng.random(n) < psychometric(model, ability, level)
+        return success, np.zeros(n, dtype=np.float32), success.astype(np.float32)
+
+
+class EmpiricalResponses:
+    """Trial outcomes drawn from observed trials at the player's level"""
+
+    def __init__(self, game, trials, rng):
+        self.game = game
+        self.rng = rng
+        low, high = RULES[GAME_MODELS[game]["rule"]]["levels"]
+        by_level = {}
+        for trial in trials:
+            by_level.setdefault(min(max(trial["level"], low), high), []).append(trial)
+
+        # Pools concatenated in level order; each level maps to its own pool
+        # or the nearest level with data
+        observed = sorted(by_level)
+        self.success = np.array([t["success"] for lv in observed for t in by_level[lv]], dtype=bool)
+        self.rt = np.array([t["rt"] for lv in observed for t in by_level[lv]], dtype=np.float32)
+        self.accuracy = np.array([t["accuracy"] for lv in observed for t in by_level[lv]], dtype=np.float32)
+        sizes = np.array([len(by_level[lv]) for lv in observed])
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        nearest = [min(range(len(observed)), key=lambda i: abs(observed[i] - lv)) for lv in range(high + 1)]
+        self.start = starts[nearest]
+        self.count = sizes[nearest]
+
+    def players(self, n):
+        return np.zeros(n, dtype=np.float32)  # ability is implicit in the observed trials
+
+    def trial(self, ability, level):
+        pick = self.start[level] + (self.rng.random(len(level)) * self.count[level]).astype(np.int64)
+        return self.success[pick], self.rt[pick], self.accuracy[pick]
+
+
+def extract_trials(rows):
+    """Per-game trial lists ({level, success, rt, accuracy}) from game_runs rows"""
+    trials = {}
+    for row in rows:
+        game = row.get("game")
+        metrics = row.get("metrics") or {}
+        if isinstance(metrics, str):
+            metrics = json.loads(metrics)
+        if game == "memory_digits":
+            for r in metrics.get("rounds") or []:
+                trials.setdefault(game, []).append({
+                    "level": int(r.get("level", 1)), "success": bool(r.get("correct")),
+                    "rt": float(r.get("responseTime") or 0), "accuracy": 1.0 if r.get("correct") else 0.0,
+                })
+        elif game == "schulte":
+            for t in metrics.get("tables") or []:
+                level = int(t.get("level", 1))
+                time_ms = float(t.get("time_ms") or 0)
+                success = time_ms <= SCHULTE_TARGET_TIME[min(max(level, 1), 20)] and t.get("mistakes", 0) <= 1
+                trials.setdefault(game, []).append({
+                    "level": level, "success": success, "rt": time_ms, "accuracy": 1.0 if success else 0.0,
+                })
+        elif game == "par_impar":
+            for r in metrics.get("rounds") or []:
+                level = int(r.get("level", 1))
+                accuracy = float(r.get("accuracy") or 0)
+                mean_rt = float(r.get("meanRt") or 0)
+                success = accuracy >= 0.85 and mean_rt <= PAR_IMPAR_GOAL_RT[min(max(level, 1), 20)]
+                trials.setdefault(game, []).append({
+                    "level": level, "success": success, "rt": mean_rt, "accuracy": accuracy,
+                })
+        elif game in GAME_MODELS:
+            for r in metrics.get("rounds") or []:
+                if "level" in r and ("success" in r or "correct" in r):
+                    success = bool(r.get("success", r.get("correct")))
+                    trials.setdefault(game, []).append({
+                        "level": int(r["level"]), "success": success,
+                        "rt": float(r.get("responseTime") or 0), "accuracy": 1.0 if success else 0.0,
+                    })
+    return trials
+
+
+def fetch_game_runs(user_id):
+    """All game runs of one user through the paginated GET /api/gameRuns"""
+    rows, cursor = [], None
+    while True:
+        params = {"user_id": user_id, "limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        response, _ = api_request("GET", "/gameRuns", params=params)
+        response.raise_for_status()
+        rows.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+
+
+def simulate_batch(game, responses, n, trials):
+    """Run one batch; returns per-player level history (n × trials) and successes"""
+    model = GAME_MODELS[game]
+    state = State(n, model["start"], model["rule"])
+    step = STEPS[model["rule"]]
+    ability = responses.players(n)
+    history = np.empty((n, trials + 1), dtype=np.int16)
+    successes = np.empty((n, trials), dtype=bool)
+    history[:, 0] = state.level
+
+    for t in range(trials):
+        success, rt, accuracy = responses.trial(ability, state.level)
+        step(state, success, rt, accuracy)
+        state.trial += 1
+        history[:, t + 1] = state.level
+        successes[:, t] = success
+    return history, successes
+
+
+def summarize_batch(history, successes, totals):
+    """Accumulate convergence, level and accuracy statistics from one batch"""
+    trials = successes.shape[1]
+    half = history[:, trials // 2 + 1:]
+    settled = np.rint(half.mean(axis=1)).astype(np.int16)
+
+    # Convergence: first trial within ±1 of the settled level (always reached,
+    # since the mean of the second half lies within its range)
+    distance = np.abs(history - settled[:, None])
+    totals["convergence"].append(np.argmax(distance <= 1, axis=1))
+    totals["stable"] += int((distance[:, trials // 2 + 1:] <= 2).all(axis=1).sum())
+    totals["final_levels"] += np.bincount(history[:, -1], minlength=len(totals["final_levels"]))
+    totals["late_successes"] += int(successes[:, trials // 2:].sum())
+    totals["late_trials"] += successes[:, trials // 2:].size
+    totals["late_changes"] += int((np.diff(half, axis=1) != 0).sum())
+    totals["late_steps"] += max(half.shape[1] - 1, 0) * half.shape[0]
+
+
+def simulate(game, responses, players, trials, batch):
+    low, high = RULES[GAME_MODELS[game]["rule"]]["levels"]
+    totals = {"convergence": [], "stable": 0, "final_levels": np.zeros(high + 1, dtype=np.int64),
+              "late_successes": 0, "late_trials": 0, "late_changes": 0, "late_steps": 0}
+
+    start = time.perf_counter()
+    for offset in range(0, players, batch):
+        history, successes = simulate_batch(game, responses, min(batch, players - offset), trials)
+        summarize_batch(history, successes, totals)
+    elapsed = time.perf_counter() - start
+
+    convergence = np.concatenate(totals["convergence"])
+    final = totals["final_levels"][low:]
+    return {
+        "players": players,
+        "trials": trials,
+        "player_trials_per_s": round(players * trials / elapsed),
+        "convergence_p50": int(np.percentile(convergence, 50)),
+        "convergence_p90": int(np.percentile(convergence, 90)),
+        "stable_share": round(totals["stable"] / players, 4),
+        "late_success_rate": round(totals["late_successes"] / max(totals["late_trials"], 1), 4),
+        "target_success_rate": RULES[GAME_MODELS[game]["rule"]]["target"],
+        "late_changes_per_trial": round(totals["late_changes"] / max(totals["late_steps"], 1), 4),
+        "final_level_distribution": {str(lv): round(int(c) / players, 4) for lv, c in zip(range(low, high + 1), final)},
+        "final_level_mean": round(float((np.arange(low, high + 1) * final).sum() / players), 2),
+    }
+
+
+def main():
+    parser = base_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--game", choices=["all", *GAME_MODELS], default="all", help="game to simulate")
+    parser.add_argument("--players", type=int, default=1_000_000, help="simulated players per game")
+    parser.add_argument("--trials", type=int, default=100, help="trials per player")
+    parser.add_argument("--batch", type=int, default=250_000, help="players simulated together")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--export", help="JSON array of game_runs rows to draw trials from")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    games = list(GAME_MODELS) if args.game == "all" else [args.game]
+
+    observed = None
+    if args.export or args.api:
+        if args.export:
+            with open(args.export, encoding="utf-8") as fh:
+                rows = json.load(fh)
+        else:
+            rows = fetch_game_runs(args.user_id)
+        observed = extract_trials(rows)
+        games = [game for game in games if observed.get(game)]
+        if not games:
+            print("⚠️ No trials with level data found for the selected games")
+            return 1
+
+    results = {}
+    for game in games:
+        if observed:
+            responses = EmpiricalResponses(game, observed[game], rng)
+            source = f"{len(observed[game])} observed trials"
+        else:
+            responses = SyntheticResponses(game, rng)
+            source = "synthetic model"
+        print(f"⏱️ {game}: {args.players} players x {args.trials} trials ({source})...")
+        results[game] = simulate(game, responses, args.players, args.trials, args.batch)
+
+    print_table(
+        f"Staircase convergence, {args.players} players x {args.trials} trials",
+        ["game", "rule", "p50 trials", "p90 trials", "stable", "success", "target", "changes/trial",
+         "mean level", "player-trials/s"],
+        [(game, GAME_MODELS[game]["rule"], r["convergence_p50"], r["convergence_p90"], r["stable_share"],
+          r["late_success_rate"], r["target_success_rate"], r["late_changes_per_trial"], r["final_level_mean"],
+          r["player_trials_per_s"]) for game, r in results.items()],
+    )
+    for game, r in results.items():
+        print_table(
+            f"{game}: final level distribution",
+            ["level", "share"],
+            [(level, share) for level, share in r["final_level_distribution"].items() if share > 0],
+        )
+    write_results(args.json_out, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())